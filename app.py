@@ -43,6 +43,38 @@ UPLOAD_DIR = os.path.join(BASE_DIR, 'uploads')
 if not os.path.exists(UPLOAD_DIR):
     os.makedirs(UPLOAD_DIR)
 
+# 급여 재계산 대상(stale) 추적 리스너
+from services.payroll_dirty_service import init_dirty_tracking
+init_dirty_tracking()
+
+# 운영 캘린더 캐시 무효화 리스너
+from services.calendar_service import init_calendar_tracking
+init_calendar_tracking()
+
+# 급여 설정 캐시 무효화 리스너
+from services.wage_service import init_wage_tracking
+init_wage_tracking()
+
+# 직원×월 근태 집계 유지 리스너
+from services.attendance_rollup_service import init_rollup_tracking
+init_rollup_tracking()
+
+# 근태·급여명세서 소속 현장(site_id) 동기화
+from services.site_stamp_service import init_site_tracking
+init_site_tracking()
+
+# 월별 운영 지표(추이) 유지 리스너 — 근태 집계 리스너 다음에 등록
+from services.monthly_metrics_service import init_metrics_tracking
+init_metrics_tracking()
+
+# 이름·전화번호 검색 문서 동기화
+from services.search_service import init_search_tracking
+init_search_tracking()
+
+# 관리자 홈·대시보드 지표 캐시 무효화 리스너
+from services.dashboard_service import init_dashboard_tracking
+init_dashboard_tracking()
+
 # Blueprint 중앙 등록
 from routes import register_blueprints
 register_blueprints(app)
@@ -135,6 +167,10 @@ def inject_nav_context():
 from services.scheduler_service import init_scheduler
 init_scheduler(app)
 
+# ── 백그라운드 작업 확인 스레드 (웹 워커의 첫 요청 때 시작, 스케줄러 비활성 워커에서도 동작) ──
+from services.job_service import init_job_runner
+init_job_runner(app)
+
 
 if __name__ == '__main__':
     # Nginx가 SSL을 처리하므로 Flask는 보통 5000 포트에서 실행됩니다
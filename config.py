@@ -49,6 +49,26 @@ class Config:
     LONGTERM_CARE_RATE = 0.1314          # 장기요양 = 건강보험료의 13.14% (2026)
     EMPLOYMENT_RATE = 0.0115             # 고용보험 1.15% (근로자 부담분)
     MAX_ADVANCE_PERCENT = 50
+    PAYROLL_OPEN_MONTHS = 2              # 급여설정 변경 시 재계산 대상으로 표시할 최근 월 수 (당월 포함)
+    PAYROLL_SIMULATION_CACHE_TTL = 300   # 급여 시뮬레이션 입력 캐시 유효시간 (초)
+    PAYSLIP_PDF_CACHE_DIR = os.path.join(BASE_DIR, "uploads", "payslip_pdf")
+    PAYSLIP_PDF_CACHE_MAX_MB = 200       # 급여명세서 PDF 캐시 최대 용량
+    PAYSLIP_PDF_CACHE_MAX_AGE_DAYS = 3   # 급여명세서 PDF 캐시 보관 기간 (발급일이 본문에 포함되므로 짧게)
+    CALENDAR_CACHE_TTL = 60              # 운영 캘린더 연도 배열 캐시 유효시간 (다른 프로세스 변경 반영 주기, 초)
+    WAGE_CACHE_CHECK_SECONDS = 1         # 급여 설정 캐시의 공유 버전 확인 주기 (초)
+    ATTENDANCE_STATS_CACHE_TTL = 30      # 관리자 근태 목록 필터별 통계 캐시 유효시간 (초)
+    DASHBOARD_CACHE_TTL = 60             # 관리자 홈·대시보드 월별 지표 캐시 유효시간 (초)
+    DASHBOARD_CACHE_CHECK_SECONDS = 1    # 대시보드 캐시의 공유 버전 확인 주기 (초)
+    ATTENDANCE_IMPORT_WORKERS = 0        # 근태 엑셀 여러 파일 파싱 프로세스 수 (0=CPU 수)
+    ATTENDANCE_IMPORT_MAX_FILES = 100    # 한 번에 업로드할 수 있는 근태 엑셀 수 (ZIP 내부 포함)
+    ATTENDANCE_IMPORT_MAX_FILE_MB = 50   # ZIP 안 엑셀 한 개의 최대 크기 (압축 해제 기준)
+    JOB_WORKERS = 2                      # 프로세스당 백그라운드 작업 스레드 수
+    JOB_POLL_SECONDS = 5                 # 대기 작업 확인 주기 (초)
+    JOB_HEARTBEAT_SECONDS = 30           # 실행 중 작업의 하트비트 갱신 주기 (초, JOB_STALE_SECONDS 보다 충분히 짧게)
+    JOB_STALE_SECONDS = 300              # 하트비트가 끊긴 실행 중 작업을 실패 처리하는 기준 (초)
+    JOB_RETENTION_DAYS = 7               # 완료된 작업 이력·결과 파일 보관 기간
+    JOB_ARTIFACT_DIR = os.path.join(BASE_DIR, "uploads", "jobs")
+    JOB_INLINE = False                   # True 면 요청 스레드에서 즉시 실행 (테스트용)
 
     ADVANCE_LIMIT_WEEKLY = 300_000
     ADVANCE_LIMIT_SHIFT = 500_000
@@ -0,0 +1,145 @@
+"""add search_documents full-text index and digits-only phone columns
+
+Revision ID: a8b9c0d1e2f3
+Revises: f7a8b9c0d1e2
+Create Date: 2026-10-17 22:00:00.000000
+
+"""
+import re
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a8b9c0d1e2f3'
+down_revision = 'f7a8b9c0d1e2'
+branch_labels = None
+depends_on = None
+
+# models/search.py 의 DDL (마이그레이션 시점 값)
+_SQLITE_DDL = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS search_documents_fts USING fts5("
+    "body, phone, grams, content='search_documents', content_rowid='id', tokenize='trigram')",
+    "CREATE TRIGGER IF NOT EXISTS search_documents_ai AFTER INSERT ON search_documents BEGIN "
+    "INSERT INTO search_documents_fts(rowid, body, phone, grams) "
+    "VALUES (new.id, new.body, new.phone, new.grams); END",
+    "CREATE TRIGGER IF NOT EXISTS search_documents_ad AFTER DELETE ON search_documents BEGIN "
+    "INSERT INTO search_documents_fts(search_documents_fts, rowid, body, phone, grams) "
+    "VALUES ('delete', old.id, old.body, old.phone, old.grams); END",
+    "CREATE TRIGGER IF NOT EXISTS search_documents_au AFTER UPDATE ON search_documents BEGIN "
+    "INSERT INTO search_documents_fts(search_documents_fts, rowid, body, phone, grams) "
+    "VALUES ('delete', old.id, old.body, old.phone, old.grams); "
+    "INSERT INTO search_documents_fts(rowid, body, phone, grams) "
+    "VALUES (new.id, new.body, new.phone, new.grams); END",
+]
+_MYSQL_DDL = [
+    f"ALTER TABLE search_documents ADD FULLTEXT INDEX ft_search_documents_{column} ({column}) "
+    f"WITH PARSER ngram"
+    for column in ('body', 'phone', 'grams')
+]
+
+# services.search_service.SPECS (마이그레이션 시점 값): 엔티티 → (테이블, 텍스트 컬럼, 전화 컬럼)
+_SPECS = {
+    'application': ('applications', ('name',), 'phone'),
+    'inquiry': ('inquiries', ('company', 'name', 'email'), 'phone'),
+    'employee': ('employees', ('name',), None),
+    'contract': ('contracts', ('title',), None),
+}
+_GRAM_PAD = '\x1f'
+
+
+def _digits(value):
+    return re.sub(r'\D', '', value or '')
+
+
+def _grams(body):
+    seen = {}
+    for line in body.lower().split('\n'):
+        for size in (1, 2):
+            for i in range(len(line) - size + 1):
+                gram = line[i:i + size]
+                if not gram.isspace():
+                    seen[gram.ljust(3, _GRAM_PAD)] = None
+    return ' '.join(seen)
+
+
+def _backfill():
+    """phone_digits 와 검색 문서를 채운다 (scripts/rebuild_search_index.py 와 같은 규칙)."""
+    bind = op.get_bind()
+    documents = sa.table(
+        'search_documents',
+        sa.column('entity'), sa.column('entity_id'), sa.column('body'),
+        sa.column('phone'), sa.column('grams'),
+    )
+    for entity, (table_name, text_columns, phone_column) in _SPECS.items():
+        columns = ['id', *text_columns] + ([phone_column] if phone_column else [])
+        extra = ['phone_digits'] if phone_column else []
+        source = sa.table(table_name, *[sa.column(c) for c in columns + extra])
+        rows = bind.execute(sa.select(*[source.c[c] for c in columns])).all()
+        docs, digits = [], []
+        for row in rows:
+            values = row._mapping
+            body = '\n'.join(str(values[c]) for c in text_columns if values[c])
+            phone = _digits(values[phone_column]) if phone_column else ''
+            if phone_column:
+                digits.append({'_id': values['id'], '_digits': phone or None})
+            docs.append({
+                'entity': entity, 'entity_id': str(values['id']),
+                'body': body, 'phone': phone, 'grams': _grams(body),
+            })
+        if digits:
+            bind.execute(
+                source.update()
+                .where(source.c.id == sa.bindparam('_id'))
+                .values(phone_digits=sa.bindparam('_digits')),
+                digits,
+            )
+        for i in range(0, len(docs), 1000):
+            bind.execute(documents.insert(), docs[i:i + 1000])
+
+
+def upgrade():
+    with op.batch_alter_table('applications', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('phone_digits', sa.String(length=20), nullable=True))
+        batch_op.create_index('ix_applications_phone_digits', ['phone_digits'], unique=False)
+
+    with op.batch_alter_table('inquiries', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('phone_digits', sa.String(length=30), nullable=True))
+        batch_op.create_index('ix_inquiries_phone_digits', ['phone_digits'], unique=False)
+
+    op.create_table(
+        'search_documents',
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('entity', sa.String(length=20), nullable=False),
+        sa.Column('entity_id', sa.String(length=36), nullable=False),
+        sa.Column('body', sa.Text(), nullable=False),
+        sa.Column('phone', sa.String(length=30), nullable=False),
+        sa.Column('grams', sa.Text(), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('entity', 'entity_id', name='uq_search_documents_entity'),
+    )
+
+    dialect = op.get_bind().dialect.name
+    if dialect == 'sqlite':
+        for statement in _SQLITE_DDL:
+            op.execute(statement)
+    elif dialect in ('mysql', 'mariadb'):
+        for statement in _MYSQL_DDL:
+            op.execute(statement)
+
+    _backfill()
+
+
+def downgrade():
+    if op.get_bind().dialect.name == 'sqlite':
+        op.execute('DROP TABLE IF EXISTS search_documents_fts')
+    op.drop_table('search_documents')
+
+    with op.batch_alter_table('inquiries', schema=None) as batch_op:
+        batch_op.drop_index('ix_inquiries_phone_digits')
+        batch_op.drop_column('phone_digits')
+
+    with op.batch_alter_table('applications', schema=None) as batch_op:
+        batch_op.drop_index('ix_applications_phone_digits')
+        batch_op.drop_column('phone_digits')
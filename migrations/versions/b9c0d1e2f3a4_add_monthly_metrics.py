@@ -0,0 +1,141 @@
+"""add monthly_metrics trend table and site_id on attendance_monthly
+
+Revision ID: b9c0d1e2f3a4
+Revises: a8b9c0d1e2f3
+Create Date: 2026-10-17 23:00:00.000000
+
+"""
+from datetime import datetime
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b9c0d1e2f3a4'
+down_revision = 'a8b9c0d1e2f3'
+branch_labels = None
+depends_on = None
+
+# services.monthly_metrics_service.METRICS (마이그레이션 시점 값)
+_METRICS = (
+    'headcount', 'attendance_records', 'total_hours', 'ot_hours', 'night_hours',
+    'holiday_hours', 'payslip_count', 'gross', 'net', 'advance_count', 'advance_amount',
+)
+
+
+def _backfill_rollup_sites():
+    """근태 월 집계에 그 달 근태의 현장(MAX(site_id), 집계 서비스와 같은 규칙)을 채운다."""
+    bind = op.get_bind()
+    records = sa.table(
+        'attendance_records',
+        sa.column('employee_id'), sa.column('work_date', sa.Date), sa.column('site_id'),
+    )
+    sites = {}
+    for emp_id, work_date, site_id in bind.execute(
+        sa.select(records.c.employee_id, records.c.work_date, records.c.site_id)
+        .where(records.c.site_id.isnot(None))
+    ):
+        key = (emp_id, work_date.strftime('%Y-%m'))
+        if site_id > sites.get(key, 0):
+            sites[key] = site_id
+
+    monthly = sa.table(
+        'attendance_monthly', sa.column('employee_id'), sa.column('month'), sa.column('site_id'),
+    )
+    values = [
+        {'_emp': emp_id, '_month': month, '_site': site_id}
+        for (emp_id, month), site_id in sites.items()
+    ]
+    for i in range(0, len(values), 1000):
+        bind.execute(
+            monthly.update()
+            .where(monthly.c.employee_id == sa.bindparam('_emp'), monthly.c.month == sa.bindparam('_month'))
+            .values(site_id=sa.bindparam('_site')),
+            values[i:i + 1000],
+        )
+
+
+def _backfill_metrics():
+    """근태 월 집계·급여명세서·승인 가불에서 월 × 현장 지표를 채운다
+    (scripts/rebuild_monthly_metrics.py 와 같은 규칙, site_id=0 은 전체 합계)."""
+    bind = op.get_bind()
+    now = datetime.now()
+    rows = {}
+
+    def add(month, site_id, values):
+        for key in (0, site_id) if site_id else (0,):
+            row = rows.get((month, key))
+            if row is None:
+                row = rows[(month, key)] = dict.fromkeys(_METRICS, 0)
+                row.update(month=month, site_id=key, updated_at=now)
+            for name, value in values.items():
+                row[name] += value or 0
+
+    for month, site_id, headcount, records, total, ot, night, holiday in bind.execute(sa.text(
+        "SELECT month, site_id, COUNT(id), SUM(record_count), SUM(total_hours), "
+        "SUM(overtime_hours), SUM(night_hours), SUM(holiday_hours) "
+        "FROM attendance_monthly GROUP BY month, site_id"
+    )):
+        add(month, site_id, {
+            'headcount': headcount, 'attendance_records': records, 'total_hours': total,
+            'ot_hours': ot, 'night_hours': night, 'holiday_hours': holiday,
+        })
+    for month, site_id, count, gross, net in bind.execute(sa.text(
+        "SELECT month, site_id, COUNT(id), SUM(gross), SUM(net) FROM payslips GROUP BY month, site_id"
+    )):
+        add(month, site_id, {'payslip_count': count, 'gross': gross, 'net': net})
+    for month, site_id, count, amount in bind.execute(sa.text(
+        "SELECT a.request_month, m.site_id, COUNT(a.id), SUM(a.amount) FROM advance_requests a "
+        "LEFT OUTER JOIN attendance_monthly m "
+        "ON m.employee_id = a.employee_id AND m.month = a.request_month "
+        "WHERE a.status = 'approved' GROUP BY a.request_month, m.site_id"
+    )):
+        add(month, site_id, {'advance_count': count, 'advance_amount': amount})
+
+    metrics = sa.table(
+        'monthly_metrics',
+        *[sa.column(c) for c in ('month', 'site_id', 'updated_at') + _METRICS],
+    )
+    values = list(rows.values())
+    for i in range(0, len(values), 1000):
+        bind.execute(metrics.insert(), values[i:i + 1000])
+
+
+def upgrade():
+    with op.batch_alter_table('attendance_monthly', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('site_id', sa.Integer(), nullable=True))
+        batch_op.create_index('ix_attendance_monthly_site_id', ['site_id'], unique=False)
+
+    _backfill_rollup_sites()
+
+    op.create_table(
+        'monthly_metrics',
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('month', sa.String(length=7), nullable=False),
+        sa.Column('site_id', sa.Integer(), nullable=False),
+        sa.Column('headcount', sa.Integer(), nullable=False),
+        sa.Column('attendance_records', sa.Integer(), nullable=False),
+        sa.Column('total_hours', sa.Float(), nullable=False),
+        sa.Column('ot_hours', sa.Float(), nullable=False),
+        sa.Column('night_hours', sa.Float(), nullable=False),
+        sa.Column('holiday_hours', sa.Float(), nullable=False),
+        sa.Column('payslip_count', sa.Integer(), nullable=False),
+        sa.Column('gross', sa.BigInteger(), nullable=False),
+        sa.Column('net', sa.BigInteger(), nullable=False),
+        sa.Column('advance_count', sa.Integer(), nullable=False),
+        sa.Column('advance_amount', sa.BigInteger(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('site_id', 'month', name='uq_monthly_metrics_site_month'),
+    )
+
+    _backfill_metrics()
+
+
+def downgrade():
+    op.drop_table('monthly_metrics')
+
+    with op.batch_alter_table('attendance_monthly', schema=None) as batch_op:
+        batch_op.drop_index('ix_attendance_monthly_site_id')
+        batch_op.drop_column('site_id')
@@ -0,0 +1,25 @@
+"""add emp_name index on attendance_records for name filters
+
+Revision ID: c0d1e2f3a4b5
+Revises: b9c0d1e2f3a4
+Create Date: 2026-10-18 09:00:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'c0d1e2f3a4b5'
+down_revision = 'b9c0d1e2f3a4'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('attendance_records', schema=None) as batch_op:
+        batch_op.create_index('ix_attendance_emp_name', ['emp_name'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('attendance_records', schema=None) as batch_op:
+        batch_op.drop_index('ix_attendance_emp_name')
@@ -0,0 +1,52 @@
+"""add attendance_imports table
+
+Revision ID: c4d5e6f7a8b9
+Revises: b3c4d5e6f7a8
+Create Date: 2026-10-17 16:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c4d5e6f7a8b9'
+down_revision = 'b3c4d5e6f7a8'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('attendance_imports',
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('file_hash', sa.String(length=64), nullable=False),
+        sa.Column('sheet_index', sa.Integer(), nullable=False),
+        sa.Column('filename', sa.String(length=255), nullable=False),
+        sa.Column('sheet', sa.String(length=100), nullable=False),
+        sa.Column('site_name', sa.String(length=100), nullable=False),
+        sa.Column('month', sa.String(length=7), nullable=False),
+        sa.Column('employee_count', sa.Integer(), nullable=False),
+        sa.Column('record_count', sa.Integer(), nullable=False),
+        sa.Column('created', sa.Integer(), nullable=False),
+        sa.Column('updated', sa.Integer(), nullable=False),
+        sa.Column('unchanged', sa.Integer(), nullable=False),
+        sa.Column('skipped', sa.Integer(), nullable=False),
+        sa.Column('status', sa.String(length=20), nullable=False),
+        sa.Column('preview', sa.Text(), nullable=True),
+        sa.Column('snapshot', sa.LargeBinary(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('executed_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    with op.batch_alter_table('attendance_imports', schema=None) as batch_op:
+        batch_op.create_index('ix_attendance_imports_file_hash', ['file_hash'], unique=False)
+        batch_op.create_index('ix_attendance_imports_site_month', ['site_name', 'month'], unique=False)
+        batch_op.create_index('ix_attendance_imports_created_at', ['created_at'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('attendance_imports', schema=None) as batch_op:
+        batch_op.drop_index('ix_attendance_imports_created_at')
+        batch_op.drop_index('ix_attendance_imports_site_month')
+        batch_op.drop_index('ix_attendance_imports_file_hash')
+    op.drop_table('attendance_imports')
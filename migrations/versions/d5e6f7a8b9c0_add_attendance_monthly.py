@@ -0,0 +1,112 @@
+"""add attendance_monthly rollup table
+
+Revision ID: d5e6f7a8b9c0
+Revises: c4d5e6f7a8b9
+Create Date: 2026-10-17 18:00:00.000000
+
+"""
+import json
+from collections import Counter
+from datetime import datetime
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd5e6f7a8b9c0'
+down_revision = 'c4d5e6f7a8b9'
+branch_labels = None
+depends_on = None
+
+# services.payslip_service.ATTENDED_WORK_TYPES (마이그레이션 시점 값)
+_ATTENDED = {"normal", "night", "annual", "early"}
+
+
+def _backfill():
+    """기존 근태로 집계 행을 채운다 (scripts/rebuild_attendance_rollup.py 와 같은 규칙)."""
+    bind = op.get_bind()
+    records = sa.table(
+        'attendance_records',
+        sa.column('employee_id'), sa.column('work_date', sa.Date), sa.column('work_type'),
+        sa.column('emp_name'), sa.column('dept'), sa.column('total_work_hours'),
+        sa.column('overtime_hours'), sa.column('night_hours'), sa.column('holiday_work_hours'),
+    )
+    monthly = sa.table(
+        'attendance_monthly',
+        sa.column('employee_id'), sa.column('month'), sa.column('emp_name'), sa.column('dept'),
+        sa.column('record_count'), sa.column('attended_days'), sa.column('attended_bitmap'),
+        sa.column('total_hours'), sa.column('overtime_hours'), sa.column('night_hours'),
+        sa.column('holiday_hours'), sa.column('work_type_counts'), sa.column('updated_at'),
+    )
+    accs = {}
+    for emp_id, work_date, work_type, name, dept, total, ot, night, holiday in bind.execute(
+        sa.select(*records.c)
+    ):
+        key = (emp_id, work_date.strftime('%Y-%m'))
+        acc = accs.setdefault(key, {
+            'emp_name': None, 'dept': None, 'records': 0, 'bitmap': 0,
+            'hours': [0.0, 0.0, 0.0, 0.0], 'types': Counter(),
+        })
+        if name is not None and (acc['emp_name'] is None or name > acc['emp_name']):
+            acc['emp_name'] = name
+        if dept is not None and (acc['dept'] is None or dept > acc['dept']):
+            acc['dept'] = dept
+        acc['records'] += 1
+        for i, value in enumerate((total, ot, night, holiday)):
+            acc['hours'][i] += value or 0.0
+        acc['types'][work_type] += 1
+        if work_type in _ATTENDED:
+            acc['bitmap'] |= 1 << (work_date.day - 1)
+
+    now = datetime.now()
+    rows = [
+        {
+            'employee_id': emp_id, 'month': month,
+            'emp_name': acc['emp_name'] or '', 'dept': acc['dept'] or '',
+            'record_count': acc['records'],
+            'attended_days': bin(acc['bitmap']).count('1'),
+            'attended_bitmap': acc['bitmap'],
+            'total_hours': acc['hours'][0], 'overtime_hours': acc['hours'][1],
+            'night_hours': acc['hours'][2], 'holiday_hours': acc['hours'][3],
+            'work_type_counts': json.dumps(dict(sorted(acc['types'].items())), ensure_ascii=False),
+            'updated_at': now,
+        }
+        for (emp_id, month), acc in accs.items()
+    ]
+    for i in range(0, len(rows), 1000):
+        bind.execute(monthly.insert(), rows[i:i + 1000])
+
+
+def upgrade():
+    op.create_table('attendance_monthly',
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('employee_id', sa.Integer(), nullable=False),
+        sa.Column('month', sa.String(length=7), nullable=False),
+        sa.Column('emp_name', sa.String(length=50), nullable=False),
+        sa.Column('dept', sa.String(length=50), nullable=True),
+        sa.Column('record_count', sa.Integer(), nullable=False),
+        sa.Column('attended_days', sa.Integer(), nullable=False),
+        sa.Column('attended_bitmap', sa.Integer(), nullable=False),
+        sa.Column('total_hours', sa.Float(), nullable=False),
+        sa.Column('overtime_hours', sa.Float(), nullable=False),
+        sa.Column('night_hours', sa.Float(), nullable=False),
+        sa.Column('holiday_hours', sa.Float(), nullable=False),
+        sa.Column('work_type_counts', sa.Text(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['employee_id'], ['employees.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('employee_id', 'month', name='uq_attendance_monthly_employee_month'),
+    )
+    with op.batch_alter_table('attendance_monthly', schema=None) as batch_op:
+        batch_op.create_index('ix_attendance_monthly_employee_id', ['employee_id'], unique=False)
+        batch_op.create_index('ix_attendance_monthly_month', ['month'], unique=False)
+
+    _backfill()
+
+
+def downgrade():
+    with op.batch_alter_table('attendance_monthly', schema=None) as batch_op:
+        batch_op.drop_index('ix_attendance_monthly_month')
+        batch_op.drop_index('ix_attendance_monthly_employee_id')
+    op.drop_table('attendance_monthly')
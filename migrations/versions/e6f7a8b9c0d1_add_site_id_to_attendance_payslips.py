@@ -0,0 +1,56 @@
+"""add denormalized site_id to attendance_records and payslips
+
+Revision ID: e6f7a8b9c0d1
+Revises: d5e6f7a8b9c0
+Create Date: 2026-10-17 20:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e6f7a8b9c0d1'
+down_revision = 'd5e6f7a8b9c0'
+branch_labels = None
+depends_on = None
+
+
+def _backfill(table_name):
+    """직원의 현재 소속 현장으로 채운다 (이력이 없으므로 현재 값이 최선)."""
+    op.execute(
+        f"UPDATE {table_name} SET site_id = "
+        f"(SELECT employees.site_id FROM employees WHERE employees.id = {table_name}.employee_id) "
+        f"WHERE site_id IS NULL"
+    )
+
+
+def upgrade():
+    with op.batch_alter_table('attendance_records', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('site_id', sa.Integer(), nullable=True))
+        batch_op.create_foreign_key(
+            'fk_attendance_records_site_id', 'sites', ['site_id'], ['id'], ondelete='SET NULL'
+        )
+        batch_op.create_index('ix_attendance_site_date', ['site_id', 'work_date'], unique=False)
+
+    with op.batch_alter_table('payslips', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('site_id', sa.Integer(), nullable=True))
+        batch_op.create_foreign_key(
+            'fk_payslips_site_id', 'sites', ['site_id'], ['id'], ondelete='SET NULL'
+        )
+        batch_op.create_index('ix_payslip_site_month', ['site_id', 'month'], unique=False)
+
+    _backfill('attendance_records')
+    _backfill('payslips')
+
+
+def downgrade():
+    with op.batch_alter_table('payslips', schema=None) as batch_op:
+        batch_op.drop_index('ix_payslip_site_month')
+        batch_op.drop_constraint('fk_payslips_site_id', type_='foreignkey')
+        batch_op.drop_column('site_id')
+
+    with op.batch_alter_table('attendance_records', schema=None) as batch_op:
+        batch_op.drop_index('ix_attendance_site_date')
+        batch_op.drop_constraint('fk_attendance_records_site_id', type_='foreignkey')
+        batch_op.drop_column('site_id')
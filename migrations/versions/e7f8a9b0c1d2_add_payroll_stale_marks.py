@@ -0,0 +1,39 @@
+"""add payroll_stale_marks table
+
+Revision ID: e7f8a9b0c1d2
+Revises: d5e6f7g8h9i0
+Create Date: 2026-10-17 09:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e7f8a9b0c1d2'
+down_revision = 'd5e6f7g8h9i0'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('payroll_stale_marks',
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('employee_id', sa.Integer(), nullable=False),
+        sa.Column('month', sa.String(length=7), nullable=False),
+        sa.Column('reason', sa.String(length=20), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['employee_id'], ['employees.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('employee_id', 'month', name='uq_payroll_stale_employee_month'),
+    )
+    with op.batch_alter_table('payroll_stale_marks', schema=None) as batch_op:
+        batch_op.create_index('ix_payroll_stale_marks_employee_id', ['employee_id'], unique=False)
+        batch_op.create_index('ix_payroll_stale_marks_month', ['month'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('payroll_stale_marks', schema=None) as batch_op:
+        batch_op.drop_index('ix_payroll_stale_marks_month')
+        batch_op.drop_index('ix_payroll_stale_marks_employee_id')
+    op.drop_table('payroll_stale_marks')
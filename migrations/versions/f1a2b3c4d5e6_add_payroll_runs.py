@@ -0,0 +1,48 @@
+"""add payroll_runs table
+
+Revision ID: f1a2b3c4d5e6
+Revises: e7f8a9b0c1d2
+Create Date: 2026-10-17 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f1a2b3c4d5e6'
+down_revision = 'e7f8a9b0c1d2'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('payroll_runs',
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('month', sa.String(length=7), nullable=False),
+        sa.Column('salary_mode', sa.String(length=20), nullable=False),
+        sa.Column('trigger', sa.String(length=20), nullable=False),
+        sa.Column('scope', sa.String(length=10), nullable=False),
+        sa.Column('inputs_hash', sa.String(length=64), nullable=False),
+        sa.Column('employees', sa.Integer(), nullable=False),
+        sa.Column('created', sa.Integer(), nullable=False),
+        sa.Column('updated', sa.Integer(), nullable=False),
+        sa.Column('skipped', sa.Integer(), nullable=False),
+        sa.Column('queries', sa.Integer(), nullable=True),
+        sa.Column('elapsed_ms', sa.Float(), nullable=True),
+        sa.Column('phases', sa.Text(), nullable=True),
+        sa.Column('result_fields', sa.Text(), nullable=False),
+        sa.Column('result_blob', sa.LargeBinary(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    with op.batch_alter_table('payroll_runs', schema=None) as batch_op:
+        batch_op.create_index('ix_payroll_runs_month', ['month'], unique=False)
+        batch_op.create_index('ix_payroll_runs_created_at', ['created_at'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('payroll_runs', schema=None) as batch_op:
+        batch_op.drop_index('ix_payroll_runs_created_at')
+        batch_op.drop_index('ix_payroll_runs_month')
+    op.drop_table('payroll_runs')
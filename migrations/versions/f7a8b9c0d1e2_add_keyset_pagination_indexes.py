@@ -0,0 +1,37 @@
+"""add (sort key, id) composite indexes for keyset pagination
+
+Revision ID: f7a8b9c0d1e2
+Revises: e6f7a8b9c0d1
+Create Date: 2026-10-17 21:00:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'f7a8b9c0d1e2'
+down_revision = 'e6f7a8b9c0d1'
+branch_labels = None
+depends_on = None
+
+
+# (테이블, 인덱스 이름, 컬럼) — 목록 화면의 정렬 순서와 같게 유지한다
+_INDEXES = [
+    ('applications', 'ix_applications_timestamp_id', ['timestamp', 'id']),
+    ('inquiries', 'ix_inquiries_created_id', ['created_at', 'id']),
+    ('contracts', 'ix_contracts_created_id', ['created_at', 'id']),
+    ('employees', 'ix_employees_name_id', ['name', 'id']),
+    ('announcements', 'ix_announcements_pinned_created_id', ['is_pinned', 'created_at', 'id']),
+]
+
+
+def upgrade():
+    for table_name, index_name, columns in _INDEXES:
+        with op.batch_alter_table(table_name, schema=None) as batch_op:
+            batch_op.create_index(index_name, columns, unique=False)
+
+
+def downgrade():
+    for table_name, index_name, _ in reversed(_INDEXES):
+        with op.batch_alter_table(table_name, schema=None) as batch_op:
+            batch_op.drop_index(index_name)
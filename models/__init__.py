@@ -3,7 +3,12 @@ from models.application import Application, Career
 from models.inquiry import Inquiry
 from models.site import Site
 from models.employee import Employee
-from models.attendance import AttendanceRecord, OperationCalendarDay
+from models.attendance import (
+    AttendanceImport,
+    AttendanceMonthly,
+    AttendanceRecord,
+    OperationCalendarDay,
+)
 from models.payslip import Payslip
 from models.advance import AdvanceRequest
 from models.auth import AdminLoginAttempt
@@ -11,6 +16,11 @@ from models.announcement import Announcement
 from models.contract import Contract, ContractAuditLog, ContractParticipant, ContractTemplate
 from models.leave import LeaveAccrual, LeaveBalance, LeaveUsage
 from models.wage_config import WageConfig
+from models.payroll import PayrollRun, PayrollStaleMark
+from models.job import BackgroundJob
+from models.cache_version import CacheVersion
+from models.search import SearchDocument
+from models.monthly_metric import MonthlyMetric
 
 __all__ = [
     "db",
@@ -20,6 +30,8 @@ __all__ = [
     "Site",
     "Employee",
     "AttendanceRecord",
+    "AttendanceImport",
+    "AttendanceMonthly",
     "OperationCalendarDay",
     "Payslip",
     "AdvanceRequest",
@@ -33,4 +45,10 @@ __all__ = [
     "LeaveAccrual",
     "LeaveUsage",
     "WageConfig",
+    "PayrollStaleMark",
+    "PayrollRun",
+    "BackgroundJob",
+    "CacheVersion",
+    "SearchDocument",
+    "MonthlyMetric",
 ]
@@ -5,6 +5,9 @@ from models._base import db
 
 class Announcement(db.Model):
     __tablename__ = "announcements"
+    __table_args__ = (
+        db.Index("ix_announcements_pinned_created_id", "is_pinned", "created_at", "id"),
+    )
 
     id = db.Column(db.Integer, primary_key=True, autoincrement=True)
     title = db.Column(db.String(200), nullable=False)
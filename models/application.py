@@ -5,6 +5,9 @@ from models._base import db
 
 class Application(db.Model):
     __tablename__ = "applications"
+    __table_args__ = (
+        db.Index("ix_applications_timestamp_id", "timestamp", "id"),
+    )
 
     id = db.Column(db.String(36), primary_key=True)
     timestamp = db.Column(db.DateTime, default=datetime.now, index=True)
@@ -16,6 +19,7 @@ class Application(db.Model):
     name = db.Column(db.String(50), nullable=False, index=True)
     birth = db.Column(db.Date)
     phone = db.Column(db.String(20), index=True)
+    phone_digits = db.Column(db.String(20), index=True)  # 숫자만 (search_service 가 유지)
     email = db.Column(db.String(100), index=True)
     gender = db.Column(db.String(10), index=True)
     address = db.Column(db.String(200))
@@ -7,6 +7,9 @@ class AttendanceRecord(db.Model):
     __tablename__ = "attendance_records"
     __table_args__ = (
         db.Index("ix_attendance_employee_date", "employee_id", "work_date"),
+        db.Index("ix_attendance_site_date", "site_id", "work_date"),
+        # 이름 검색은 근무일 당시 기록된 이름(emp_name)을 기준으로 한다
+        db.Index("ix_attendance_emp_name", "emp_name"),
         db.UniqueConstraint("employee_id", "work_date", name="uq_attendance_employee_date"),
     )
 
@@ -17,6 +20,8 @@ class AttendanceRecord(db.Model):
         nullable=False,
         index=True,
     )
+    # 근무일 당시 소속 현장 (Employee.site_id 비정규화, site_stamp_service 가 유지)
+    site_id = db.Column(db.Integer, db.ForeignKey("sites.id", ondelete="SET NULL"), nullable=True)
     birth_date = db.Column(db.String(6), nullable=False)
     emp_name = db.Column(db.String(50), nullable=False)
     dept = db.Column(db.String(50), default="")
@@ -39,6 +44,7 @@ class AttendanceRecord(db.Model):
             "id": self.id,
             "employee_id": self.employee_id,
             "emp_id": self.employee_id,
+            "site_id": self.site_id,
             "birth_date": self.birth_date,
             "emp_name": self.emp_name,
             "dept": self.dept,
@@ -54,6 +60,42 @@ class AttendanceRecord(db.Model):
         }
 
 
+class AttendanceMonthly(db.Model):
+    """직원 × 월 근태 집계 (attendance_records 에서 유지되는 롤업).
+
+    근태 쓰기 트랜잭션이 commit 될 때 영향받은 (직원, 월) 행만 다시 계산한다.
+    attended_bitmap 은 출근으로 인정되는 근무 유형(ATTENDED_WORK_TYPES)이 있는
+    날의 비트마스크 (bit d-1 = d일), work_type_counts 는 근무 유형별 건수 JSON.
+    """
+
+    __tablename__ = "attendance_monthly"
+    __table_args__ = (
+        db.UniqueConstraint("employee_id", "month", name="uq_attendance_monthly_employee_month"),
+    )
+
+    id = db.Column(db.Integer, primary_key=True, autoincrement=True)
+    employee_id = db.Column(
+        db.Integer,
+        db.ForeignKey("employees.id", ondelete="CASCADE"),
+        nullable=False,
+        index=True,
+    )
+    month = db.Column(db.String(7), nullable=False, index=True)
+    # 그 달 근태에 저장된 소속 현장 (AttendanceRecord.site_id 의 MAX)
+    site_id = db.Column(db.Integer, nullable=True, index=True)
+    emp_name = db.Column(db.String(50), nullable=False, default="")
+    dept = db.Column(db.String(50), default="")
+    record_count = db.Column(db.Integer, nullable=False, default=0)
+    attended_days = db.Column(db.Integer, nullable=False, default=0)
+    attended_bitmap = db.Column(db.Integer, nullable=False, default=0)
+    total_hours = db.Column(db.Float, nullable=False, default=0.0)
+    overtime_hours = db.Column(db.Float, nullable=False, default=0.0)
+    night_hours = db.Column(db.Float, nullable=False, default=0.0)
+    holiday_hours = db.Column(db.Float, nullable=False, default=0.0)
+    work_type_counts = db.Column(db.Text, nullable=False, default="{}")
+    updated_at = db.Column(db.DateTime, default=datetime.now)
+
+
 class OperationCalendarDay(db.Model):
     __tablename__ = "operation_calendar_days"
     __table_args__ = (
@@ -75,3 +117,55 @@ class OperationCalendarDay(db.Model):
             "day_type": self.day_type,
             "note": self.note or "",
         }
+
+
+class AttendanceImport(db.Model):
+    """근태 엑셀 업로드 이력 (파일 내용 해시 × 시트).
+
+    같은 파일을 다시 올리면 해시로 찾아 파싱 없이 저장된 미리보기를 돌려주고,
+    같은 업체·월의 이전 반영분과 비교할 수 있도록 파싱 결과(npz)를 남긴다.
+    """
+
+    __tablename__ = "attendance_imports"
+    __table_args__ = (
+        db.Index("ix_attendance_imports_site_month", "site_name", "month"),
+    )
+
+    id = db.Column(db.Integer, primary_key=True, autoincrement=True)
+    file_hash = db.Column(db.String(64), nullable=False, index=True)  # sha256 (업로드 바이트)
+    sheet_index = db.Column(db.Integer, nullable=False, default=0)
+    filename = db.Column(db.String(255), nullable=False, default="")
+    sheet = db.Column(db.String(100), nullable=False, default="")
+    site_name = db.Column(db.String(100), nullable=False, default="")
+    month = db.Column(db.String(7), nullable=False)
+    employee_count = db.Column(db.Integer, nullable=False, default=0)
+    record_count = db.Column(db.Integer, nullable=False, default=0)
+    created = db.Column(db.Integer, nullable=False, default=0)
+    updated = db.Column(db.Integer, nullable=False, default=0)
+    unchanged = db.Column(db.Integer, nullable=False, default=0)
+    skipped = db.Column(db.Integer, nullable=False, default=0)
+    status = db.Column(db.String(20), nullable=False, default="preview")  # preview / executed / failed
+    preview = db.Column(db.Text, nullable=True)  # JSON (dry-run 결과)
+    snapshot = db.Column(db.LargeBinary, nullable=False)  # pack_parsed() npz
+    created_at = db.Column(db.DateTime, default=datetime.now, index=True)
+    executed_at = db.Column(db.DateTime, nullable=True)
+
+    def to_dict(self):
+        return {
+            "id": self.id,
+            "file_hash": self.file_hash,
+            "sheet_index": self.sheet_index,
+            "filename": self.filename,
+            "sheet": self.sheet,
+            "site_name": self.site_name,
+            "month": self.month,
+            "employee_count": self.employee_count,
+            "record_count": self.record_count,
+            "created": self.created,
+            "updated": self.updated,
+            "unchanged": self.unchanged,
+            "skipped": self.skipped,
+            "status": self.status,
+            "created_at": self.created_at.strftime("%Y-%m-%d %H:%M") if self.created_at else "",
+            "executed_at": self.executed_at.strftime("%Y-%m-%d %H:%M") if self.executed_at else "",
+        }
@@ -0,0 +1,18 @@
+"""프로세스 간 캐시 무효화용 버전 카운터 모델."""
+from datetime import datetime
+
+from models._base import db
+
+
+class CacheVersion(db.Model):
+    """이름별 캐시 버전.
+
+    데이터가 바뀌면 같은 트랜잭션에서 version 을 1 올리고,
+    각 워커는 자신이 캐시한 버전과 비교해 다르면 캐시를 다시 만든다.
+    """
+
+    __tablename__ = "cache_versions"
+
+    name = db.Column(db.String(50), primary_key=True)
+    version = db.Column(db.Integer, nullable=False, default=0)
+    updated_at = db.Column(db.DateTime, default=datetime.now, onupdate=datetime.now)
@@ -67,6 +67,9 @@ class Contract(db.Model):
     """계약 인스턴스."""
 
     __tablename__ = "contracts"
+    __table_args__ = (
+        db.Index("ix_contracts_created_id", "created_at", "id"),
+    )
 
     id = db.Column(db.Integer, primary_key=True, autoincrement=True)
     template_id = db.Column(
@@ -7,6 +7,7 @@ class Employee(db.Model):
     __tablename__ = "employees"
     __table_args__ = (
         db.UniqueConstraint("name", "birth_date", name="uq_employee_name_birth"),
+        db.Index("ix_employees_name_id", "name", "id"),
     )
 
     id = db.Column(db.Integer, primary_key=True, autoincrement=True)
@@ -5,6 +5,9 @@ from models._base import db
 
 class Inquiry(db.Model):
     __tablename__ = "inquiries"
+    __table_args__ = (
+        db.Index("ix_inquiries_created_id", "created_at", "id"),
+    )
 
     id = db.Column(db.Integer, primary_key=True, autoincrement=True)
     created_at = db.Column(db.DateTime, default=datetime.now, index=True)
@@ -14,6 +17,7 @@ class Inquiry(db.Model):
     company = db.Column(db.String(100), nullable=False, index=True)
     name = db.Column(db.String(50), nullable=False, index=True)
     phone = db.Column(db.String(30), nullable=False, index=True)
+    phone_digits = db.Column(db.String(30), index=True)  # 숫자만 (search_service 가 유지)
     email = db.Column(db.String(100), index=True)
     message = db.Column(db.Text)
     status = db.Column(db.String(20), default="new", index=True)
@@ -0,0 +1,53 @@
+"""백그라운드 작업(BackgroundJob) 모델.
+
+급여 생성·근태 업로드 반영·월 PDF·연차 동기화·대용량 내보내기처럼
+오래 걸리는 관리자 작업을 요청 밖에서 실행하기 위한 작업 큐 테이블.
+status: queued → running → succeeded / failed
+"""
+import json
+from datetime import datetime
+
+from models._base import db
+
+JOB_STATUSES = ("queued", "running", "succeeded", "failed")
+
+
+class BackgroundJob(db.Model):
+    __tablename__ = "background_jobs"
+
+    id = db.Column(db.Integer, primary_key=True, autoincrement=True)
+    kind = db.Column(db.String(40), nullable=False)
+    status = db.Column(db.String(20), nullable=False, default="queued", index=True)
+    params = db.Column(db.Text, nullable=True)            # JSON
+    progress = db.Column(db.Integer, nullable=False, default=0)  # 0~100
+    message = db.Column(db.String(200), nullable=True)
+    result = db.Column(db.Text, nullable=True)            # JSON
+    error = db.Column(db.Text, nullable=True)
+    artifact_path = db.Column(db.String(500), nullable=True)
+    artifact_name = db.Column(db.String(200), nullable=True)
+    worker = db.Column(db.String(100), nullable=True)     # 실행 중인 프로세스 (host:pid)
+    created_at = db.Column(db.DateTime, default=datetime.now, index=True)
+    started_at = db.Column(db.DateTime, nullable=True)
+    heartbeat_at = db.Column(db.DateTime, nullable=True)
+    finished_at = db.Column(db.DateTime, nullable=True)
+
+    @property
+    def params_dict(self):
+        return json.loads(self.params) if self.params else {}
+
+    def to_dict(self):
+        fmt = "%Y-%m-%d %H:%M:%S"
+        return {
+            "id": self.id,
+            "kind": self.kind,
+            "status": self.status,
+            "params": self.params_dict,
+            "progress": self.progress,
+            "message": self.message or "",
+            "result": json.loads(self.result) if self.result else None,
+            "error": self.error or "",
+            "artifact": self.artifact_name or "",
+            "created_at": self.created_at.strftime(fmt) if self.created_at else "",
+            "started_at": self.started_at.strftime(fmt) if self.started_at else "",
+            "finished_at": self.finished_at.strftime(fmt) if self.finished_at else "",
+        }
@@ -0,0 +1,38 @@
+"""월별 추이 지표 모델."""
+from datetime import datetime
+
+from models._base import db
+
+
+class MonthlyMetric(db.Model):
+    """월 × 현장 운영 지표 (services.monthly_metrics_service 가 유지하는 집계).
+
+    site_id = 0 은 전체 합계 행이고, 그 밖의 행은 근태 월 집계·급여명세서에 저장된
+    현장 기준이다. 추이 API 는 이 테이블의 (site_id, month) 범위만 읽는다.
+
+    - headcount: 그 달 근태가 있는 직원 수
+    - 시간 합계: attendance_monthly 합계
+    - payslip_count / gross / net: 급여명세서 합계
+    - advance_count / advance_amount: 승인된 가불 (현장은 그 달 근태 집계 기준)
+    """
+
+    __tablename__ = "monthly_metrics"
+    __table_args__ = (
+        db.UniqueConstraint("site_id", "month", name="uq_monthly_metrics_site_month"),
+    )
+
+    id = db.Column(db.Integer, primary_key=True, autoincrement=True)
+    month = db.Column(db.String(7), nullable=False)
+    site_id = db.Column(db.Integer, nullable=False, default=0)
+    headcount = db.Column(db.Integer, nullable=False, default=0)
+    attendance_records = db.Column(db.Integer, nullable=False, default=0)
+    total_hours = db.Column(db.Float, nullable=False, default=0.0)
+    ot_hours = db.Column(db.Float, nullable=False, default=0.0)
+    night_hours = db.Column(db.Float, nullable=False, default=0.0)
+    holiday_hours = db.Column(db.Float, nullable=False, default=0.0)
+    payslip_count = db.Column(db.Integer, nullable=False, default=0)
+    gross = db.Column(db.BigInteger, nullable=False, default=0)
+    net = db.Column(db.BigInteger, nullable=False, default=0)
+    advance_count = db.Column(db.Integer, nullable=False, default=0)
+    advance_amount = db.Column(db.BigInteger, nullable=False, default=0)
+    updated_at = db.Column(db.DateTime, default=datetime.now)
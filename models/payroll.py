@@ -0,0 +1,82 @@
+import json
+from datetime import datetime
+
+from models._base import db
+
+
+class PayrollStaleMark(db.Model):
+    """급여 재계산이 필요한 (직원, 월) 표시.
+
+    근태/가불/급여설정/운영캘린더 변경 시 자동 기록되고,
+    '변경분 재계산' 실행 후 삭제된다.
+    """
+
+    __tablename__ = "payroll_stale_marks"
+    __table_args__ = (
+        db.UniqueConstraint("employee_id", "month", name="uq_payroll_stale_employee_month"),
+    )
+
+    id = db.Column(db.Integer, primary_key=True, autoincrement=True)
+    employee_id = db.Column(
+        db.Integer,
+        db.ForeignKey("employees.id", ondelete="CASCADE"),
+        nullable=False,
+        index=True,
+    )
+    month = db.Column(db.String(7), nullable=False, index=True)
+    reason = db.Column(db.String(20), nullable=False, default="attendance")
+    created_at = db.Column(db.DateTime, default=datetime.now)
+
+    def to_dict(self):
+        return {
+            "id": self.id,
+            "employee_id": self.employee_id,
+            "month": self.month,
+            "reason": self.reason,
+            "created_at": self.created_at.strftime("%Y-%m-%d %H:%M") if self.created_at else "",
+        }
+
+
+class PayrollRun(db.Model):
+    """급여 일괄 계산 실행 이력.
+
+    실행마다 입력 해시, 산정 방식, 단계별 통계와 직원별 결과 벡터
+    (employee_id 배열 + 값 행렬, npz 압축)를 남겨 두 실행을 필드 단위로 비교한다.
+    """
+
+    __tablename__ = "payroll_runs"
+
+    id = db.Column(db.Integer, primary_key=True, autoincrement=True)
+    month = db.Column(db.String(7), nullable=False, index=True)
+    salary_mode = db.Column(db.String(20), nullable=False)
+    trigger = db.Column(db.String(20), nullable=False, default="generate")
+    scope = db.Column(db.String(10), nullable=False, default="full")  # full / partial
+    inputs_hash = db.Column(db.String(64), nullable=False)
+    employees = db.Column(db.Integer, nullable=False, default=0)
+    created = db.Column(db.Integer, nullable=False, default=0)
+    updated = db.Column(db.Integer, nullable=False, default=0)
+    skipped = db.Column(db.Integer, nullable=False, default=0)
+    queries = db.Column(db.Integer, nullable=True)
+    elapsed_ms = db.Column(db.Float, nullable=True)
+    phases = db.Column(db.Text, nullable=True)  # JSON
+    result_fields = db.Column(db.Text, nullable=False)  # 콤마 구분 필드명 (행렬 열 순서)
+    result_blob = db.Column(db.LargeBinary, nullable=False)
+    created_at = db.Column(db.DateTime, default=datetime.now, index=True)
+
+    def to_dict(self):
+        return {
+            "id": self.id,
+            "month": self.month,
+            "salary_mode": self.salary_mode,
+            "trigger": self.trigger,
+            "scope": self.scope,
+            "inputs_hash": self.inputs_hash,
+            "employees": self.employees,
+            "created": self.created,
+            "updated": self.updated,
+            "skipped": self.skipped,
+            "queries": self.queries,
+            "elapsed_ms": self.elapsed_ms,
+            "phases": json.loads(self.phases) if self.phases else [],
+            "created_at": self.created_at.strftime("%Y-%m-%d %H:%M:%S") if self.created_at else "",
+        }
@@ -8,6 +8,7 @@ class Payslip(db.Model):
     __table_args__ = (
         db.UniqueConstraint("employee_id", "month", name="uq_payslip_employee_month"),
         db.Index("ix_payslip_employee_month", "employee_id", "month"),
+        db.Index("ix_payslip_site_month", "site_id", "month"),
     )
 
     id = db.Column(db.Integer, primary_key=True, autoincrement=True)
@@ -17,6 +18,8 @@ class Payslip(db.Model):
         nullable=False,
         index=True,
     )
+    # 급여월 당시 소속 현장 (Employee.site_id 비정규화, site_stamp_service 가 유지)
+    site_id = db.Column(db.Integer, db.ForeignKey("sites.id", ondelete="SET NULL"), nullable=True)
     emp_name = db.Column(db.String(50), nullable=False)
     dept = db.Column(db.String(50), default="")
     month = db.Column(db.String(7), nullable=False, index=True)
@@ -54,6 +57,7 @@ class Payslip(db.Model):
             "id": self.id,
             "employee_id": self.employee_id,
             "emp_id": self.employee_id,
+            "site_id": self.site_id,
             "emp_name": self.emp_name,
             "dept": self.dept,
             "month": self.month,
@@ -0,0 +1,66 @@
+from sqlalchemy import DDL, event
+
+from models._base import db
+
+
+class SearchDocument(db.Model):
+    """이름·전화번호 검색용 문서 (엔티티 1건당 1행, services.search_service 가 유지).
+
+    - body: 이름·회사·제목 등 부분 문자열 검색 대상 텍스트 (필드별 줄바꿈 구분)
+    - phone: 숫자만 남긴 전화번호
+    - grams: body 의 1~2글자 조각 (트라이그램으로 찾을 수 없는 짧은 검색어용)
+
+    SQLite 는 FTS5 trigram 가상 테이블(search_documents_fts), MySQL 은 ngram FULLTEXT
+    인덱스가 이 테이블에 붙는다.
+    """
+
+    __tablename__ = "search_documents"
+    __table_args__ = (
+        db.UniqueConstraint("entity", "entity_id", name="uq_search_documents_entity"),
+    )
+
+    id = db.Column(db.Integer, primary_key=True, autoincrement=True)
+    entity = db.Column(db.String(20), nullable=False)
+    entity_id = db.Column(db.String(36), nullable=False)
+    body = db.Column(db.Text, nullable=False, default="")
+    phone = db.Column(db.String(30), nullable=False, default="")
+    grams = db.Column(db.Text, nullable=False, default="")
+
+
+# SQLite: 외부 콘텐츠 FTS5 테이블 + 동기화 트리거
+SQLITE_FTS_DDL = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS search_documents_fts USING fts5("
+    "body, phone, grams, content='search_documents', content_rowid='id', tokenize='trigram')",
+    "CREATE TRIGGER IF NOT EXISTS search_documents_ai AFTER INSERT ON search_documents BEGIN "
+    "INSERT INTO search_documents_fts(rowid, body, phone, grams) "
+    "VALUES (new.id, new.body, new.phone, new.grams); END",
+    "CREATE TRIGGER IF NOT EXISTS search_documents_ad AFTER DELETE ON search_documents BEGIN "
+    "INSERT INTO search_documents_fts(search_documents_fts, rowid, body, phone, grams) "
+    "VALUES ('delete', old.id, old.body, old.phone, old.grams); END",
+    "CREATE TRIGGER IF NOT EXISTS search_documents_au AFTER UPDATE ON search_documents BEGIN "
+    "INSERT INTO search_documents_fts(search_documents_fts, rowid, body, phone, grams) "
+    "VALUES ('delete', old.id, old.body, old.phone, old.grams); "
+    "INSERT INTO search_documents_fts(rowid, body, phone, grams) "
+    "VALUES (new.id, new.body, new.phone, new.grams); END",
+]
+
+# MySQL: 컬럼별 ngram FULLTEXT 인덱스 (MATCH 대상 컬럼 목록과 인덱스가 일치해야 함)
+MYSQL_FULLTEXT_DDL = [
+    f"ALTER TABLE search_documents ADD FULLTEXT INDEX ft_search_documents_{column} ({column}) "
+    f"WITH PARSER ngram"
+    for column in ("body", "phone", "grams")
+]
+
+for _statement in SQLITE_FTS_DDL:
+    event.listen(
+        SearchDocument.__table__, "after_create", DDL(_statement).execute_if(dialect="sqlite")
+    )
+for _statement in MYSQL_FULLTEXT_DDL:
+    event.listen(
+        SearchDocument.__table__, "after_create", DDL(_statement).execute_if(dialect="mysql")
+    )
+event.listen(
+    SearchDocument.__table__,
+    "before_drop",
+    DDL("DROP TABLE IF EXISTS search_documents_fts").execute_if(dialect="sqlite"),
+)
@@ -14,6 +14,7 @@ def register_blueprints(app):
     from routes.notice import notice_bp
     from routes.contract import contract_bp
     from routes.leave import leave_bp
+    from routes.jobs import jobs_bp
 
     app.register_blueprint(auth_bp)
     app.register_blueprint(apply_bp)
@@ -27,3 +28,4 @@ def register_blueprints(app):
     app.register_blueprint(notice_bp)
     app.register_blueprint(contract_bp)
     app.register_blueprint(leave_bp)
+    app.register_blueprint(jobs_bp)
@@ -15,30 +15,24 @@ from flask import (
     send_from_directory,
     url_for,
 )
-from openpyxl import Workbook, load_workbook
+from openpyxl import load_workbook
 from openpyxl.drawing.image import Image as ExcelImage
 from openpyxl.styles import Border, Font, Side
-from openpyxl.utils import get_column_letter
 from PIL import Image as PILImage, ImageOps
-from sqlalchemy import func, or_
-from sqlalchemy.orm import joinedload
-
-from models import (
-    AdvanceRequest,
-    Application,
-    AttendanceRecord,
-    Employee,
-    Inquiry,
-    Payslip,
-    Site,
-    db,
-)
+from sqlalchemy.orm import joinedload, selectinload
+
+from models import Application, Inquiry, db
 from routes.utils import BASE_DIR, ENV_FILE_PATH, UPLOAD_DIR, require_admin
+from services.dashboard_service import dashboard_metrics
 from services.excel_service import (
     EXCEL_COLUMN_LABELS,
+    EXCEL_SOURCE_FIELDS,
     _excel_row_values,
     parse_excel_columns as _parse_excel_columns,
 )
+from services.export_service import build_export, requested_format, send_export, stream_query
+from services.pagination_service import paginate_request
+from services.search_service import match_ids
 
 logger = logging.getLogger(__name__)
 
@@ -72,7 +66,7 @@ def _update_env_value(env_path: str, key: str, value: str) -> None:
         f.writelines(lines)
     os.replace(tmp_path, env_path)
 
-def build_filtered_query(args):
+def build_filtered_query(args, with_careers=True):
     search_type = args.get('type', 'name')
     search_query = args.get('q', '')
 
@@ -91,13 +85,15 @@ def build_filtered_query(args):
     start_date = args.get('start_date')
     end_date = args.get('end_date')
 
-    query = Application.query.options(joinedload(Application.careers))
+    query = Application.query
+    if with_careers:
+        query = query.options(joinedload(Application.careers))
 
     if search_query:
         if search_type == 'name':
-            query = query.filter(Application.name.contains(search_query))
+            query = query.filter(Application.id.in_(match_ids('application', search_query, fields=('text',))))
         elif search_type == 'phone':
-            query = query.filter(Application.phone.contains(search_query))
+            query = query.filter(Application.id.in_(match_ids('application', search_query, fields=('phone',))))
 
     if filters['gender']:
         query = query.filter(Application.gender == filters['gender'])
@@ -137,97 +133,22 @@ def build_filtered_query(args):
 @admin_bp.route('/humetix_master_99')
 @require_admin
 def master_view():
-    today = date.today()
-    current_month = today.strftime("%Y-%m")
-
-    # ── 처리 대기 (To-Do) ──
-    pending_advances = AdvanceRequest.query.filter_by(status="pending").count()
-    new_applications = Application.query.filter_by(status="new").count()
-    new_inquiries = Inquiry.query.filter_by(status="new").count()
-
-    # ── 운영 스냅샷 ──
-    emp_active = Employee.query.filter_by(is_active=True).count()
-
-    month_start = date(today.year, today.month, 1)
-    if today.month == 12:
-        month_end = date(today.year + 1, 1, 1)
-    else:
-        month_end = date(today.year, today.month + 1, 1)
-
-    att = db.session.query(
-        func.count(AttendanceRecord.id),
-        func.coalesce(func.sum(AttendanceRecord.total_work_hours), 0),
-        func.coalesce(func.sum(AttendanceRecord.overtime_hours), 0),
-    ).filter(
-        AttendanceRecord.work_date >= month_start,
-        AttendanceRecord.work_date < month_end,
-    ).first()
-
-    pay_count = Payslip.query.filter_by(month=current_month).count()
-
-    adv_approved_amount = db.session.query(
-        func.coalesce(func.sum(AdvanceRequest.amount), 0)
-    ).filter(
-        AdvanceRequest.status == "approved",
-        AdvanceRequest.request_month == current_month,
-    ).scalar()
-
-    # ── 현장별 인원 ──
-    site_stats = db.session.query(
-        Site.name,
-        func.count(Employee.id),
-    ).outerjoin(Employee, db.and_(
-        Employee.site_id == Site.id,
-        Employee.is_active.is_(True),
-    )).filter(Site.is_active.is_(True)).group_by(Site.name).all()
-
-    unassigned = Employee.query.filter(
-        Employee.is_active.is_(True),
-        Employee.site_id.is_(None),
-    ).count()
-
-    # ── 최근 활동 ──
-    recent_apps = Application.query.order_by(
-        Application.timestamp.desc()
-    ).limit(5).all()
-
-    recent_advances = AdvanceRequest.query.options(
-        joinedload(AdvanceRequest.employee)
-    ).order_by(
-        AdvanceRequest.created_at.desc()
-    ).limit(5).all()
-
-    return render_template(
-        'admin_home.html',
-        month=current_month,
-        todo={
-            'advances': pending_advances,
-            'applications': new_applications,
-            'inquiries': new_inquiries,
-        },
-        snapshot={
-            'emp_active': emp_active,
-            'att_records': att[0] or 0,
-            'att_hours': round(float(att[1]), 1),
-            'att_ot': round(float(att[2]), 1),
-            'pay_count': pay_count,
-            'adv_amount': int(adv_approved_amount),
-        },
-        site_stats=site_stats,
-        unassigned=unassigned,
-        recent_apps=recent_apps,
-        recent_advances=recent_advances,
-    )
+    month = date.today().strftime("%Y-%m")
+    return render_template('admin_home.html', month=month, stats=dashboard_metrics(month))
 
 
 @admin_bp.route('/admin/applications')
 @require_admin
 def applications():
-    query, filters, search_query, start_date, end_date = build_filtered_query(request.args)
-
-    page = request.args.get('page', 1, type=int)
-    per_page = 10
-    pagination = query.order_by(Application.timestamp.desc()).paginate(page=page, per_page=per_page, error_out=False)
+    query, filters, search_query, start_date, end_date = build_filtered_query(request.args, with_careers=False)
+
+    # 키셋 페이지 (접수일시, id) — 경력은 페이지 행만 IN 조회
+    pagination = paginate_request(
+        query.options(selectinload(Application.careers)),
+        [(Application.timestamp, True), (Application.id, True)],
+        per_page=10,
+        count_total=True,
+    )
 
     data = [app.to_dict() for app in pagination.items]
 
@@ -285,44 +206,30 @@ def change_admin_password():
 @admin_bp.route('/download_excel')
 @require_admin
 def download_excel():
-    query, _, _, _, _ = build_filtered_query(request.args)
-    apps = query.order_by(Application.timestamp.desc()).all()
-
     selected_columns = _parse_excel_columns(request.args.get("excel_columns"))
 
     if selected_columns is not None:
-        wb = Workbook()
-        ws = wb.active
-        ws.title = "지원자목록"
-
-        headers = [EXCEL_COLUMN_LABELS[key] for key in selected_columns]
-        ws.append(headers)
-        for app in apps:
-            values = _excel_row_values(app)
-            ws.append([values.get(key, "") for key in selected_columns])
-
-        header_font = Font(bold=True)
-        for cell in ws[1]:
-            cell.font = header_font
-
-        ws.freeze_panes = "A2"
-        sampled_row_count = min(ws.max_row, 200)
-        for idx, key in enumerate(selected_columns, start=1):
-            max_len = len(EXCEL_COLUMN_LABELS[key])
-            for row_num in range(2, sampled_row_count + 1):
-                cell_value = ws.cell(row=row_num, column=idx).value
-                max_len = max(max_len, len(str(cell_value or "")))
-            ws.column_dimensions[get_column_letter(idx)].width = min(max(12, max_len + 2), 40)
-
-        buf = BytesIO()
-        wb.save(buf)
-        buf.seek(0)
-        return send_file(
-            buf,
-            as_attachment=True,
-            download_name="humetix_applications.xlsx",
-            mimetype="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+        # 컬럼 모드: 필요한 컬럼만 스트리밍 (경력 조인 없음)
+        query, _, _, _, _ = build_filtered_query(request.args, with_careers=False)
+        columns = query.with_entities(
+            *(getattr(Application, field) for field in EXCEL_SOURCE_FIELDS)
+        ).order_by(Application.timestamp.desc())
+
+        def _rows():
+            for app in stream_query(columns):
+                values = _excel_row_values(app)
+                yield [values.get(key, "") for key in selected_columns]
+
+        fmt = requested_format()
+        out = build_export(
+            [EXCEL_COLUMN_LABELS[key] for key in selected_columns], _rows(), fmt,
+            sheet_title="지원자목록", auto_width=True, freeze_header=True,
         )
+        return send_export(out, "humetix_applications", fmt)
+
+    query, _, _, _, _ = build_filtered_query(request.args)
+    apps = query.order_by(Application.timestamp.desc()).all()
+
     template_path = os.path.join(BASE_DIR, "templates", "excel", "입사지원서.xlsx")
     wb = load_workbook(template_path)
     template_ws = wb.active
@@ -547,21 +454,18 @@ def inquiries():
 
     query = Inquiry.query
     if q:
-        like = f"%{q}%"
-        query = query.filter(or_(
-            Inquiry.company.ilike(like),
-            Inquiry.name.ilike(like),
-            Inquiry.phone.ilike(like),
-            Inquiry.email.ilike(like),
-        ))
+        query = query.filter(Inquiry.id.in_(match_ids('inquiry', q)))
     if status:
         query = query.filter(Inquiry.status == status)
 
-    items = query.order_by(Inquiry.created_at.desc()).all()
+    pagination = paginate_request(
+        query, [(Inquiry.created_at, True), (Inquiry.id, True)], per_page=50, count_total=True
+    )
     status_options = ['new', 'in_progress', 'done']
     return render_template(
         'admin_inquiries.html',
-        items=items,
+        items=pagination.items,
+        pagination=pagination,
         q=q,
         status=status,
         status_options=status_options
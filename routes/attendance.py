@@ -1,9 +1,7 @@
 ﻿import logging
-import os
 import re
 from calendar import monthrange
 from datetime import date, datetime
-from io import BytesIO
 
 from flask import (
     Blueprint,
@@ -11,14 +9,13 @@ from flask import (
     redirect,
     render_template,
     request,
-    send_file,
     url_for,
 )
 from sqlalchemy.exc import IntegrityError, OperationalError
 
 from extensions import limiter
 from models import AttendanceRecord, Employee, OperationCalendarDay, Site, db
-from routes.utils import require_admin
+from routes.utils import require_admin, wants_async as _wants_async
 from services.attendance_service import (
     ALLOWED_WORK_TYPES,
     CALENDAR_DAY_TYPES,
@@ -29,8 +26,10 @@ from services.attendance_service import (
     _get_cfg,
     _parse_date,
     _validate_hhmm,
+    attendance_list_stats,
     calc_work_hours,
 )
+from services.pagination_service import InvalidCursor, paginate_request
 
 logger = logging.getLogger(__name__)
 
@@ -210,6 +209,12 @@ def list_attendance():
             return jsonify({"error": "employee_id must be integer"}), 400
         query = query.filter(AttendanceRecord.employee_id == int(employee_id))
 
+    site_id = request.args.get("site_id")
+    if site_id:
+        if not str(site_id).isdigit():
+            return jsonify({"error": "site_id must be integer"}), 400
+        query = query.filter(AttendanceRecord.site_id == int(site_id))
+
     emp_name = request.args.get("emp_name", "").strip()
     if emp_name:
         query = query.filter(AttendanceRecord.emp_name.contains(emp_name))
@@ -229,12 +234,20 @@ def list_attendance():
             return jsonify({"error": "end_date format must be YYYY-MM-DD"}), 400
 
     try:
-        records = query.order_by(AttendanceRecord.work_date.asc()).all()
+        page = paginate_request(
+            query,
+            [(AttendanceRecord.work_date, False), (AttendanceRecord.id, False)],
+            per_page=500,
+            max_per_page=1000,
+            strict=True,
+        )
+    except InvalidCursor as exc:
+        return jsonify({"error": str(exc)}), 400
     except OperationalError as exc:
         logger.error("Attendance list query failed: %s", exc)
         return _db_not_ready_json()
 
-    return jsonify({"records": [r.to_dict() for r in records]})
+    return jsonify({"records": [r.to_dict() for r in page.items], **page.to_dict()})
 
 
 @attendance_bp.route("/attendance")
@@ -364,8 +377,11 @@ def admin_attendance():
     end = request.args.get("end_date", "")
     emp_name = request.args.get("emp_name", "")
     work_type = request.args.get("work_type", "")
+    site_id = request.args.get("site_id", type=int)
 
     query = AttendanceRecord.query
+    if site_id:
+        query = query.filter(AttendanceRecord.site_id == site_id)
     if start:
         try:
             query = query.filter(AttendanceRecord.work_date >= _parse_date(start))
@@ -385,49 +401,21 @@ def admin_attendance():
     per_page = 50
 
     try:
-        # 통계는 전체 필터 결과 기반
-        from sqlalchemy import func as sa_func
-        stats_query = query.with_entities(
-            sa_func.count().label("total"),
-            sa_func.sum(AttendanceRecord.total_work_hours).label("total_work"),
-            sa_func.sum(AttendanceRecord.night_hours).label("total_night"),
-            sa_func.sum(AttendanceRecord.overtime_hours).label("total_ot"),
-            sa_func.sum(AttendanceRecord.holiday_work_hours).label("total_holiday"),
-        ).first()
-
-        day_count = query.filter(AttendanceRecord.work_type == "normal").count()
-        night_count = query.filter(AttendanceRecord.work_type == "night").count()
-
-        stats = {
-            "total": stats_query.total or 0,
-            "day": day_count,
-            "night": night_count,
-            "total_work": round(stats_query.total_work or 0, 1),
-            "total_night": round(stats_query.total_night or 0, 1),
-            "total_ot": round(stats_query.total_ot or 0, 1),
-            "total_holiday": round(stats_query.total_holiday or 0, 1),
-        }
-
-        pagination = query.order_by(AttendanceRecord.work_date.desc()).paginate(
-            page=page, per_page=per_page, error_out=False
-        )
+        # 통계는 전체 필터 결과 기반 (한 번의 집계, 필터별 캐시) — 전체 건수는 페이지 계산에도 사용
+        stats = attendance_list_stats(query, (start, end, emp_name, work_type, site_id))
+        pagination = query.order_by(
+            AttendanceRecord.work_date.desc(), AttendanceRecord.id.desc()
+        ).paginate(page=page, per_page=per_page, error_out=False, count=False)
+        pagination.total = stats["total"]
     except OperationalError as exc:
         logger.error("Admin attendance query failed: %s", exc)
         return _db_not_ready_page()
 
     today = date.today()
 
-    # 고객사 매핑 (employee_id → site_name)
-    emp_ids = list({r.employee_id for r in pagination.items})
-    site_map = {}
-    if emp_ids:
-        rows = (
-            db.session.query(Employee.id, Site.name)
-            .outerjoin(Site, Employee.site_id == Site.id)
-            .filter(Employee.id.in_(emp_ids))
-            .all()
-        )
-        site_map = {eid: sname or "-" for eid, sname in rows}
+    # 고객사 목록 (필터 선택지 + 근무일 당시 현장 site_id → 이름)
+    sites = Site.query.order_by(Site.name).all()
+    site_map = {site.id: site.name for site in sites}
 
     return render_template(
         "admin_attendance.html",
@@ -437,6 +425,8 @@ def admin_attendance():
         end_date=end,
         emp_name=emp_name,
         work_type=work_type,
+        site_id=site_id,
+        sites=sites,
         stats=stats,
         today=today,
         site_map=site_map,
@@ -446,96 +436,26 @@ def admin_attendance():
 @attendance_bp.route("/admin/attendance/excel")
 @require_admin
 def attendance_excel():
-    from openpyxl import Workbook
-    from openpyxl.styles import Font
+    from services.export_service import attendance_export, requested_format, send_export
 
-    start = request.args.get("start_date", "")
-    end = request.args.get("end_date", "")
-    emp_name = request.args.get("emp_name", "")
-    work_type = request.args.get("work_type", "")
+    fmt = requested_format()
+    if _wants_async():
+        from services.job_service import enqueue_job
 
-    query = AttendanceRecord.query
-    if start:
-        try:
-            query = query.filter(AttendanceRecord.work_date >= _parse_date(start))
-        except ValueError:
-            start = ""
-    if end:
-        try:
-            query = query.filter(AttendanceRecord.work_date <= _parse_date(end))
-        except ValueError:
-            end = ""
-    if emp_name:
-        query = query.filter(AttendanceRecord.emp_name.contains(emp_name))
-    if work_type:
-        query = query.filter(AttendanceRecord.work_type == work_type)
+        filters = {
+            key: request.args.get(key, "")
+            for key in ("start_date", "end_date", "emp_name", "work_type", "site_id")
+        }
+        job = enqueue_job("attendance_export", {"filters": filters, "fmt": fmt})
+        return jsonify({"success": True, "job_id": job.id}), 202
 
     try:
-        records = query.order_by(AttendanceRecord.work_date.asc()).all()
+        out, download_name = attendance_export(request.args, fmt)
     except OperationalError as exc:
         logger.error("Attendance excel query failed: %s", exc)
         return _db_not_ready_page()
 
-    wb = Workbook()
-    ws = wb.active
-    ws.title = "근태기록"
-
-    headers = [
-        "직원ID",
-        "이름",
-        "부서",
-        "날짜",
-        "출근",
-        "퇴근",
-        "구분",
-        "총근무(h)",
-        "잔업(h)",
-        "야간(h)",
-        "휴일(h)",
-        "출처",
-    ]
-    bold = Font(bold=True)
-    for col, header in enumerate(headers, 1):
-        cell = ws.cell(row=1, column=col, value=header)
-        cell.font = bold
-
-    work_type_labels = {
-        "normal": "주간",
-        "night": "야간",
-        "annual": "연차",
-        "absent": "결근",
-        "holiday": "휴무",
-        "early": "조퇴",
-    }
-
-    for i, rec in enumerate(records, 2):
-        ws.cell(row=i, column=1, value=rec.employee_id)
-        ws.cell(row=i, column=2, value=rec.emp_name)
-        ws.cell(row=i, column=3, value=rec.dept)
-        ws.cell(
-            row=i,
-            column=4,
-            value=rec.work_date.strftime("%Y-%m-%d") if rec.work_date else "",
-        )
-        ws.cell(row=i, column=5, value=rec.clock_in)
-        ws.cell(row=i, column=6, value=rec.clock_out)
-        ws.cell(row=i, column=7, value=work_type_labels.get(rec.work_type, rec.work_type))
-        ws.cell(row=i, column=8, value=rec.total_work_hours)
-        ws.cell(row=i, column=9, value=rec.overtime_hours)
-        ws.cell(row=i, column=10, value=rec.night_hours)
-        ws.cell(row=i, column=11, value=rec.holiday_work_hours or 0)
-        source_labels = {"employee": "직원", "excel": "엑셀", "admin": "관리자"}
-        ws.cell(row=i, column=12, value=source_labels.get(rec.source, rec.source or "직원"))
-
-    buf = BytesIO()
-    wb.save(buf)
-    buf.seek(0)
-    return send_file(
-        buf,
-        as_attachment=True,
-        download_name=f"근태기록_{start or 'all'}_{end or 'all'}.xlsx",
-        mimetype="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-    )
+    return send_export(out, download_name, fmt)
 
 
 @attendance_bp.route("/api/attendance/admin", methods=["POST"])
@@ -792,11 +712,16 @@ def bulk_delete_attendance():
         end = filt.get("end_date", "")
         emp_name = filt.get("emp_name", "")
         work_type = filt.get("work_type", "")
+        site_id = filt.get("site_id")
+        site_id = int(site_id) if str(site_id or "").isdigit() else None
 
         # 최소 하나의 필터 조건 필수 (전체 삭제 방지)
-        if not any([start, end, emp_name, work_type]):
+        if not any([start, end, emp_name, work_type, site_id]):
             return jsonify({"error": "최소 하나의 필터 조건을 지정해야 합니다."}), 400
 
+        if site_id:
+            query = query.filter(AttendanceRecord.site_id == site_id)
+
         if start:
             try:
                 query = query.filter(AttendanceRecord.work_date >= _parse_date(start))
@@ -827,60 +752,56 @@ def bulk_delete_attendance():
 @attendance_bp.route("/admin/attendance/import", methods=["GET", "POST"])
 @require_admin
 def import_attendance():
-    """GET: 업로드 폼, POST: 미리보기(dry-run)"""
+    """GET: 업로드 폼, POST: 미리보기(dry-run)
+
+    여러 엑셀 파일, ZIP, 월별 시트가 여러 개인 워크북을 함께 받는다.
+    업로드는 임시 디렉터리에 디스크로 저장한 뒤 프로세스 풀에서 병렬로 파싱하고,
+    시트가 둘 이상이면 합친 미리보기와 파일별 결과를 보여준다. 이전에 올린 파일과
+    내용이 같으면 저장된 미리보기를, 같은 업체·월의 이전 반영분이 있으면 차이를 보여준다.
+    """
     if request.method == "GET":
         return render_template("admin_attendance_import.html", result=None)
 
-    file = request.files.get("file")
-    if not file or not file.filename:
+    uploads = [f for f in request.files.getlist("files") + request.files.getlist("file") if f and f.filename]
+    if not uploads:
         return render_template(
             "admin_attendance_import.html",
             result={"errors": ["파일을 선택해주세요."]},
         )
 
-    ext = os.path.splitext(file.filename)[1].lower()
-    if ext not in (".xlsx", ".xls"):
-        return render_template(
-            "admin_attendance_import.html",
-            result={"errors": ["엑셀 파일(.xlsx, .xls)만 업로드 가능합니다."]},
-        )
+    import tempfile
 
-    from services.attendance_import import import_attendance_to_db, parse_attendance_excel
+    from flask import current_app
 
-    try:
-        parsed = parse_attendance_excel(file, filename=file.filename)
-    except Exception as exc:
-        logger.error("엑셀 파싱 오류: %s", exc)
-        return render_template(
-            "admin_attendance_import.html",
-            result={"errors": [f"엑셀 파싱 실패: {exc}"]},
+    from services.attendance_import import stage_uploads
+    from services.import_history_service import build_preview
+
+    cfg = current_app.config
+    with tempfile.TemporaryDirectory(prefix="attendance_import_") as tmp_dir:
+        files, failed_files = stage_uploads(
+            uploads,
+            tmp_dir,
+            max_files=cfg.get("ATTENDANCE_IMPORT_MAX_FILES", 100),
+            max_bytes=cfg.get("ATTENDANCE_IMPORT_MAX_FILE_MB", 50) * 1024 * 1024,
         )
+        # 이력에 있는 파일(내용 해시 일치)은 파싱하지 않고 저장된 결과를 쓴다
+        sets, failures, preview = build_preview(files, workers=cfg.get("ATTENDANCE_IMPORT_WORKERS") or None)
+    failed_files += failures
 
-    if parsed.get("errors"):
+    if preview is None:
+        errors = [f"{f['label']}: {err}" for f in failed_files for err in f["errors"]]
         return render_template(
             "admin_attendance_import.html",
-            result={"errors": parsed["errors"]},
+            result={"errors": errors or ["엑셀에서 근태 시트를 찾을 수 없습니다."]},
         )
-
-    # dry_run으로 미리보기 결과 생성
-    preview = import_attendance_to_db(parsed, dry_run=True)
-    preview["month_str"] = parsed["month_str"]
-    preview["site_name"] = parsed["site_name"]
-    preview["employee_count"] = len(parsed["employees"])
+    preview["failed_files"] = failed_files
 
     # 파싱 결과를 임시 파일에 저장 (세션 쿠키 4KB 제한 회피)
-    import json
-    import uuid
-
     from flask import session as flask_session
 
-    serializable = _serialize_parsed(parsed)
-    import_id = uuid.uuid4().hex[:12]
-    tmp_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), "tmp")
-    os.makedirs(tmp_dir, exist_ok=True)
-    tmp_path = os.path.join(tmp_dir, f"import_{import_id}.json")
-    with open(tmp_path, "w", encoding="utf-8") as f:
-        json.dump(serializable, f, ensure_ascii=False)
+    from services.attendance_import import save_pending_import
+
+    import_id = save_pending_import(sets)
     flask_session["attendance_import_id"] = import_id
 
     return render_template(
@@ -893,40 +814,53 @@ def import_attendance():
 @attendance_bp.route("/admin/attendance/import/execute", methods=["POST"])
 @require_admin
 def execute_import():
-    """미리보기 확인 후 실제 DB 저장 실행."""
-    import json
+    """미리보기 확인 후 실제 DB 저장 실행.
 
+    async=1 이면 백그라운드 작업으로 등록하고 작업 ID 를 바로 반환한다.
+    """
     from flask import flash, session as flask_session
 
-    from services.attendance_import import import_attendance_to_db
+    from services.attendance_import import execute_pending_import, pending_import_exists
 
     import_id = flask_session.pop("attendance_import_id", None)
-    if not import_id:
+    if not import_id or not pending_import_exists(import_id):
+        if _wants_async():
+            return jsonify({"error": "업로드 데이터가 만료되었습니다. 다시 업로드해주세요."}), 410
         flash("업로드 데이터가 만료되었습니다. 다시 업로드해주세요.", "error")
         return redirect(url_for("attendance.import_attendance"))
 
-    tmp_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), "tmp")
-    tmp_path = os.path.join(tmp_dir, f"import_{import_id}.json")
+    if _wants_async():
+        from services.job_service import enqueue_job
 
-    if not os.path.exists(tmp_path):
-        flash("업로드 데이터가 만료되었습니다. 다시 업로드해주세요.", "error")
-        return redirect(url_for("attendance.import_attendance"))
+        job = enqueue_job("attendance_import", {"import_id": import_id})
+        return jsonify({"success": True, "job_id": job.id}), 202
 
     try:
-        with open(tmp_path, "r", encoding="utf-8") as f:
-            parsed = json.load(f)
-        parsed = _deserialize_parsed(parsed)
-        os.remove(tmp_path)  # 사용 후 삭제
-    except Exception as exc:
+        result = execute_pending_import(import_id)
+    except ValueError as exc:
         logger.error("Import 데이터 복원 실패: %s", exc)
         flash("데이터 복원 실패. 다시 업로드해주세요.", "error")
         return redirect(url_for("attendance.import_attendance"))
 
-    result = import_attendance_to_db(parsed, dry_run=False)
-    result["month_str"] = parsed["month_str"]
-    result["site_name"] = parsed["site_name"]
-    result["employee_count"] = len(parsed["employees"])
+    return _render_import_result(result)
+
+
+@attendance_bp.route("/admin/attendance/import/result/<int:job_id>")
+@require_admin
+def import_result(job_id):
+    """백그라운드로 반영한 근태 업로드(attendance_import 작업)의 결과 화면."""
+    from flask import flash
+
+    from models import BackgroundJob
+
+    job = db.session.get(BackgroundJob, job_id)
+    if not job or job.kind != "attendance_import" or job.status != "succeeded":
+        flash(job.error if job and job.error else "업로드 결과를 찾을 수 없습니다.", "error")
+        return redirect(url_for("attendance.import_attendance"))
+    return _render_import_result(job.to_dict()["result"])
+
 
+def _render_import_result(result):
     from flask import flash
 
     if not result["errors"]:
@@ -943,35 +877,3 @@ def execute_import():
         result=result,
         executed=True,
     )
-
-
-def _serialize_parsed(parsed: dict) -> dict:
-    """파싱 결과를 JSON 직렬화 가능하게 변환."""
-    import copy
-
-    data = copy.deepcopy(parsed)
-    for emp in data.get("employees", []):
-        if emp.get("hire_date"):
-            emp["hire_date"] = emp["hire_date"].isoformat()
-        if emp.get("resign_date"):
-            emp["resign_date"] = emp["resign_date"].isoformat()
-        new_days = {}
-        for d, v in emp.get("days", {}).items():
-            key = d.isoformat() if isinstance(d, date) else str(d)
-            new_days[key] = v
-        emp["days"] = new_days
-    return data
-
-
-def _deserialize_parsed(data: dict) -> dict:
-    """JSON에서 복원된 파싱 결과를 원래 타입으로 변환."""
-    for emp in data.get("employees", []):
-        if emp.get("hire_date"):
-            emp["hire_date"] = date.fromisoformat(emp["hire_date"])
-        if emp.get("resign_date"):
-            emp["resign_date"] = date.fromisoformat(emp["resign_date"])
-        new_days = {}
-        for d_str, v in emp.get("days", {}).items():
-            new_days[date.fromisoformat(d_str)] = v
-        emp["days"] = new_days
-    return data
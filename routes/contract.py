@@ -16,8 +16,8 @@ from flask import (
     send_file,
     url_for,
 )
-from sqlalchemy import func, or_
-from sqlalchemy.orm import joinedload
+from sqlalchemy import case, func, or_
+from sqlalchemy.orm import joinedload, selectinload
 from werkzeug.utils import secure_filename
 
 from models import (
@@ -30,6 +30,8 @@ from models import (
 )
 from routes.utils import BASE_DIR, require_admin
 from services.contract_service import generate_final_pdf, generate_sign_token
+from services.pagination_service import paginate_request
+from services.search_service import match_ids
 from services.sms_service import send_contract_link
 
 logger = logging.getLogger(__name__)
@@ -395,6 +397,26 @@ def upload_field_image():
 # ── 계약 관리 ──
 
 
+def _contract_stats(query):
+    """필터된 계약의 상태별 건수 + 만료 건수 (GROUP BY 한 번)."""
+    rows = (
+        query.order_by(None)
+        .with_entities(
+            Contract.status,
+            func.count(Contract.id),
+            func.sum(case((Contract.expires_at < datetime.now(), 1), else_=0)),
+        )
+        .group_by(Contract.status)
+        .all()
+    )
+    by_status = {status: count for status, count, _ in rows}
+    return {
+        "total": sum(by_status.values()),
+        "by_status": by_status,
+        "expired": sum(int(expired or 0) for _, _, expired in rows),
+    }
+
+
 @contract_bp.route("/admin/contracts")
 @require_admin
 def admin_contracts():
@@ -404,11 +426,7 @@ def admin_contracts():
     date_from = request.args.get("date_from", "").strip()
     date_to = request.args.get("date_to", "").strip()
 
-    query = Contract.query.options(
-        joinedload(Contract.template),
-        joinedload(Contract.employee),
-        joinedload(Contract.participants),
-    )
+    query = Contract.query
 
     # 상태 필터
     if status_filter:
@@ -416,10 +434,10 @@ def admin_contracts():
 
     # 키워드 검색 (제목 또는 직원 이름)
     if q:
-        query = query.outerjoin(Employee, Contract.employee_id == Employee.id).filter(
+        query = query.filter(
             or_(
-                Contract.title.ilike(f"%{q}%"),
-                Employee.name.ilike(f"%{q}%"),
+                Contract.id.in_(match_ids("contract", q)),
+                Contract.employee_id.in_(match_ids("employee", q)),
             )
         )
 
@@ -439,14 +457,26 @@ def admin_contracts():
         except ValueError:
             pass
 
-    contracts = query.order_by(Contract.created_at.desc()).all()
+    stats = _contract_stats(query)
+    pagination = paginate_request(
+        query.options(
+            joinedload(Contract.template),
+            joinedload(Contract.employee),
+            selectinload(Contract.participants),
+        ),
+        [(Contract.created_at, True), (Contract.id, True)],
+        per_page=50,
+    )
+    pagination.total = stats["total"]
 
     templates = ContractTemplate.query.filter_by(status="active").order_by(
         ContractTemplate.name
     ).all()
     return render_template(
         "admin_contracts.html",
-        contracts=contracts,
+        contracts=pagination.items,
+        pagination=pagination,
+        stats=stats,
         templates=templates,
         status_filter=status_filter,
         q=q,
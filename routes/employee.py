@@ -4,10 +4,12 @@ from datetime import datetime
 
 from flask import Blueprint, jsonify, render_template, request
 from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import joinedload
 
 from models import AdvanceRequest, AttendanceRecord, Employee, Payslip, Site, WageConfig, db
 from routes.utils import require_admin
 from extensions import limiter
+from services.pagination_service import paginate_request
 from services.wage_service import get_wage_config, get_wage_config_detail, save_wage_config
 
 logger = logging.getLogger(__name__)
@@ -29,9 +31,16 @@ def _parse_bool(value):
 @employee_bp.route("/admin/employees")
 @require_admin
 def admin_employees():
-    employees = Employee.query.order_by(Employee.name).all()
+    pagination = paginate_request(
+        Employee.query.options(joinedload(Employee.site)),
+        [(Employee.name, False), (Employee.id, False)],
+        per_page=100,
+        count_total=True,
+    )
     sites = Site.query.filter_by(is_active=True).order_by(Site.name).all()
-    return render_template("admin_employee.html", employees=employees, sites=sites)
+    return render_template(
+        "admin_employee.html", employees=pagination.items, pagination=pagination, sites=sites
+    )
 
 
 @employee_bp.route("/api/employees", methods=["POST"])
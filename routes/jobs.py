@@ -0,0 +1,48 @@
+"""백그라운드 작업 블루프린트 — 상태 조회 및 결과 파일 다운로드."""
+
+import os
+
+from flask import Blueprint, jsonify, request, send_file
+
+from models import BackgroundJob, db
+from routes.utils import require_admin
+
+jobs_bp = Blueprint("jobs", __name__)
+
+
+@jobs_bp.route("/admin/jobs")
+@require_admin
+def list_jobs():
+    """최근 작업 목록 (?status=, ?kind= 필터)."""
+    query = BackgroundJob.query
+    status = request.args.get("status", "").strip()
+    kind = request.args.get("kind", "").strip()
+    if status:
+        query = query.filter(BackgroundJob.status == status)
+    if kind:
+        query = query.filter(BackgroundJob.kind == kind)
+    limit = max(1, min(request.args.get("limit", 50, type=int) or 50, 200))
+    jobs = query.order_by(BackgroundJob.id.desc()).limit(limit).all()
+    return jsonify({"jobs": [job.to_dict() for job in jobs]})
+
+
+@jobs_bp.route("/admin/jobs/<int:job_id>")
+@require_admin
+def job_status(job_id: int):
+    job = db.session.get(BackgroundJob, job_id)
+    if not job:
+        return jsonify({"error": "작업을 찾을 수 없습니다."}), 404
+    return jsonify(job.to_dict())
+
+
+@jobs_bp.route("/admin/jobs/<int:job_id>/artifact")
+@require_admin
+def job_artifact(job_id: int):
+    job = db.session.get(BackgroundJob, job_id)
+    if not job:
+        return jsonify({"error": "작업을 찾을 수 없습니다."}), 404
+    if job.status != "succeeded" or not job.artifact_path:
+        return jsonify({"error": "다운로드할 결과 파일이 없습니다.", "status": job.status}), 409
+    if not os.path.exists(job.artifact_path):
+        return jsonify({"error": "결과 파일 보관 기간이 지났습니다."}), 410
+    return send_file(job.artifact_path, as_attachment=True, download_name=job.artifact_name)
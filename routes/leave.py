@@ -8,7 +8,8 @@ from sqlalchemy.orm import joinedload
 
 from extensions import limiter
 from models import Employee, LeaveAccrual, LeaveBalance, LeaveUsage, db
-from routes.utils import require_admin
+from routes.utils import require_admin, wants_async
+from services.job_service import enqueue_job
 from services.leave_service import (
     calc_severance,
     delete_accrual,
@@ -16,6 +17,7 @@ from services.leave_service import (
     generate_accruals,
     get_employee_leave_detail,
     register_usage_fifo,
+    severance_report,
     sync_employees_to_leave,
     sync_leave_balances,
     sync_single_balance,
@@ -77,6 +79,14 @@ def sync_leave():
     """전 직원 연차 일괄 동기화."""
     year = request.form.get("year", date.today().year, type=int)
     include_attendance = request.form.get("include_attendance", "1") == "1"
+    if wants_async():
+        job = enqueue_job("leave_sync", {"year": year, "include_attendance": include_attendance})
+        return jsonify({
+            "success": True,
+            "job_id": job.id,
+            "message": "연차 동기화 작업을 등록했습니다.",
+        }), 202
+
     synced, skipped, auto_created = sync_leave_balances(year, include_attendance)
     db.session.commit()
     parts = [f"{synced}명 동기화 완료"]
@@ -472,9 +482,30 @@ def apply_leave_balance(emp_id):
 @leave_bp.route("/admin/severance")
 @require_admin
 def admin_severance():
-    """퇴직금 시뮬레이션 페이지."""
+    """퇴직금 시뮬레이션 페이지 (재직자 전체 일괄 계산 표 포함)."""
     employees = Employee.query.filter_by(is_active=True).order_by(Employee.name).all()
-    return render_template("admin_severance.html", employees=employees)
+    return render_template("admin_severance.html", employees=employees, report=severance_report())
+
+
+@leave_bp.route("/api/severance")
+@require_admin
+def api_severance_report():
+    """재직자 전체 퇴직금 JSON (일괄 계산)."""
+    return jsonify(severance_report())
+
+
+@leave_bp.route("/admin/severance/excel")
+@require_admin
+def severance_excel():
+    """재직자 전체 퇴직금 다운로드 (?format=csv, ?async=1 이면 백그라운드 작업)."""
+    from services.export_service import requested_format, send_export, severance_export
+
+    fmt = requested_format()
+    if wants_async():
+        job = enqueue_job("severance_export", {"fmt": fmt})
+        return jsonify({"success": True, "job_id": job.id}), 202
+    out, download_name = severance_export(fmt)
+    return send_export(out, download_name, fmt)
 
 
 @leave_bp.route("/api/severance/<int:emp_id>")
@@ -6,6 +6,7 @@ from flask import Blueprint, jsonify, render_template, request
 
 from models import Announcement, db
 from routes.utils import require_admin
+from services.pagination_service import paginate_request
 
 logger = logging.getLogger(__name__)
 
@@ -50,11 +51,13 @@ def check_new_notices():
 @notice_bp.route("/admin/notices")
 @require_admin
 def admin_notices():
-    notices = Announcement.query.order_by(
-        Announcement.is_pinned.desc(),
-        Announcement.created_at.desc(),
-    ).all()
-    return render_template("admin_notices.html", notices=notices)
+    pagination = paginate_request(
+        Announcement.query,
+        [(Announcement.is_pinned, True), (Announcement.created_at, True), (Announcement.id, True)],
+        per_page=50,
+        count_total=True,
+    )
+    return render_template("admin_notices.html", notices=pagination.items, pagination=pagination)
 
 
 @notice_bp.route("/api/notices", methods=["POST"])
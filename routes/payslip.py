@@ -1,7 +1,6 @@
 ﻿import logging
 import re
 from datetime import datetime
-from io import BytesIO
 
 from flask import (
     Blueprint,
@@ -11,10 +10,15 @@ from flask import (
     request,
     send_file,
 )
-from models import Employee, Payslip, Site, db
-from routes.utils import require_admin, validate_month as _validate_month
+from models import Employee, Payslip, PayrollRun, Site, db
+from routes.utils import require_admin, validate_month as _validate_month, wants_async
+from services.payroll_bulk_service import compute_payslips_bulk
+from services.payroll_dirty_service import clear_stale, recompute_stale, stale_summary
+from services.job_service import enqueue_job
+from services.payroll_run_service import diff_runs, list_runs
+from services.payslip_pdf_service import invalidate_pdf_cache
 from services.payslip_service import (
-    ALLOWED_SALARY_MODES, compute_payslips, compute_single_payslip, _effective_salary_mode,
+    ALLOWED_SALARY_MODES, compute_single_payslip, _effective_salary_mode,
 )
 from extensions import limiter
 
@@ -30,20 +34,17 @@ def admin_payslip():
     if not _validate_month(month):
         month = datetime.now().strftime("%Y-%m")
 
-    payslips = Payslip.query.filter(Payslip.month == month).order_by(Payslip.emp_name.asc()).all()
+    site_id = request.args.get("site_id", type=int)
+
+    query = Payslip.query.filter(Payslip.month == month)
+    if site_id:
+        query = query.filter(Payslip.site_id == site_id)
+    payslips = query.order_by(Payslip.emp_name.asc()).all()
     employees = Employee.query.filter_by(is_active=True).order_by(Employee.name).all()
 
-    # 고객사 매핑
-    emp_ids = list({ps.employee_id for ps in payslips})
-    site_map = {}
-    if emp_ids:
-        rows = (
-            db.session.query(Employee.id, Site.name)
-            .outerjoin(Site, Employee.site_id == Site.id)
-            .filter(Employee.id.in_(emp_ids))
-            .all()
-        )
-        site_map = {eid: sname or "-" for eid, sname in rows}
+    # 고객사 목록 (필터 선택지 + 급여월 당시 현장 site_id → 이름)
+    sites = Site.query.order_by(Site.name).all()
+    site_map = {site.id: site.name for site in sites}
 
     cfg = current_app.config
     return render_template(
@@ -51,7 +52,10 @@ def admin_payslip():
         payslips=payslips,
         employees=employees,
         month=month,
+        site_id=site_id,
+        sites=sites,
         site_map=site_map,
+        stale_count=stale_summary().get(month, 0),
         salary_mode=cfg.get("SALARY_MODE", "standard"),
         hourly_wage=cfg.get("HOURLY_WAGE", 10320),
     )
@@ -74,8 +78,12 @@ def generate_payslips():
     if salary_mode not in ALLOWED_SALARY_MODES:
         return jsonify({"error": f"invalid salary_mode: {salary_mode}"}), 400
 
+    if wants_async():
+        job = enqueue_job("payroll_generate", {"month": month, "salary_mode": salary_mode})
+        return jsonify({"success": True, "job_id": job.id}), 202
+
     try:
-        result = compute_payslips(month, salary_mode)
+        result = compute_payslips_bulk(month, salary_mode)
     except Exception as exc:
         db.session.rollback()
         logger.error("Payslip generate error: %s", exc)
@@ -84,8 +92,78 @@ def generate_payslips():
     if isinstance(result, str):
         return jsonify({"error": result}), 404
 
-    created, updated, skipped = result
-    return jsonify({"success": True, "created": created, "updated": updated, "skipped": skipped})
+    return jsonify({
+        "success": True,
+        "created": result["created"],
+        "updated": result["updated"],
+        "skipped": result["skipped"],
+        "run_id": result["run_id"],
+        "stats": {
+            "employees": result["employees"],
+            "queries": result["queries"],
+            "elapsed_ms": result["elapsed_ms"],
+            "phases": result["phases"],
+        },
+    })
+
+
+@payslip_bp.route("/admin/payslip/runs")
+@require_admin
+def payslip_runs():
+    """급여 일괄 계산 실행 이력 (?month= 로 월 필터)."""
+    month = request.args.get("month", "").strip() or None
+    if month and not _validate_month(month):
+        return jsonify({"error": "invalid month format"}), 400
+    limit = request.args.get("limit", 50, type=int)
+    return jsonify({"runs": list_runs(month, limit=max(1, min(limit or 50, 500)))})
+
+
+@payslip_bp.route("/admin/payslip/runs/<int:run_a>/diff/<int:run_b>")
+@require_admin
+def payslip_runs_diff(run_a: int, run_b: int):
+    """두 실행 결과를 직원·필드 단위로 비교한다 (a → b)."""
+    a = db.session.get(PayrollRun, run_a)
+    b = db.session.get(PayrollRun, run_b)
+    if not a or not b:
+        return jsonify({"error": "실행 이력을 찾을 수 없습니다."}), 404
+    if a.month != b.month:
+        return jsonify({"error": "같은 월의 실행만 비교할 수 있습니다."}), 400
+    return jsonify(diff_runs(a, b))
+
+
+@payslip_bp.route("/admin/payslip/stale")
+@require_admin
+def payslip_stale():
+    """재계산 대기 중인 (직원, 월) 건수를 월별로 반환."""
+    months = stale_summary()
+    return jsonify({"total": sum(months.values()), "months": months})
+
+
+@payslip_bp.route("/admin/payslip/recompute-stale", methods=["POST"])
+@require_admin
+def recompute_stale_payslips():
+    """근태/가불/급여설정/캘린더 변경으로 표시된 명세서만 재계산."""
+    payload = request.get_json(silent=True) or {}
+    month = (request.form.get("month") or payload.get("month") or "").strip() or None
+    if month and not _validate_month(month):
+        return jsonify({"error": "invalid month format"}), 400
+
+    salary_mode = (
+        request.form.get("salary_mode")
+        or payload.get("salary_mode")
+        or current_app.config.get("SALARY_MODE", "standard")
+    )
+    if salary_mode not in ALLOWED_SALARY_MODES:
+        return jsonify({"error": f"invalid salary_mode: {salary_mode}"}), 400
+
+    try:
+        result = recompute_stale(salary_mode, month)
+    except Exception as exc:
+        db.session.rollback()
+        logger.error("Stale payslip recompute error: %s", exc)
+        return jsonify({"error": "변경분 재계산 중 오류가 발생했습니다."}), 500
+
+    return jsonify({"success": True, **result})
 
 
 @payslip_bp.route("/admin/payslip/<int:payslip_id>", methods=["DELETE"])
@@ -135,6 +213,7 @@ def update_payslip(payslip_id: int):
         payslip.is_manual = True
 
         db.session.commit()
+        invalidate_pdf_cache(payslip.month, payslip.id)
         return jsonify({"success": True, "payslip": payslip.to_dict()})
     except Exception as exc:
         db.session.rollback()
@@ -153,10 +232,7 @@ def reset_payslip(payslip_id: int):
     if not payslip.is_manual:
         return jsonify({"error": "수동 수정된 명세서가 아닙니다."}), 400
 
-    from services.payslip_service import (
-        _month_range, _calc_pay, _calc_deductions, _calc_attendance_info,
-        _calc_absence_deductions, _effective_salary_mode,
-    )
+    from services.payslip_service import _month_range, _calc_attendance_info, _payslip_values
     from services.wage_service import get_wage_config
     from models import AttendanceRecord, AdvanceRequest
     from sqlalchemy import func
@@ -183,38 +259,18 @@ def reset_payslip(payslip_id: int):
     if not row or not row.total_hours:
         return jsonify({"error": "해당 월 근태 기록이 없어 초기화할 수 없습니다."}), 404
 
-    total_h = round(row.total_hours or 0, 2)
-    ot_h = round(row.ot_hours or 0, 2)
-    night_h = round(row.night_hours or 0, 2)
-    holiday_h = round(row.holiday_hours or 0, 2)
+    hours = tuple(
+        round(value or 0, 2)
+        for value in (row.total_hours, row.ot_hours, row.night_hours, row.holiday_hours)
+    )
 
     # WageConfig 기반 계산
     wage_cfg = get_wage_config(employee_id=payslip.employee_id)
     fallback_mode = payslip.salary_mode if payslip.salary_mode in ("standard", "actual", "daily_build") else "standard"
-    effective_mode = _effective_salary_mode(wage_cfg, fallback_mode)
-
-    # 출근/결근 정보
-    absent_days_val, non_full_weeks, attended_days, full_weeks = (
-        _calc_attendance_info(payslip.employee_id, payslip.month, cfg)
-    )
-
-    base_salary, weekly_hol_pay, ot_pay, night_pay, holiday_pay = _calc_pay(
-        wage_cfg, effective_mode, total_h, ot_h, night_h, holiday_h,
-        attended_days, full_weeks,
-    )
-
-    # 결근/주휴 공제 (standard만 해당)
-    absent_ded, weekly_hol_ded = _calc_absence_deductions(
-        wage_cfg, effective_mode, absent_days_val, non_full_weeks
-    )
-
-    gross = max(0, base_salary + weekly_hol_pay + ot_pay + night_pay + holiday_pay
-                 - absent_ded - weekly_hol_ded)
 
     # 직원별 보험 유형 조회
     emp = db.session.get(Employee, payslip.employee_id)
     emp_ins_type = emp.insurance_type if emp else "3.3%"
-    tax, pension, health, longterm, employment, insurance = _calc_deductions(gross, emp_ins_type, cfg)
 
     adv_total = (
         db.session.query(func.coalesce(func.sum(AdvanceRequest.amount), 0))
@@ -226,33 +282,19 @@ def reset_payslip(payslip_id: int):
         .scalar()
     )
 
-    net = gross - tax - insurance - adv_total
+    values = _payslip_values(
+        wage_cfg, fallback_mode, hours,
+        _calc_attendance_info(payslip.employee_id, payslip.month, cfg),
+        emp_ins_type, adv_total, cfg,
+    )
 
     try:
-        payslip.salary_mode = effective_mode
-        payslip.total_work_hours = total_h
-        payslip.ot_hours = ot_h
-        payslip.night_hours = night_h
-        payslip.holiday_hours = holiday_h
-        payslip.base_salary = base_salary
-        payslip.weekly_holiday_pay = weekly_hol_pay
-        payslip.ot_pay = ot_pay
-        payslip.night_pay = night_pay
-        payslip.holiday_pay = holiday_pay
-        payslip.absent_days = absent_days_val
-        payslip.absent_deduction = absent_ded
-        payslip.weekly_holiday_deduction = weekly_hol_ded
-        payslip.gross = gross
-        payslip.tax = tax
-        payslip.pension = pension
-        payslip.health_ins = health
-        payslip.longterm_care = longterm
-        payslip.employment_ins = employment
-        payslip.insurance = insurance
-        payslip.advance_deduction = adv_total
-        payslip.net = net
+        for field, value in values.items():
+            setattr(payslip, field, value)
         payslip.is_manual = False
+        clear_stale(payslip.employee_id, payslip.month)
         db.session.commit()
+        invalidate_pdf_cache(payslip.month, payslip.id)
         return jsonify({"success": True, "payslip": payslip.to_dict()})
     except Exception as exc:
         db.session.rollback()
@@ -340,269 +382,28 @@ def delete_selected_payslips():
 
 def _generate_payslip_pdf(payslips):
     """급여명세서 PDF 생성 (공통 헬퍼). BytesIO 반환."""
-    import os
-
-    from reportlab.lib import colors
-    from reportlab.lib.pagesizes import A4
-    from reportlab.lib.units import mm
-    from reportlab.pdfbase import pdfmetrics
-    from reportlab.pdfbase.ttfonts import TTFont
-    from reportlab.platypus import SimpleDocTemplate, Spacer, Table, TableStyle, Paragraph
-    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-    from reportlab.lib.enums import TA_CENTER, TA_RIGHT, TA_LEFT
-
-    buf = BytesIO()
-
-    font_name = "Helvetica"
-    font_name_bold = "Helvetica-Bold"
-    for font_path in [
-        "C:/Windows/Fonts/malgun.ttf",
-        "C:/Windows/Fonts/malgunbd.ttf",
-        "/usr/share/fonts/truetype/nanum/NanumGothic.ttf",
-        "/usr/share/fonts/truetype/nanum/NanumGothicBold.ttf",
-    ]:
-        if os.path.exists(font_path):
-            try:
-                fname = os.path.basename(font_path).replace(".ttf", "").replace(".ttc", "")
-                pdfmetrics.registerFont(TTFont(fname, font_path))
-                if "bold" in fname.lower() or "bd" in fname.lower():
-                    font_name_bold = fname
-                else:
-                    font_name = fname
-            except Exception:
-                continue
-
-    hourly = current_app.config.get("HOURLY_WAGE", 10320)
-
-    # 색상 정의
-    HEADER_BG = colors.HexColor("#E85D26")
-    HEADER_TEXT = colors.white
-    SECTION_BG = colors.HexColor("#F8F9FA")
-    TOTAL_BG = colors.HexColor("#FFF3ED")
-    NET_BG = colors.HexColor("#E85D26")
-    BORDER_COLOR = colors.HexColor("#DEE2E6")
-    TEXT_COLOR = colors.HexColor("#212529")
-    DEDUCT_COLOR = colors.HexColor("#DC2626")
-
-    doc = SimpleDocTemplate(
-        buf, pagesize=A4,
-        leftMargin=25 * mm, rightMargin=25 * mm,
-        topMargin=20 * mm, bottomMargin=20 * mm,
-    )
+    from services.payslip_pdf_service import render_payslips_pdf
+
+    return render_payslips_pdf(payslips, current_app.config.get("HOURLY_WAGE", 10320))
 
-    elements = []
-
-    for idx, payslip in enumerate(payslips):
-        if idx > 0:
-            elements.append(Spacer(1, 0))  # pagebreak handled by KeepTogether
-
-        # ── 회사명 헤더 ──
-        header_data = [["Humetix Inc."]]
-        header_table = Table(header_data, colWidths=[160 * mm])
-        header_table.setStyle(TableStyle([
-            ("FONTNAME", (0, 0), (-1, -1), font_name_bold),
-            ("FONTSIZE", (0, 0), (-1, -1), 18),
-            ("TEXTCOLOR", (0, 0), (-1, -1), HEADER_BG),
-            ("BOTTOMPADDING", (0, 0), (-1, -1), 2),
-            ("TOPPADDING", (0, 0), (-1, -1), 0),
-        ]))
-        elements.append(header_table)
-
-        # 구분선
-        line_data = [["" ]]
-        line_table = Table(line_data, colWidths=[160 * mm], rowHeights=[2])
-        line_table.setStyle(TableStyle([
-            ("LINEBELOW", (0, 0), (-1, -1), 2, HEADER_BG),
-        ]))
-        elements.append(line_table)
-        elements.append(Spacer(1, 4 * mm))
-
-        # ── 제목 ──
-        year, mon = payslip.month.split("-")
-        title_data = [[f"{year}년 {int(mon)}월 급여명세서"]]
-        title_table = Table(title_data, colWidths=[160 * mm])
-        title_table.setStyle(TableStyle([
-            ("FONTNAME", (0, 0), (-1, -1), font_name_bold),
-            ("FONTSIZE", (0, 0), (-1, -1), 16),
-            ("TEXTCOLOR", (0, 0), (-1, -1), TEXT_COLOR),
-            ("BOTTOMPADDING", (0, 0), (-1, -1), 6),
-        ]))
-        elements.append(title_table)
-        elements.append(Spacer(1, 3 * mm))
-
-        # ── 직원 정보 박스 ──
-        _MODE_LABELS = {"standard": "209h 고정", "daily_build": "일급제", "actual": "실근무시간", "daily": "공수제"}
-        mode_label = _MODE_LABELS.get(payslip.salary_mode, payslip.salary_mode)
-        info_data = [
-            ["성명", payslip.emp_name, "부서", payslip.dept or "-"],
-            ["시급", f"{hourly:,}원", "계산방식", mode_label],
-            ["총근무시간", f"{payslip.total_work_hours}h", "잔업", f"{payslip.ot_hours}h"],
-            ["심야", f"{payslip.night_hours}h", "휴일", f"{payslip.holiday_hours}h"],
-        ]
-        info_table = Table(info_data, colWidths=[30 * mm, 50 * mm, 30 * mm, 50 * mm])
-        info_table.setStyle(TableStyle([
-            ("FONTNAME", (0, 0), (-1, -1), font_name),
-            ("FONTNAME", (0, 0), (0, -1), font_name_bold),
-            ("FONTNAME", (2, 0), (2, -1), font_name_bold),
-            ("FONTSIZE", (0, 0), (-1, -1), 10),
-            ("TEXTCOLOR", (0, 0), (0, -1), colors.HexColor("#6B7280")),
-            ("TEXTCOLOR", (2, 0), (2, -1), colors.HexColor("#6B7280")),
-            ("TEXTCOLOR", (1, 0), (1, -1), TEXT_COLOR),
-            ("TEXTCOLOR", (3, 0), (3, -1), TEXT_COLOR),
-            ("BACKGROUND", (0, 0), (-1, -1), SECTION_BG),
-            ("BOX", (0, 0), (-1, -1), 1, BORDER_COLOR),
-            ("INNERGRID", (0, 0), (-1, -1), 0.5, BORDER_COLOR),
-            ("TOPPADDING", (0, 0), (-1, -1), 6),
-            ("BOTTOMPADDING", (0, 0), (-1, -1), 6),
-            ("LEFTPADDING", (0, 0), (-1, -1), 8),
-        ]))
-        elements.append(info_table)
-        elements.append(Spacer(1, 6 * mm))
-
-        # ── 지급 내역 ──
-        earn_header = [["지급 내역", ""]]
-        earn_data = [
-            ["기본급", f"{payslip.base_salary:,}원"],
-        ]
-        if payslip.weekly_holiday_pay > 0:
-            earn_data.append(["주휴수당", f"{payslip.weekly_holiday_pay:,}원"])
-        earn_data.extend([
-            [f"잔업수당 ({payslip.ot_hours}h)", f"{payslip.ot_pay:,}원"],
-            [f"심야수당 ({payslip.night_hours}h)", f"{payslip.night_pay:,}원"],
-            [f"휴일수당 ({payslip.holiday_hours}h)", f"{payslip.holiday_pay:,}원"],
-        ])
-        if payslip.absent_deduction > 0:
-            earn_data.append([f"결근공제 ({int(payslip.absent_days)}일)", f"-{payslip.absent_deduction:,}원"])
-        if payslip.weekly_holiday_deduction > 0:
-            earn_data.append(["주휴공제", f"-{payslip.weekly_holiday_deduction:,}원"])
-        earn_total = [["총지급액", f"{payslip.gross:,}원"]]
-
-        earn_all = earn_header + earn_data + earn_total
-        earn_table = Table(earn_all, colWidths=[100 * mm, 60 * mm])
-        earn_table.setStyle(TableStyle([
-            ("FONTNAME", (0, 0), (-1, -1), font_name),
-            ("FONTSIZE", (0, 0), (-1, -1), 10),
-            ("TEXTCOLOR", (0, 0), (-1, -1), TEXT_COLOR),
-            # 헤더 행
-            ("FONTNAME", (0, 0), (-1, 0), font_name_bold),
-            ("FONTSIZE", (0, 0), (-1, 0), 12),
-            ("BACKGROUND", (0, 0), (-1, 0), HEADER_BG),
-            ("TEXTCOLOR", (0, 0), (-1, 0), HEADER_TEXT),
-            # 합계 행
-            ("FONTNAME", (0, -1), (-1, -1), font_name_bold),
-            ("BACKGROUND", (0, -1), (-1, -1), TOTAL_BG),
-            ("FONTSIZE", (0, -1), (-1, -1), 11),
-            # 금액 오른쪽 정렬
-            ("ALIGN", (1, 0), (1, -1), "RIGHT"),
-            # 테두리
-            ("BOX", (0, 0), (-1, -1), 1, BORDER_COLOR),
-            ("LINEBELOW", (0, 0), (-1, -2), 0.5, BORDER_COLOR),
-            ("LINEABOVE", (0, -1), (-1, -1), 1, BORDER_COLOR),
-            ("TOPPADDING", (0, 0), (-1, -1), 7),
-            ("BOTTOMPADDING", (0, 0), (-1, -1), 7),
-            ("LEFTPADDING", (0, 0), (-1, -1), 10),
-            ("RIGHTPADDING", (0, 0), (-1, -1), 10),
-        ]))
-        elements.append(earn_table)
-        elements.append(Spacer(1, 5 * mm))
-
-        # ── 공제 내역 ──
-        ded_header = [["공제 내역", ""]]
-        ded_data = []
-        if payslip.tax > 0:
-            ded_data.append(["소득세 (3.3%)", f"-{payslip.tax:,}원"])
-        if payslip.pension > 0:
-            ded_data.append(["국민연금 (4.75%)", f"-{payslip.pension:,}원"])
-        if payslip.health_ins > 0:
-            ded_data.append(["건강보험 (3.595%)", f"-{payslip.health_ins:,}원"])
-        if payslip.longterm_care > 0:
-            ded_data.append(["장기요양보험", f"-{payslip.longterm_care:,}원"])
-        if payslip.employment_ins > 0:
-            ded_data.append(["고용보험 (1.15%)", f"-{payslip.employment_ins:,}원"])
-        if payslip.advance_deduction > 0:
-            ded_data.append(["가불 차감", f"-{payslip.advance_deduction:,}원"])
-
-        total_deduct = payslip.tax + payslip.insurance + payslip.advance_deduction
-        ded_total = [["공제합계", f"-{total_deduct:,}원"]]
-
-        ded_all = ded_header + ded_data + ded_total
-        ded_table = Table(ded_all, colWidths=[100 * mm, 60 * mm])
-        ded_table.setStyle(TableStyle([
-            ("FONTNAME", (0, 0), (-1, -1), font_name),
-            ("FONTSIZE", (0, 0), (-1, -1), 10),
-            ("TEXTCOLOR", (0, 1), (-1, -1), TEXT_COLOR),
-            ("TEXTCOLOR", (1, 1), (1, -1), DEDUCT_COLOR),
-            # 헤더 행
-            ("FONTNAME", (0, 0), (-1, 0), font_name_bold),
-            ("FONTSIZE", (0, 0), (-1, 0), 12),
-            ("BACKGROUND", (0, 0), (-1, 0), colors.HexColor("#6B7280")),
-            ("TEXTCOLOR", (0, 0), (-1, 0), HEADER_TEXT),
-            # 합계 행
-            ("FONTNAME", (0, -1), (-1, -1), font_name_bold),
-            ("BACKGROUND", (0, -1), (-1, -1), colors.HexColor("#FEF2F2")),
-            ("FONTSIZE", (0, -1), (-1, -1), 11),
-            # 금액 오른쪽 정렬
-            ("ALIGN", (1, 0), (1, -1), "RIGHT"),
-            # 테두리
-            ("BOX", (0, 0), (-1, -1), 1, BORDER_COLOR),
-            ("LINEBELOW", (0, 0), (-1, -2), 0.5, BORDER_COLOR),
-            ("LINEABOVE", (0, -1), (-1, -1), 1, BORDER_COLOR),
-            ("TOPPADDING", (0, 0), (-1, -1), 7),
-            ("BOTTOMPADDING", (0, 0), (-1, -1), 7),
-            ("LEFTPADDING", (0, 0), (-1, -1), 10),
-            ("RIGHTPADDING", (0, 0), (-1, -1), 10),
-        ]))
-        elements.append(ded_table)
-        elements.append(Spacer(1, 6 * mm))
-
-        # ── 실수령액 ──
-        net_data = [[f"실수령액        {payslip.net:,}원"]]
-        net_table = Table(net_data, colWidths=[160 * mm])
-        net_table.setStyle(TableStyle([
-            ("FONTNAME", (0, 0), (-1, -1), font_name_bold),
-            ("FONTSIZE", (0, 0), (-1, -1), 16),
-            ("BACKGROUND", (0, 0), (-1, -1), NET_BG),
-            ("TEXTCOLOR", (0, 0), (-1, -1), HEADER_TEXT),
-            ("ALIGN", (0, 0), (-1, -1), "CENTER"),
-            ("TOPPADDING", (0, 0), (-1, -1), 12),
-            ("BOTTOMPADDING", (0, 0), (-1, -1), 12),
-            ("BOX", (0, 0), (-1, -1), 1, HEADER_BG),
-        ]))
-        elements.append(net_table)
-        elements.append(Spacer(1, 8 * mm))
-
-        # ── 발급일 ──
-        date_data = [[f"발급일: {datetime.now().strftime('%Y-%m-%d')}"]]
-        date_table = Table(date_data, colWidths=[160 * mm])
-        date_table.setStyle(TableStyle([
-            ("FONTNAME", (0, 0), (-1, -1), font_name),
-            ("FONTSIZE", (0, 0), (-1, -1), 9),
-            ("TEXTCOLOR", (0, 0), (-1, -1), colors.HexColor("#9CA3AF")),
-            ("ALIGN", (0, 0), (-1, -1), "RIGHT"),
-        ]))
-        elements.append(date_table)
-
-        # 수동 수정 표시
-        if payslip.is_manual:
-            manual_data = [["* 본 명세서는 관리자에 의해 수동 수정되었습니다."]]
-            manual_table = Table(manual_data, colWidths=[160 * mm])
-            manual_table.setStyle(TableStyle([
-                ("FONTNAME", (0, 0), (-1, -1), font_name),
-                ("FONTSIZE", (0, 0), (-1, -1), 8),
-                ("TEXTCOLOR", (0, 0), (-1, -1), colors.HexColor("#F59E0B")),
-                ("ALIGN", (0, 0), (-1, -1), "RIGHT"),
-                ("TOPPADDING", (0, 0), (-1, -1), 2),
-            ]))
-            elements.append(manual_table)
-
-        # 페이지 나누기 (마지막 제외)
-        if idx < len(payslips) - 1:
-            from reportlab.platypus import PageBreak
-            elements.append(PageBreak())
-
-    doc.build(elements)
-    buf.seek(0)
-    return buf
+
+def _send_payslip_pdf(payslips, download_name):
+    """디스크 캐시의 PDF 를 ETag 와 함께 전송한다 (If-None-Match 일치 시 304)."""
+    from services.payslip_pdf_service import get_cached_pdf
+
+    path, etag = get_cached_pdf(payslips, current_app.config.get("HOURLY_WAGE", 10320))
+    resp = send_file(
+        path,
+        as_attachment=True,
+        download_name=download_name,
+        mimetype="application/pdf",
+        etag=etag,
+        conditional=True,
+    )
+    # 개인 급여 정보 — 공유 캐시 금지, 매번 ETag 재검증
+    resp.cache_control.private = True
+    resp.cache_control.no_cache = True
+    return resp
 
 
 @payslip_bp.route("/admin/payslip/pdf")
@@ -613,6 +414,10 @@ def payslip_pdf():
         return jsonify({"error": "invalid month format"}), 400
 
     employee_id = request.args.get("employee_id") or request.args.get("emp_id")
+    if not employee_id and wants_async():
+        job = enqueue_job("payslip_pdf", {"month": month})
+        return jsonify({"success": True, "job_id": job.id}), 202
+
     query = Payslip.query.filter(Payslip.month == month)
     if employee_id:
         if not str(employee_id).isdigit():
@@ -623,107 +428,27 @@ def payslip_pdf():
     if not payslips:
         return jsonify({"error": "해당 월 급여 데이터가 없습니다."}), 404
 
-    buf = _generate_payslip_pdf(payslips)
-    return send_file(
-        buf,
-        as_attachment=True,
-        download_name=f"급여명세서_{month}.pdf",
-        mimetype="application/pdf",
-    )
+    return _send_payslip_pdf(payslips, f"급여명세서_{month}.pdf")
 
 
 @payslip_bp.route("/admin/payslip/excel")
 @require_admin
 def payslip_excel():
-    from openpyxl import Workbook
-    from openpyxl.styles import Font
+    from services.export_service import payslip_export, requested_format, send_export
 
     month = request.args.get("month", datetime.now().strftime("%Y-%m"))
     if not _validate_month(month):
         return jsonify({"error": "invalid month format"}), 400
 
-    payslips = Payslip.query.filter(Payslip.month == month).order_by(Payslip.emp_name.asc()).all()
-
-    wb = Workbook()
-    ws = wb.active
-    ws.title = f"{month} 급여"
-
-    headers = [
-        "직원ID",
-        "이름",
-        "부서",
-        "계산방식",
-        "총근무(h)",
-        "잔업(h)",
-        "야간(h)",
-        "휴일(h)",
-        "기본급",
-        "주휴수당",
-        "잔업수당",
-        "야간수당",
-        "휴일수당",
-        "결근일수",
-        "결근공제",
-        "주휴공제",
-        "총지급",
-        "소득세",
-        "국민연금",
-        "건강보험",
-        "장기요양",
-        "고용보험",
-        "4대보험합계",
-        "가불차감",
-        "실수령액",
-        "수동수정",
-    ]
-    bold = Font(bold=True)
-    for col, header in enumerate(headers, 1):
-        cell = ws.cell(row=1, column=col, value=header)
-        cell.font = bold
-
-    _XL_MODE = {"standard": "209h고정", "daily_build": "일급제", "actual": "실근무", "daily": "공수제"}
-    for i, payslip in enumerate(payslips, 2):
-        mode_label = _XL_MODE.get(payslip.salary_mode, payslip.salary_mode)
-        values = [
-            payslip.employee_id,
-            payslip.emp_name,
-            payslip.dept,
-            mode_label,
-            payslip.total_work_hours,
-            payslip.ot_hours,
-            payslip.night_hours,
-            payslip.holiday_hours,
-            payslip.base_salary,
-            payslip.weekly_holiday_pay,
-            payslip.ot_pay,
-            payslip.night_pay,
-            payslip.holiday_pay,
-            payslip.absent_days,
-            payslip.absent_deduction,
-            payslip.weekly_holiday_deduction,
-            payslip.gross,
-            payslip.tax,
-            payslip.pension,
-            payslip.health_ins,
-            payslip.longterm_care,
-            payslip.employment_ins,
-            payslip.insurance,
-            payslip.advance_deduction,
-            payslip.net,
-            "Y" if payslip.is_manual else "",
-        ]
-        for col, value in enumerate(values, 1):
-            ws.cell(row=i, column=col, value=value)
-
-    buf = BytesIO()
-    wb.save(buf)
-    buf.seek(0)
-    return send_file(
-        buf,
-        as_attachment=True,
-        download_name=f"급여명세서_{month}.xlsx",
-        mimetype="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-    )
+    site_id = request.args.get("site_id", type=int)
+
+    fmt = requested_format()
+    if wants_async():
+        job = enqueue_job("payslip_export", {"month": month, "fmt": fmt, "site_id": site_id})
+        return jsonify({"success": True, "job_id": job.id}), 202
+
+    out, download_name = payslip_export(month, fmt, site_id)
+    return send_export(out, download_name, fmt)
 
 
 # ── Public payslip lookup ──
@@ -791,10 +516,4 @@ def payslip_public_pdf():
     if not payslip:
         return jsonify({"error": "해당 월 급여 데이터가 없습니다."}), 404
 
-    buf = _generate_payslip_pdf([payslip])
-    return send_file(
-        buf,
-        as_attachment=True,
-        download_name=f"급여명세서_{month}_{emp_name}.pdf",
-        mimetype="application/pdf",
-    )
+    return _send_payslip_pdf([payslip], f"급여명세서_{month}_{emp_name}.pdf")
@@ -184,6 +184,43 @@ def update_site_wage_config(site_id):
         return jsonify({"error": "저장 실패"}), 500
 
 
+@site_bp.route("/api/sites/<int:site_id>/wage-config/simulate", methods=["POST"])
+@require_admin
+def simulate_site_wage_config(site_id):
+    """급여 설정 변경안의 최근 N개월 인건비 영향 시뮬레이션 (저장하지 않음)."""
+    from datetime import date
+
+    from services.payroll_simulation_service import parse_overrides, simulate_site_wage_change
+    from services.payslip_service import ALLOWED_SALARY_MODES
+
+    site = db.session.get(Site, site_id)
+    if not site:
+        return jsonify({"error": "현장을 찾을 수 없습니다."}), 404
+
+    data = request.get_json(silent=True)
+    if not data:
+        return jsonify({"error": "JSON body required"}), 400
+
+    try:
+        overrides = parse_overrides(data.get("overrides", {}))
+        months = int(data.get("months", 12))
+        if not 1 <= months <= 24:
+            raise ValueError("months 는 1~24 사이여야 합니다.")
+        end_month = data.get("end_month") or date.today().strftime("%Y-%m")
+        date.fromisoformat(f"{end_month}-01")
+    except (TypeError, ValueError) as exc:
+        return jsonify({"error": str(exc)}), 400
+
+    salary_mode = data.get("salary_mode", "standard")
+    if salary_mode not in ALLOWED_SALARY_MODES:
+        return jsonify({"error": f"invalid salary_mode: {salary_mode}"}), 400
+
+    result = simulate_site_wage_change(
+        site_id, overrides, end_month, months, salary_mode, refresh=bool(data.get("refresh")),
+    )
+    return jsonify({"success": True, "site_name": site.name, **result})
+
+
 @site_bp.route("/api/wage-config/system")
 @require_admin
 def get_system_wage_config():
@@ -21,6 +21,17 @@ def validate_month(month: str) -> bool:
     return int(year) >= 2000 and 1 <= int(mon) <= 12
 
 
+def wants_async() -> bool:
+    """요청이 백그라운드 작업 실행을 원하는지 (?async=1, form/JSON async)."""
+    payload = request.get_json(silent=True) if request.is_json else None
+    value = (
+        request.args.get("async")
+        or request.form.get("async")
+        or (payload or {}).get("async")
+    )
+    return str(value).lower() in ("1", "true", "yes")
+
+
 # ── 인증 데코레이터 ──
 def require_admin(f):
     """관리자 세션 인증 데코레이터.
@@ -0,0 +1,131 @@
+"""
+급여명세서 PDF 생성 벤치마크
+
+DB 없이 가상 급여명세서 N건으로 월 전체 PDF 를 생성하여 소요 시간을 측정합니다.
+기본적으로 git 이력에서 platypus 기반 기존 렌더러(routes/payslip.py 의
+_generate_payslip_pdf)를 불러와 같은 입력으로 함께 측정하고 비교합니다.
+
+사용법:
+  python scripts/bench_payslip_pdf.py            # 1,500건, 3회 반복, 기존 렌더러와 비교
+  python scripts/bench_payslip_pdf.py -n 300 -r 5
+  python scripts/bench_payslip_pdf.py --baseline <커밋>   # 비교 기준 커밋 지정
+  python scripts/bench_payslip_pdf.py --no-baseline       # 현재 렌더러만 측정
+"""
+import argparse
+import ast
+import io
+import os
+import subprocess
+import sys
+import time
+from datetime import datetime
+
+if sys.platform == "win32":
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding="utf-8", errors="replace")
+    sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding="utf-8", errors="replace")
+
+os.environ.setdefault("SCHEDULER_DISABLED", "1")
+os.environ.setdefault("JOB_RUNNER_DISABLED", "1")
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from flask import current_app  # noqa: E402
+
+from app import app  # noqa: E402
+from models import Payslip  # noqa: E402
+from routes.payslip import _generate_payslip_pdf  # noqa: E402
+
+
+def _fake_payslips(count, month):
+    payslips = []
+    for i in range(count):
+        four_ins = i % 2 == 0
+        payslips.append(Payslip(
+            employee_id=i + 1, emp_name=f"직원{i:04d}", dept="생산부" if i % 3 else None,
+            month=month, salary_mode=("standard", "actual", "daily_build")[i % 3],
+            total_work_hours=180.0 + i % 40, ot_hours=float(i % 25), night_hours=float(i % 7),
+            holiday_hours=float(i % 3) * 8, base_salary=2_156_880, weekly_holiday_pay=0,
+            ot_pay=150_000 + i * 10, night_pay=20_000, holiday_pay=(i % 3) * 60_000,
+            absent_days=float(i % 4 == 0), absent_deduction=82_560 if i % 4 == 0 else 0,
+            weekly_holiday_deduction=82_560 if i % 4 == 0 else 0,
+            gross=2_400_000 + i * 10, tax=0 if four_ins else 79_200,
+            pension=114_000 if four_ins else 0, health_ins=86_280 if four_ins else 0,
+            longterm_care=11_170 if four_ins else 0, employment_ins=27_600 if four_ins else 0,
+            insurance=239_050 if four_ins else 0, advance_deduction=100_000 if i % 5 == 0 else 0,
+            net=2_100_000 + i * 10, is_manual=i % 50 == 0,
+        ))
+    return payslips
+
+
+def _git(*args):
+    return subprocess.check_output(["git", *args], cwd=ROOT).decode("utf-8-sig")
+
+
+def _find_baseline_rev():
+    """platypus 렌더러를 마지막으로 가진 커밋 (SimpleDocTemplate 을 제거한 커밋의 부모)"""
+    removed = _git("log", "-S", "SimpleDocTemplate", "--format=%h", "--", "routes/payslip.py").split()
+    if not removed:
+        raise SystemExit("git 이력에서 기존 렌더러를 찾지 못했습니다. --baseline 으로 지정하세요.")
+    return removed[0] + "^"
+
+
+def _load_baseline(rev):
+    """해당 커밋의 routes/payslip.py 에서 _generate_payslip_pdf 만 꺼내 실행 가능한 함수로 만든다."""
+    source = _git("show", f"{rev}:routes/payslip.py")
+    tree = ast.parse(source)
+    for node in tree.body:
+        if isinstance(node, ast.FunctionDef) and node.name == "_generate_payslip_pdf":
+            break
+    else:
+        raise SystemExit(f"{rev}:routes/payslip.py 에 _generate_payslip_pdf 가 없습니다.")
+    # 기존 함수는 reportlab 을 함수 안에서 import 하고 모듈 전역은 아래 세 개만 쓴다
+    namespace = {"BytesIO": io.BytesIO, "current_app": current_app, "datetime": datetime}
+    exec(compile(ast.Module(body=[node], type_ignores=[]), f"{rev}:routes/payslip.py", "exec"), namespace)
+    return namespace["_generate_payslip_pdf"]
+
+
+def _measure(render, payslips, repeat):
+    timings = []
+    size = 0
+    for _ in range(repeat):
+        started = time.perf_counter()
+        buf = render(payslips)
+        timings.append(time.perf_counter() - started)
+        size = len(buf.getvalue())
+    return min(timings), sum(timings) / len(timings), size
+
+
+def _report(label, count, result):
+    best, avg, size = result
+    print(f"  [{label}] 최소 {best:.3f}s / 평균 {avg:.3f}s, 건당 {best / count * 1000:.2f}ms, PDF {size / 1024:.0f}KB")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="급여명세서 PDF 생성 벤치마크")
+    parser.add_argument("-n", "--count", type=int, default=1500, help="명세서 수 (기본 1500)")
+    parser.add_argument("-r", "--repeat", type=int, default=3, help="반복 횟수 (기본 3)")
+    parser.add_argument("--month", default="2026-03")
+    parser.add_argument("--baseline", metavar="REV", help="기존 렌더러를 가져올 커밋 (기본: 자동 탐색)")
+    parser.add_argument("--no-baseline", action="store_true", help="기존 렌더러와 비교하지 않음")
+    args = parser.parse_args()
+
+    baseline = None
+    if not args.no_baseline:
+        rev = args.baseline or _find_baseline_rev()
+        baseline = _load_baseline(rev)
+
+    payslips = _fake_payslips(args.count, args.month)
+    with app.app_context():
+        current = _measure(_generate_payslip_pdf, payslips, args.repeat)
+        base = _measure(baseline, payslips, args.repeat) if baseline else None
+
+    print(f"명세서 {args.count}건 × {args.repeat}회")
+    _report("현재", args.count, current)
+    if base:
+        _report(f"기존 {rev}", args.count, base)
+        print(f"  속도 {base[0] / current[0]:.1f}배, 크기 {current[2] / base[2] * 100:.0f}%")
+
+
+if __name__ == "__main__":
+    main()
@@ -32,10 +32,11 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from app import app  # noqa: E402
 from models import db, Employee, AttendanceRecord  # noqa: E402
+from services import calendar_service  # noqa: E402
 from services.attendance_service import (  # noqa: E402
-    calc_work_hours,
+    calc_work_hours_batch,
+    hhmm_to_minutes,
     _get_cfg,
-    _effective_day_type,
     TIME_REQUIRED_TYPES,
 )
 
@@ -293,8 +294,11 @@ def get_or_create_employee(name: str, birth_date: str, work_type: str):
 # 근태 레코드 생성
 # ---------------------------------------------------------------------------
 
-def create_attendance_record(employee, work_date, clock_in, clock_out, work_type, cfg):
-    """단일 근태 레코드 생성. (record_or_None, status) 반환."""
+def create_attendance_record(employee, work_date, clock_in, clock_out, work_type, hours=None):
+    """단일 근태 레코드 생성. (record_or_None, status) 반환.
+
+    hours: 미리 일괄 계산한 (total, ot, night, holiday). 없으면 모두 0.
+    """
     exists = AttendanceRecord.query.filter_by(
         employee_id=employee.id,
         work_date=work_date,
@@ -302,15 +306,7 @@ def create_attendance_record(employee, work_date, clock_in, clock_out, work_type
     if exists:
         return None, "duplicate"
 
-    total_hours = ot_hours = night_hours = holiday_hours = 0.0
-
-    if work_type in TIME_REQUIRED_TYPES and clock_in and clock_out:
-        day_type = _effective_day_type(work_date, cfg)
-        total_hours, ot_hours, night_hours, holiday_hours = calc_work_hours(
-            clock_in, clock_out, cfg,
-            work_date=work_date,
-            calendar_day_type=day_type,
-        )
+    total_hours, ot_hours, night_hours, holiday_hours = hours or (0.0, 0.0, 0.0, 0.0)
 
     record = AttendanceRecord(
         employee_id=employee.id,
@@ -334,12 +330,41 @@ def create_attendance_record(employee, work_date, clock_in, clock_out, work_type
 # 메인 임포트 로직
 # ---------------------------------------------------------------------------
 
+def _work_date(rec, year):
+    try:
+        return date(year, rec.month, rec.day)
+    except ValueError:
+        return None
+
+
+def precompute_hours(records, cfg, year):
+    """시간 계산이 필요한 레코드의 근무시간을 한 번에 계산한다. {index: (total, ot, night, holiday)}"""
+    targets = []
+    for i, rec in enumerate(records):
+        if rec.work_type in TIME_REQUIRED_TYPES and rec.clock_in and rec.clock_out:
+            work_date = _work_date(rec, year)
+            if work_date is not None:
+                targets.append((i, work_date))
+    if not targets:
+        return {}
+    in_min = hhmm_to_minutes([records[i].clock_in for i, _ in targets])
+    out_min = hhmm_to_minutes([records[i].clock_out for i, _ in targets])
+    day_types = calendar_service.day_type_codes([wd for _, wd in targets])
+    columns = calc_work_hours_batch(in_min, out_min, day_types, cfg)
+    return {
+        i: tuple(float(col[k]) for col in columns)
+        for k, (i, _) in enumerate(targets)
+        if in_min[k] >= 0 and out_min[k] >= 0
+    }
+
+
 def import_records(records, mapping, cfg, default_work_type, year, dry_run):
     """전체 레코드 처리. ImportResult 반환."""
     result = ImportResult()
     seen_employees = set()
+    hours_by_index = precompute_hours(records, cfg, year)
 
-    for rec in records:
+    for idx, rec in enumerate(records):
         info = mapping.get(rec.name)
         if not info or not info.get("birth_date"):
             continue
@@ -360,13 +385,12 @@ def import_records(records, mapping, cfg, default_work_type, year, dry_run):
             emp = Employee.query.filter_by(name=rec.name, birth_date=birth_date).first()
 
         # 근태 레코드 생성
-        try:
-            work_date = date(year, rec.month, rec.day)
-        except ValueError:
+        work_date = _work_date(rec, year)
+        if work_date is None:
             continue
 
         att_rec, status = create_attendance_record(
-            emp, work_date, rec.clock_in, rec.clock_out, rec.work_type, cfg,
+            emp, work_date, rec.clock_in, rec.clock_out, rec.work_type, hours_by_index.get(idx),
         )
 
         if status == "created":
@@ -0,0 +1,68 @@
+"""
+직원×월 근태 집계(attendance_monthly) 재구성 스크립트
+
+근태 원본(attendance_records)에서 직원·월별 합계, 출근일 비트맵, 근무 유형별
+건수를 다시 계산해 집계 테이블을 교체합니다. 평소에는 근태 쓰기 시 자동으로
+유지되므로, 직접 DB 를 수정했거나 집계가 어긋났다고 의심될 때 실행합니다.
+
+사용법:
+  # 전체 재구성
+  python scripts/rebuild_attendance_rollup.py
+
+  # 특정 월만
+  python scripts/rebuild_attendance_rollup.py --month 2026-03
+
+  # 특정 월을 원본 건수·총시간과 대조해 어긋난 직원만 다시 집계
+  python scripts/rebuild_attendance_rollup.py --month 2026-03 --check
+"""
+import argparse
+import io
+import os
+import re
+import sys
+import time
+
+# Windows 콘솔 한글 출력 보정
+if sys.platform == "win32":
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding="utf-8", errors="replace")
+    sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding="utf-8", errors="replace")
+
+os.environ.setdefault("SCHEDULER_DISABLED", "1")
+os.environ.setdefault("JOB_RUNNER_DISABLED", "1")
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import app  # noqa: E402
+from services.attendance_rollup_service import rebuild_rollups, reconcile_rollups  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description="직원×월 근태 집계 재구성")
+    parser.add_argument("--month", help="대상 월 (YYYY-MM, 생략 시 전체)")
+    parser.add_argument("--check", action="store_true", help="재구성 대신 원본과 대조해 어긋난 직원만 재집계 (--month 필요)")
+    args = parser.parse_args()
+
+    if args.month and not re.fullmatch(r"\d{4}-\d{2}", args.month):
+        parser.error("--month 는 YYYY-MM 형식이어야 합니다.")
+    if args.check and not args.month:
+        parser.error("--check 는 --month 와 함께 사용해야 합니다.")
+
+    if args.check:
+        with app.app_context():
+            result = reconcile_rollups(args.month)
+        print(f"근태 집계 점검 ({args.month}): {result['checked']}명 중 {result['stale']}명 재집계")
+        return
+
+    with app.app_context():
+        started = time.perf_counter()
+        result = rebuild_rollups(args.month)
+        elapsed = time.perf_counter() - started
+
+    print(
+        f"근태 집계 재구성 ({args.month or '전체'}): 원본 {result['records']}건 → "
+        f"집계 {result['rows']}행 ({elapsed:.1f}초)"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""
+월별 운영 지표(monthly_metrics) 재구성 스크립트
+
+근태 월 집계(attendance_monthly), 급여명세서, 승인된 가불에서 월 × 현장 지표
+(인원, 근무·연장·야간 시간, 급여 총액·실지급액, 가불)를 다시 계산해 지표 테이블을
+교체합니다. 평소에는 쓰기 시 자동으로 유지되므로, 직접 DB 를 수정했거나 지표가
+어긋났다고 의심될 때 실행합니다. 근태 원본을 직접 고쳤다면
+rebuild_attendance_rollup.py 를 먼저 실행하세요.
+
+사용법:
+  # 전체 재구성
+  python scripts/rebuild_monthly_metrics.py
+
+  # 특정 월만
+  python scripts/rebuild_monthly_metrics.py --month 2026-03
+"""
+import argparse
+import io
+import os
+import re
+import sys
+import time
+
+# Windows 콘솔 한글 출력 보정
+if sys.platform == "win32":
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding="utf-8", errors="replace")
+    sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding="utf-8", errors="replace")
+
+os.environ.setdefault("SCHEDULER_DISABLED", "1")
+os.environ.setdefault("JOB_RUNNER_DISABLED", "1")
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import app  # noqa: E402
+from services.monthly_metrics_service import rebuild_metrics  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description="월별 운영 지표 재구성")
+    parser.add_argument("--month", help="대상 월 (YYYY-MM, 생략 시 전체)")
+    args = parser.parse_args()
+
+    if args.month and not re.fullmatch(r"\d{4}-\d{2}", args.month):
+        parser.error("--month 는 YYYY-MM 형식이어야 합니다.")
+
+    with app.app_context():
+        started = time.perf_counter()
+        result = rebuild_metrics(args.month)
+        elapsed = time.perf_counter() - started
+
+    print(
+        f"월별 지표 재구성 ({args.month or '전체'}): {result['months']}개월 → "
+        f"지표 {result['rows']}행 ({elapsed:.1f}초)"
+    )
+
+
+if __name__ == "__main__":
+    main()
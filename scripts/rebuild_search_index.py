@@ -0,0 +1,41 @@
+"""
+이름·전화번호 검색 인덱스(search_documents) 재구성 스크립트
+
+지원자·문의·직원·계약의 검색 문서와 숫자만 남긴 전화번호(phone_digits)를 원본
+테이블에서 다시 만듭니다. 평소에는 저장 시 자동으로 유지되므로, 직접 DB 를
+수정했거나 검색 결과가 어긋났다고 의심될 때 실행합니다.
+
+사용법:
+  python scripts/rebuild_search_index.py
+"""
+import io
+import os
+import sys
+import time
+
+# Windows 콘솔 한글 출력 보정
+if sys.platform == "win32":
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding="utf-8", errors="replace")
+    sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding="utf-8", errors="replace")
+
+os.environ.setdefault("SCHEDULER_DISABLED", "1")
+os.environ.setdefault("JOB_RUNNER_DISABLED", "1")
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import app  # noqa: E402
+from services.search_service import rebuild_search_index  # noqa: E402
+
+
+def main():
+    with app.app_context():
+        started = time.perf_counter()
+        counts = rebuild_search_index()
+        elapsed = time.perf_counter() - started
+
+    summary = ", ".join(f"{entity} {count}건" for entity, count in counts.items())
+    print(f"검색 인덱스 재구성: {summary} ({elapsed:.1f}초)")
+
+
+if __name__ == "__main__":
+    main()
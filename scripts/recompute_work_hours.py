@@ -0,0 +1,70 @@
+"""
+근태 근무시간 일괄 재계산 스크립트
+
+기간 내 근태(출퇴근 시각이 있는 근무 유형)의 총근무/연장/야간/휴일근로 시간을
+현재 설정(휴게·소정근로·야간 시간대)과 운영 캘린더 기준으로 한 번에 다시 계산합니다.
+값이 달라진 레코드만 갱신하고 해당 직원·월을 급여 재계산 대상으로 표시합니다.
+
+사용법:
+  # 2026년 전체 변경 건수 확인 (저장하지 않음)
+  python scripts/recompute_work_hours.py --from 2026-01-01 --to 2026-12-31 --dry-run
+
+  # 실제 반영
+  python scripts/recompute_work_hours.py --from 2026-01-01 --to 2026-12-31
+"""
+import argparse
+import io
+import os
+import sys
+import time
+from datetime import date
+
+# Windows 콘솔 한글 출력 보정
+if sys.platform == "win32":
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding="utf-8", errors="replace")
+    sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding="utf-8", errors="replace")
+
+os.environ.setdefault("SCHEDULER_DISABLED", "1")
+os.environ.setdefault("JOB_RUNNER_DISABLED", "1")
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import app  # noqa: E402
+from models import db  # noqa: E402
+from services.attendance_service import recompute_work_hours  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description="근태 근무시간 일괄 재계산")
+    parser.add_argument("--from", dest="start", required=True, help="시작일 (YYYY-MM-DD)")
+    parser.add_argument("--to", dest="end", required=True, help="종료일 (YYYY-MM-DD, 포함)")
+    parser.add_argument("--dry-run", action="store_true", help="변경 건수만 확인")
+    args = parser.parse_args()
+
+    try:
+        start, end = date.fromisoformat(args.start), date.fromisoformat(args.end)
+    except ValueError:
+        parser.error("--from/--to 는 YYYY-MM-DD 형식이어야 합니다.")
+    if start > end:
+        parser.error("시작일이 종료일보다 늦습니다.")
+
+    with app.app_context():
+        started = time.perf_counter()
+        result = recompute_work_hours(start, end, dry_run=args.dry_run)
+        if args.dry_run:
+            db.session.rollback()
+        else:
+            db.session.commit()
+        elapsed = time.perf_counter() - started
+
+    mode = "[DRY-RUN] " if args.dry_run else ""
+    print(
+        f"{mode}근무시간 재계산 {start} ~ {end}: 대상 {result['scanned']}건, "
+        f"변경 {result['changed']}건 ({elapsed:.1f}초)"
+    )
+    if result["months"]:
+        print(f"  급여 재계산 필요 월: {', '.join(result['months'])}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""
+급여 병렬 재계산 스크립트
+
+(월, 현장) 단위로 작업을 나누어 프로세스 풀에서 계산하고,
+월별로 한 트랜잭션씩 저장합니다. 공휴일/보험요율 수정 후 연간 재계산 등에 사용합니다.
+
+사용법:
+  # 2026년 1~12월 전체 재계산 (CPU 수만큼 워커)
+  python scripts/run_payroll.py --from 2026-01 --to 2026-12
+
+  # 워커 8개, 특정 현장만
+  python scripts/run_payroll.py --from 2026-01 --to 2026-06 --workers 8 --site 3 --site 5
+
+  # 현장 미배정 직원만
+  python scripts/run_payroll.py --from 2026-03 --to 2026-03 --site unassigned
+"""
+import argparse
+import io
+import os
+import sys
+
+# Windows 콘솔 한글 출력 보정
+if sys.platform == "win32":
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding="utf-8", errors="replace")
+    sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding="utf-8", errors="replace")
+
+# 워커/부모 모두 예약발송 스케줄러를 띄우지 않는다
+os.environ.setdefault("SCHEDULER_DISABLED", "1")
+os.environ.setdefault("JOB_RUNNER_DISABLED", "1")
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import app  # noqa: E402
+from routes.utils import validate_month  # noqa: E402
+from services.payslip_service import ALLOWED_SALARY_MODES  # noqa: E402
+from services.payroll_parallel_service import UNASSIGNED, month_span, run_payroll  # noqa: E402
+
+
+def _print_progress(event):
+    if event["type"] == "chunk":
+        print(
+            f"  [{event['done']}/{event['total']}] {event['month']} 현장={event['site']} "
+            f"{event['employees']}명 ({event['ms']:.0f}ms)"
+        )
+    else:
+        print(
+            f"✔ {event['month']} 저장 — 생성 {event['created']}, "
+            f"갱신 {event['updated']}, 수동수정 건너뜀 {event['skipped']}"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="급여 병렬 재계산")
+    parser.add_argument("--from", dest="start", required=True, help="시작 월 (YYYY-MM)")
+    parser.add_argument("--to", dest="end", required=True, help="끝 월 (YYYY-MM, 포함)")
+    parser.add_argument("--workers", type=int, default=None, help="프로세스 수 (기본: CPU 수)")
+    parser.add_argument("--salary-mode", default=None, help="기본 산정 방식 (standard/actual/daily_build)")
+    parser.add_argument("--site", action="append", default=None,
+                        help=f"현장 ID (여러 번 지정 가능, 미배정은 '{UNASSIGNED}')")
+    args = parser.parse_args()
+
+    if not (validate_month(args.start) and validate_month(args.end)) or args.start > args.end:
+        parser.error("--from/--to 는 YYYY-MM 형식이며 시작 ≤ 끝 이어야 합니다.")
+
+    site_ids = None
+    if args.site:
+        site_ids = [s if s == UNASSIGNED else int(s) for s in args.site]
+
+    with app.app_context():
+        salary_mode = args.salary_mode or app.config.get("SALARY_MODE", "standard")
+        if salary_mode not in ALLOWED_SALARY_MODES:
+            parser.error(f"invalid salary_mode: {salary_mode}")
+
+        months = month_span(args.start, args.end)
+        print(f"급여 재계산: {months[0]} ~ {months[-1]} ({len(months)}개월), 산정방식={salary_mode}")
+        result = run_payroll(
+            months, salary_mode, workers=args.workers, site_ids=site_ids, progress=_print_progress,
+        )
+
+    totals = {k: sum(m[k] for m in result["months"].values()) for k in ("created", "updated", "skipped")}
+    print(
+        f"\n완료: {result['chunks']}개 작업, 워커 {result['workers']}개, "
+        f"{result['elapsed_ms'] / 1000:.1f}초 — 생성 {totals['created']}, "
+        f"갱신 {totals['updated']}, 건너뜀 {totals['skipped']}"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,14 +1,31 @@
 """근태 엑셀 파일 파싱 및 DB 저장 서비스."""
 
+import io
+import json
 import logging
+import multiprocessing
 import os
+import shutil
+import uuid
 import re
+import zipfile
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
 from datetime import date, datetime
 
+import numpy as np
+from sqlalchemy import func, or_
+
 from models import AttendanceRecord, Employee, db
+from services.attendance_rollup_service import touch_rollups
+from services.payroll_dirty_service import mark_stale
 
 logger = logging.getLogger(__name__)
 
+# 미리보기 → 실행 사이에 파싱 결과를 보관하는 임시 디렉터리
+_PENDING_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "tmp")
+
 # 엑셀 구조 상수
 _HEADER_ROW = 5           # 날짜 헤더 행
 _DATA_START_ROW = 8       # 첫 직원 데이터 시작 행
@@ -26,6 +43,11 @@ _CATEGORY_MAP = {
     "특연": "holiday_ot",
     "지조": "late",
 }
+# 압축 표현의 카테고리 축 순서
+CATEGORIES = ("base", "ot", "night", "holiday", "holiday_ot", "late")
+_CATEGORY_INDEX = {key: k for k, key in enumerate(CATEGORIES)}
+_CATEGORY_LABELS = ("기본", "연장", "심야", "특근", "특연", "지조")
+_DAY_COLUMNS = _DATE_COL_END - _DATE_COL_START + 1   # 31
 
 
 def _safe_float(value) -> float:
@@ -65,57 +87,158 @@ def _extract_site_name(filename: str) -> str:
     return name
 
 
-def parse_attendance_excel(file_stream, filename: str = "") -> dict:
-    """
-    근태 엑셀 파일을 파싱하여 구조화된 데이터를 반환.
+# 엑셀로 덮어쓰지 않는 상위 source
+_PROTECTED_SOURCES = ("admin", "employee")
 
-    Args:
-        file_stream: 엑셀 파일 스트림 (BytesIO 또는 FileStorage)
-        filename: 원본 파일명 (업체명 추출용)
+# upsert 시 갱신하는 컬럼 (source 는 MySQL 에서 보호 조건보다 나중에 바뀌도록 마지막)
+_UPSERT_UPDATE_COLUMNS = (
+    "work_type", "total_work_hours", "overtime_hours", "night_hours",
+    "holiday_work_hours", "updated_at", "source", "site_id",
+)
+_HOUR_FIELDS = ("total_work_hours", "overtime_hours", "night_hours", "holiday_work_hours")
 
-    Returns:
-        {
-            "year": 2026,
-            "month": 1,
-            "month_str": "2026-01",
-            "site_name": "영진팩",
-            "employees": [
-                {
-                    "name": "이은비",
-                    "hire_date": date(2022, 11, 10),
-                    "resign_date": None,
-                    "hourly_wage": 10320,
-                    "days": {
-                        date(2026,1,2): {
-                            "base": 8, "ot": 0, "night": 0,
-                            "holiday": 0, "holiday_ot": 0, "late": 0,
-                            "is_annual": False
-                        },
-                        ...
-                    },
-                    "summary": {"base": 209, "ot": 30, "night": 0, ...}
-                },
-                ...
-            ],
-            "errors": []
-        }
+
+def _same_values(current, row) -> bool:
+    """기존 레코드와 반영할 값이 같은지 (MySQL FLOAT 정밀도 고려)."""
+    if current.source != row["source"] or current.work_type != row["work_type"]:
+        return False
+    return all(abs((getattr(current, f) or 0.0) - row[f]) < 1e-4 for f in _HOUR_FIELDS)
+
+
+def _upsert_records(rows: list) -> None:
+    """(employee_id, work_date) 기준 일괄 INSERT/UPDATE.
+
+    미리 조회한 뒤 다른 요청이 관리자/직원 기록을 넣었더라도 덮어쓰지 않도록
+    충돌 시 갱신에도 source 보호 조건을 건다.
+    """
+    table = AttendanceRecord.__table__
+    # executemany 에서는 IN 확장 파라미터를 쓸 수 없어 OR 로 풀어 쓴다
+    protected = or_(*[table.c.source == source for source in _PROTECTED_SOURCES])
+    dialect = db.session.get_bind().dialect.name
+    if dialect in ("sqlite", "postgresql"):
+        if dialect == "sqlite":
+            from sqlalchemy.dialects.sqlite import insert
+        else:
+            from sqlalchemy.dialects.postgresql import insert
+        stmt = insert(table)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["employee_id", "work_date"],
+            set_={col: stmt.excluded[col] for col in _UPSERT_UPDATE_COLUMNS},
+            where=~protected,
+        )
+    else:
+        from sqlalchemy.dialects.mysql import insert
+        stmt = insert(table)
+        stmt = stmt.on_duplicate_key_update([
+            (col, func.if_(protected, table.c[col], stmt.inserted[col]))
+            for col in _UPSERT_UPDATE_COLUMNS
+        ])
+    db.session.execute(stmt, rows)
+
+
+def _write_planned(planned: dict) -> None:
+    if planned:
+        _upsert_records(list(planned.values()))
+        pairs = {(emp_id, work_date.strftime("%Y-%m")) for emp_id, work_date in planned}
+        mark_stale(pairs, "attendance")
+        touch_rollups(pairs)
+
+
+@dataclass(slots=True)
+class ParsedEmployee:
+    """엑셀 한 직원 블록의 압축 표현.
+
+    hours[카테고리, 열] — 카테고리 순서는 CATEGORIES, 열 0 = H열(날짜 헤더 dates[0]).
+    annual 은 '연차' 표시가 있는 열의 비트마스크 (bit i = 열 i).
     """
-    import openpyxl
 
-    wb = openpyxl.load_workbook(file_stream, data_only=True, read_only=True)
-    ws = wb.worksheets[0]
+    name: str
+    hire_date: date | None
+    resign_date: date | None
+    hourly_wage: float
+    hours: np.ndarray            # float64 (6, 31)
+    annual: int
+    summary: np.ndarray          # float64 (6,) — AM열 합계
+
+    def is_annual(self, col: int) -> bool:
+        return bool(self.annual >> col & 1)
+
+    def annual_count(self) -> int:
+        return bin(self.annual).count("1")
 
+    def active_columns(self) -> list:
+        """값이나 연차 표시가 있는 열 번호 (열 순서)."""
+        mask = (self.hours != 0).any(axis=0)
+        return [i for i in range(_DAY_COLUMNS) if mask[i] or self.annual >> i & 1]
+
+
+def _clean_name(value) -> str:
+    """이름 정리: 줄바꿈 제거, 괄호 내 부서명 제거, 공백 정리."""
+    name = str(value).strip()
+    name = re.sub(r"[\r\n]+", " ", name)  # 줄바꿈 → 공백
+    name = re.sub(r"\s*\(.*?\)", "", name)  # (부서명) 제거
+    return re.sub(r"\s{2,}", " ", name).strip()  # 다중 공백 정리
+
+
+def _cell(row: tuple, col: int):
+    """values_only 행 튜플(B열 시작)에서 열 번호로 값을 꺼낸다."""
+    idx = col - 2
+    return row[idx] if idx < len(row) else None
+
+
+def _parse_block(block: list, dates: list) -> ParsedEmployee | None:
+    """직원 6행 블록 → ParsedEmployee (이름 없는 빈 블록은 None)."""
+    first = block[0]
+    # 첫 행(기본): 연번(B), 성명(C), 입사일(D), 퇴사일(E), 시급(F)
+    emp_name = _cell(first, 3)
+    if not emp_name:
+        return None
+
+    hours = np.zeros((len(CATEGORIES), _DAY_COLUMNS), dtype=np.float64)
+    summary = np.zeros(len(CATEGORIES), dtype=np.float64)
+    annual = 0
+    for row in block:
+        cat_key = _CATEGORY_MAP.get(_cell(row, 7) or "")
+        if not cat_key:
+            continue
+        k = _CATEGORY_INDEX[cat_key]
+        hours[k] = 0.0  # 같은 구분 행이 다시 나오면 나중 행 기준
+        for i in range(_DAY_COLUMNS):
+            val = _cell(row, _DATE_COL_START + i)
+            if val is None:
+                continue
+            # "연차" 텍스트 감지 (연장 행에서)
+            if isinstance(val, str) and "연차" in val:
+                if dates[i] is not None:
+                    annual |= 1 << i
+                continue
+            if dates[i] is not None:
+                hours[k, i] = _safe_float(val)
+        summary[k] = _safe_float(_cell(row, _SUMMARY_COL))
+
+    return ParsedEmployee(
+        name=_clean_name(emp_name),
+        hire_date=_to_date(_cell(first, 4)),
+        resign_date=_to_date(_cell(first, 5)),
+        hourly_wage=_safe_float(_cell(first, 6)),
+        hours=hours,
+        annual=annual,
+        summary=summary,
+    )
+
+
+def _parse_sheet(ws, filename: str = "") -> dict:
+    """시트 하나를 파싱한다 (parse_attendance_excel 반환 형식, "sheet" 키 추가)."""
     errors = []
 
-    # ── 연월 추출 ──
-    year_val = None
-    month_val = None
-    for row in ws.iter_rows(min_row=2, max_row=2, min_col=1, max_col=20, values_only=False):
-        for cell in row:
-            if cell.column == 10:  # J열
-                year_val = cell.value
-            if cell.column == 13:  # M열
-                month_val = cell.value
+    # ── 연월 / 업체명 추출 (Row 2: E열 업체명, J열 연도, M열 월) ──
+    year_val = month_val = None
+    site_name = ""
+    for row in ws.iter_rows(min_row=2, max_row=2, min_col=1, max_col=20, values_only=True):
+        year_val = row[9] if len(row) > 9 else None
+        month_val = row[12] if len(row) > 12 else None
+        if len(row) > 4 and row[4]:
+            site_name = str(row[4]).strip()
 
     if year_val is None or month_val is None:
         # 시트명에서 추출 시도: "1월 근태"
@@ -125,175 +248,133 @@ def parse_attendance_excel(file_stream, filename: str = "") -> dict:
             month_val = int(m.group(1))
         if year_val is None:
             year_val = date.today().year
+    if month_val is None:
+        return {
+            "year": int(year_val), "month": None, "month_str": "",
+            "site_name": site_name, "sheet": ws.title, "dates": [None] * _DAY_COLUMNS,
+            "employees": [], "errors": ["대상 월을 찾을 수 없습니다 (Row 2 M열 또는 시트명)."],
+        }
 
     year = int(year_val)
     month = int(month_val)
     month_str = f"{year}-{month:02d}"
 
-    # ── 업체명 추출 ──
-    site_name = ""
-    # E2:F3 merged cell
-    for row in ws.iter_rows(min_row=2, max_row=2, min_col=5, max_col=5, values_only=False):
-        for cell in row:
-            if cell.value:
-                site_name = str(cell.value).strip()
     if not site_name and filename:
         site_name = _extract_site_name(filename)
 
     # ── 날짜 헤더 추출 (Row 5, H~AL) ──
-    date_columns = {}  # col_index → date
+    dates = [None] * _DAY_COLUMNS
     for row in ws.iter_rows(min_row=_HEADER_ROW, max_row=_HEADER_ROW,
                             min_col=_DATE_COL_START, max_col=_DATE_COL_END,
-                            values_only=False):
-        for cell in row:
-            d = _to_date(cell.value)
-            if d:
-                date_columns[cell.column] = d
+                            values_only=True):
+        for i, value in enumerate(row[:_DAY_COLUMNS]):
+            dates[i] = _to_date(value)
 
-    if not date_columns:
-        wb.close()
+    if not any(dates):
         return {
             "year": year, "month": month, "month_str": month_str,
-            "site_name": site_name, "employees": [],
+            "site_name": site_name, "sheet": ws.title, "dates": dates, "employees": [],
             "errors": ["날짜 헤더를 찾을 수 없습니다 (Row 5, H~AL열)."],
         }
 
-    # ── 직원 데이터 파싱 ──
+    # ── 직원 데이터 파싱 (G열 '기본' 행부터 6행 단위) ──
     employees = []
-
-    # read_only 모드에서는 전체 행을 미리 읽어둔다
-    all_rows = {}
+    block = None
     for row in ws.iter_rows(min_row=_DATA_START_ROW, max_row=ws.max_row or 500,
                             min_col=2, max_col=_SUMMARY_COL + 1,
-                            values_only=False):
-        for cell in row:
-            if cell.row not in all_rows:
-                all_rows[cell.row] = {}
-            all_rows[cell.row][cell.column] = cell.value
-
-    wb.close()
-
-    row_num = _DATA_START_ROW
-    while row_num in all_rows:
-        row_data = all_rows.get(row_num, {})
-        g_val = row_data.get(7)  # G열 = 구분
-
-        if g_val != "기본":
-            row_num += 1
-            continue
-
-        # 첫 행(기본): 연번(B), 성명(C), 입사일(D), 퇴사일(E), 시급(F)
-        seq_num = row_data.get(2)  # B열
-        emp_name = row_data.get(3)  # C열
-        hire_date_raw = row_data.get(4)  # D열
-        resign_date_raw = row_data.get(5)  # E열
-        hourly_wage_raw = row_data.get(6)  # F열
-
-        # 이름 없는 빈 블록 → 스킵
-        if not emp_name:
-            row_num += _ROWS_PER_EMPLOYEE
-            continue
-
-        # 이름 정리: 줄바꿈 제거, 괄호 내 부서명 제거, 공백 정리
-        emp_name = str(emp_name).strip()
-        emp_name = re.sub(r"[\r\n]+", " ", emp_name)  # 줄바꿈 → 공백
-        emp_name = re.sub(r"\s*\(.*?\)", "", emp_name)  # (부서명) 제거
-        emp_name = re.sub(r"\s{2,}", " ", emp_name).strip()  # 다중 공백 정리
-        hire_date = _to_date(hire_date_raw)
-        resign_date = _to_date(resign_date_raw)
-        hourly_wage = _safe_float(hourly_wage_raw)
-
-        # 6행 데이터 수집
-        category_data = {}  # "base" → {col: value, ...}
-        annual_dates = set()  # 연차인 날짜
-
-        for offset in range(_ROWS_PER_EMPLOYEE):
-            r = row_num + offset
-            r_data = all_rows.get(r, {})
-            g = r_data.get(7, "")
-            cat_key = _CATEGORY_MAP.get(g)
-            if not cat_key:
+                            values_only=True):
+        if block is None:
+            if _cell(row, 7) != "기본":
                 continue
-
-            col_values = {}
-            for col_idx in range(_DATE_COL_START, _DATE_COL_END + 1):
-                val = r_data.get(col_idx)
-                if val is None:
-                    continue
-                # "연차" 텍스트 감지 (연장 행에서)
-                if isinstance(val, str) and "연차" in val:
-                    if col_idx in date_columns:
-                        annual_dates.add(date_columns[col_idx])
-                    continue
-                num = _safe_float(val)
-                if num != 0:
-                    col_values[col_idx] = num
-
-            # 합계(AM열)
-            summary_val = _safe_float(r_data.get(_SUMMARY_COL))
-            category_data[cat_key] = {
-                "values": col_values,
-                "summary": summary_val,
-            }
-
-        # 날짜별 데이터 구성
-        days = {}
-        for col_idx, work_date in date_columns.items():
-            day_data = {
-                "base": 0.0, "ot": 0.0, "night": 0.0,
-                "holiday": 0.0, "holiday_ot": 0.0, "late": 0.0,
-                "is_annual": work_date in annual_dates,
-            }
-            has_data = work_date in annual_dates
-            for cat_key, cat_info in category_data.items():
-                v = cat_info["values"].get(col_idx, 0.0)
-                if v != 0:
-                    day_data[cat_key] = v
-                    has_data = True
-
-            if has_data:
-                days[work_date] = day_data
-
-        # 요약
-        summary = {}
-        for cat_key in ("base", "ot", "night", "holiday", "holiday_ot", "late"):
-            summary[cat_key] = category_data.get(cat_key, {}).get("summary", 0.0)
-        summary["annual"] = len(annual_dates)
-
-        employees.append({
-            "name": emp_name,
-            "hire_date": hire_date,
-            "resign_date": resign_date,
-            "hourly_wage": hourly_wage,
-            "days": days,
-            "summary": summary,
-        })
-
-        row_num += _ROWS_PER_EMPLOYEE
+            block = []
+        block.append(row)
+        if len(block) == _ROWS_PER_EMPLOYEE:
+            emp = _parse_block(block, dates)
+            if emp is not None:
+                employees.append(emp)
+            block = None
+    if block:
+        # 파일 끝에서 잘린 블록도 있는 행까지 반영
+        emp = _parse_block(block, dates)
+        if emp is not None:
+            employees.append(emp)
 
     return {
         "year": year,
         "month": month,
         "month_str": month_str,
         "site_name": site_name,
+        "sheet": ws.title,
+        "dates": dates,
         "employees": employees,
         "errors": errors,
     }
 
 
-def import_attendance_to_db(parsed_data: dict, dry_run: bool = False) -> dict:
+def parse_attendance_excel(file_stream, filename: str = "") -> dict:
+    """
+    근태 엑셀 파일의 첫 시트를 파싱하여 구조화된 데이터를 반환.
+
+    시트 전체를 메모리에 올리지 않고 iter_rows(values_only=True) 로 한 행씩 읽으며
+    직원 6행 블록 단위로 ParsedEmployee 배열을 만든다.
+
+    Args:
+        file_stream: 엑셀 파일 스트림 (BytesIO 또는 FileStorage) 또는 경로
+        filename: 원본 파일명 (업체명 추출용)
+
+    Returns:
+        {
+            "year": 2026,
+            "month": 1,
+            "month_str": "2026-01",
+            "site_name": "영진팩",
+            "sheet": "1월 근태",
+            "dates": [date(2026,1,1), ..., None],   # H~AL열 날짜 헤더 (31칸)
+            "employees": [ParsedEmployee(name="이은비", hire_date=..., hours=..., ...), ...],
+            "errors": []
+        }
+    """
+    import openpyxl
+
+    wb = openpyxl.load_workbook(file_stream, data_only=True, read_only=True)
+    try:
+        return _parse_sheet(wb.worksheets[0], filename)
+    finally:
+        wb.close()
+
+
+def parse_attendance_workbook(file_stream, filename: str = "") -> list:
+    """월별 시트가 여러 개인 워크북을 시트마다 파싱한다.
+
+    날짜 헤더가 없는 시트(요약·메모 시트 등)는 건너뛴다. 근태 시트가 하나도
+    없으면 첫 시트의 파싱 결과(오류 포함) 하나만 돌려준다.
+    """
+    import openpyxl
+
+    wb = openpyxl.load_workbook(file_stream, data_only=True, read_only=True)
+    try:
+        sheets = [_parse_sheet(ws, filename) for ws in wb.worksheets]
+    finally:
+        wb.close()
+    found = [parsed for parsed in sheets if any(parsed["dates"])]
+    return found or sheets[:1]
+
+
+def import_attendance_to_db(parsed_data: dict, dry_run: bool = False, commit: bool = True) -> dict:
     """
     파싱된 근태 데이터를 DB에 저장.
 
     Args:
         parsed_data: parse_attendance_excel() 반환값
         dry_run: True이면 실제 저장 없이 결과만 반환
+        commit: False이면 commit 하지 않고 예외도 호출자에게 넘긴다 (여러 파일 일괄 반영용)
 
     Returns:
         {
             "created": int,
             "updated": int,
             "skipped": int,
+            "unchanged": int,   # 기존 값과 같아 쓰지 않은 건수
             "new_employees": [{"name": ..., "hire_date": ...}],
             "matched_employees": [{"name": ..., "id": ...}],
             "errors": [...],
@@ -305,6 +386,7 @@ def import_attendance_to_db(parsed_data: dict, dry_run: bool = False) -> dict:
         "created": 0,
         "updated": 0,
         "skipped": 0,
+        "unchanged": 0,
         "new_employees": [],
         "matched_employees": [],
         "errors": list(parsed_data.get("errors", [])),
@@ -317,14 +399,19 @@ def import_attendance_to_db(parsed_data: dict, dry_run: bool = False) -> dict:
         result["errors"].append("파싱된 직원 데이터가 없습니다.")
         return result
 
-    # ── 직원 매칭 ──
+    # ── 직원 매칭 (이름 IN 조회 1회) ──
+    names = list(dict.fromkeys(emp_data.name for emp_data in employees_data))
+    candidates = defaultdict(list)
+    for emp in Employee.query.filter(Employee.name.in_(names), Employee.is_active.is_(True)).all():
+        candidates[emp.name].append(emp)
+
     emp_map = {}  # 엑셀 이름 → Employee 객체
+    hire_dates = {}
     for emp_data in employees_data:
-        name = emp_data["name"]
-        if name in emp_map:
-            continue  # 이미 매칭됨
-
-        matches = Employee.query.filter_by(name=name, is_active=True).all()
+        hire_dates.setdefault(emp_data.name, emp_data.hire_date)
+    created_emps = []
+    for name in names:
+        matches = candidates.get(name, [])
         if len(matches) == 1:
             emp_map[name] = matches[0]
             result["matched_employees"].append({"name": name, "id": matches[0].id})
@@ -332,35 +419,61 @@ def import_attendance_to_db(parsed_data: dict, dry_run: bool = False) -> dict:
             # 자동 등록
             if dry_run:
                 emp_map[name] = None  # dry_run에서는 None 표시
-                result["new_employees"].append({
-                    "name": name,
-                    "hire_date": emp_data.get("hire_date"),
-                })
+                result["new_employees"].append({"name": name, "hire_date": hire_dates[name]})
             else:
                 new_emp = Employee(
                     name=name,
                     birth_date="000000",
-                    hire_date=emp_data.get("hire_date"),
+                    hire_date=hire_dates[name],
                     is_active=True,
                 )
                 db.session.add(new_emp)
-                db.session.flush()  # ID 할당
                 emp_map[name] = new_emp
-                result["new_employees"].append({
-                    "name": name,
-                    "hire_date": emp_data.get("hire_date"),
-                    "id": new_emp.id,
-                })
-                logger.info("자동 등록: %s (hire_date=%s)", name, emp_data.get("hire_date"))
+                created_emps.append(new_emp)
         else:
             result["errors"].append(
                 f"동명이인: {name} ({len(matches)}명) — 직원관리에서 확인 필요"
             )
-            continue
 
-    # ── 근태 레코드 생성/갱신 ──
+    if created_emps:
+        db.session.flush()  # ID 일괄 할당
+        for new_emp in created_emps:
+            result["new_employees"].append({
+                "name": new_emp.name,
+                "hire_date": new_emp.hire_date,
+                "id": new_emp.id,
+            })
+            logger.info("자동 등록: %s (hire_date=%s)", new_emp.name, new_emp.hire_date)
+
+    # ── 기존 근태 일괄 조회 (매칭 직원 × 파일 기간) ──
+    existing = {}
+    dates = parsed_data["dates"]
+    all_dates = [dates[i] for emp_data in employees_data for i in emp_data.active_columns()]
+    matched_ids = [emp.id for emp in emp_map.values() if emp is not None]
+    if not dry_run and matched_ids and all_dates:
+        existing = {
+            (row.employee_id, row.work_date): row
+            for row in db.session.query(
+                AttendanceRecord.employee_id,
+                AttendanceRecord.work_date,
+                AttendanceRecord.source,
+                AttendanceRecord.work_type,
+                AttendanceRecord.total_work_hours,
+                AttendanceRecord.overtime_hours,
+                AttendanceRecord.night_hours,
+                AttendanceRecord.holiday_work_hours,
+            ).filter(
+                AttendanceRecord.employee_id.in_(matched_ids),
+                AttendanceRecord.work_date >= min(all_dates),
+                AttendanceRecord.work_date <= max(all_dates),
+            )
+        }
+
+    # ── 근태 레코드 생성/갱신 (메모리에서 비교 후 변경분만 upsert) ──
+    now = datetime.now()
+    planned = {}  # (employee_id, work_date) → upsert 행
     for emp_data in employees_data:
-        name = emp_data["name"]
+        name = emp_data.name
         employee = emp_map.get(name)
 
         if employee is None and not dry_run:
@@ -369,27 +482,20 @@ def import_attendance_to_db(parsed_data: dict, dry_run: bool = False) -> dict:
             continue  # 동명이인 등으로 매칭 실패
 
         # 합계 검증 (2시간 이상 차이만 경고 — 엑셀 수식이 수동값이므로 소폭 차이는 허용)
-        for cat_key, label in [("base", "기본"), ("ot", "연장"), ("night", "심야"),
-                                ("holiday", "특근"), ("holiday_ot", "특연"), ("late", "지조")]:
-            excel_sum = emp_data["summary"].get(cat_key, 0)
-            calc_sum = sum(
-                day.get(cat_key, 0) for day in emp_data["days"].values()
-            )
+        for k, label in enumerate(_CATEGORY_LABELS):
+            excel_sum = float(emp_data.summary[k])
+            calc_sum = sum(emp_data.hours[k].tolist())
             if abs(excel_sum - calc_sum) > 2.0:
                 result["warnings"].append(
                     f"합계 불일치: {name} {label} 엑셀={excel_sum} 계산={calc_sum}"
                 )
 
-        for work_date, day_data in emp_data["days"].items():
+        for col in emp_data.active_columns():
+            work_date = dates[col]
             result["total_records"] += 1
 
-            base = day_data.get("base", 0)
-            ot = day_data.get("ot", 0)
-            night = day_data.get("night", 0)
-            holiday = day_data.get("holiday", 0)
-            holiday_ot = day_data.get("holiday_ot", 0)
-            late = day_data.get("late", 0)
-            is_annual = day_data.get("is_annual", False)
+            base, ot, night, holiday, holiday_ot, late = emp_data.hours[:, col].tolist()
+            is_annual = emp_data.is_annual(col)
 
             total_hours = base + ot + night + holiday + holiday_ot - late
             overtime = ot + holiday_ot
@@ -408,49 +514,54 @@ def import_attendance_to_db(parsed_data: dict, dry_run: bool = False) -> dict:
                 result["created"] += 1
                 continue
 
-            # upsert: 기존 레코드 있으면 UPDATE
-            existing = AttendanceRecord.query.filter_by(
-                employee_id=employee.id,
-                work_date=work_date,
-            ).first()
+            row = {
+                "employee_id": employee.id,
+                "site_id": employee.site_id,
+                "birth_date": employee.birth_date,
+                "emp_name": employee.name,
+                "dept": "",
+                "work_date": work_date,
+                "work_type": work_type,
+                "total_work_hours": total_hours,
+                "overtime_hours": overtime,
+                "night_hours": night,
+                "holiday_work_hours": holiday,
+                "source": "excel",
+                "created_at": now,
+                "updated_at": now,
+            }
+            key = (employee.id, work_date)
+            if key in planned:
+                # 같은 파일에 같은 직원·날짜가 다시 나오면 나중 값으로 갱신
+                planned[key] = row
+                result["updated"] += 1
+                continue
 
-            if existing:
+            current = existing.get(key)
+            if current is not None:
                 # 우선순위: admin > employee > excel
                 # 상위 source의 기록은 엑셀로 덮어쓰지 않음
-                if existing.source in ("admin", "employee"):
+                if current.source in _PROTECTED_SOURCES:
                     result["skipped"] += 1
                     result["warnings"].append(
                         f"건너뜀: {name} {work_date} — 기존 "
-                        f"{'관리자' if existing.source == 'admin' else '직원'} "
+                        f"{'관리자' if current.source == 'admin' else '직원'} "
                         f"입력 기록 보호"
                     )
                     continue
-                existing.total_work_hours = total_hours
-                existing.overtime_hours = overtime
-                existing.night_hours = night
-                existing.holiday_work_hours = holiday
-                existing.work_type = work_type
-                existing.source = "excel"
+                if _same_values(current, row):
+                    result["unchanged"] += 1
+                    continue
                 result["updated"] += 1
             else:
-                record = AttendanceRecord(
-                    employee_id=employee.id,
-                    birth_date=employee.birth_date,
-                    emp_name=employee.name,
-                    dept="",
-                    work_date=work_date,
-                    work_type=work_type,
-                    total_work_hours=total_hours,
-                    overtime_hours=overtime,
-                    night_hours=night,
-                    holiday_work_hours=holiday,
-                    source="excel",
-                )
-                db.session.add(record)
                 result["created"] += 1
+            planned[key] = row
 
-    if not dry_run:
+    if not dry_run and not commit:
+        _write_planned(planned)
+    elif not dry_run:
         try:
+            _write_planned(planned)
             db.session.commit()
         except Exception as exc:
             db.session.rollback()
@@ -458,9 +569,379 @@ def import_attendance_to_db(parsed_data: dict, dry_run: bool = False) -> dict:
             result["errors"].append(f"DB 저장 실패: {exc}")
 
     if result["new_employees"]:
-        result["warnings"].append(
-            f"신규 직원 {len(result['new_employees'])}명 자동 등록 "
-            f"(생년월일 미설정 → 직원관리에서 수정 필요)"
+        result["warnings"].append(_new_employee_warning(result["new_employees"]))
+
+    return result
+
+
+def _new_employee_warning(new_employees: list) -> str:
+    return (
+        f"신규 직원 {len(new_employees)}명 자동 등록 "
+        f"(생년월일 미설정 → 직원관리에서 수정 필요)"
+    )
+
+
+# ── 여러 파일 / ZIP / 월별 시트 일괄 업로드 ──
+
+_EXCEL_EXTENSIONS = (".xlsx", ".xls")
+_BATCH_COUNT_KEYS = ("created", "updated", "skipped", "unchanged", "total_records")
+
+
+def _zip_member_name(info: zipfile.ZipInfo) -> str:
+    """ZIP 항목 이름. UTF-8 플래그 없이 저장된 이름(윈도우 탐색기 압축)은 cp949 로 다시 읽는다."""
+    if info.flag_bits & 0x800:
+        return info.filename
+    try:
+        return info.filename.encode("cp437").decode("cp949")
+    except (UnicodeEncodeError, UnicodeDecodeError):
+        return info.filename
+
+
+def _extract_zip(zip_path: str, zip_name: str, dest_dir: str, files: list, errors: list,
+                 max_files: int, max_bytes: int) -> None:
+    """ZIP 안의 엑셀 파일을 하나씩 dest_dir 에 풀어 files 에 추가한다.
+
+    항목 경로는 쓰지 않고 임의 파일명으로 저장하므로 '../' 같은 경로로 밖에 쓰지 않는다.
+    """
+    with zipfile.ZipFile(zip_path) as zf:
+        for info in zf.infolist():
+            if info.is_dir():
+                continue
+            member = _zip_member_name(info).replace("\\", "/")
+            base = member.rsplit("/", 1)[-1]
+            ext = os.path.splitext(base)[1].lower()
+            if ext not in _EXCEL_EXTENSIONS or base.startswith((".", "~$")) or "__MACOSX/" in member:
+                continue
+            if info.file_size > max_bytes:
+                errors.append({"label": f"{zip_name}/{base}", "errors": ["파일이 너무 큽니다."]})
+                continue
+            if len(files) >= max_files:
+                errors.append({"label": zip_name, "errors": [f"파일은 최대 {max_files}개까지 업로드할 수 있습니다."]})
+                return
+            path = os.path.join(dest_dir, f"{uuid.uuid4().hex[:12]}{ext}")
+            with zf.open(info) as src, open(path, "wb") as dst:
+                shutil.copyfileobj(src, dst)
+            files.append((path, base))
+
+
+def stage_uploads(uploads, dest_dir: str, max_files: int = 100,
+                  max_bytes: int = 50 * 1024 * 1024) -> tuple:
+    """업로드 파일(엑셀 또는 ZIP)을 dest_dir 에 디스크로 저장한다.
+
+    Args:
+        uploads: FileStorage 목록
+        max_files: 엑셀 파일 최대 개수 (ZIP 안의 파일 포함)
+        max_bytes: ZIP 안의 파일 하나당 최대 크기 (압축 해제 기준)
+
+    Returns:
+        ([(저장 경로, 원본 파일명), ...], [{"label": 파일명, "errors": [...]}, ...])
+    """
+    files, errors = [], []
+    for upload in uploads:
+        if not upload or not upload.filename:
+            continue
+        name = os.path.basename(upload.filename.replace("\\", "/"))
+        ext = os.path.splitext(name)[1].lower()
+        if ext not in _EXCEL_EXTENSIONS + (".zip",):
+            errors.append({"label": name, "errors": ["엑셀(.xlsx, .xls) 또는 ZIP 파일만 업로드 가능합니다."]})
+            continue
+        if ext != ".zip" and len(files) >= max_files:
+            errors.append({"label": name, "errors": [f"파일은 최대 {max_files}개까지 업로드할 수 있습니다."]})
+            break
+        path = os.path.join(dest_dir, f"{uuid.uuid4().hex[:12]}{ext}")
+        upload.save(path)
+        if ext != ".zip":
+            files.append((path, name))
+            continue
+        try:
+            _extract_zip(path, name, dest_dir, files, errors, max_files, max_bytes)
+        except zipfile.BadZipFile:
+            errors.append({"label": name, "errors": ["ZIP 파일을 열 수 없습니다."]})
+        finally:
+            os.remove(path)
+    return files, errors
+
+
+def label_sets(sets: list, filename: str, file_hash: str | None = None) -> list:
+    """한 파일에서 나온 시트들에 파일명·표시 이름·시트 번호를 붙인다."""
+    for i, parsed in enumerate(sets):
+        parsed["filename"] = filename
+        parsed["label"] = f"{filename} [{parsed['sheet']}]" if len(sets) > 1 else filename
+        parsed["sheet_index"] = i
+        if file_hash:
+            parsed["file_hash"] = file_hash
+    return sets
+
+
+def _init_parse_worker():
+    """파싱 워커 초기화: 스케줄러·작업 확인 스레드 비활성화, fork 로 복제된 커넥션 버림."""
+    from flask import has_app_context
+
+    os.environ["SCHEDULER_DISABLED"] = "1"
+    os.environ["JOB_RUNNER_DISABLED"] = "1"
+    if has_app_context():
+        # 부모 커넥션은 닫지 않고 버린다 (부모가 계속 사용)
+        db.engine.dispose(close=False)
+
+
+def _parse_file(path: str, filename: str, file_hash: str | None = None) -> tuple:
+    """워커에서 실행: 파일 하나의 모든 근태 시트를 파싱한다 (DB 를 쓰지 않음)."""
+    try:
+        sets = parse_attendance_workbook(path, filename)
+    except Exception as exc:
+        return filename, [], f"엑셀 파싱 실패: {exc}"
+    return filename, label_sets(sets, filename, file_hash), None
+
+
+def parse_attendance_files(files: list, workers: int | None = None) -> tuple:
+    """여러 엑셀 파일을 프로세스 풀에서 병렬로 파싱한다.
+
+    Args:
+        files: [(경로, 원본 파일명[, 내용 해시]), ...] — stage_uploads() 반환값
+        workers: 프로세스 수 (None=CPU 수, 1 이하면 현재 프로세스에서 순차 실행)
+
+    Returns:
+        (파싱 성공 시트 목록 (파일 순서), [{"label": ..., "errors": [...]}] 실패 목록)
+    """
+    workers = workers or os.cpu_count() or 1
+    if workers <= 1 or len(files) <= 1:
+        outcomes = [_parse_file(*item) for item in files]
+    else:
+        method = "fork" if "fork" in multiprocessing.get_all_start_methods() else "spawn"
+        with ProcessPoolExecutor(
+            max_workers=min(workers, len(files)),
+            mp_context=multiprocessing.get_context(method),
+            initializer=_init_parse_worker,
+        ) as pool:
+            outcomes = list(pool.map(_parse_file, *zip(*files)))
+
+    sets, failures = [], []
+    for filename, file_sets, error in outcomes:
+        if error:
+            logger.error("엑셀 파싱 오류 (%s): %s", filename, error)
+            failures.append({"label": filename, "errors": [error]})
+            continue
+        for parsed in file_sets:
+            if parsed["errors"]:
+                failures.append({"label": parsed["label"], "errors": parsed["errors"]})
+            else:
+                sets.append(parsed)
+    return sets, failures
+
+
+def _batch_summary(parsed_list: list) -> dict:
+    months = sorted({parsed["month_str"] for parsed in parsed_list})
+    sites = list(dict.fromkeys(parsed["site_name"] for parsed in parsed_list if parsed["site_name"]))
+    site_name = sites[0] if sites else ""
+    if len(sites) > 1:
+        site_name += f" 외 {len(sites) - 1}곳"
+    return {
+        "month_str": ", ".join(months),
+        "site_name": site_name,
+        "employee_count": sum(len(parsed["employees"]) for parsed in parsed_list),
+    }
+
+
+def merge_import_results(parsed_list: list, subs: list) -> dict:
+    """시트별 import_attendance_to_db() 결과를 하나로 합친다.
+
+    Returns:
+        import_attendance_to_db() 와 같은 합계 + month_str/site_name/employee_count
+        + "files": [시트별 결과 + label/month_str/site_name/employee_count, ...]
+    """
+    result = {
+        **{key: 0 for key in _BATCH_COUNT_KEYS},
+        "new_employees": [],
+        "matched_employees": [],
+        "errors": [],
+        "warnings": [],
+        "files": [],
+        **_batch_summary(parsed_list),
+    }
+    multi = len(parsed_list) > 1
+    new_names, matched_ids = set(), set()
+    for parsed, sub in zip(parsed_list, subs):
+        label = parsed.get("label") or parsed.get("filename") or parsed["site_name"]
+        prefix = f"{label}: " if multi else ""
+        for key in _BATCH_COUNT_KEYS:
+            result[key] += sub[key]
+        for emp in sub["new_employees"]:
+            if emp["name"] not in new_names:
+                new_names.add(emp["name"])
+                result["new_employees"].append(emp)
+        for emp in sub["matched_employees"]:
+            if emp["id"] not in matched_ids:
+                matched_ids.add(emp["id"])
+                result["matched_employees"].append(emp)
+        result["errors"].extend(prefix + err for err in sub["errors"])
+        new_warning = _new_employee_warning(sub["new_employees"])
+        result["warnings"].extend(prefix + warn for warn in sub["warnings"] if warn != new_warning)
+        result["files"].append({
+            **sub,
+            "label": label,
+            "month_str": parsed["month_str"],
+            "site_name": parsed["site_name"],
+            "employee_count": len(parsed["employees"]),
+        })
+
+    if result["new_employees"]:
+        result["warnings"].append(_new_employee_warning(result["new_employees"]))
+    return result
+
+
+def import_attendance_batch(parsed_list: list, dry_run: bool = False) -> dict:
+    """여러 파일·시트의 파싱 결과를 한 트랜잭션으로 반영한다.
+
+    import_attendance_to_db() 를 시트마다 commit 없이 실행한 뒤 한 번에 commit 하고,
+    하나라도 실패하면 전체를 rollback 한다. 앞 시트에서 자동 등록한 직원은
+    같은 세션에 flush 되어 있으므로 뒤 시트에서는 기존 직원으로 매칭된다.
+
+    Returns:
+        merge_import_results() 결과 + "committed" (실제 저장 여부)
+    """
+    subs, failure = [], None
+    try:
+        for parsed in parsed_list:
+            subs.append(import_attendance_to_db(parsed, dry_run=dry_run, commit=False))
+        if not dry_run:
+            db.session.commit()
+    except Exception as exc:
+        db.session.rollback()
+        logger.error("근태 일괄 import 커밋 실패: %s", exc)
+        failure = f"DB 저장 실패 (전체 취소): {exc}"
+
+    result = merge_import_results(parsed_list[:len(subs)], subs)
+    if failure:
+        result["errors"].append(failure)
+    result["committed"] = not dry_run and failure is None
+    return result
+
+
+# ── 미리보기 결과 임시 보관 (미리보기 → 실행) ──
+
+def _date_ordinals(values) -> np.ndarray:
+    return np.array([d.toordinal() if d else 0 for d in values], dtype=np.int64)
+
+
+def _ordinal_dates(values) -> list:
+    return [date.fromordinal(v) if v else None for v in values.tolist()]
+
+
+_META_KEYS = (
+    "year", "month", "month_str", "site_name", "sheet", "filename", "label", "errors",
+    "sheet_index", "file_hash", "history_id",
+)
+
+
+def _pack_arrays(parsed: dict, prefix: str = "") -> dict:
+    employees = parsed.get("employees", [])
+    n = len(employees)
+    meta = {key: parsed.get(key) for key in _META_KEYS if key in parsed}
+    arrays = {
+        "meta": np.array(json.dumps(meta, ensure_ascii=False)),
+        "dates": _date_ordinals(parsed.get("dates") or [None] * _DAY_COLUMNS),
+        "names": np.array([e.name for e in employees], dtype=str),
+        "hire": _date_ordinals(e.hire_date for e in employees),
+        "resign": _date_ordinals(e.resign_date for e in employees),
+        "wage": np.array([e.hourly_wage for e in employees], dtype=np.float64),
+        "hours": (np.stack([e.hours for e in employees]) if n
+                  else np.zeros((0, len(CATEGORIES), _DAY_COLUMNS))),
+        "annual": np.array([e.annual for e in employees], dtype=np.int64),
+        "summary": np.stack([e.summary for e in employees]) if n else np.zeros((0, len(CATEGORIES))),
+    }
+    return {prefix + key: value for key, value in arrays.items()}
+
+
+def _unpack_arrays(data, prefix: str = "") -> dict:
+    parsed = json.loads(str(data[prefix + "meta"]))
+    parsed["dates"] = _ordinal_dates(data[prefix + "dates"])
+    hire, resign = _ordinal_dates(data[prefix + "hire"]), _ordinal_dates(data[prefix + "resign"])
+    hours, summary, wage = data[prefix + "hours"], data[prefix + "summary"], data[prefix + "wage"]
+    annual = data[prefix + "annual"]
+    parsed["employees"] = [
+        ParsedEmployee(
+            name=str(name),
+            hire_date=hire[i],
+            resign_date=resign[i],
+            hourly_wage=float(wage[i]),
+            hours=hours[i],
+            annual=int(annual[i]),
+            summary=summary[i],
         )
+        for i, name in enumerate(data[prefix + "names"].tolist())
+    ]
+    return parsed
+
+
+def pack_parsed(parsed) -> bytes:
+    """파싱 결과를 npz 바이너리로 직렬화한다 (직원 수 × 고정 크기 배열).
+
+    여러 파일·시트의 결과(list)는 시트마다 's{번호}_' 접두사를 붙여 한 파일에 담는다.
+    """
+    buf = io.BytesIO()
+    if isinstance(parsed, list):
+        arrays = {"sets": np.array(len(parsed))}
+        for i, item in enumerate(parsed):
+            arrays.update(_pack_arrays(item, f"s{i}_"))
+        np.savez(buf, **arrays)
+    else:
+        np.savez(buf, **_pack_arrays(parsed))
+    return buf.getvalue()
+
+
+def unpack_parsed(blob: bytes):
+    """pack_parsed() 결과를 파싱 결과 dict (여러 시트면 list) 로 복원한다."""
+    with np.load(io.BytesIO(blob), allow_pickle=False) as data:
+        if "sets" in data.files:
+            return [_unpack_arrays(data, f"s{i}_") for i in range(int(data["sets"]))]
+        return _unpack_arrays(data)
+
+
+def _pending_path(import_id: str) -> str:
+    if not re.fullmatch(r"[0-9a-f]{12}", import_id or ""):
+        raise ValueError("invalid import id")
+    return os.path.join(_PENDING_DIR, f"import_{import_id}.npz")
+
+
+def save_pending_import(parsed) -> str:
+    """파싱 결과(dict 또는 여러 시트의 list)를 임시 파일에 저장하고 import_id 를 반환한다."""
+    import_id = uuid.uuid4().hex[:12]
+    os.makedirs(_PENDING_DIR, exist_ok=True)
+    with open(_pending_path(import_id), "wb") as f:
+        f.write(pack_parsed(parsed))
+    return import_id
+
+
+def pending_import_exists(import_id: str) -> bool:
+    try:
+        return os.path.exists(_pending_path(import_id))
+    except ValueError:
+        return False
+
+
+def execute_pending_import(import_id: str) -> dict:
+    """보관된 파싱 결과를 DB 에 반영하고 임시 파일을 지운다.
+
+    Raises:
+        ValueError: 보관 파일이 없거나 복원 실패
+    """
+    path = _pending_path(import_id)
+    try:
+        with open(path, "rb") as f:
+            parsed = unpack_parsed(f.read())
+        os.remove(path)  # 사용 후 삭제
+    except (OSError, ValueError, KeyError, zipfile.BadZipFile) as exc:
+        raise ValueError(f"업로드 데이터 복원 실패: {exc}") from exc
+
+    if isinstance(parsed, list):
+        from services.import_history_service import record_execution
+
+        result = import_attendance_batch(parsed, dry_run=False)
+        record_execution(parsed, result)
+        return result
 
+    result = import_attendance_to_db(parsed, dry_run=False)
+    result["month_str"] = parsed["month_str"]
+    result["site_name"] = parsed["site_name"]
+    result["employee_count"] = len(parsed["employees"])
     return result
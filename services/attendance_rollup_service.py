@@ -0,0 +1,350 @@
+"""직원 × 월 근태 집계(attendance_monthly) 유지 서비스.
+
+급여 계산, 대시보드, 만근 판정처럼 월 단위로 근태를 합산하는 곳이 매번
+attendance_records 를 훑지 않도록 (직원, 월)마다 합계·출근일 비트맵·근무 유형별
+건수를 미리 쌓아 둔다.
+
+- ORM 추가/수정/삭제: after_flush 에서 영향받은 (직원, 월)을 모아 둔다 (근무일 변경 시 이전 월 포함)
+- Query.update()/delete(): 실행 전에 대상 (직원, 월)을 조회해 모아 둔다
+- Core 일괄 쓰기(엑셀 import, 근무시간 재계산): touch_rollups() 로 직접 표시
+- commit 직전(before_commit)에 모인 쌍만 원본에서 다시 집계해 같은 트랜잭션으로 교체
+  (관리자 근태 목록 통계 캐시도 함께 비우고, 해당 월의 월별 지표를 재계산 대상으로 표시)
+
+불변식: commit 된 시점에 attendance_monthly 의 (직원, 월) 행은 그 쌍의
+attendance_records 를 다시 집계한 값과 같다. 급여 계산·대시보드는 집계만 읽고 원본과
+대조하지 않으므로, 세션을 거치지 않는 쓰기는 같은 트랜잭션에서 touch_rollups() 를
+불러야 한다. DB 를 직접 수정한 뒤에는 scripts/rebuild_attendance_rollup.py 로
+재구성하거나 --check 로 어긋난 쌍만 다시 집계한다.
+
+rebuild_rollups() 는 전체(또는 특정 월)를 원본에서 다시 만들고,
+reconcile_rollups() 는 한 달의 건수·총시간을 원본과 대조해 어긋난 쌍만 고친다.
+"""
+import json
+import logging
+from collections import Counter, defaultdict
+from datetime import date, datetime
+
+from sqlalchemy import event, func, select
+
+from models import AttendanceMonthly, AttendanceRecord, db
+from services.attendance_service import clear_list_stats_cache
+from services.monthly_metrics_service import touch_metrics
+from services.payroll_dirty_service import _attr_values, _month_of
+from services.payslip_service import ATTENDED_WORK_TYPES, _month_range
+
+logger = logging.getLogger(__name__)
+
+_PENDING_KEY = "attendance_rollup_pairs"
+_ID_CHUNK = 500
+_INSERT_CHUNK = 1000
+_registered = False
+
+# 집계에 쓰는 원본 컬럼 (fold 순서와 동일)
+_SOURCE_COLUMNS = (
+    AttendanceRecord.employee_id,
+    AttendanceRecord.work_date,
+    AttendanceRecord.work_type,
+    AttendanceRecord.emp_name,
+    AttendanceRecord.dept,
+    AttendanceRecord.total_work_hours,
+    AttendanceRecord.overtime_hours,
+    AttendanceRecord.night_hours,
+    AttendanceRecord.holiday_work_hours,
+    AttendanceRecord.site_id,
+)
+
+
+class _Acc:
+    __slots__ = (
+        "emp_name", "dept", "site_id", "records", "bitmap", "total", "ot", "night", "holiday", "types",
+    )
+
+    def __init__(self):
+        self.emp_name = self.dept = self.site_id = None
+        self.records = self.bitmap = 0
+        self.total = self.ot = self.night = self.holiday = 0.0
+        self.types = Counter()
+
+
+def _fold(rows, accs=None):
+    """원본 행을 (employee_id, month) 별 누적값으로 접는다."""
+    accs = {} if accs is None else accs
+    for emp_id, work_date, work_type, emp_name, dept, total, ot, night, holiday, site_id in rows:
+        key = (emp_id, _month_of(work_date))
+        acc = accs.get(key)
+        if acc is None:
+            acc = accs[key] = _Acc()
+        # 급여 집계의 MAX(emp_name)/MAX(dept) 와 같은 값
+        if emp_name is not None and (acc.emp_name is None or emp_name > acc.emp_name):
+            acc.emp_name = emp_name
+        if dept is not None and (acc.dept is None or dept > acc.dept):
+            acc.dept = dept
+        if site_id is not None and (acc.site_id is None or site_id > acc.site_id):
+            acc.site_id = site_id
+        acc.records += 1
+        acc.total += total or 0.0
+        acc.ot += ot or 0.0
+        acc.night += night or 0.0
+        acc.holiday += holiday or 0.0
+        acc.types[work_type] += 1
+        if work_type in ATTENDED_WORK_TYPES:
+            acc.bitmap |= 1 << (work_date.day - 1)
+    return accs
+
+
+def _rows(accs, now):
+    return [
+        {
+            "employee_id": emp_id,
+            "month": month,
+            "emp_name": acc.emp_name or "",
+            "dept": acc.dept or "",
+            "site_id": acc.site_id,
+            "record_count": acc.records,
+            "attended_days": bin(acc.bitmap).count("1"),
+            "attended_bitmap": acc.bitmap,
+            "total_hours": acc.total,
+            "overtime_hours": acc.ot,
+            "night_hours": acc.night,
+            "holiday_hours": acc.holiday,
+            "work_type_counts": json.dumps(dict(sorted(acc.types.items())), ensure_ascii=False),
+            "updated_at": now,
+        }
+        for (emp_id, month), acc in accs.items()
+    ]
+
+
+def _insert(session, rows):
+    table = AttendanceMonthly.__table__
+    for i in range(0, len(rows), _INSERT_CHUNK):
+        session.execute(table.insert(), rows[i:i + _INSERT_CHUNK])
+
+
+def refresh_rollups(session, pairs):
+    """(employee_id, month) 쌍의 집계 행을 원본에서 다시 만든다 (commit 은 호출자).
+
+    Returns:
+        int: 다시 쓴 집계 행 수 (근태가 모두 지워진 쌍은 행이 삭제됨)
+    """
+    by_month = defaultdict(set)
+    for emp_id, month in pairs:
+        if emp_id and month:
+            by_month[month].add(emp_id)
+
+    table = AttendanceMonthly.__table__
+    written = 0
+    now = datetime.now()
+    for month, emp_ids in by_month.items():
+        start_date, end_date = _month_range(month)
+        ids = sorted(emp_ids)
+        for i in range(0, len(ids), _ID_CHUNK):
+            chunk = ids[i:i + _ID_CHUNK]
+            accs = _fold(session.execute(
+                select(*_SOURCE_COLUMNS).where(
+                    AttendanceRecord.employee_id.in_(chunk),
+                    AttendanceRecord.work_date >= start_date,
+                    AttendanceRecord.work_date < end_date,
+                )
+            ))
+            session.execute(
+                table.delete().where(table.c.month == month, table.c.employee_id.in_(chunk))
+            )
+            rows = _rows(accs, now)
+            if rows:
+                _insert(session, rows)
+            written += len(rows)
+    touch_metrics(by_month, session)
+    return written
+
+
+def rebuild_rollups(month=None, batch_size=10000):
+    """집계 테이블을 원본에서 전부(또는 한 달만) 다시 만들고 commit 한다.
+
+    Returns:
+        dict {"records": 원본 행 수, "rows": 집계 행 수}
+    """
+    table = AttendanceMonthly.__table__
+    stmt = select(*_SOURCE_COLUMNS)
+    delete = table.delete()
+    if month:
+        start_date, end_date = _month_range(month)
+        stmt = stmt.where(AttendanceRecord.work_date >= start_date, AttendanceRecord.work_date < end_date)
+        delete = delete.where(table.c.month == month)
+
+    accs = {}
+    records = 0
+    result = db.session.execute(stmt.execution_options(yield_per=batch_size))
+    for partition in result.partitions():
+        records += len(partition)
+        _fold(partition, accs)
+
+    db.session.execute(delete)
+    rows = _rows(accs, datetime.now())
+    _insert(db.session, rows)
+    db.session.info.pop(_PENDING_KEY, None)
+    touch_metrics({m for _, m in accs} | ({month} if month else set()), db.session)
+    db.session.commit()
+    logger.info("[근태 집계 재구성] %s: 원본 %d건 → 집계 %d행", month or "전체", records, len(rows))
+    return {"records": records, "rows": len(rows)}
+
+
+def reconcile_rollups(month):
+    """한 달의 집계 행을 원본 건수·총시간과 대조해 어긋난 (직원, 월)만 다시 집계하고 commit 한다.
+
+    DB 를 직접 수정한 뒤 관리자가 실행하는 점검용이다 (급여 계산 경로에서는 부르지 않는다).
+
+    Returns:
+        dict {"checked": 대조한 직원 수, "stale": 다시 집계한 쌍 수}
+    """
+    session = db.session
+    start_date, end_date = _month_range(month)
+    source = {
+        emp_id: (count, total)
+        for emp_id, count, total in session.execute(
+            select(
+                AttendanceRecord.employee_id,
+                func.count(AttendanceRecord.id),
+                func.coalesce(func.sum(AttendanceRecord.total_work_hours), 0),
+            )
+            .where(AttendanceRecord.work_date >= start_date, AttendanceRecord.work_date < end_date)
+            .group_by(AttendanceRecord.employee_id)
+        )
+    }
+    stored = {
+        emp_id: (count, total)
+        for emp_id, count, total in session.execute(
+            select(
+                AttendanceMonthly.employee_id, AttendanceMonthly.record_count, AttendanceMonthly.total_hours,
+            ).where(AttendanceMonthly.month == month)
+        )
+    }
+
+    def _same(a, b):
+        return a is not None and b is not None and a[0] == b[0] and abs((a[1] or 0) - (b[1] or 0)) < 1e-6
+
+    checked = source.keys() | stored.keys()
+    stale = {(emp_id, month) for emp_id in checked if not _same(source.get(emp_id), stored.get(emp_id))}
+    if stale:
+        refresh_rollups(session, stale)
+        session.commit()
+        clear_list_stats_cache()
+    logger.info("[근태 집계 점검] %s: %d명 중 %d명 재집계", month, len(checked), len(stale))
+    return {"checked": len(checked), "stale": len(stale)}
+
+
+# ── 변경 추적 ──
+
+def touch_rollups(pairs, session=None):
+    """Core 일괄 쓰기 후 (employee_id, month) 쌍을 재집계 대상으로 표시한다.
+
+    표시된 쌍은 현재 트랜잭션의 commit 직전에 다시 집계된다.
+    """
+    session = session or db.session
+    session.info.setdefault(_PENDING_KEY, set()).update(
+        (emp_id, month) for emp_id, month in pairs if emp_id and month
+    )
+
+
+def _collect_pairs(session):
+    pairs = set()
+    changed = list(session.new) + list(session.deleted) + [
+        obj for obj in session.dirty if session.is_modified(obj, include_collections=False)
+    ]
+    for obj in changed:
+        if not isinstance(obj, AttendanceRecord):
+            continue
+        for emp_id in _attr_values(obj, "employee_id"):
+            for work_date in _attr_values(obj, "work_date"):
+                if emp_id and work_date:
+                    pairs.add((emp_id, _month_of(work_date)))
+    return pairs
+
+
+def _after_flush(session, flush_context):
+    pairs = _collect_pairs(session)
+    if pairs:
+        touch_rollups(pairs, session)
+
+
+def _on_orm_execute(orm_execute_state):
+    """Query.update()/delete() 대상 (직원, 월)을 실행 전에 조회해 둔다."""
+    if not (orm_execute_state.is_update or orm_execute_state.is_delete):
+        return
+    if AttendanceRecord not in {m.class_ for m in orm_execute_state.all_mappers}:
+        return
+    stmt = select(AttendanceRecord.employee_id, AttendanceRecord.work_date).distinct()
+    whereclause = orm_execute_state.statement.whereclause
+    if whereclause is not None:
+        stmt = stmt.where(whereclause)
+    session = orm_execute_state.session
+    touch_rollups(
+        {(emp_id, _month_of(work_date)) for emp_id, work_date in session.execute(stmt).all()},
+        session,
+    )
+
+
+def _before_commit(session):
+    # commit 이 곧 할 flush 를 먼저 실행해 남은 변경의 (직원, 월)도 after_flush 에서 모은다
+    if session.new or session.dirty or session.deleted:
+        session.flush()
+    pairs = session.info.pop(_PENDING_KEY, None)
+    if pairs:
+        refresh_rollups(session, pairs)
+        clear_list_stats_cache()
+
+
+def _after_rollback(session):
+    session.info.pop(_PENDING_KEY, None)
+
+
+def init_rollup_tracking():
+    """세션 이벤트 리스너를 등록한다 (프로세스당 1회)."""
+    global _registered
+    if _registered:
+        return
+    event.listen(db.session, "after_flush", _after_flush)
+    event.listen(db.session, "do_orm_execute", _on_orm_execute)
+    event.listen(db.session, "before_commit", _before_commit)
+    event.listen(db.session, "after_rollback", _after_rollback)
+    _registered = True
+
+
+# ── 조회 ──
+
+def bitmap_dates(month, bitmap):
+    """출근일 비트맵 → date 집합."""
+    year, mon = (int(part) for part in month.split("-"))
+    return {date(year, mon, bit + 1) for bit in range(31) if bitmap >> bit & 1}
+
+
+def work_type_counts(row):
+    """집계 행의 근무 유형별 건수 dict."""
+    return json.loads(row.work_type_counts or "{}") if row is not None else {}
+
+
+def get_rollup(employee_id, month):
+    return AttendanceMonthly.query.filter_by(employee_id=employee_id, month=month).first()
+
+
+def month_totals(month):
+    """월 전체 근태 합계 (직원 수만큼의 집계 행만 읽음).
+
+    Returns:
+        dict {records, total_hours, ot_hours, night_hours, holiday_hours, workers}
+    """
+    row = db.session.query(
+        func.coalesce(func.sum(AttendanceMonthly.record_count), 0),
+        func.coalesce(func.sum(AttendanceMonthly.total_hours), 0),
+        func.coalesce(func.sum(AttendanceMonthly.overtime_hours), 0),
+        func.coalesce(func.sum(AttendanceMonthly.night_hours), 0),
+        func.coalesce(func.sum(AttendanceMonthly.holiday_hours), 0),
+        func.count(AttendanceMonthly.id),
+    ).filter(AttendanceMonthly.month == month).one()
+    return {
+        "records": int(row[0] or 0),
+        "total_hours": float(row[1] or 0),
+        "ot_hours": float(row[2] or 0),
+        "night_hours": float(row[3] or 0),
+        "holiday_hours": float(row[4] or 0),
+        "workers": int(row[5] or 0),
+    }
@@ -1,10 +1,15 @@
 """근태 관련 비즈니스 로직 (근무시간 계산, 날짜 유형 판별 등)"""
 import re
+import threading
+import time
+from collections import OrderedDict
 from datetime import datetime
 
+import numpy as np
 from flask import current_app
+from sqlalchemy import bindparam
 
-from models import OperationCalendarDay
+from services import calendar_service
 
 ALLOWED_WORK_TYPES = {"normal", "night", "annual", "absent", "holiday", "early"}
 TIME_REQUIRED_TYPES = {"normal", "night"}
@@ -63,8 +68,8 @@ def calc_work_hours(clock_in: str, clock_out: str, cfg, work_date=None, calendar
             if work_date.weekday() >= 5:
                 is_holiday_work = True
 
-            holidays_2026 = cfg.get("PUBLIC_HOLIDAYS_2026", [])
-            if work_date.strftime("%Y-%m-%d") in holidays_2026:
+            holidays = calendar_service.public_holidays(work_date.year, cfg)
+            if work_date.strftime("%Y-%m-%d") in holidays:
                 is_holiday_work = True
 
     std_hours = cfg.get("STANDARD_WORK_HOURS", 8.0)
@@ -76,8 +81,8 @@ def calc_work_hours(clock_in: str, clock_out: str, cfg, work_date=None, calendar
     elif calendar_day_type not in CALENDAR_DAY_TYPES and work_date:
         if isinstance(work_date, str):
             work_date = _parse_date(work_date)
-        holidays_2026 = cfg.get("PUBLIC_HOLIDAYS_2026", [])
-        if work_date.weekday() == 6 or work_date.strftime("%Y-%m-%d") in holidays_2026:
+        holidays = calendar_service.public_holidays(work_date.year, cfg)
+        if work_date.weekday() == 6 or work_date.strftime("%Y-%m-%d") in holidays:
             is_paid_holiday = True
 
     if is_holiday_work:
@@ -111,6 +116,236 @@ def calc_work_hours(clock_in: str, clock_out: str, cfg, work_date=None, calendar
     return total_hours, ot_hours, night_hours, holiday_work_hours
 
 
+def hhmm_to_minutes(values):
+    """'HH:MM' 문자열 목록을 자정 기준 분(int32) 배열로 변환한다. 형식 오류/빈 값은 -1."""
+    out = np.full(len(values), -1, dtype=np.int32)
+    for i, value in enumerate(values):
+        if value and _validate_hhmm(value):
+            out[i] = int(value[:2]) * 60 + int(value[3:])
+    return out
+
+
+def _minutes_in_range_batch(start_min, end_min, range_start_min, range_end_min):
+    """_minutes_in_range 의 배열 버전 (start/end 는 배열, 구간 경계는 스칼라)."""
+    if range_start_min >= range_end_min:
+        part1 = _minutes_in_range_batch(start_min, end_min, range_start_min, 24 * 60)
+        part2 = _minutes_in_range_batch(start_min, end_min, 0, range_end_min)
+        return part1 + part2
+
+    overlap_start = np.maximum(start_min, range_start_min)
+    overlap_end = np.minimum(end_min, range_end_min)
+    return np.maximum(0, overlap_end - overlap_start)
+
+
+def calc_work_hours_batch(in_min, out_min, day_types, cfg, break_hours=None, std_hours=None):
+    """calc_work_hours 의 벡터화 버전 — 여러 근태를 한 번에 계산한다.
+
+    Args:
+        in_min, out_min: 출근/퇴근 시각 (자정 기준 분) 배열
+        day_types: calendar_service day-type 코드 배열
+            (WORKDAY/PAID_LEAVE/UNPAID_LEAVE, -1 = 미지정 → 평일 취급)
+        break_hours, std_hours: 행별 휴게/소정근로시간 (스칼라 또는 배열, None 이면 cfg 값)
+
+    Returns:
+        (total_hours, ot_hours, night_hours, holiday_work_hours) float64 배열
+        — 같은 입력의 calc_work_hours(..., calendar_day_type=...) 결과와 동일
+    """
+    in_min = np.asarray(in_min, dtype=np.int64)
+    out_min = np.asarray(out_min, dtype=np.int64)
+    day_types = np.asarray(day_types)
+    if break_hours is None:
+        break_hours = cfg.get("BREAK_HOURS", 1.0)
+    if std_hours is None:
+        std_hours = cfg.get("STANDARD_WORK_HOURS", 8.0)
+    std_hours = np.asarray(std_hours, dtype=np.float64)
+    # int(BREAK_HOURS * 60) 과 같은 절사
+    break_min = np.trunc(np.asarray(break_hours, dtype=np.float64) * 60).astype(np.int64)
+
+    overnight = out_min <= in_min
+    raw_minutes = np.where(overnight, 24 * 60 - in_min + out_min, out_min - in_min)
+    worked_min = np.maximum(0, raw_minutes - break_min)
+    total = np.round(worked_min / 60, 2)
+
+    is_holiday_work = (day_types == calendar_service.PAID_LEAVE) | (day_types == calendar_service.UNPAID_LEAVE)
+    is_paid = day_types == calendar_service.PAID_LEAVE
+    over_std = np.round(np.maximum(0, total - std_hours), 2)
+    ot = np.where(is_holiday_work & ~is_paid, 0.0, over_std)
+    holiday = np.where(
+        is_holiday_work,
+        np.where(is_paid, np.round(np.minimum(total, std_hours), 2), total),
+        0.0,
+    )
+
+    night_start = cfg.get("NIGHT_START", 22) * 60
+    night_end = cfg.get("NIGHT_END", 6) * 60
+    night_overnight = (
+        _minutes_in_range_batch(in_min, 24 * 60, night_start, 24 * 60)
+        + _minutes_in_range_batch(0, out_min, 0, night_end)
+    )
+    night_same_day = _minutes_in_range_batch(in_min, out_min, night_start, night_end)
+    night_total = np.where(overnight, night_overnight, night_same_day)
+
+    is_night_shift = (in_min >= 15 * 60) | (in_min < night_end)
+    night_calc = np.maximum(0, night_total - np.where(is_night_shift, break_min, 0))
+    night = np.round(night_calc / 60, 2)
+    return total, ot, night, holiday
+
+
+def recompute_work_hours(start_date, end_date, dry_run=False, batch_size=5000):
+    """기간 내 근태의 근무시간을 현재 설정/캘린더로 일괄 재계산한다.
+
+    출퇴근 시각이 있는 근무 유형(TIME_REQUIRED_TYPES)만 대상이며, 값이 달라진
+    레코드만 갱신하고 해당 (직원, 월)을 급여 재계산 대상으로 표시한다 (commit 은 호출자).
+
+    Returns:
+        dict {scanned, changed, months}
+    """
+    from models import AttendanceRecord, db
+    from services.attendance_rollup_service import touch_rollups
+    from services.payroll_dirty_service import mark_stale
+
+    rows = (
+        db.session.query(
+            AttendanceRecord.id,
+            AttendanceRecord.employee_id,
+            AttendanceRecord.work_date,
+            AttendanceRecord.clock_in,
+            AttendanceRecord.clock_out,
+            AttendanceRecord.total_work_hours,
+            AttendanceRecord.overtime_hours,
+            AttendanceRecord.night_hours,
+            AttendanceRecord.holiday_work_hours,
+        )
+        .filter(
+            AttendanceRecord.work_date >= start_date,
+            AttendanceRecord.work_date <= end_date,
+            AttendanceRecord.work_type.in_(TIME_REQUIRED_TYPES),
+        )
+        .order_by(AttendanceRecord.id.asc())
+        .all()
+    )
+    result = {"scanned": 0, "changed": 0, "months": []}
+    if not rows:
+        return result
+
+    in_min = hhmm_to_minutes([r.clock_in for r in rows])
+    out_min = hhmm_to_minutes([r.clock_out for r in rows])
+    valid = (in_min >= 0) & (out_min >= 0)
+    rows = [r for r, ok in zip(rows, valid.tolist()) if ok]
+    in_min, out_min = in_min[valid], out_min[valid]
+    result["scanned"] = len(rows)
+    if not rows:
+        return result
+
+    day_types = calendar_service.day_type_codes([r.work_date for r in rows])
+    computed = np.column_stack(calc_work_hours_batch(in_min, out_min, day_types, _get_cfg()))
+    stored = np.array(
+        [[r.total_work_hours or 0.0, r.overtime_hours or 0.0, r.night_hours or 0.0,
+          r.holiday_work_hours or 0.0] for r in rows],
+        dtype=np.float64,
+    )
+    changed = np.flatnonzero(np.any(np.abs(computed - stored) > 0.005, axis=1))
+    result["changed"] = int(changed.size)
+
+    pairs = {(rows[i].employee_id, rows[i].work_date.strftime("%Y-%m")) for i in changed.tolist()}
+    result["months"] = sorted({month for _emp, month in pairs})
+    if dry_run or not changed.size:
+        return result
+
+    # ORM bulk update 는 WHERE 없는 일괄 수정으로 보여 전체 근태를 stale 로 표시하므로 Core 로 실행
+    table = AttendanceRecord.__table__
+    stmt = (
+        table.update()
+        .where(table.c.id == bindparam("b_id"))
+        .values(
+            total_work_hours=bindparam("b_total"),
+            overtime_hours=bindparam("b_ot"),
+            night_hours=bindparam("b_night"),
+            holiday_work_hours=bindparam("b_holiday"),
+            updated_at=datetime.now(),
+        )
+    )
+    params = [
+        {
+            "b_id": rows[i].id,
+            "b_total": float(computed[i, 0]),
+            "b_ot": float(computed[i, 1]),
+            "b_night": float(computed[i, 2]),
+            "b_holiday": float(computed[i, 3]),
+        }
+        for i in changed.tolist()
+    ]
+    for offset in range(0, len(params), batch_size):
+        db.session.execute(stmt, params[offset:offset + batch_size])
+    mark_stale(pairs, "attendance")
+    touch_rollups(pairs)
+    return result
+
+
+_LIST_STATS_MAX = 256
+_list_stats_cache = OrderedDict()   # 필터 시그니처 → (built_at, stats), 최근 사용 순 (LRU)
+_list_stats_lock = threading.Lock()
+
+
+def clear_list_stats_cache():
+    with _list_stats_lock:
+        _list_stats_cache.clear()
+
+
+def attendance_list_stats(query, signature):
+    """근태 목록 필터 결과의 통계를 한 번의 집계로 구한다 (필터별 짧은 TTL 캐시).
+
+    캐시는 최근 사용한 필터 _LIST_STATS_MAX 개까지만 두고 가장 오래 쓰지 않은 것부터 버린다.
+
+    건수·시간 합계와 주간/야간 건수를 조건부 SUM 으로 같은 스캔에서 함께 계산한다.
+    같은 프로세스의 근태 변경은 commit 시 캐시를 비우고, 다른 프로세스의 변경은
+    ATTENDANCE_STATS_CACHE_TTL 이내에 반영된다.
+
+    Args:
+        query: 필터가 적용된 AttendanceRecord 쿼리
+        signature: 필터 값 튜플 (캐시 키)
+
+    Returns:
+        dict {total, day, night, total_work, total_night, total_ot, total_holiday}
+    """
+    from sqlalchemy import case, func
+
+    from models import AttendanceRecord
+
+    ttl = current_app.config.get("ATTENDANCE_STATS_CACHE_TTL", 30)
+    now = time.monotonic()
+    with _list_stats_lock:
+        cached = _list_stats_cache.get(signature)
+        if cached and now - cached[0] < ttl:
+            _list_stats_cache.move_to_end(signature)
+            return cached[1]
+
+    row = query.with_entities(
+        func.count().label("total"),
+        func.sum(case((AttendanceRecord.work_type == "normal", 1), else_=0)).label("day"),
+        func.sum(case((AttendanceRecord.work_type == "night", 1), else_=0)).label("night"),
+        func.sum(AttendanceRecord.total_work_hours).label("total_work"),
+        func.sum(AttendanceRecord.night_hours).label("total_night"),
+        func.sum(AttendanceRecord.overtime_hours).label("total_ot"),
+        func.sum(AttendanceRecord.holiday_work_hours).label("total_holiday"),
+    ).order_by(None).one()
+    stats = {
+        "total": int(row.total or 0),
+        "day": int(row.day or 0),
+        "night": int(row.night or 0),
+        "total_work": round(row.total_work or 0, 1),
+        "total_night": round(row.total_night or 0, 1),
+        "total_ot": round(row.total_ot or 0, 1),
+        "total_holiday": round(row.total_holiday or 0, 1),
+    }
+    with _list_stats_lock:
+        _list_stats_cache[signature] = (now, stats)
+        _list_stats_cache.move_to_end(signature)
+        while len(_list_stats_cache) > _LIST_STATS_MAX:
+            _list_stats_cache.popitem(last=False)
+    return stats
+
+
 def _get_cfg():
     c = current_app.config
     return {
@@ -118,30 +353,16 @@ def _get_cfg():
         "BREAK_HOURS": c.get("BREAK_HOURS", 1.0),
         "NIGHT_START": c.get("NIGHT_START", 22),
         "NIGHT_END": c.get("NIGHT_END", 6),
-        "PUBLIC_HOLIDAYS_2026": c.get("PUBLIC_HOLIDAYS_2026", []),
+        "PUBLIC_HOLIDAYS": c.get("PUBLIC_HOLIDAYS", {}),
+        **{k: v for k, v in c.items() if k.startswith("PUBLIC_HOLIDAYS_")},
     }
 
 
-def _default_day_type(work_date, cfg):
-    holidays_2026 = cfg.get("PUBLIC_HOLIDAYS_2026", [])
-    if work_date.weekday() == 6:
-        return "paid_leave"
-    if work_date.weekday() == 5:
-        return "unpaid_leave"
-    if work_date.strftime("%Y-%m-%d") in holidays_2026:
-        return "paid_leave"
-    return "workday"
-
-
-def _calendar_override_type(work_date):
-    row = OperationCalendarDay.query.filter_by(work_date=work_date).first()
-    if not row:
-        return None
-    return row.day_type
+def _default_day_type(work_date, cfg=None):
+    """오버라이드를 제외한 기본 day-type (연도 캘린더 배열 조회, cfg 는 하위 호환용)."""
+    return calendar_service.default_day_type(work_date)
 
 
-def _effective_day_type(work_date, cfg):
-    override = _calendar_override_type(work_date)
-    if override in CALENDAR_DAY_TYPES:
-        return override
-    return _default_day_type(work_date, cfg)
+def _effective_day_type(work_date, cfg=None):
+    """오버라이드를 반영한 day-type (연도 캘린더 배열 조회, cfg 는 하위 호환용)."""
+    return calendar_service.day_type(work_date)
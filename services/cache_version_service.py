@@ -0,0 +1,60 @@
+"""프로세스 간 캐시 버전 카운터.
+
+gunicorn 워커마다 따로 두는 메모리 캐시를 맞추기 위해 cache_versions 테이블에
+이름별 버전을 두고, 원본 데이터를 바꾸는 트랜잭션에서 버전을 올린다.
+각 워커는 캐시를 쓸 때 저장된 버전과 비교해 달라졌으면 다시 적재한다.
+"""
+from datetime import datetime
+
+from sqlalchemy import select, update
+
+from models import CacheVersion, db
+
+
+def _insert_ignore(session, name):
+    table = CacheVersion.__table__
+    dialect = session.get_bind().dialect.name
+    if dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert
+        stmt = insert(table).on_conflict_do_nothing(index_elements=["name"])
+    elif dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+        stmt = insert(table).on_conflict_do_nothing(index_elements=["name"])
+    else:
+        stmt = table.insert().prefix_with("IGNORE")
+    session.execute(stmt, [{"name": name, "version": 0, "updated_at": datetime.now()}])
+
+
+def bump_version(session, name):
+    """버전을 1 올린다 (호출한 세션의 트랜잭션에 포함, commit 은 호출자)."""
+    table = CacheVersion.__table__
+    now = datetime.now()
+    dialect = session.get_bind().dialect.name
+    if dialect in ("sqlite", "postgresql"):
+        if dialect == "sqlite":
+            from sqlalchemy.dialects.sqlite import insert
+        else:
+            from sqlalchemy.dialects.postgresql import insert
+        stmt = insert(table).on_conflict_do_update(
+            index_elements=["name"],
+            set_={"version": table.c.version + 1, "updated_at": now},
+        )
+        session.execute(stmt, [{"name": name, "version": 1, "updated_at": now}])
+        return
+    if dialect in ("mysql", "mariadb"):
+        from sqlalchemy.dialects.mysql import insert
+        stmt = insert(table).on_duplicate_key_update(version=table.c.version + 1, updated_at=now)
+        session.execute(stmt, [{"name": name, "version": 1, "updated_at": now}])
+        return
+    _insert_ignore(session, name)
+    session.execute(
+        update(table).where(table.c.name == name).values(version=table.c.version + 1, updated_at=now)
+    )
+
+
+def current_version(name):
+    """저장된 버전 (행이 없으면 0)."""
+    value = db.session.execute(
+        select(CacheVersion.version).where(CacheVersion.name == name)
+    ).scalar()
+    return value or 0
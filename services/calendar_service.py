@@ -0,0 +1,215 @@
+"""운영 캘린더 통합 서비스 (근무일 / 유급휴일 / 무급휴일).
+
+연도별로 일 단위 day-type 배열(uint8, 1월 1일=0번)과 ISO 주 키 배열을
+config 공휴일 + OperationCalendarDay 오버라이드로 한 번 만들어 프로세스에 캐시한다.
+근태 시간 계산, 급여 소정근로일/주휴 판정, 연차 만근 판정이 모두 이 배열을
+인덱스로 조회하므로 날짜·직원마다 캘린더를 다시 조회하지 않는다.
+
+- 기본 규칙: 일요일 → 유급휴일, 토요일 → 무급휴일, 평일 공휴일 → 유급휴일
+- 공휴일: config 의 PUBLIC_HOLIDAYS_{연도} (없으면 PUBLIC_HOLIDAYS[연도]), 미등록 연도는 주말만
+- OperationCalendarDay 변경은 세션 flush 시점에 감지하여 해당 연도 캐시를 비운다.
+  다른 프로세스의 변경은 CALENDAR_CACHE_TTL 이내에 반영된다.
+"""
+import threading
+import time
+from collections import defaultdict
+from datetime import date, timedelta
+
+import numpy as np
+from flask import current_app
+from sqlalchemy import event, inspect
+
+from models import OperationCalendarDay, db
+
+WORKDAY, PAID_LEAVE, UNPAID_LEAVE = 0, 1, 2
+DAY_TYPES = ("workday", "paid_leave", "unpaid_leave")
+DAY_TYPE_CODES = {name: code for code, name in enumerate(DAY_TYPES)}
+
+_cache = {}          # year → (YearCalendar, built_at)
+_lock = threading.Lock()
+_registered = False
+
+
+def public_holidays(year, cfg=None):
+    """연도별 공휴일 문자열('YYYY-MM-DD') 목록."""
+    cfg = cfg if cfg is not None else current_app.config
+    holidays = cfg.get(f"PUBLIC_HOLIDAYS_{year}")
+    if holidays is None:
+        holidays = (cfg.get("PUBLIC_HOLIDAYS") or {}).get(year, [])
+    return holidays
+
+
+class YearCalendar:
+    """한 해의 day-type 배열과 ISO 주 키 배열."""
+
+    __slots__ = ("year", "start", "defaults", "codes", "week_keys", "overrides")
+
+    def __init__(self, year, holidays, overrides):
+        self.year = year
+        self.start = date(year, 1, 1)
+        n = (date(year + 1, 1, 1) - self.start).days
+        weekday = (np.arange(n) + self.start.weekday()) % 7
+
+        defaults = np.full(n, WORKDAY, dtype=np.uint8)
+        for text in holidays:
+            d = date.fromisoformat(text)
+            if d.year == year:
+                defaults[self.index(d)] = PAID_LEAVE
+        defaults[weekday == 5] = UNPAID_LEAVE
+        defaults[weekday == 6] = PAID_LEAVE
+        self.defaults = defaults
+
+        self.overrides = {d: t for d, t in overrides.items() if t in DAY_TYPE_CODES}
+        codes = defaults.copy()
+        for d, day_type in self.overrides.items():
+            codes[self.index(d)] = DAY_TYPE_CODES[day_type]
+        self.codes = codes
+
+        # ISO 주 키 (ISO 연도 * 100 + 주차)
+        self.week_keys = np.array([
+            iso[0] * 100 + iso[1]
+            for iso in ((self.start + timedelta(days=i)).isocalendar() for i in range(n))
+        ], dtype=np.int32)
+
+    def index(self, d):
+        return (d - self.start).days
+
+    def day_type(self, d):
+        return DAY_TYPES[self.codes[self.index(d)]]
+
+    def default_day_type(self, d):
+        return DAY_TYPES[self.defaults[self.index(d)]]
+
+    def month_slice(self, month):
+        mon = int(month.split("-")[1])
+        first = self.index(date(self.year, mon, 1))
+        end = date(self.year + 1, 1, 1) if mon == 12 else date(self.year, mon + 1, 1)
+        return slice(first, self.index(end))
+
+    def month_overrides(self, month):
+        """해당 월의 오버라이드 {date: day_type}."""
+        mon = int(month.split("-")[1])
+        return {d: t for d, t in self.overrides.items() if d.month == mon}
+
+    def working_days(self, month):
+        return int(np.count_nonzero(self.codes[self.month_slice(month)] == WORKDAY))
+
+    def month_schedule(self, month):
+        """월 소정근로일 집합과 주별(ISO week) 소정근로일 그룹.
+
+        Returns:
+            (scheduled_workdays, weeks) — weeks: {(iso_year, iso_week): set of date}
+        """
+        span = self.month_slice(month)
+        idx = np.flatnonzero(self.codes[span] == WORKDAY) + span.start
+        scheduled = set()
+        weeks = defaultdict(set)
+        for i, key in zip(idx.tolist(), self.week_keys[idx].tolist()):
+            d = self.start + timedelta(days=i)
+            scheduled.add(d)
+            weeks[divmod(key, 100)].add(d)
+        return scheduled, weeks
+
+
+def _build(year):
+    overrides = {
+        row.work_date: row.day_type
+        for row in db.session.query(OperationCalendarDay.work_date, OperationCalendarDay.day_type)
+        .filter(
+            OperationCalendarDay.work_date >= date(year, 1, 1),
+            OperationCalendarDay.work_date < date(year + 1, 1, 1),
+        )
+        .all()
+    }
+    return YearCalendar(year, set(public_holidays(year)), overrides)
+
+
+def get_year_calendar(year):
+    """연도 캘린더 (캐시, 만료·무효화 시 1회 조회로 재생성)."""
+    ttl = current_app.config.get("CALENDAR_CACHE_TTL", 60)
+    now = time.monotonic()
+    with _lock:
+        entry = _cache.get(year)
+    if entry and now - entry[1] < ttl:
+        return entry[0]
+    calendar = _build(year)
+    with _lock:
+        _cache[year] = (calendar, now)
+    return calendar
+
+
+def invalidate_calendar(year=None):
+    """연도(None 이면 전체) 캐시를 비운다."""
+    with _lock:
+        if year is None:
+            _cache.clear()
+        else:
+            _cache.pop(year, None)
+
+
+def day_type(d):
+    """오버라이드를 반영한 day-type."""
+    return get_year_calendar(d.year).day_type(d)
+
+
+def default_day_type(d):
+    return get_year_calendar(d.year).default_day_type(d)
+
+
+def day_type_codes(dates):
+    """날짜 목록의 day-type 코드 배열 (오버라이드 반영, 연도별로 한 번씩 인덱싱)."""
+    days = np.asarray(dates, dtype="datetime64[D]")
+    codes = np.empty(len(days), dtype=np.int8)
+    years = days.astype("datetime64[Y]").astype(np.int64) + 1970
+    for year in np.unique(years).tolist():
+        mask = years == year
+        offset = (days[mask] - np.datetime64(f"{year:04d}-01-01", "D")).astype(np.int64)
+        codes[mask] = get_year_calendar(year).codes[offset]
+    return codes
+
+
+def month_schedule(month):
+    return get_year_calendar(int(month.split("-")[0])).month_schedule(month)
+
+
+def month_overrides(month):
+    return get_year_calendar(int(month.split("-")[0])).month_overrides(month)
+
+
+def working_days(year, month):
+    """해당 월 소정근로일수."""
+    return get_year_calendar(year).working_days(f"{year:04d}-{month:02d}")
+
+
+_PENDING_KEY = "calendar_years"
+
+
+def _after_flush(session, flush_context):
+    years = set()
+    for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+        if not isinstance(obj, OperationCalendarDay):
+            continue
+        values = {obj.work_date}
+        values.update(inspect(obj).attrs.work_date.history.deleted or ())
+        years.update(d.year for d in values if d)
+    for year in years:
+        invalidate_calendar(year)
+    if years:
+        session.info.setdefault(_PENDING_KEY, set()).update(years)
+
+
+def _after_end(session):
+    # flush~commit/rollback 사이에 다시 적재된 캐시도 확정 상태로 재생성되도록 한 번 더 비운다
+    for year in session.info.pop(_PENDING_KEY, ()):
+        invalidate_calendar(year)
+
+
+def init_calendar_tracking():
+    """OperationCalendarDay 변경 감지 리스너 등록 (프로세스당 1회)."""
+    global _registered
+    if _registered:
+        return
+    event.listen(db.session, "after_flush", _after_flush)
+    event.listen(db.session, "after_commit", _after_end)
+    event.listen(db.session, "after_rollback", _after_end)
+    _registered = True
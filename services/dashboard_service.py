@@ -0,0 +1,232 @@
+"""관리자 홈·대시보드 지표 스냅샷 서비스.
+
+홈(admin.master_view)과 종합 대시보드(dashboard.admin_dashboard), JSON API 가 같은
+월별 스냅샷을 읽는다. 스냅샷은 테이블별 조건부 집계 몇 번으로 만들고 워커 메모리에
+월 단위로 DASHBOARD_CACHE_TTL 초 동안 캐시한다.
+
+- 지표 원본 테이블(직원·현장·지원서·문의·가불·급여명세서·근태 월 집계)을 바꾸는
+  트랜잭션은 공유 버전 카운터(cache_versions)를 올리고 이 워커의 캐시를 비운다
+  (ORM flush 와 session.execute 로 실행한 Core INSERT/UPDATE/DELETE 모두)
+- 다른 워커는 DASHBOARD_CACHE_CHECK_SECONDS 마다 버전을 확인해 바뀌었으면 비운다
+- 세션을 거치지 않은 변경은 TTL 이 지나면 반영된다
+"""
+import threading
+import time
+
+from flask import current_app
+from sqlalchemy import and_, case, event, func, select
+
+from models import AdvanceRequest, Application, Employee, Inquiry, Payslip, Site, db
+from services.attendance_rollup_service import month_totals
+from services.cache_version_service import bump_version, current_version
+
+_CACHE_NAME = "dashboard_metrics"
+_PENDING_KEY = "dashboard_metrics_changed"
+_MAX_MONTHS = 24
+
+# 지표에 쓰이는 테이블 (attendance_monthly 는 근태 저장 시 집계 서비스가 Core 로 갱신)
+_WATCHED_TABLES = {
+    "employees", "sites", "applications", "inquiries",
+    "advance_requests", "payslips", "attendance_monthly",
+}
+
+_lock = threading.Lock()
+_cache = {"entries": {}, "version": None, "checked": 0.0, "generation": 0}
+_registered = False
+
+
+def _count_if(condition):
+    return func.coalesce(func.sum(case((condition, 1), else_=0)), 0)
+
+
+def _sum_if(condition, column):
+    return func.coalesce(func.sum(case((condition, column), else_=0)), 0)
+
+
+def compute_metrics(month):
+    """월 스냅샷을 DB 에서 계산한다 (캐시 없이).
+
+    Returns:
+        dict {month, employees, todo, attendance, payslip, advance, sites,
+              recent_apps, recent_advances}
+    """
+    active = Employee.is_active.is_(True)
+    emp = db.session.execute(select(
+        _count_if(active),
+        _count_if(Employee.is_active.is_(False)),
+        _count_if(and_(active, Employee.work_type == "weekly")),
+        _count_if(and_(active, Employee.work_type == "shift")),
+        _count_if(and_(active, Employee.site_id.is_(None))),
+    )).one()
+
+    in_month = AdvanceRequest.request_month == month
+    approved = and_(AdvanceRequest.status == "approved", in_month)
+    adv = db.session.execute(select(
+        _count_if(AdvanceRequest.status == "pending"),
+        _count_if(approved),
+        _count_if(and_(AdvanceRequest.status == "rejected", in_month)),
+        _sum_if(approved, AdvanceRequest.amount),
+    )).one()
+
+    pay = db.session.execute(select(
+        func.count(Payslip.id),
+        func.coalesce(func.sum(Payslip.gross), 0),
+        func.coalesce(func.sum(Payslip.net), 0),
+        func.coalesce(func.avg(Payslip.net), 0),
+    ).where(Payslip.month == month)).one()
+
+    todo = db.session.execute(select(
+        select(func.count(Application.id)).where(Application.status == "new").scalar_subquery(),
+        select(func.count(Inquiry.id)).where(Inquiry.status == "new").scalar_subquery(),
+    )).one()
+
+    sites = db.session.execute(
+        select(Site.id, Site.name, func.count(Employee.id))
+        .outerjoin(Employee, and_(Employee.site_id == Site.id, active))
+        .where(Site.is_active.is_(True))
+        .group_by(Site.id, Site.name)
+        .order_by(Site.name)
+    ).all()
+
+    recent_apps = db.session.execute(
+        select(Application.id, Application.name, Application.phone,
+               Application.status, Application.timestamp)
+        .order_by(Application.timestamp.desc())
+        .limit(5)
+    ).mappings().all()
+
+    recent_advances = db.session.execute(
+        select(AdvanceRequest.id, Employee.name.label("employee_name"), AdvanceRequest.amount,
+               AdvanceRequest.status, AdvanceRequest.created_at)
+        .outerjoin(Employee, AdvanceRequest.employee_id == Employee.id)
+        .order_by(AdvanceRequest.created_at.desc())
+        .limit(5)
+    ).mappings().all()
+
+    att = month_totals(month)
+    return {
+        "month": month,
+        "employees": {
+            "active": int(emp[0]),
+            "inactive": int(emp[1]),
+            "weekly": int(emp[2]),
+            "shift": int(emp[3]),
+            "unassigned": int(emp[4]),
+        },
+        "todo": {
+            "advances": int(adv[0]),
+            "applications": int(todo[0] or 0),
+            "inquiries": int(todo[1] or 0),
+        },
+        "attendance": {
+            "records": att["records"],
+            "total_hours": round(att["total_hours"], 1),
+            "ot_hours": round(att["ot_hours"], 1),
+            "night_hours": round(att["night_hours"], 1),
+            "holiday_hours": round(att["holiday_hours"], 1),
+            "workers": att["workers"],
+        },
+        "payslip": {
+            "count": int(pay[0] or 0),
+            "total_gross": int(pay[1]),
+            "total_net": int(pay[2]),
+            "avg_net": round(float(pay[3])),
+        },
+        "advance": {
+            "pending": int(adv[0]),
+            "approved": int(adv[1]),
+            "rejected": int(adv[2]),
+            "total_amount": int(adv[3]),
+        },
+        "sites": [{"id": sid, "name": name, "count": count} for sid, name, count in sites],
+        "recent_apps": [dict(row) for row in recent_apps],
+        "recent_advances": [dict(row) for row in recent_advances],
+    }
+
+
+def dashboard_metrics(month, fresh=False):
+    """월 스냅샷 (워커 메모리 캐시, 호출자는 수정하지 말 것)."""
+    now = time.monotonic()
+    interval = current_app.config.get("DASHBOARD_CACHE_CHECK_SECONDS", 1)
+    ttl = current_app.config.get("DASHBOARD_CACHE_TTL", 60)
+
+    with _lock:
+        version, checked = _cache["version"], _cache["checked"]
+    if fresh or now - checked >= interval:
+        stored = current_version(_CACHE_NAME)
+        with _lock:
+            if stored != version:
+                _cache["entries"].clear()
+                _cache["generation"] += 1
+            _cache.update(version=stored, checked=now)
+
+    with _lock:
+        entry = _cache["entries"].get(month)
+        generation = _cache["generation"]
+    if entry is not None and not fresh and now - entry[0] < ttl:
+        return entry[1]
+
+    snapshot = compute_metrics(month)
+    with _lock:
+        # 계산 중에 무효화됐으면 이번 결과는 저장하지 않는다
+        if _cache["generation"] == generation:
+            entries = _cache["entries"]
+            entries[month] = (now, snapshot)
+            while len(entries) > _MAX_MONTHS:
+                entries.pop(min(entries, key=lambda m: entries[m][0]))
+    return snapshot
+
+
+def clear_dashboard_cache():
+    """이 워커의 캐시를 비운다."""
+    with _lock:
+        _cache["entries"].clear()
+        _cache["generation"] += 1
+        _cache.update(version=None, checked=0.0)
+
+
+# ── 변경 추적 ──
+
+def _mark_changed(session):
+    if not session.info.get(_PENDING_KEY):
+        # 트랜잭션당 한 번만 올린다
+        session.info[_PENDING_KEY] = True
+        bump_version(session, _CACHE_NAME)
+    clear_dashboard_cache()
+
+
+def _after_flush(session, flush_context):
+    for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+        table = getattr(type(obj), "__tablename__", None)
+        if table in _WATCHED_TABLES and (
+            obj not in session.dirty or session.is_modified(obj, include_collections=False)
+        ):
+            _mark_changed(session)
+            return
+
+
+def _on_orm_execute(orm_execute_state):
+    if not (orm_execute_state.is_insert or orm_execute_state.is_update
+            or orm_execute_state.is_delete):
+        return
+    table = getattr(orm_execute_state.statement, "table", None)
+    if getattr(table, "name", None) in _WATCHED_TABLES:
+        _mark_changed(orm_execute_state.session)
+
+
+def _after_end(session):
+    # flush~commit 사이에 다시 채워진 캐시도 확정 상태로 다시 계산되도록 한 번 더 비운다
+    if session.info.pop(_PENDING_KEY, False):
+        clear_dashboard_cache()
+
+
+def init_dashboard_tracking():
+    """세션 이벤트 리스너를 등록한다 (프로세스당 1회)."""
+    global _registered
+    if _registered:
+        return
+    event.listen(db.session, "after_flush", _after_flush)
+    event.listen(db.session, "do_orm_execute", _on_orm_execute)
+    event.listen(db.session, "after_commit", _after_end)
+    event.listen(db.session, "after_rollback", _after_end)
+    _registered = True
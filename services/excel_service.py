@@ -23,6 +23,12 @@ EXCEL_COLUMNS = [
 EXCEL_COLUMN_LABELS = dict(EXCEL_COLUMNS)
 EXCEL_COLUMN_KEYS = {key for key, _ in EXCEL_COLUMNS}
 DEFAULT_EXCEL_COLUMNS = ["name", "phone", "email", "address", "status", "submitted_at"]
+# _excel_row_values() 가 읽는 Application 컬럼 (컬럼 단위 조회용)
+EXCEL_SOURCE_FIELDS = [
+    "name", "phone", "email", "address", "status", "timestamp", "gender", "birth",
+    "shift", "posture", "overtime", "holiday", "advance_pay", "insurance_type",
+    "interview_date", "start_date", "memo",
+]
 
 
 def _to_date_text(value):
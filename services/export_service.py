@@ -0,0 +1,314 @@
+"""XLSX/CSV 다운로드 공통 스트리밍 내보내기 서비스.
+
+- 행은 컬럼만 조회하는 쿼리를 yield_per 로 나누어 읽는다 (ORM 객체 미생성).
+- openpyxl write-only 모드(또는 csv)로 SpooledTemporaryFile 에 기록한다.
+  일정 크기를 넘으면 디스크로 넘어가므로 행 수와 무관하게 메모리가 일정하다.
+- 완성된 파일은 send_file 이 청크 단위로 전송한다.
+"""
+import csv
+import io
+import tempfile
+from itertools import islice
+
+from flask import request, send_file
+
+XLSX_MIMETYPE = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+CSV_MIMETYPE = "text/csv"
+EXPORT_FORMATS = ("xlsx", "csv")
+
+BATCH_SIZE = 2000
+SPOOL_MAX_BYTES = 8 * 1024 * 1024
+WIDTH_SAMPLE_ROWS = 200
+
+
+def requested_format(default="xlsx"):
+    """요청의 ?format= 값 (xlsx/csv, 그 외는 기본값)."""
+    fmt = (request.args.get("format") or default).lower()
+    return fmt if fmt in EXPORT_FORMATS else default
+
+
+def stream_query(query, batch_size=BATCH_SIZE):
+    """컬럼 조회 쿼리를 batch_size 단위로 읽어 행을 하나씩 내보낸다."""
+    yield from query.yield_per(batch_size)
+
+
+def _column_widths(headers, sample):
+    """헤더와 앞부분 행 기준 열 너비 (12~40)."""
+    widths = []
+    for idx, header in enumerate(headers):
+        max_len = len(str(header))
+        for row in sample:
+            max_len = max(max_len, len(str(row[idx] if row[idx] is not None else "")))
+        widths.append(min(max(12, max_len + 2), 40))
+    return widths
+
+
+def _write_xlsx(out, headers, rows, sheet_title, auto_width, freeze_header):
+    from openpyxl import Workbook
+    from openpyxl.cell import WriteOnlyCell
+    from openpyxl.styles import Font
+    from openpyxl.utils import get_column_letter
+
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet(title=sheet_title)
+
+    rows = iter(rows)
+    sample = []
+    if auto_width:
+        # 열 너비는 행을 쓰기 전에 정해야 하므로 앞부분만 미리 읽는다
+        sample = list(islice(rows, WIDTH_SAMPLE_ROWS))
+        for idx, width in enumerate(_column_widths(headers, sample), start=1):
+            ws.column_dimensions[get_column_letter(idx)].width = width
+    if freeze_header:
+        ws.freeze_panes = "A2"
+
+    bold = Font(bold=True)
+    header_cells = []
+    for header in headers:
+        cell = WriteOnlyCell(ws, value=header)
+        cell.font = bold
+        header_cells.append(cell)
+    ws.append(header_cells)
+
+    for row in sample:
+        ws.append(row)
+    for row in rows:
+        ws.append(row)
+    wb.save(out)
+
+
+def _write_csv(out, headers, rows):
+    # Excel 에서 한글이 깨지지 않도록 BOM 포함
+    text = io.TextIOWrapper(out, encoding="utf-8-sig", newline="")
+    writer = csv.writer(text)
+    writer.writerow(headers)
+    writer.writerows(rows)
+    text.flush()
+    text.detach()
+
+
+def build_export(headers, rows, fmt="xlsx", sheet_title="Sheet1", auto_width=False, freeze_header=False):
+    """헤더와 행 iterable 로 내보내기 파일을 만든다.
+
+    Args:
+        rows: 값 리스트/튜플의 iterable (generator 권장)
+        auto_width: 앞부분 행으로 열 너비 자동 조정 (xlsx)
+        freeze_header: 머리행 고정 (xlsx)
+
+    Returns:
+        처음 위치로 되감긴 SpooledTemporaryFile
+    """
+    out = tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_BYTES, mode="w+b")
+    if fmt == "csv":
+        _write_csv(out, headers, rows)
+    else:
+        _write_xlsx(out, headers, rows, sheet_title, auto_width, freeze_header)
+    out.seek(0)
+    return out
+
+
+def send_export(out, download_name, fmt="xlsx"):
+    """build_export() 결과를 청크 단위로 전송한다 (download_name 은 확장자 제외)."""
+    size = out.seek(0, io.SEEK_END)
+    out.seek(0)
+    resp = send_file(
+        out,
+        as_attachment=True,
+        download_name=f"{download_name}.{fmt}",
+        mimetype=CSV_MIMETYPE if fmt == "csv" else XLSX_MIMETYPE,
+    )
+    resp.content_length = size
+    return resp
+
+
+# ── 관리자 내보내기 (라우트와 백그라운드 작업 공용) ──
+
+ATTENDANCE_HEADERS = [
+    "직원ID", "이름", "부서", "날짜", "출근", "퇴근", "구분",
+    "총근무(h)", "잔업(h)", "야간(h)", "휴일(h)", "출처",
+]
+_WORK_TYPE_LABELS = {
+    "normal": "주간",
+    "night": "야간",
+    "annual": "연차",
+    "absent": "결근",
+    "holiday": "휴무",
+    "early": "조퇴",
+}
+_SOURCE_LABELS = {"employee": "직원", "excel": "엑셀", "admin": "관리자"}
+
+PAYSLIP_HEADERS = [
+    "직원ID", "이름", "부서", "계산방식",
+    "총근무(h)", "잔업(h)", "야간(h)", "휴일(h)",
+    "기본급", "주휴수당", "잔업수당", "야간수당", "휴일수당",
+    "결근일수", "결근공제", "주휴공제", "총지급",
+    "소득세", "국민연금", "건강보험", "장기요양", "고용보험", "4대보험합계",
+    "가불차감", "실수령액", "수동수정",
+]
+_XL_MODE = {"standard": "209h고정", "daily_build": "일급제", "actual": "실근무", "daily": "공수제"}
+
+
+def attendance_export(filters, fmt="xlsx"):
+    """근태기록 내보내기.
+
+    Args:
+        filters: start_date/end_date/emp_name/work_type/site_id 키를 가진 mapping
+
+    Returns:
+        (SpooledTemporaryFile, 확장자 제외 파일명)
+    """
+    from models import AttendanceRecord
+    from services.attendance_service import _parse_date
+
+    start = filters.get("start_date", "")
+    end = filters.get("end_date", "")
+    emp_name = filters.get("emp_name", "")
+    work_type = filters.get("work_type", "")
+    site_id = str(filters.get("site_id") or "")
+
+    query = AttendanceRecord.query
+    if site_id.isdigit():
+        query = query.filter(AttendanceRecord.site_id == int(site_id))
+    if start:
+        try:
+            query = query.filter(AttendanceRecord.work_date >= _parse_date(start))
+        except ValueError:
+            start = ""
+    if end:
+        try:
+            query = query.filter(AttendanceRecord.work_date <= _parse_date(end))
+        except ValueError:
+            end = ""
+    if emp_name:
+        query = query.filter(AttendanceRecord.emp_name.contains(emp_name))
+    if work_type:
+        query = query.filter(AttendanceRecord.work_type == work_type)
+
+    columns = query.with_entities(
+        AttendanceRecord.employee_id,
+        AttendanceRecord.emp_name,
+        AttendanceRecord.dept,
+        AttendanceRecord.work_date,
+        AttendanceRecord.clock_in,
+        AttendanceRecord.clock_out,
+        AttendanceRecord.work_type,
+        AttendanceRecord.total_work_hours,
+        AttendanceRecord.overtime_hours,
+        AttendanceRecord.night_hours,
+        AttendanceRecord.holiday_work_hours,
+        AttendanceRecord.source,
+    ).order_by(AttendanceRecord.work_date.asc(), AttendanceRecord.id.asc())
+
+    def _rows():
+        for (emp_id, name, dept, work_date, clock_in, clock_out, wtype,
+             total_h, ot_h, night_h, holiday_h, source) in stream_query(columns):
+            yield [
+                emp_id,
+                name,
+                dept,
+                work_date.strftime("%Y-%m-%d") if work_date else "",
+                clock_in,
+                clock_out,
+                _WORK_TYPE_LABELS.get(wtype, wtype),
+                total_h,
+                ot_h,
+                night_h,
+                holiday_h or 0,
+                _SOURCE_LABELS.get(source, source or "직원"),
+            ]
+
+    out = build_export(ATTENDANCE_HEADERS, _rows(), fmt, sheet_title="근태기록")
+    return out, f"근태기록_{start or 'all'}_{end or 'all'}"
+
+
+def payslip_export(month, fmt="xlsx", site_id=None):
+    """월 급여명세서 내보내기 (site_id 지정 시 해당 현장만).
+
+    Returns:
+        (SpooledTemporaryFile, 확장자 제외 파일명)
+    """
+    from models import Payslip
+
+    columns = (
+        Payslip.query.with_entities(
+            Payslip.employee_id,
+            Payslip.emp_name,
+            Payslip.dept,
+            Payslip.salary_mode,
+            Payslip.total_work_hours,
+            Payslip.ot_hours,
+            Payslip.night_hours,
+            Payslip.holiday_hours,
+            Payslip.base_salary,
+            Payslip.weekly_holiday_pay,
+            Payslip.ot_pay,
+            Payslip.night_pay,
+            Payslip.holiday_pay,
+            Payslip.absent_days,
+            Payslip.absent_deduction,
+            Payslip.weekly_holiday_deduction,
+            Payslip.gross,
+            Payslip.tax,
+            Payslip.pension,
+            Payslip.health_ins,
+            Payslip.longterm_care,
+            Payslip.employment_ins,
+            Payslip.insurance,
+            Payslip.advance_deduction,
+            Payslip.net,
+            Payslip.is_manual,
+        )
+        .filter(Payslip.month == month)
+        .order_by(Payslip.emp_name.asc(), Payslip.id.asc())
+    )
+    if site_id:
+        columns = columns.filter(Payslip.site_id == site_id)
+
+    def _rows():
+        for row in stream_query(columns):
+            values = list(row)
+            values[3] = _XL_MODE.get(values[3], values[3])
+            values[-1] = "Y" if values[-1] else ""
+            yield values
+
+    out = build_export(PAYSLIP_HEADERS, _rows(), fmt, sheet_title=f"{month} 급여")
+    return out, f"급여명세서_{month}"
+
+
+SEVERANCE_HEADERS = [
+    "직원ID", "이름", "생년월일", "입사일", "기준일", "근속일수", "근속연수",
+    "최근3개월 급여", "평균일급", "예상 퇴직금", "비고",
+]
+
+
+def severance_export(fmt="xlsx"):
+    """재직자 퇴직금 일괄 계산 결과 내보내기.
+
+    Returns:
+        (SpooledTemporaryFile, 확장자 제외 파일명)
+    """
+    from datetime import date
+
+    from services.leave_service import severance_report
+
+    today = date.today()
+    report = severance_report(today)
+
+    def _rows():
+        for entry in report["employees"]:
+            yield [
+                entry["employee_id"],
+                entry["employee_name"],
+                entry["birth_date"],
+                entry.get("hire_date", ""),
+                entry.get("end_date", ""),
+                entry.get("service_days", ""),
+                entry.get("service_years", ""),
+                entry.get("total_gross_3m", ""),
+                entry.get("avg_daily_wage", ""),
+                entry["severance"],
+                entry.get("error") or entry.get("message", ""),
+            ]
+
+    out = build_export(SEVERANCE_HEADERS, _rows(), fmt, sheet_title="퇴직금")
+    return out, f"퇴직금_{today.strftime('%Y-%m-%d')}"
@@ -0,0 +1,246 @@
+"""근태 엑셀 업로드 이력: 내용 해시로 중복 업로드 감지, 이전 반영분과의 차이 계산.
+
+- 업로드 파일마다 sha256 을 구해 attendance_imports 에서 찾는다. 이미 본 파일이면
+  저장된 파싱 결과(npz)와 미리보기를 그대로 써서 다시 파싱하지 않는다.
+- 새 파일은 파싱·미리보기 후 시트마다 이력 행을 남긴다 (status=preview).
+- 같은 업체·월의 마지막 반영분(status=executed)과 직원·일자 단위로 비교한다.
+"""
+import hashlib
+import json
+import logging
+from collections import defaultdict
+from datetime import datetime
+
+import numpy as np
+
+from models import AttendanceImport, db
+from services.attendance_import import (
+    _CATEGORY_LABELS,
+    _DAY_COLUMNS,
+    import_attendance_batch,
+    label_sets,
+    merge_import_results,
+    pack_parsed,
+    parse_attendance_files,
+    unpack_parsed,
+)
+
+logger = logging.getLogger(__name__)
+
+_CHUNK = 1024 * 1024
+_COUNT_FIELDS = ("created", "updated", "unchanged", "skipped")
+
+
+def file_sha256(path: str) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(_CHUNK), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def find_imports(hashes) -> dict:
+    """{file_hash: [AttendanceImport, ...] (시트 순서)} — 이력이 있는 해시만."""
+    found = defaultdict(list)
+    if not hashes:
+        return found
+    rows = (
+        AttendanceImport.query.filter(AttendanceImport.file_hash.in_(set(hashes)))
+        .order_by(AttendanceImport.file_hash, AttendanceImport.sheet_index)
+        .all()
+    )
+    for row in rows:
+        found[row.file_hash].append(row)
+    return found
+
+
+def _restore(row: AttendanceImport) -> dict:
+    parsed = unpack_parsed(row.snapshot)
+    parsed["history_id"] = row.id
+    return parsed
+
+
+def record_previews(sets: list, preview: dict) -> None:
+    """새로 파싱한 시트의 이력 행을 남기고 parsed["history_id"] 를 채운다."""
+    rows = []
+    for parsed, entry in zip(sets, preview["files"]):
+        if parsed.get("history_id") or not parsed.get("file_hash"):
+            continue
+        row = AttendanceImport(
+            file_hash=parsed["file_hash"],
+            sheet_index=parsed.get("sheet_index", 0),
+            filename=(parsed.get("filename") or "")[:255],
+            sheet=(parsed.get("sheet") or "")[:100],
+            site_name=parsed["site_name"][:100],
+            month=parsed["month_str"],
+            employee_count=len(parsed["employees"]),
+            record_count=entry["total_records"],
+            status="preview",
+            preview=json.dumps(entry, ensure_ascii=False, default=str),
+            snapshot=pack_parsed(parsed),
+        )
+        db.session.add(row)
+        rows.append((parsed, row))
+    if not rows:
+        return
+    db.session.flush()
+    for parsed, row in rows:
+        parsed["history_id"] = row.id
+    db.session.commit()
+
+
+def record_execution(parsed_list: list, result: dict) -> None:
+    """반영 결과를 이력 행에 기록한다 (실패 시 status=failed)."""
+    ids = [parsed.get("history_id") for parsed in parsed_list]
+    rows = {
+        row.id: row
+        for row in AttendanceImport.query.filter(AttendanceImport.id.in_([i for i in ids if i])).all()
+    }
+    if not rows:
+        return
+    now = datetime.now()
+    entries = result.get("files", [])
+    for i, history_id in enumerate(ids):
+        row = rows.get(history_id)
+        if row is None:
+            continue
+        if result.get("committed") and i < len(entries):
+            row.status = "executed"
+            row.executed_at = now
+            for field in _COUNT_FIELDS:
+                setattr(row, field, entries[i][field])
+        else:
+            row.status = "failed"
+    db.session.commit()
+
+
+def previous_import(site_name: str, month: str, exclude_hash: str | None = None):
+    """같은 업체·월의 마지막 반영 이력 (내용이 같은 파일은 제외)."""
+    query = AttendanceImport.query.filter_by(site_name=site_name, month=month, status="executed")
+    if exclude_hash:
+        query = query.filter(AttendanceImport.file_hash != exclude_hash)
+    return query.order_by(AttendanceImport.executed_at.desc(), AttendanceImport.id.desc()).first()
+
+
+def _day_text(emp, col: int) -> str:
+    if emp is None:
+        return "-"
+    if emp.is_annual(col):
+        return "연차"
+    parts = [
+        f"{label} {value:g}"
+        for label, value in zip(_CATEGORY_LABELS, emp.hours[:, col].tolist())
+        if value
+    ]
+    return " · ".join(parts) or "-"
+
+
+def _annual_mask(bits: int) -> np.ndarray:
+    return np.array([bool(bits >> i & 1) for i in range(_DAY_COLUMNS)])
+
+
+def diff_parsed(old: dict, new: dict) -> dict:
+    """두 파싱 결과를 직원·일자 단위로 비교한다 (값이 다른 날만).
+
+    Returns:
+        {"added": [이름], "removed": [이름],
+         "changed": [{"name": ..., "days": [{"date", "before", "after"}]}],
+         "changed_days": int, "identical": bool}
+    """
+    old_map = {emp.name: emp for emp in old["employees"]}
+    new_map = {emp.name: emp for emp in new["employees"]}
+    dates = new["dates"]
+    changed, changed_days = [], 0
+    for name, emp in new_map.items():
+        prev = old_map.get(name)
+        if prev is None:
+            continue
+        mask = np.abs(prev.hours - emp.hours).max(axis=0) > 1e-9
+        if prev.annual != emp.annual:
+            mask |= _annual_mask(prev.annual ^ emp.annual)
+        cols = [int(c) for c in np.flatnonzero(mask) if dates[c] is not None]
+        if not cols:
+            continue
+        changed_days += len(cols)
+        changed.append({
+            "name": name,
+            "days": [
+                {"date": dates[c].isoformat(), "before": _day_text(prev, c), "after": _day_text(emp, c)}
+                for c in cols
+            ],
+        })
+    added = [name for name in new_map if name not in old_map]
+    removed = [name for name in old_map if name not in new_map]
+    return {
+        "added": added,
+        "removed": removed,
+        "changed": changed,
+        "changed_days": changed_days,
+        "identical": not (added or removed or changed),
+    }
+
+
+def attach_diffs(sets: list, preview: dict) -> None:
+    """미리보기 시트별 결과에 이전 반영분과의 차이("diff")를 붙인다."""
+    for parsed, entry in zip(sets, preview["files"]):
+        prev = previous_import(parsed["site_name"], parsed["month_str"], parsed.get("file_hash"))
+        if prev is None:
+            continue
+        try:
+            diff = diff_parsed(unpack_parsed(prev.snapshot), parsed)
+        except (ValueError, KeyError) as exc:
+            logger.warning("이전 업로드 복원 실패 (id=%s): %s", prev.id, exc)
+            continue
+        diff["previous"] = prev.to_dict()
+        entry["diff"] = diff
+
+
+def build_preview(files: list, workers: int | None = None) -> tuple:
+    """업로드 파일들의 미리보기를 만든다.
+
+    이력에 있는 파일은 저장된 파싱 결과를 쓰고, 업로드한 파일이 모두 이력에
+    있으면 저장된 미리보기를 그대로 합쳐 돌려준다 (파싱·조회 없음).
+
+    Args:
+        files: [(경로, 원본 파일명), ...] — stage_uploads() 반환값
+
+    Returns:
+        (시트 목록, 실패 목록, 미리보기 결과 또는 None)
+    """
+    hashed, failures, seen = [], [], set()
+    for path, name in files:
+        file_hash = file_sha256(path)
+        if file_hash in seen:
+            failures.append({"label": name, "errors": ["같은 내용의 파일이 이미 포함되어 있습니다."]})
+            continue
+        seen.add(file_hash)
+        hashed.append((path, name, file_hash))
+
+    history = find_imports(seen)
+    unknown = [item for item in hashed if item[2] not in history]
+    parsed_sets, parse_failures = parse_attendance_files(unknown, workers)
+    failures += parse_failures
+    by_hash = defaultdict(list)
+    for parsed in parsed_sets:
+        by_hash[parsed["file_hash"]].append(parsed)
+
+    sets, duplicates = [], []
+    for _, name, file_hash in hashed:
+        if file_hash in history:
+            rows = history[file_hash]
+            sets.extend(label_sets([_restore(row) for row in rows], name, file_hash))
+            duplicates.extend(rows)
+        else:
+            sets.extend(by_hash.get(file_hash, []))
+    if not sets:
+        return sets, failures, None
+
+    if not unknown:
+        preview = merge_import_results(sets, [json.loads(row.preview) for row in duplicates])
+        preview["cached"] = True
+    else:
+        preview = import_attendance_batch(sets, dry_run=True)
+        record_previews(sets, preview)
+    preview["duplicates"] = [row.to_dict() for row in duplicates]
+    attach_diffs(sets, preview)
+    return sets, failures, preview
@@ -0,0 +1,436 @@
+"""백그라운드 작업 큐 및 실행기.
+
+오래 걸리는 관리자 작업(급여 생성, 근태 업로드 반영, 월 PDF, 연차 동기화,
+대용량 내보내기)을 BackgroundJob 테이블에 등록하고 프로세스별 스레드 풀에서 실행한다.
+
+- 등록 즉시 현재 프로세스의 풀에 제출하고, 웹 워커마다 첫 요청 때 시작하는 작업 확인
+  스레드(init_job_runner, APScheduler 와 별개)가 남은 대기 작업을 가져간다.
+  SCHEDULER_DISABLED=1 인 워커도 작업을 실행한다. 프로세스 풀 워커·스크립트는
+  JOB_RUNNER_DISABLED=1 로 작업 확인 스레드를 끈다.
+- 실행 권한은 `UPDATE ... WHERE status='queued'` 의 영향 행 수로 선점하므로
+  gunicorn 워커가 여럿이어도 작업은 정확히 한 번만 실행된다.
+- 실행 중인 작업은 run_job 이 띄운 하트비트 스레드가 JOB_HEARTBEAT_SECONDS 마다
+  heartbeat_at 을 갱신한다. 하트비트가 JOB_STALE_SECONDS 이상 끊긴 작업(프로세스
+  종료 등)은 재실행하지 않고 실패로 표시하며, 이후 끝난 실행의 결과는 버린다
+  (완료 UPDATE 는 status='running' 이고 선점한 워커일 때만 반영).
+"""
+import json
+import logging
+import os
+import shutil
+import socket
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+from flask import current_app
+from sqlalchemy import update
+
+from models import BackgroundJob, db
+
+logger = logging.getLogger(__name__)
+
+_handlers = {}
+_lock = threading.Lock()
+_executor = None
+_submitted = set()   # 이 프로세스의 풀에 제출된(대기+실행 중) 작업 ID
+_last_purge = 0.0
+_PURGE_INTERVAL = 3600
+_runner = {"thread": None}
+
+
+class JobError(Exception):
+    """작업 실패 (메시지를 그대로 사용자에게 표시)."""
+
+
+def job_handler(kind):
+    """작업 종류별 실행 함수 등록 데코레이터. 함수는 (ctx, **params) 를 받는다."""
+
+    def decorator(func):
+        _handlers[kind] = func
+        return func
+
+    return decorator
+
+
+def job_kinds():
+    return sorted(_handlers)
+
+
+def _worker_id():
+    # fork 후에도 실제 실행 프로세스를 가리키도록 매번 계산
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+class JobContext:
+    """실행 중인 작업에 전달되는 진행률/결과 파일 도우미."""
+
+    def __init__(self, job):
+        self.job_id = job.id
+        self.kind = job.kind
+        self.artifact = None
+
+    def progress(self, percent, message=None):
+        """진행률(0~100)과 메시지를 기록한다.
+
+        작업 본문의 트랜잭션과 섞이지 않도록 별도 커넥션으로 즉시 커밋한다.
+        """
+        values = {"progress": max(0, min(100, int(percent))), "heartbeat_at": datetime.now()}
+        if message is not None:
+            values["message"] = str(message)[:200]
+        with db.engine.begin() as conn:
+            conn.execute(
+                update(BackgroundJob).where(BackgroundJob.id == self.job_id).values(**values)
+            )
+
+    def artifact_path(self, filename):
+        """결과 파일 경로를 만들고 다운로드 대상으로 지정한다."""
+        directory = os.path.join(current_app.config["JOB_ARTIFACT_DIR"], str(self.job_id))
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, os.path.basename(filename))
+        self.artifact = (path, filename)
+        return path
+
+
+# ── 등록 / 선점 / 실행 ──
+
+
+def enqueue_job(kind, params=None):
+    """작업을 등록하고 BackgroundJob 을 반환한다 (실행은 비동기).
+
+    JOB_INLINE 설정 시 현재 스레드에서 바로 실행한다 (테스트용).
+    """
+    if kind not in _handlers:
+        raise ValueError(f"unknown job kind: {kind}")
+    job = BackgroundJob(
+        kind=kind,
+        status="queued",
+        params=json.dumps(params or {}, ensure_ascii=False, default=str),
+    )
+    db.session.add(job)
+    db.session.commit()
+    logger.info("[작업] #%d %s 등록", job.id, kind)
+
+    app = current_app._get_current_object()
+    if app.config.get("JOB_INLINE"):
+        run_job(job.id)
+        db.session.refresh(job)
+    else:
+        _submit(app, job.id)
+    return job
+
+
+def claim_job(job_id):
+    """대기 중인 작업의 실행 권한을 원자적으로 선점한다."""
+    now = datetime.now()
+    result = db.session.execute(
+        update(BackgroundJob)
+        .where(BackgroundJob.id == job_id, BackgroundJob.status == "queued")
+        .values(status="running", worker=_worker_id(), started_at=now, heartbeat_at=now)
+    )
+    db.session.commit()
+    return result.rowcount == 1
+
+
+def _owned(job_id, worker):
+    """이 워커가 실행 중인 작업 조건 (중단 처리된 뒤에는 맞지 않는다)."""
+    return (
+        BackgroundJob.id == job_id,
+        BackgroundJob.status == "running",
+        BackgroundJob.worker == worker,
+    )
+
+
+def _heartbeat_loop(engine, job_id, worker, interval, stop):
+    while not stop.wait(interval):
+        try:
+            with engine.begin() as conn:
+                conn.execute(
+                    update(BackgroundJob)
+                    .where(*_owned(job_id, worker))
+                    .values(heartbeat_at=datetime.now())
+                )
+        except Exception as exc:
+            logger.warning("[작업] #%d 하트비트 갱신 실패: %s", job_id, exc)
+
+
+def run_job(job_id):
+    """작업을 선점해 실행한다. 다른 프로세스가 먼저 가져갔으면 False."""
+    if not claim_job(job_id):
+        return False
+
+    worker = _worker_id()
+    job = db.session.get(BackgroundJob, job_id)
+    ctx = JobContext(job)
+    handler = _handlers.get(job.kind)
+    started = time.perf_counter()
+    result, error = None, None
+
+    # 작업이 실제로 도는 동안만 하트비트를 보낸다 (작업 확인 스레드·스케줄러와 무관)
+    stop = threading.Event()
+    heartbeat = threading.Thread(
+        target=_heartbeat_loop,
+        args=(db.engine, job_id, worker, current_app.config.get("JOB_HEARTBEAT_SECONDS", 30), stop),
+        name=f"job-heartbeat-{job_id}",
+        daemon=True,
+    )
+    heartbeat.start()
+    try:
+        if handler is None:
+            raise JobError(f"알 수 없는 작업 종류입니다: {job.kind}")
+        result = handler(ctx, **job.params_dict)
+    except JobError as exc:
+        db.session.rollback()
+        error = str(exc)
+    except Exception as exc:
+        db.session.rollback()
+        logger.exception("[작업] #%d %s 실패", job_id, job.kind)
+        error = f"작업 중 오류가 발생했습니다: {exc}"
+    finally:
+        stop.set()
+        heartbeat.join()
+
+    values = {
+        "status": "failed" if error else "succeeded",
+        "error": error,
+        "result": json.dumps(result, ensure_ascii=False, default=str) if result is not None else None,
+        "finished_at": datetime.now(),
+        "heartbeat_at": datetime.now(),
+    }
+    if not error:
+        values["progress"] = 100
+        if ctx.artifact:
+            values["artifact_path"], values["artifact_name"] = ctx.artifact
+    finished = db.session.execute(
+        update(BackgroundJob).where(*_owned(job_id, worker)).values(**values)
+    ).rowcount
+    db.session.commit()
+    if not finished:
+        logger.warning("[작업] #%d %s 이미 중단 처리되어 결과를 반영하지 않습니다", job_id, ctx.kind)
+        return True
+    logger.info(
+        "[작업] #%d %s %s (%.1fs)", job_id, ctx.kind, values["status"], time.perf_counter() - started
+    )
+    return True
+
+
+def _run_in_context(app, job_id):
+    try:
+        with app.app_context():
+            try:
+                run_job(job_id)
+            finally:
+                db.session.remove()
+    finally:
+        with _lock:
+            _submitted.discard(job_id)
+
+
+def _submit(app, job_id):
+    global _executor
+    with _lock:
+        if job_id in _submitted:
+            return
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=app.config.get("JOB_WORKERS", 2), thread_name_prefix="job"
+            )
+        _submitted.add(job_id)
+    _executor.submit(_run_in_context, app, job_id)
+
+
+# ── 주기 작업 (작업 확인 스레드) ──
+
+
+def _recover_stale(app):
+    now = datetime.now()
+    stale_before = now - timedelta(seconds=app.config.get("JOB_STALE_SECONDS", 300))
+    recovered = db.session.execute(
+        update(BackgroundJob)
+        .where(BackgroundJob.status == "running", BackgroundJob.heartbeat_at < stale_before)
+        .values(status="failed", error="작업자 응답이 없어 중단되었습니다.", finished_at=now)
+    ).rowcount
+    db.session.commit()
+    if recovered:
+        logger.warning("[작업] 응답 없는 작업 %d건 실패 처리", recovered)
+
+
+def purge_jobs(retention_days):
+    """보관 기간이 지난 완료 작업과 결과 파일을 지운다. 삭제 건수 반환."""
+    cutoff = datetime.now() - timedelta(days=retention_days)
+    old = BackgroundJob.query.filter(
+        BackgroundJob.status.in_(("succeeded", "failed")),
+        BackgroundJob.finished_at < cutoff,
+    ).with_entities(BackgroundJob.id).all()
+    ids = [row.id for row in old]
+    if not ids:
+        return 0
+    base = current_app.config["JOB_ARTIFACT_DIR"]
+    for job_id in ids:
+        shutil.rmtree(os.path.join(base, str(job_id)), ignore_errors=True)
+    BackgroundJob.query.filter(BackgroundJob.id.in_(ids)).delete(synchronize_session=False)
+    db.session.commit()
+    return len(ids)
+
+
+def dispatch_pending(app):
+    """중단 작업 정리, 대기 작업 가져오기 (작업 확인 스레드가 주기 호출)."""
+    global _last_purge
+    if app.config.get("JOB_INLINE"):
+        return
+    with app.app_context():
+        try:
+            _recover_stale(app)
+
+            with _lock:
+                free = app.config.get("JOB_WORKERS", 2) - len(_submitted)
+                busy = set(_submitted)
+            if free > 0:
+                queued = (
+                    BackgroundJob.query.filter(BackgroundJob.status == "queued")
+                    .with_entities(BackgroundJob.id)
+                    .order_by(BackgroundJob.id.asc())
+                    .limit(free + len(busy))
+                    .all()
+                )
+                for (job_id,) in queued:
+                    if job_id not in busy and free > 0:
+                        _submit(app, job_id)
+                        free -= 1
+
+            if time.time() - _last_purge > _PURGE_INTERVAL:
+                _last_purge = time.time()
+                purge_jobs(app.config.get("JOB_RETENTION_DAYS", 7))
+        except Exception as exc:
+            db.session.rollback()
+            logger.error("[작업] 대기 작업 처리 오류: %s", exc)
+        finally:
+            db.session.remove()
+
+
+def _runner_loop(app):
+    while True:
+        time.sleep(app.config.get("JOB_POLL_SECONDS", 5))
+        dispatch_pending(app)
+
+
+def _runner_disabled(app):
+    return os.environ.get("JOB_RUNNER_DISABLED", "") == "1" or app.config.get("JOB_INLINE")
+
+
+def _ensure_runner():
+    """요청 전 훅: 이 프로세스의 작업 확인 스레드가 없으면 시작한다."""
+    thread = _runner["thread"]
+    if thread is not None and thread.is_alive():
+        return
+    app = current_app._get_current_object()
+    if _runner_disabled(app):
+        return
+    with _lock:
+        thread = _runner["thread"]
+        if thread is not None and thread.is_alive():
+            return
+        _runner["thread"] = threading.Thread(
+            target=_runner_loop, args=(app,), name="job-runner", daemon=True
+        )
+        _runner["thread"].start()
+    logger.info("[작업] 작업 확인 스레드 시작 (pid=%d)", os.getpid())
+
+
+def init_job_runner(app):
+    """작업 확인 스레드를 웹 요청을 처리하는 프로세스에서만 시작하도록 등록한다.
+
+    스레드는 첫 요청 때 시작하므로 gunicorn 워커·개발 서버에서만 돌고, 요청을 받지 않는
+    프로세스 풀 워커와 스크립트는 대기 작업을 가져가지 않는다. 환경변수
+    JOB_RUNNER_DISABLED=1 로 명시적으로 끌 수 있다 (풀 초기화 함수·스크립트에서 설정).
+    """
+    if os.environ.get("JOB_RUNNER_DISABLED", "") == "1":
+        logger.info("[작업] JOB_RUNNER_DISABLED=1 — 작업 확인 스레드 비활성화")
+        return
+    app.before_request(_ensure_runner)
+
+
+# ── 작업 종류 ──
+
+
+@job_handler("payroll_generate")
+def _payroll_generate(ctx, month, salary_mode):
+    from services.payroll_bulk_service import compute_payslips_bulk
+
+    ctx.progress(5, f"{month} 급여 계산 중")
+    result = compute_payslips_bulk(month, salary_mode, trigger="job")
+    if isinstance(result, str):
+        raise JobError(result)
+    return result
+
+
+@job_handler("attendance_import")
+def _attendance_import(ctx, import_id):
+    from services.attendance_import import execute_pending_import
+
+    ctx.progress(5, "근태 업로드 반영 중")
+    try:
+        return execute_pending_import(import_id)
+    except ValueError as exc:
+        raise JobError("업로드 데이터가 만료되었습니다. 다시 업로드해주세요.") from exc
+
+
+@job_handler("payslip_pdf")
+def _payslip_pdf(ctx, month):
+    from models import Payslip
+    from services.payslip_pdf_service import get_cached_pdf
+
+    payslips = Payslip.query.filter(Payslip.month == month).order_by(Payslip.emp_name.asc()).all()
+    if not payslips:
+        raise JobError("해당 월 급여 데이터가 없습니다.")
+    ctx.progress(5, f"명세서 {len(payslips)}건 PDF 생성 중")
+    path, _etag = get_cached_pdf(payslips, current_app.config.get("HOURLY_WAGE", 10320))
+    shutil.copyfile(path, ctx.artifact_path(f"급여명세서_{month}.pdf"))
+    return {"count": len(payslips)}
+
+
+@job_handler("leave_sync")
+def _leave_sync(ctx, year, include_attendance=True):
+    from services.leave_service import sync_leave_balances
+
+    ctx.progress(5, f"{year}년 연차 동기화 중")
+    synced, skipped, auto_created = sync_leave_balances(year, include_attendance)
+    db.session.commit()
+    return {"synced": synced, "skipped": skipped, "auto_created": auto_created}
+
+
+def _write_export(ctx, out, download_name, fmt):
+    with open(ctx.artifact_path(f"{download_name}.{fmt}"), "wb") as f:
+        shutil.copyfileobj(out, f)
+    out.close()
+
+
+@job_handler("attendance_export")
+def _attendance_export(ctx, filters, fmt="xlsx"):
+    from services.export_service import attendance_export
+
+    ctx.progress(5, "근태기록 내보내기 중")
+    out, download_name = attendance_export(filters, fmt)
+    _write_export(ctx, out, download_name, fmt)
+    return {"file": f"{download_name}.{fmt}"}
+
+
+@job_handler("payslip_export")
+def _payslip_export(ctx, month, fmt="xlsx", site_id=None):
+    from services.export_service import payslip_export
+
+    ctx.progress(5, f"{month} 급여 내보내기 중")
+    out, download_name = payslip_export(month, fmt, site_id)
+    _write_export(ctx, out, download_name, fmt)
+    return {"file": f"{download_name}.{fmt}"}
+
+
+@job_handler("severance_export")
+def _severance_export(ctx, fmt="xlsx"):
+    from services.export_service import severance_export
+
+    ctx.progress(5, "퇴직금 내보내기 중")
+    out, download_name = severance_export(fmt)
+    _write_export(ctx, out, download_name, fmt)
+    return {"file": f"{download_name}.{fmt}"}
@@ -1,6 +1,5 @@
 """연차/퇴직금 계산 서비스 — FIFO 발생/사용 추적 포함."""
 
-import calendar as _cal
 import logging
 from datetime import date
 
@@ -8,11 +7,24 @@ from dateutil.relativedelta import relativedelta
 from sqlalchemy import extract, func
 from sqlalchemy.orm import joinedload
 
-from config import Config
-from models import AttendanceRecord, Employee, LeaveAccrual, LeaveBalance, LeaveUsage, OperationCalendarDay, Payslip, db
+from models import (
+    AttendanceMonthly,
+    AttendanceRecord,
+    Employee,
+    LeaveAccrual,
+    LeaveBalance,
+    LeaveUsage,
+    Payslip,
+    db,
+)
+from services import calendar_service
+from services.attendance_rollup_service import get_rollup, work_type_counts
 
 logger = logging.getLogger(__name__)
 
+# 만근 판정에서 출근으로 인정하는 근무 유형
+FULL_ATTENDANCE_WORK_TYPES = ("normal", "night", "annual")
+
 
 # ────────────────────────────────────────────
 # 기존: 연차 계산
@@ -252,35 +264,10 @@ def delete_accrual(accrual_id):
 def get_working_days(year, month):
     """해당 월의 소정근로일수(주말·공휴일 제외 평일)를 반환한다.
 
-    판단 우선순위:
-    1) OperationCalendarDay 테이블에 해당 월 데이터가 있으면 day_type='workday' 수
-    2) 없으면 config 공휴일 + 주말 제외 평일 수
+    운영 캘린더(OperationCalendarDay 오버라이드 + config 공휴일 + 주말)의
+    연도 배열에서 'workday' 일수를 센다.
     """
-    last_day = _cal.monthrange(year, month)[1]
-    start = date(year, month, 1)
-    end = date(year, month, last_day)
-
-    # OperationCalendarDay 오버라이드 확인
-    overrides = {
-        d.work_date: d.day_type
-        for d in OperationCalendarDay.query.filter(
-            OperationCalendarDay.work_date >= start,
-            OperationCalendarDay.work_date <= end,
-        ).all()
-    }
-
-    holidays_set = set(Config.get_public_holidays(year))
-    working = 0
-    for day_num in range(1, last_day + 1):
-        d = date(year, month, day_num)
-        if d in overrides:
-            if overrides[d] == "workday":
-                working += 1
-        else:
-            # 기본: 토(5)/일(6) + 공휴일 제외
-            if d.weekday() < 5 and d.strftime("%Y-%m-%d") not in holidays_set:
-                working += 1
-    return working
+    return calendar_service.working_days(year, month)
 
 
 def check_full_attendance(employee_id, year, month):
@@ -296,20 +283,8 @@ def check_full_attendance(employee_id, year, month):
     if required == 0:
         return False, 0, 0
 
-    last_day = _cal.monthrange(year, month)[1]
-    start = date(year, month, 1)
-    end = date(year, month, last_day)
-
-    worked = (
-        db.session.query(func.count(AttendanceRecord.id))
-        .filter(
-            AttendanceRecord.employee_id == employee_id,
-            AttendanceRecord.work_date >= start,
-            AttendanceRecord.work_date <= end,
-            AttendanceRecord.work_type.in_(("normal", "night", "annual")),
-        )
-        .scalar()
-    ) or 0
+    counts = work_type_counts(get_rollup(employee_id, f"{year:04d}-{month:02d}"))
+    worked = sum(counts.get(work_type, 0) for work_type in FULL_ATTENDANCE_WORK_TYPES)
 
     return worked >= required, worked, required
 
@@ -324,16 +299,14 @@ def _auto_generate_accruals(employee_id, year):
 
     # 해당 직원의 해당 연도 근태 데이터가 있는 월 목록
     attendance_months = (
-        db.session.query(
-            func.distinct(extract("month", AttendanceRecord.work_date))
-        )
+        db.session.query(AttendanceMonthly.month)
         .filter(
-            AttendanceRecord.employee_id == employee_id,
-            extract("year", AttendanceRecord.work_date) == year,
+            AttendanceMonthly.employee_id == employee_id,
+            AttendanceMonthly.month.like(f"{year:04d}-%"),
         )
         .all()
     )
-    months_with_data = {int(m[0]) for m in attendance_months if m[0]}
+    months_with_data = {int(m[0][5:7]) for m in attendance_months}
 
     if not months_with_data:
         return 0
@@ -669,60 +642,40 @@ def get_employee_leave_detail(employee_id, year):
 # 퇴직금 (기존 유지)
 # ────────────────────────────────────────────
 
-def calc_severance(employee_id):
-    """퇴직급여법에 따라 퇴직금을 계산한다.
+def _severance_entry(name, hire_date, resign_date, total_gross, months_count, today=None):
+    """퇴직금 계산 규칙 (단건/일괄 공용).
 
-    - 1년 이상 근속 대상
-    - 평균임금 = 최근 3개월 Payslip.gross 합 / 90일
-    - 퇴직금 = 평균일급 x 30 x (근속일수 / 365)
-
-    Returns:
-        dict: 계산 결과 또는 에러 메시지
+    Args:
+        total_gross: 최근 3개월 Payslip.gross 합
+        months_count: 합산한 명세서 수 (최대 3)
     """
-    emp = db.session.get(Employee, employee_id)
-    if not emp:
-        return {"error": "직원을 찾을 수 없습니다."}
-
-    if not emp.hire_date:
-        return {"error": "입사일이 등록되지 않았습니다."}
-
-    end_date = emp.resign_date or date.today()
-    service_days = (end_date - emp.hire_date).days
+    end_date = resign_date or today or date.today()
+    service_days = (end_date - hire_date).days
 
     if service_days < 365:
         return {
-            "employee_name": emp.name,
-            "hire_date": emp.hire_date.strftime("%Y-%m-%d"),
+            "employee_name": name,
+            "hire_date": hire_date.strftime("%Y-%m-%d"),
             "service_days": service_days,
             "eligible": False,
             "message": "근속 1년 미만으로 퇴직금 대상이 아닙니다.",
             "severance": 0,
         }
 
-    recent_payslips = (
-        Payslip.query
-        .filter_by(employee_id=employee_id)
-        .order_by(Payslip.month.desc())
-        .limit(3)
-        .all()
-    )
-
-    if not recent_payslips:
+    if not months_count:
         return {
-            "employee_name": emp.name,
-            "hire_date": emp.hire_date.strftime("%Y-%m-%d"),
+            "employee_name": name,
+            "hire_date": hire_date.strftime("%Y-%m-%d"),
             "service_days": service_days,
             "eligible": True,
             "message": "급여 데이터가 없어 퇴직금을 계산할 수 없습니다.",
             "severance": 0,
         }
 
-    total_gross = sum(p.gross for p in recent_payslips)
-    months_count = len(recent_payslips)
     if months_count < 3:
         return {
-            "employee_name": emp.name,
-            "hire_date": emp.hire_date.strftime("%Y-%m-%d"),
+            "employee_name": name,
+            "hire_date": hire_date.strftime("%Y-%m-%d"),
             "service_days": service_days,
             "eligible": True,
             "message": f"급여 데이터가 {months_count}건뿐입니다. 최소 3개월 데이터가 필요합니다.",
@@ -732,8 +685,8 @@ def calc_severance(employee_id):
     severance = round(avg_daily * 30 * (service_days / 365))
 
     return {
-        "employee_name": emp.name,
-        "hire_date": emp.hire_date.strftime("%Y-%m-%d"),
+        "employee_name": name,
+        "hire_date": hire_date.strftime("%Y-%m-%d"),
         "end_date": end_date.strftime("%Y-%m-%d"),
         "service_days": service_days,
         "service_years": round(service_days / 365, 1),
@@ -743,3 +696,98 @@ def calc_severance(employee_id):
         "avg_daily_wage": round(avg_daily),
         "severance": severance,
     }
+
+
+def calc_severance(employee_id):
+    """퇴직급여법에 따라 퇴직금을 계산한다.
+
+    - 1년 이상 근속 대상
+    - 평균임금 = 최근 3개월 Payslip.gross 합 / 90일
+    - 퇴직금 = 평균일급 x 30 x (근속일수 / 365)
+
+    Returns:
+        dict: 계산 결과 또는 에러 메시지
+    """
+    emp = db.session.get(Employee, employee_id)
+    if not emp:
+        return {"error": "직원을 찾을 수 없습니다."}
+
+    if not emp.hire_date:
+        return {"error": "입사일이 등록되지 않았습니다."}
+
+    recent_payslips = (
+        Payslip.query
+        .filter_by(employee_id=employee_id)
+        .order_by(Payslip.month.desc())
+        .limit(3)
+        .all()
+    )
+    return _severance_entry(
+        emp.name, emp.hire_date, emp.resign_date,
+        sum(p.gross for p in recent_payslips), len(recent_payslips),
+    )
+
+
+def severance_report(today=None):
+    """재직 중인 전체 직원의 퇴직금을 한 번의 조회로 계산한다.
+
+    직원별 최근 3개월 gross 는 ROW_NUMBER() 윈도 함수로 순위를 매겨 합산하고,
+    직원 목록과 외부 조인하여 한 쿼리로 가져온다. 명세서가 저장되는 즉시
+    다음 조회에 반영되므로 별도 집계 테이블을 두지 않는다.
+
+    Returns:
+        dict {employees: [...], summary: {...}} — 항목은 calc_severance() 결과에
+        employee_id, birth_date 를 더한 형태 (입사일 미등록은 error 항목)
+    """
+    ranked = (
+        db.session.query(
+            Payslip.employee_id.label("employee_id"),
+            Payslip.gross.label("gross"),
+            func.row_number().over(
+                partition_by=Payslip.employee_id, order_by=Payslip.month.desc()
+            ).label("rn"),
+        )
+        .subquery()
+    )
+    recent = (
+        db.session.query(
+            ranked.c.employee_id,
+            func.sum(ranked.c.gross).label("total_gross"),
+            func.count().label("months"),
+        )
+        .filter(ranked.c.rn <= 3)
+        .group_by(ranked.c.employee_id)
+        .subquery()
+    )
+    rows = (
+        db.session.query(
+            Employee.id, Employee.name, Employee.birth_date, Employee.hire_date, Employee.resign_date,
+            recent.c.total_gross, recent.c.months,
+        )
+        .outerjoin(recent, recent.c.employee_id == Employee.id)
+        .filter(Employee.is_active.is_(True))
+        .order_by(Employee.name.asc(), Employee.id.asc())
+        .all()
+    )
+
+    today = today or date.today()
+    entries = []
+    for emp_id, name, birth_date, hire_date, resign_date, total_gross, months in rows:
+        if not hire_date:
+            entry = {"employee_name": name, "error": "입사일이 등록되지 않았습니다.", "severance": 0}
+        else:
+            entry = _severance_entry(
+                name, hire_date, resign_date, int(total_gross or 0), months or 0, today,
+            )
+        entry.update(employee_id=emp_id, birth_date=birth_date)
+        entries.append(entry)
+
+    return {
+        "employees": entries,
+        "summary": {
+            "employees": len(entries),
+            "eligible": sum(1 for e in entries if e.get("eligible")),
+            "calculated": sum(1 for e in entries if e["severance"]),
+            "total_severance": sum(e["severance"] for e in entries),
+        },
+    }
@@ -0,0 +1,302 @@
+"""월별 운영 지표(monthly_metrics) 유지·추이 조회 서비스.
+
+대시보드 추이 차트가 월 선택을 12번 바꿔 가며 전체 집계를 다시 돌리지 않도록,
+월 × 현장 지표를 monthly_metrics 에 미리 쌓아 두고 추이 API 는 그 행만 읽는다.
+
+- 원본: 근태 월 집계(attendance_monthly), 급여명세서, 승인된 가불
+- 근태 월 집계가 다시 계산되면(attendance_rollup_service) 그 월을 재계산 대상으로 표시
+- 급여명세서·가불 ORM 추가/수정/삭제, Query.update()/delete(): 해당 월을 표시
+- Core 일괄 쓰기(급여 일괄 계산, 현장 재배정): touch_metrics() 로 직접 표시
+- commit 직전(before_commit)에 표시된 월만 원본 집계로 다시 만들어 같은 트랜잭션으로 교체
+  (근태 집계 리스너보다 뒤에 등록해야 갱신된 근태 집계를 읽는다)
+
+rebuild_metrics() 는 전체(또는 특정 월)를 다시 만든다.
+"""
+import logging
+from datetime import date, datetime
+
+from sqlalchemy import and_, event, func, literal, or_, select, union_all
+
+from models import AdvanceRequest, AttendanceMonthly, MonthlyMetric, Payslip, Site, db
+from services.payroll_dirty_service import _attr_values
+
+logger = logging.getLogger(__name__)
+
+_PENDING_KEY = "monthly_metrics_months"
+_registered = False
+
+TOTAL_SITE = 0  # 전체 합계 행의 site_id
+MAX_MONTHS = 24
+
+# 추이 API 가 돌려주는 지표 (MonthlyMetric 컬럼)
+METRICS = (
+    "headcount",
+    "attendance_records",
+    "total_hours",
+    "ot_hours",
+    "night_hours",
+    "holiday_hours",
+    "payslip_count",
+    "gross",
+    "net",
+    "advance_count",
+    "advance_amount",
+)
+_HOUR_METRICS = {"total_hours", "ot_hours", "night_hours", "holiday_hours"}
+
+
+def month_window(months, end=None):
+    """end 월(기본 당월)까지 months 개월의 'YYYY-MM' 목록 (오래된 달부터)."""
+    if end:
+        year, mon = (int(part) for part in end.split("-"))
+    else:
+        today = date.today()
+        year, mon = today.year, today.month
+    result = []
+    for _ in range(months):
+        result.append(f"{year:04d}-{mon:02d}")
+        mon -= 1
+        if mon == 0:
+            year, mon = year - 1, 12
+    return result[::-1]
+
+
+# ── 계산 ──
+
+def _empty_row(month, site_id, now):
+    row = {name: 0 for name in METRICS}
+    row.update(month=month, site_id=site_id, updated_at=now)
+    return row
+
+
+def _grouped(month_column, site_column, values):
+    """(월, 현장)별 집계 SELECT — 지표 컬럼 순서를 맞추고 없는 지표는 0 으로 채운다."""
+    columns = [month_column.label("month"), site_column.label("site_id")]
+    columns += [values.get(name, literal(0)).label(name) for name in METRICS]
+    return select(*columns).group_by(month_column, site_column)
+
+
+def _compute(session, months):
+    """{(month, site_id): 행 dict} — 전체 합계(site_id=0)와 현장별 행 (조회 1번)."""
+    now = datetime.now()
+    rows = {}
+
+    def add(month, site_id, values):
+        for key in (TOTAL_SITE, site_id) if site_id else (TOTAL_SITE,):
+            row = rows.get((month, key))
+            if row is None:
+                row = rows[(month, key)] = _empty_row(month, key, now)
+            for name, value in values.items():
+                row[name] += value or 0
+
+    am = AttendanceMonthly
+    sources = union_all(
+        _grouped(am.month, am.site_id, {
+            "headcount": func.count(am.id),
+            "attendance_records": func.sum(am.record_count),
+            "total_hours": func.sum(am.total_hours),
+            "ot_hours": func.sum(am.overtime_hours),
+            "night_hours": func.sum(am.night_hours),
+            "holiday_hours": func.sum(am.holiday_hours),
+        }).where(am.month.in_(months)),
+        _grouped(Payslip.month, Payslip.site_id, {
+            "payslip_count": func.count(Payslip.id),
+            "gross": func.sum(Payslip.gross),
+            "net": func.sum(Payslip.net),
+        }).where(Payslip.month.in_(months)),
+        # 가불에는 현장이 없으므로 같은 달 근태 집계의 현장으로 나눈다
+        _grouped(AdvanceRequest.request_month, am.site_id, {
+            "advance_count": func.count(AdvanceRequest.id),
+            "advance_amount": func.sum(AdvanceRequest.amount),
+        })
+        .select_from(AdvanceRequest)
+        .outerjoin(am, and_(
+            am.employee_id == AdvanceRequest.employee_id,
+            am.month == AdvanceRequest.request_month,
+        ))
+        .where(AdvanceRequest.status == "approved", AdvanceRequest.request_month.in_(months)),
+    )
+    for row in session.execute(sources).mappings():
+        add(row["month"], row["site_id"], {name: row[name] for name in METRICS})
+
+    return rows
+
+
+def refresh_metrics(session, months):
+    """월 목록의 지표 행을 원본 집계로 다시 만든다 (commit 은 호출자).
+
+    Returns:
+        int: 다시 쓴 지표 행 수
+    """
+    months = sorted({m for m in months if m})
+    if not months:
+        return 0
+    rows = list(_compute(session, months).values())
+    table = MonthlyMetric.__table__
+    session.execute(table.delete().where(table.c.month.in_(months)))
+    if rows:
+        session.execute(table.insert(), rows)
+    return len(rows)
+
+
+def rebuild_metrics(month=None):
+    """지표 테이블을 전체(또는 한 달만) 다시 만들고 commit 한다.
+
+    Returns:
+        dict {"months": 대상 월 수, "rows": 지표 행 수}
+    """
+    session = db.session
+    if month:
+        months = [month]
+    else:
+        months = set(session.execute(select(AttendanceMonthly.month).distinct()).scalars())
+        months.update(session.execute(select(Payslip.month).distinct()).scalars())
+        months.update(session.execute(
+            select(AdvanceRequest.request_month).where(AdvanceRequest.status == "approved").distinct()
+        ).scalars())
+        session.execute(MonthlyMetric.__table__.delete())
+    rows = refresh_metrics(session, months)
+    session.info.pop(_PENDING_KEY, None)
+    session.commit()
+    logger.info("[월별 지표 재구성] %s: %d개월 → %d행", month or "전체", len(months), rows)
+    return {"months": len(months), "rows": rows}
+
+
+# ── 변경 추적 ──
+
+def touch_metrics(months, session=None):
+    """Core 일괄 쓰기 후 월을 재계산 대상으로 표시한다 (commit 직전에 다시 계산)."""
+    session = session or db.session
+    session.info.setdefault(_PENDING_KEY, set()).update(m for m in months if m)
+
+
+def _collect_months(session):
+    months = set()
+    changed = list(session.new) + list(session.deleted) + [
+        obj for obj in session.dirty if session.is_modified(obj, include_collections=False)
+    ]
+    for obj in changed:
+        if isinstance(obj, Payslip):
+            months.update(_attr_values(obj, "month"))
+        elif isinstance(obj, AdvanceRequest) and "approved" in _attr_values(obj, "status"):
+            months.update(_attr_values(obj, "request_month"))
+    return months
+
+
+def _after_flush(session, flush_context):
+    months = _collect_months(session)
+    if months:
+        touch_metrics(months, session)
+
+
+def _on_orm_execute(orm_execute_state):
+    """Query.update()/delete() 대상 월을 실행 전에 조회해 둔다."""
+    if not (orm_execute_state.is_update or orm_execute_state.is_delete):
+        return
+    mappers = {m.class_ for m in orm_execute_state.all_mappers}
+    if Payslip in mappers:
+        column = Payslip.month
+    elif AdvanceRequest in mappers:
+        column = AdvanceRequest.request_month
+    else:
+        return
+    stmt = select(column).distinct()
+    whereclause = orm_execute_state.statement.whereclause
+    if whereclause is not None:
+        stmt = stmt.where(whereclause)
+    session = orm_execute_state.session
+    touch_metrics(session.execute(stmt).scalars().all(), session)
+
+
+def _before_commit(session):
+    if session.new or session.dirty or session.deleted:
+        session.flush()
+    months = session.info.pop(_PENDING_KEY, None)
+    if months:
+        refresh_metrics(session, months)
+
+
+def _after_rollback(session):
+    session.info.pop(_PENDING_KEY, None)
+
+
+def init_metrics_tracking():
+    """세션 이벤트 리스너를 등록한다 (프로세스당 1회, 근태 집계 리스너 다음)."""
+    global _registered
+    if _registered:
+        return
+    event.listen(db.session, "after_flush", _after_flush)
+    event.listen(db.session, "do_orm_execute", _on_orm_execute)
+    event.listen(db.session, "before_commit", _before_commit)
+    event.listen(db.session, "after_rollback", _after_rollback)
+    _registered = True
+
+
+# ── 조회 ──
+
+def _value(name, value):
+    if name in _HOUR_METRICS:
+        return round(float(value or 0), 1)
+    return int(value or 0)
+
+
+def trend(site_id=TOTAL_SITE, months=12, end=None):
+    """한 현장(기본 전체)의 월별 지표 추이. 지표가 없는 달은 0.
+
+    Returns:
+        dict {"site_id", "months": [YYYY-MM...], "series": {지표: [값...]}}
+    """
+    window = month_window(months, end)
+    stored = {
+        row.month: row
+        for row in MonthlyMetric.query.filter(
+            MonthlyMetric.site_id == site_id,
+            MonthlyMetric.month >= window[0],
+            MonthlyMetric.month <= window[-1],
+        )
+    }
+    return {
+        "site_id": site_id,
+        "months": window,
+        "series": {
+            name: [_value(name, getattr(stored.get(m), name, 0)) for m in window]
+            for name in METRICS
+        },
+    }
+
+
+def site_trends(metric, months=12, end=None):
+    """현장별 한 지표의 월별 추이 (운영 중이거나 기간 내 지표가 있는 현장).
+
+    Returns:
+        dict {"metric", "months", "sites": [{"id", "name", "values": [...]}]}
+    """
+    window = month_window(months, end)
+    column = getattr(MonthlyMetric, metric)
+    values = {}
+    for site_id, month, value in db.session.execute(
+        select(MonthlyMetric.site_id, MonthlyMetric.month, column).where(
+            MonthlyMetric.site_id != TOTAL_SITE,
+            MonthlyMetric.month >= window[0],
+            MonthlyMetric.month <= window[-1],
+        )
+    ):
+        values.setdefault(site_id, {})[month] = value
+
+    sites = db.session.execute(
+        select(Site.id, Site.name)
+        .where(or_(Site.is_active.is_(True), Site.id.in_(list(values))))
+        .order_by(Site.name)
+    ).all()
+    return {
+        "metric": metric,
+        "months": window,
+        "sites": [
+            {
+                "id": site_id,
+                "name": name,
+                "values": [_value(metric, values.get(site_id, {}).get(m)) for m in window],
+            }
+            for site_id, name in sites
+        ],
+    }
@@ -0,0 +1,205 @@
+"""키셋(cursor) 페이지네이션 공통 모듈.
+
+OFFSET 대신 마지막으로 본 행의 (정렬 키..., id) 값을 불투명 커서로 넘기고, 다음
+페이지는 "그 값 다음" 조건 + LIMIT 로 읽는다. (정렬 키, id) 복합 인덱스가 있으면
+몇 번째 페이지든 인덱스 범위 탐색 한 번이라 1페이지와 500페이지의 비용이 같다.
+
+- 커서: 정렬 키 값 + 방향을 JSON → base64url 로 감싼 문자열 (클라이언트는 해석하지 않음)
+- 이전 페이지: 정렬 방향을 뒤집어 읽은 뒤 순서를 되돌린다
+- 전체 건수(선택): COUNT 를 상한(total_cap)까지만 세어 비용을 제한한다 (넘으면 total_capped)
+- NULL 정렬 키는 가장 작은 값으로 취급한다 (SQLite/MySQL 정렬 규칙과 같음)
+"""
+import base64
+import binascii
+import json
+from dataclasses import dataclass, field
+from datetime import date, datetime
+
+from flask import request, url_for
+from sqlalchemy import and_, false, func, or_
+
+from models import db
+
+NEXT, PREV = "n", "p"
+
+
+class InvalidCursor(ValueError):
+    """해석할 수 없거나 정렬 기준과 맞지 않는 커서."""
+
+
+@dataclass
+class CursorPage:
+    items: list
+    per_page: int
+    next_cursor: str | None = None
+    prev_cursor: str | None = None
+    total: int | None = None
+    total_capped: bool = False
+    next_url: str | None = field(default=None, repr=False)
+    prev_url: str | None = field(default=None, repr=False)
+    first_url: str | None = field(default=None, repr=False)
+
+    @property
+    def has_next(self):
+        return self.next_cursor is not None
+
+    @property
+    def has_prev(self):
+        return self.prev_cursor is not None
+
+    def to_dict(self):
+        return {
+            "next_cursor": self.next_cursor,
+            "prev_cursor": self.prev_cursor,
+            "per_page": self.per_page,
+            "total": self.total,
+            "total_capped": self.total_capped,
+        }
+
+
+# ── 커서 인코딩 ──
+
+def _dump_value(value):
+    if isinstance(value, datetime):
+        return {"dt": value.isoformat()}
+    if isinstance(value, date):
+        return {"d": value.isoformat()}
+    return value
+
+
+def _load_value(value):
+    if isinstance(value, dict):
+        if "dt" in value:
+            return datetime.fromisoformat(value["dt"])
+        if "d" in value:
+            return date.fromisoformat(value["d"])
+        raise InvalidCursor("알 수 없는 커서 값")
+    return value
+
+
+def encode_cursor(values, direction=NEXT):
+    payload = json.dumps(
+        {"v": [_dump_value(v) for v in values], "d": direction},
+        separators=(",", ":"), ensure_ascii=False,
+    )
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(token, width):
+    """커서 → (정렬 키 값 목록, 방향). 형식이 틀리면 InvalidCursor."""
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+        payload = json.loads(raw.decode("utf-8"))
+        values = [_load_value(v) for v in payload["v"]]
+        direction = payload["d"]
+    except (binascii.Error, UnicodeDecodeError, ValueError, KeyError, TypeError) as exc:
+        raise InvalidCursor("잘못된 커서입니다.") from exc
+    if len(values) != width or direction not in (NEXT, PREV):
+        raise InvalidCursor("잘못된 커서입니다.")
+    return values, direction
+
+
+# ── 조건 생성 ──
+
+def _nullable(col):
+    return getattr(getattr(col, "expression", col), "nullable", True)
+
+
+def _equals(col, value):
+    return col.is_(None) if value is None else col == value
+
+
+def _beyond(col, descending, value):
+    """정렬 순서상 value 보다 뒤에 오는 행 조건 (NULL = 최솟값). 없으면 None."""
+    if descending:
+        if value is None:
+            return None
+        return or_(col < value, col.is_(None)) if _nullable(col) else col < value
+    return col.isnot(None) if value is None else col > value
+
+
+def _after(order, values):
+    clauses = []
+    for i, ((col, descending), value) in enumerate(zip(order, values)):
+        beyond = _beyond(col, descending, value)
+        if beyond is None:
+            continue
+        ties = [_equals(c, v) for (c, _), v in zip(order[:i], values[:i])]
+        clauses.append(and_(*ties, beyond))
+    return or_(*clauses) if clauses else false()
+
+
+def _key_of(item, order):
+    return [getattr(item, col.key) for col, _ in order]
+
+
+def _count_capped(query, cap):
+    limited = query.enable_eagerloads(False).order_by(None).limit(cap + 1).subquery()
+    total = db.session.query(func.count()).select_from(limited).scalar() or 0
+    return min(total, cap), total > cap
+
+
+def keyset_page(query, order, cursor=None, per_page=20, count_total=False, total_cap=10000):
+    """키셋 방식으로 한 페이지를 읽는다.
+
+    Args:
+        query: 필터가 적용된 Query (order_by 없이)
+        order: [(컬럼, 내림차순 여부), ...] — 마지막은 고유 키(id)여야 한다
+        cursor: 이전 응답의 next_cursor / prev_cursor (None 이면 첫 페이지)
+        count_total: True 면 total_cap 까지만 센 전체 건수를 함께 돌려준다
+
+    Returns:
+        CursorPage
+    """
+    direction = NEXT
+    values = None
+    if cursor:
+        values, direction = decode_cursor(cursor, len(order))
+
+    # 이전 페이지는 방향을 뒤집어 읽고 순서를 되돌린다
+    effective = order if direction == NEXT else [(col, not desc) for col, desc in order]
+    ordered = query.order_by(*[col.desc() if desc else col.asc() for col, desc in effective])
+    if values is not None:
+        ordered = ordered.filter(_after(effective, values))
+    rows = ordered.limit(per_page + 1).all()
+    more = len(rows) > per_page
+    rows = rows[:per_page]
+    if direction == PREV:
+        rows.reverse()
+
+    page = CursorPage(items=rows, per_page=per_page)
+    if rows:
+        first, last = _key_of(rows[0], order), _key_of(rows[-1], order)
+        if direction == NEXT:
+            page.next_cursor = encode_cursor(last, NEXT) if more else None
+            page.prev_cursor = encode_cursor(first, PREV) if values is not None else None
+        else:
+            page.next_cursor = encode_cursor(last, NEXT)
+            page.prev_cursor = encode_cursor(first, PREV) if more else None
+    if count_total:
+        page.total, page.total_capped = _count_capped(query, total_cap)
+    return page
+
+
+def paginate_request(query, order, per_page=20, max_per_page=200, count_total=False, strict=False):
+    """요청의 ?cursor=&per_page= 로 keyset_page() 를 호출하고 이동 URL 을 채운다.
+
+    잘못된 커서는 strict 면 InvalidCursor 를 그대로 올리고, 아니면 첫 페이지를 보여준다.
+    """
+    per_page = max(1, min(request.args.get("per_page", per_page, type=int) or per_page, max_per_page))
+    cursor = request.args.get("cursor") or None
+    try:
+        page = keyset_page(query, order, cursor, per_page, count_total)
+    except InvalidCursor:
+        if strict:
+            raise
+        page = keyset_page(query, order, None, per_page, count_total)
+
+    args = {k: v for k, v in request.args.items() if k not in ("cursor", "page")}
+    endpoint_args = {**(request.view_args or {}), **args}
+    page.first_url = url_for(request.endpoint, **endpoint_args)
+    if page.next_cursor:
+        page.next_url = url_for(request.endpoint, **endpoint_args, cursor=page.next_cursor)
+    if page.prev_cursor:
+        page.prev_url = url_for(request.endpoint, **endpoint_args, cursor=page.prev_cursor)
+    return page
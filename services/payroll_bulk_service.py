@@ -0,0 +1,358 @@
+"""월 급여 일괄 계산 (set-based bulk payroll).
+
+직원별로 6~8회씩 조회하던 방식 대신, 한 달치 입력(근태 집계, 출근일,
+캘린더 오버라이드, 직원, 급여 설정, 가불, 기존 명세서)을 고정 횟수의
+쿼리로 미리 적재하고 메모리에서 계산한 뒤 한 번의 bulk upsert 로 저장한다.
+금액 계산은 payroll_kernel 의 컬럼형 커널이 맡으며, payslip_service 헬퍼와
+연산 순서·반올림이 같으므로 직원별 경로와 결과가 동일하다.
+"""
+import logging
+import time
+from contextlib import contextmanager
+from datetime import datetime
+
+from flask import current_app
+from sqlalchemy import event, false, func
+
+from models import AdvanceRequest, AttendanceMonthly, Employee, Payslip, PayrollStaleMark, db
+from services.attendance_rollup_service import bitmap_dates
+from services.payslip_service import (
+    _count_attendance,
+    _effective_salary_mode,
+)
+from services.calendar_service import get_year_calendar
+from services.payroll_kernel import compute_columns, pack_columns
+from services.monthly_metrics_service import touch_metrics
+from services.payslip_pdf_service import invalidate_pdf_cache
+from services.wage_service import resolve_wage_configs
+
+logger = logging.getLogger(__name__)
+
+# upsert 시 갱신하는 컬럼 (emp_name/dept/created_at/is_manual 은 기존 값 유지)
+PAYSLIP_VALUE_FIELDS = [
+    "salary_mode",
+    "total_work_hours", "ot_hours", "night_hours", "holiday_hours",
+    "base_salary", "weekly_holiday_pay", "ot_pay", "night_pay", "holiday_pay",
+    "absent_days", "absent_deduction", "weekly_holiday_deduction",
+    "gross", "tax", "pension", "health_ins", "longterm_care", "employment_ins",
+    "insurance", "advance_deduction", "net",
+]
+
+
+class PhaseStats:
+    """단계별 쿼리 수/소요 시간 측정기."""
+
+    def __init__(self):
+        self.phases = []
+        self._queries = 0
+
+    def _on_execute(self, *args, **kwargs):
+        self._queries += 1
+
+    @contextmanager
+    def phase(self, name):
+        # 엔진 전체가 아니라 현재 세션의 커넥션에만 붙여 다른 스레드의 쿼리는 세지 않는다
+        conn = db.session.connection()
+        event.listen(conn, "before_cursor_execute", self._on_execute)
+        start_queries = self._queries
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            event.remove(conn, "before_cursor_execute", self._on_execute)
+            self.phases.append({
+                "phase": name,
+                "queries": self._queries - start_queries,
+                "ms": round((time.perf_counter() - start) * 1000, 2),
+            })
+
+    def summary(self):
+        return {
+            "queries": sum(p["queries"] for p in self.phases),
+            "elapsed_ms": round(sum(p["ms"] for p in self.phases), 2),
+            "phases": list(self.phases),
+        }
+
+
+def load_month_inputs(month, stats=None, employee_ids=None, wage_index=None):
+    """월 급여 계산에 필요한 입력을 고정 횟수의 쿼리로 적재한다.
+
+    Args:
+        employee_ids: 지정 시 해당 직원만 적재 (변경분 재계산용)
+        wage_index: 재사용할 WageIndex (여러 달 연속 적재용)
+
+    Returns:
+        dict 또는 None (해당 월 근태 기록 없음)
+    """
+    stats = stats or PhaseStats()
+    in_month = [AttendanceMonthly.month == month]
+    if employee_ids is not None:
+        in_month.append(AttendanceMonthly.employee_id.in_(list(employee_ids)))
+
+    with stats.phase("attendance"):
+        # 직원×월 집계 테이블에서 읽는다 (근태 행 수와 무관하게 직원 수만큼)
+        aggregates = (
+            db.session.query(
+                AttendanceMonthly.employee_id,
+                AttendanceMonthly.emp_name,
+                AttendanceMonthly.dept,
+                AttendanceMonthly.total_hours,
+                AttendanceMonthly.overtime_hours.label("ot_hours"),
+                AttendanceMonthly.night_hours,
+                AttendanceMonthly.holiday_hours,
+                AttendanceMonthly.attended_bitmap,
+            )
+            .filter(*in_month)
+            .order_by(AttendanceMonthly.employee_id)
+            .all()
+        )
+        if not aggregates:
+            return None
+
+        attended = {
+            row.employee_id: bitmap_dates(month, row.attended_bitmap)
+            for row in aggregates
+            if row.attended_bitmap
+        }
+
+    with stats.phase("calendar"):
+        calendar = get_year_calendar(int(month.split("-")[0]))
+        overrides = calendar.month_overrides(month)
+        schedule = calendar.month_schedule(month)
+
+    emp_ids = [row.employee_id for row in aggregates]
+
+    with stats.phase("employees"):
+        employees = {
+            row.id: row
+            for row in db.session.query(
+                Employee.id, Employee.site_id, Employee.insurance_type
+            ).filter(Employee.id.in_(emp_ids)).all()
+        }
+
+    with stats.phase("wage_configs"):
+        employee_sites = {
+            eid: (employees[eid].site_id if eid in employees else None)
+            for eid in emp_ids
+        }
+        wage_cfgs = resolve_wage_configs(employee_sites, fresh=True, index=wage_index)
+
+    with stats.phase("advances"):
+        advances = dict(
+            db.session.query(
+                AdvanceRequest.employee_id,
+                func.coalesce(func.sum(AdvanceRequest.amount), 0),
+            )
+            .filter(
+                AdvanceRequest.request_month == month,
+                AdvanceRequest.status == "approved",
+                AdvanceRequest.employee_id.in_(emp_ids),
+            )
+            .group_by(AdvanceRequest.employee_id)
+            .all()
+        )
+
+    with stats.phase("existing"):
+        existing = dict(
+            db.session.query(Payslip.employee_id, Payslip.is_manual)
+            .filter(Payslip.month == month, Payslip.employee_id.in_(emp_ids))
+            .all()
+        )
+
+    return {
+        "month": month,
+        "aggregates": aggregates,
+        "attended": attended,
+        "overrides": overrides,
+        "schedule": schedule,
+        "employees": employees,
+        "wage_cfgs": wage_cfgs,
+        "advances": advances,
+        "existing": existing,
+    }
+
+
+def compute_month_rows(inputs, salary_mode, cfg):
+    """적재된 입력으로 직원별 명세서 값을 메모리에서 계산한다 (DB 접근 없음).
+
+    금액 계산은 payroll_kernel 의 컬럼형 커널로 전 직원을 한 번에 수행한다.
+
+    Returns:
+        list of dict: employee_id/site_id/emp_name/dept/month + PAYSLIP_VALUE_FIELDS
+    """
+    month = inputs["month"]
+    scheduled_workdays, weeks = inputs["schedule"]
+    aggregates = inputs["aggregates"]
+    if not aggregates:
+        return []
+
+    wage_cfgs, modes, hours, attendance, ins_types, advances = [], [], [], [], [], []
+    for agg in aggregates:
+        employee_id = agg.employee_id
+        wage_cfg = inputs["wage_cfgs"][employee_id]
+        emp = inputs["employees"].get(employee_id)
+        wage_cfgs.append(wage_cfg)
+        modes.append(_effective_salary_mode(wage_cfg, salary_mode))
+        hours.append((
+            round(agg.total_hours or 0, 2),
+            round(agg.ot_hours or 0, 2),
+            round(agg.night_hours or 0, 2),
+            round(agg.holiday_hours or 0, 2),
+        ))
+        attendance.append(_count_attendance(
+            scheduled_workdays, weeks, inputs["attended"].get(employee_id, set())
+        ))
+        ins_types.append(emp.insurance_type if emp else "3.3%")
+        advances.append(inputs["advances"].get(employee_id, 0))
+
+    cols = pack_columns(wage_cfgs, modes, hours, attendance, ins_types, advances)
+    amounts = {k: v.tolist() for k, v in compute_columns(cols, cfg).items()}
+
+    rows = []
+    for i, agg in enumerate(aggregates):
+        total_h, ot_h, night_h, holiday_h = hours[i]
+        emp = inputs["employees"].get(agg.employee_id)
+        row = {
+            "employee_id": agg.employee_id,
+            "site_id": emp.site_id if emp else None,
+            "emp_name": agg.emp_name,
+            "dept": agg.dept,
+            "month": month,
+            "salary_mode": modes[i],
+            "total_work_hours": total_h,
+            "ot_hours": ot_h,
+            "night_hours": night_h,
+            "holiday_hours": holiday_h,
+            "absent_days": attendance[i][0],
+        }
+        for field, values in amounts.items():
+            row[field] = values[i]
+        rows.append(row)
+    return rows
+
+
+def _upsert_statement(dialect_name):
+    """(employee_id, month) 기준 upsert 문을 dialect 별로 생성한다. 미지원이면 None."""
+    table = Payslip.__table__
+    update_fields = PAYSLIP_VALUE_FIELDS + ["site_id", "updated_at"]
+
+    if dialect_name in ("sqlite", "postgresql"):
+        if dialect_name == "sqlite":
+            from sqlalchemy.dialects.sqlite import insert
+        else:
+            from sqlalchemy.dialects.postgresql import insert
+        stmt = insert(table)
+        return stmt.on_conflict_do_update(
+            index_elements=["employee_id", "month"],
+            set_={f: stmt.excluded[f] for f in update_fields},
+            where=table.c.is_manual == false(),
+        )
+
+    if dialect_name == "mysql":
+        from sqlalchemy.dialects.mysql import insert
+        stmt = insert(table)
+        # ON DUPLICATE KEY UPDATE 에는 WHERE 가 없으므로 컬럼마다 수동 수정 행의 값을 유지한다
+        return stmt.on_duplicate_key_update(
+            {f: func.if_(table.c.is_manual, table.c[f], stmt.inserted[f]) for f in update_fields}
+        )
+
+    return None
+
+
+def write_payslips(rows, existing):
+    """계산 결과를 bulk upsert 한다. 수동 수정(is_manual) 명세서는 건너뛴다.
+
+    rows 는 모두 같은 월이어야 한다. 저장한 (직원, 월) 의 stale 표시도 함께 지운다.
+
+    Returns:
+        (created, updated, skipped)
+    """
+    now = datetime.now()
+    created = updated = skipped = 0
+    payload = []
+    for row in rows:
+        is_manual = existing.get(row["employee_id"])
+        if is_manual:
+            skipped += 1
+            continue
+        if is_manual is None:
+            created += 1
+        else:
+            updated += 1
+        payload.append({**row, "is_manual": False, "created_at": now, "updated_at": now})
+
+    # 재계산해 저장한 (직원, 월) 의 stale 표시만 정리 (건너뛴 수동 명세서는 유지)
+    if payload:
+        PayrollStaleMark.query.filter(
+            PayrollStaleMark.month == rows[0]["month"],
+            PayrollStaleMark.employee_id.in_([r["employee_id"] for r in payload]),
+        ).delete(synchronize_session=False)
+        invalidate_pdf_cache(rows[0]["month"])
+        touch_metrics([rows[0]["month"]])
+
+    if not payload:
+        return created, updated, skipped
+
+    stmt = _upsert_statement(db.session.get_bind().dialect.name)
+    if stmt is not None:
+        db.session.execute(stmt, payload)
+    else:
+        inserts = [r for r in payload if r["employee_id"] not in existing]
+        updates = [r for r in payload if r["employee_id"] in existing]
+        if inserts:
+            db.session.execute(Payslip.__table__.insert(), inserts)
+        for r in updates:
+            Payslip.query.filter_by(employee_id=r["employee_id"], month=r["month"], is_manual=False).update(
+                {f: r[f] for f in PAYSLIP_VALUE_FIELDS + ["site_id", "updated_at"]},
+                synchronize_session=False,
+            )
+    return created, updated, skipped
+
+
+def compute_payslips_bulk(month: str, salary_mode: str, employee_ids=None, trigger="generate"):
+    """월 급여를 일괄 계산·저장하고 단계별 통계를 반환한다.
+
+    employee_ids 를 지정하면 해당 직원만 재계산한다.
+    실행마다 PayrollRun 이력(입력 해시·통계·결과 벡터)을 함께 저장한다.
+
+    Returns:
+        dict {created, updated, skipped, employees, queries, elapsed_ms, phases, run_id}
+        또는 error 문자열.
+    """
+    from services.payroll_run_service import combine_inputs_hash, inputs_digests, record_run
+
+    cfg = current_app.config
+    stats = PhaseStats()
+
+    inputs = load_month_inputs(month, stats, employee_ids)
+    if inputs is None:
+        return f"{month} 근태 기록이 없습니다."
+
+    with stats.phase("compute"):
+        rows = compute_month_rows(inputs, salary_mode, cfg)
+
+    with stats.phase("write"):
+        created, updated, skipped = write_payslips(rows, inputs["existing"])
+
+    summary = stats.summary()
+    run = record_run(
+        month, salary_mode, rows, inputs["existing"],
+        combine_inputs_hash(*inputs_digests(inputs, salary_mode, cfg)),
+        (created, updated, skipped), summary,
+        trigger=trigger, scope="full" if employee_ids is None else "partial",
+    )
+    db.session.commit()
+
+    logger.info(
+        "[급여일괄] %s: %d명 (생성 %d, 갱신 %d, 건너뜀 %d) — 쿼리 %d회, %.1fms",
+        month, len(rows), created, updated, skipped,
+        summary["queries"], summary["elapsed_ms"],
+    )
+    return {
+        "created": created,
+        "updated": updated,
+        "skipped": skipped,
+        "employees": len(rows),
+        "run_id": run.id,
+        **summary,
+    }
@@ -0,0 +1,309 @@
+"""급여 재계산 대상(stale) 추적 서비스.
+
+AttendanceRecord / AdvanceRequest / WageConfig / OperationCalendarDay / Employee
+변경을 세션 flush 시점에 감지하여 영향을 받는 (직원, 월) 쌍을
+payroll_stale_marks 에 같은 트랜잭션으로 기록한다.
+
+- 근태: 해당 직원 × 근무월 (근무일 변경 시 이전 월 포함)
+- 가불: 승인 상태가 관련된 변경만, 해당 직원 × 신청월
+- 급여설정: employee → 해당 직원, site → 현장 소속 직원, system → 전체 직원
+  (PAYROLL_OPEN_MONTHS 범위의 최근 월 중 근태가 있는 직원)
+- 운영캘린더: 해당 월에 근태가 있는 전체 직원
+- 직원: 소속 현장/보험 유형 변경 시 최근 월
+
+recompute_stale() 은 표시된 쌍만 일괄 엔진으로 재계산한다. 수동 수정 명세서는 건너뛰고
+표시도 남겨 두어, 관리자가 초기화(재계산)할 때까지 재계산 필요로 보인다.
+"""
+import logging
+from collections import defaultdict
+from datetime import date
+
+from sqlalchemy import event, inspect, select
+
+from config import Config
+from models import (
+    AdvanceRequest,
+    AttendanceRecord,
+    Employee,
+    OperationCalendarDay,
+    PayrollStaleMark,
+    Payslip,
+    WageConfig,
+    db,
+)
+from services.payslip_service import _month_range
+
+logger = logging.getLogger(__name__)
+
+_PENDING_KEY = "payroll_stale_scopes"
+_registered = False
+
+
+def _month_of(value):
+    return value.strftime("%Y-%m") if value else None
+
+
+def _open_months(today=None):
+    """급여설정/직원 변경 시 재계산 대상이 되는 최근 월 목록 (당월 포함)."""
+    today = today or date.today()
+    year, mon = today.year, today.month
+    months = []
+    for _ in range(max(1, Config.PAYROLL_OPEN_MONTHS)):
+        months.append(f"{year:04d}-{mon:02d}")
+        mon -= 1
+        if mon == 0:
+            year, mon = year - 1, 12
+    return months
+
+
+def _attr_values(obj, attr):
+    """현재 값과 변경 전 값을 함께 반환한다."""
+    values = {getattr(obj, attr)}
+    values.update(inspect(obj).attrs[attr].history.deleted or ())
+    return values
+
+
+def _collect_scopes(session):
+    """flush 대상 객체에서 재계산 범위를 수집한다."""
+    scopes = set()
+    changed = list(session.new) + list(session.deleted) + [
+        obj for obj in session.dirty if session.is_modified(obj, include_collections=False)
+    ]
+    for obj in changed:
+        if isinstance(obj, AttendanceRecord):
+            for emp_id in _attr_values(obj, "employee_id"):
+                for work_date in _attr_values(obj, "work_date"):
+                    if emp_id and work_date:
+                        scopes.add(("pair", emp_id, _month_of(work_date), "attendance"))
+        elif isinstance(obj, AdvanceRequest):
+            if "approved" not in _attr_values(obj, "status"):
+                continue
+            for emp_id in _attr_values(obj, "employee_id"):
+                for month in _attr_values(obj, "request_month"):
+                    if emp_id and month:
+                        scopes.add(("pair", emp_id, month, "advance"))
+        elif isinstance(obj, WageConfig):
+            for target_id in _attr_values(obj, "target_id"):
+                scopes.add(("wage", obj.config_type, target_id))
+        elif isinstance(obj, OperationCalendarDay):
+            for work_date in _attr_values(obj, "work_date"):
+                if work_date:
+                    scopes.add(("calendar", _month_of(work_date)))
+        elif isinstance(obj, Employee) and obj not in session.new and obj not in session.deleted:
+            state = inspect(obj)
+            if state.attrs.site_id.history.has_changes() or state.attrs.insurance_type.history.has_changes():
+                scopes.add(("employee", obj.id))
+    return scopes
+
+
+def _employees_with_attendance(session, months, extra_filter=None):
+    """지정 월들에 근태 기록이 있는 직원 ID 집합."""
+    conditions = []
+    for month in months:
+        start_date, end_date = _month_range(month)
+        conditions.append(
+            (AttendanceRecord.work_date >= start_date) & (AttendanceRecord.work_date < end_date)
+        )
+    stmt = select(AttendanceRecord.employee_id, AttendanceRecord.work_date).where(
+        db.or_(*conditions)
+    )
+    if extra_filter is not None:
+        stmt = stmt.join(Employee, Employee.id == AttendanceRecord.employee_id).where(extra_filter)
+    pairs = set()
+    for emp_id, work_date in session.execute(stmt.distinct()).all():
+        pairs.add((emp_id, _month_of(work_date)))
+    return pairs
+
+
+def _resolve_scopes(session, scopes):
+    """수집된 범위를 (employee_id, month, reason) 목록으로 펼친다."""
+    marks = {}
+    open_months = None
+    for scope in scopes:
+        kind = scope[0]
+        if kind == "pair":
+            _, emp_id, month, reason = scope
+            marks.setdefault((emp_id, month), reason)
+        elif kind == "calendar":
+            for emp_id, month in _employees_with_attendance(session, [scope[1]]):
+                marks.setdefault((emp_id, month), "calendar")
+        elif kind == "wage":
+            _, config_type, target_id = scope
+            open_months = open_months or _open_months()
+            if config_type == "employee":
+                for month in open_months:
+                    marks.setdefault((target_id, month), "wage_config")
+            else:
+                extra = Employee.site_id == target_id if config_type == "site" else None
+                for emp_id, month in _employees_with_attendance(session, open_months, extra):
+                    marks.setdefault((emp_id, month), "wage_config")
+        elif kind == "employee":
+            open_months = open_months or _open_months()
+            for month in open_months:
+                marks.setdefault((scope[1], month), "employee")
+    return [
+        {"employee_id": emp_id, "month": month, "reason": reason}
+        for (emp_id, month), reason in marks.items()
+        if emp_id and month
+    ]
+
+
+def _insert_ignore(session, rows):
+    """(employee_id, month) 중복을 무시하는 dialect 별 INSERT."""
+    table = PayrollStaleMark.__table__
+    dialect = session.get_bind().dialect.name
+    if dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert
+        stmt = insert(table).on_conflict_do_nothing(index_elements=["employee_id", "month"])
+    elif dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+        stmt = insert(table).on_conflict_do_nothing(index_elements=["employee_id", "month"])
+    else:
+        stmt = table.insert().prefix_with("IGNORE")
+    session.execute(stmt, rows)
+
+
+def _write_marks(session, scopes):
+    rows = _resolve_scopes(session, scopes)
+    if rows:
+        _insert_ignore(session, rows)
+
+
+def mark_stale(pairs, reason):
+    """(employee_id, month) 쌍을 직접 재계산 대상으로 표시한다.
+
+    세션 이벤트를 거치지 않는 Core 일괄 수정 후 호출한다 (commit 은 호출자).
+    """
+    rows = [
+        {"employee_id": emp_id, "month": month, "reason": reason}
+        for emp_id, month in pairs
+        if emp_id and month
+    ]
+    if rows:
+        _insert_ignore(db.session, rows)
+
+
+def _after_flush(session, flush_context):
+    scopes = _collect_scopes(session)
+    if scopes:
+        _write_marks(session, scopes)
+
+
+def _on_orm_execute(orm_execute_state):
+    """Query.update()/delete() 같은 bulk 문도 대상 행을 미리 조회하여 표시한다."""
+    if not (orm_execute_state.is_update or orm_execute_state.is_delete):
+        return
+    mappers = {m.class_ for m in orm_execute_state.all_mappers}
+    whereclause = orm_execute_state.statement.whereclause
+    session = orm_execute_state.session
+    scopes = set()
+    if AttendanceRecord in mappers:
+        stmt = select(AttendanceRecord.employee_id, AttendanceRecord.work_date).distinct()
+        if whereclause is not None:
+            stmt = stmt.where(whereclause)
+        for emp_id, work_date in session.execute(stmt).all():
+            scopes.add(("pair", emp_id, _month_of(work_date), "attendance"))
+    elif AdvanceRequest in mappers:
+        stmt = select(AdvanceRequest.employee_id, AdvanceRequest.request_month).where(
+            AdvanceRequest.status == "approved"
+        ).distinct()
+        if whereclause is not None:
+            stmt = stmt.where(whereclause)
+        for emp_id, month in session.execute(stmt).all():
+            scopes.add(("pair", emp_id, month, "advance"))
+    if scopes:
+        _write_marks(session, scopes)
+
+
+def init_dirty_tracking():
+    """세션 이벤트 리스너를 등록한다 (프로세스당 1회)."""
+    global _registered
+    if _registered:
+        return
+    event.listen(db.session, "after_flush", _after_flush)
+    event.listen(db.session, "do_orm_execute", _on_orm_execute)
+    _registered = True
+
+
+def stale_summary():
+    """월별 재계산 대기 건수. {month: count}"""
+    rows = (
+        db.session.query(PayrollStaleMark.month, db.func.count(PayrollStaleMark.id))
+        .group_by(PayrollStaleMark.month)
+        .order_by(PayrollStaleMark.month.asc())
+        .all()
+    )
+    return {month: count for month, count in rows}
+
+
+def clear_stale(employee_id, month):
+    """개별 재계산/초기화 후 해당 (직원, 월) 표시를 지운다 (commit 은 호출자)."""
+    PayrollStaleMark.query.filter_by(employee_id=employee_id, month=month).delete(
+        synchronize_session=False
+    )
+
+
+def recompute_stale(salary_mode, month=None):
+    """표시된 (직원, 월) 쌍만 재계산한다.
+
+    재계산해 저장한 쌍과 근태가 없어 계산할 것이 없는 쌍의 표시만 지우고,
+    건너뛴 수동 수정 명세서의 표시는 남긴다.
+
+    Args:
+        salary_mode: 기본 산정 방식 (WageConfig.calc_method 가 우선)
+        month: 특정 월만 처리 (None 이면 전체)
+
+    Returns:
+        dict {months, created, updated, skipped, cleared}
+    """
+    from services.payroll_bulk_service import compute_payslips_bulk
+
+    query = PayrollStaleMark.query
+    if month:
+        query = query.filter(PayrollStaleMark.month == month)
+    by_month = defaultdict(dict)
+    for mark_id, emp_id, mark_month in query.with_entities(
+        PayrollStaleMark.id, PayrollStaleMark.employee_id, PayrollStaleMark.month
+    ).all():
+        by_month[mark_month][emp_id] = mark_id
+
+    totals = {"months": {}, "created": 0, "updated": 0, "skipped": 0, "cleared": 0}
+    for target_month in sorted(by_month):
+        marks = by_month[target_month]
+        # 저장한 쌍의 표시는 write_payslips 가 지운다
+        result = compute_payslips_bulk(
+            target_month, salary_mode, employee_ids=list(marks), trigger="stale"
+        )
+        if isinstance(result, str):
+            # 근태가 모두 삭제된 경우
+            result = {"created": 0, "updated": 0, "skipped": 0, "employees": 0}
+        manual = set(db.session.execute(
+            select(Payslip.employee_id).where(
+                Payslip.month == target_month,
+                Payslip.is_manual.is_(True),
+                Payslip.employee_id.in_(list(marks)),
+            )
+        ).scalars())
+        cleared = [mark_id for emp_id, mark_id in marks.items() if emp_id not in manual]
+        # 수동 명세서 외의 표시 정리 (저장한 쌍은 이미 지워졌고, 남은 것은 근태가 없는 쌍)
+        PayrollStaleMark.query.filter(PayrollStaleMark.id.in_(cleared)).delete(
+            synchronize_session=False
+        )
+        db.session.commit()
+        totals["months"][target_month] = {
+            "employees": len(marks),
+            "kept": len(marks) - len(cleared),
+            "created": result["created"],
+            "updated": result["updated"],
+            "skipped": result["skipped"],
+        }
+        totals["created"] += result["created"]
+        totals["updated"] += result["updated"]
+        totals["skipped"] += result["skipped"]
+        totals["cleared"] += len(cleared)
+
+    logger.info(
+        "[변경분 재계산] %d개월, 표시 %d건 (생성 %d, 갱신 %d, 건너뜀 %d)",
+        len(by_month), totals["cleared"], totals["created"], totals["updated"], totals["skipped"],
+    )
+    return totals
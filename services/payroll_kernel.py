@@ -0,0 +1,180 @@
+"""급여 계산 컬럼형(NumPy) 커널.
+
+payslip_service 의 _calc_pay / _calc_absence_deductions / _calc_deductions 를
+직원 1명 단위 분기 대신 배열 단위 마스크 연산으로 수행한다.
+연산 순서와 반올림 규칙(round() = 짝수 반올림 → np.rint, int() 절사 → np.trunc)을
+원본과 동일하게 유지하므로 결과가 정확히 일치한다.
+"""
+import numpy as np
+
+from config import Config
+
+# salary_mode → 모드 코드
+MODE_STANDARD = 0
+MODE_ACTUAL = 1
+MODE_DAILY_BUILD = 2
+MODE_DAILY = 3
+MODE_CODES = {
+    "standard": MODE_STANDARD,
+    "actual": MODE_ACTUAL,
+    "daily_build": MODE_DAILY_BUILD,
+    "daily": MODE_DAILY,
+}
+
+INSURANCE_4 = "4대보험"
+
+
+def pack_columns(wage_cfgs, modes, hours, attendance, ins_types, advances):
+    """직원별 입력 목록을 커널 입력 배열로 변환한다.
+
+    _calc_pay 와 동일하게 `값 or 기본값` 폴백을 적용한다.
+
+    Args:
+        wage_cfgs: get_wage_config() 딕셔너리 목록
+        modes: _effective_salary_mode() 결과 목록
+        hours: (total_h, ot_h, night_h, holiday_h) 목록
+        attendance: (absent_days, non_full_weeks, attended_days, full_weeks) 목록
+        ins_types: 보험 유형 목록 ('4대보험' | '3.3%')
+        advances: 가불 합계 목록
+
+    Returns:
+        dict of np.ndarray
+    """
+    n = len(wage_cfgs)
+    mode = np.empty(n, dtype=np.int8)
+    hourly = np.empty(n, dtype=np.float64)
+    daily = np.empty(n, dtype=np.float64)
+    ot_mult = np.empty(n, dtype=np.float64)
+    night_prem = np.empty(n, dtype=np.float64)
+    ot_fixed = np.zeros(n, dtype=np.float64)
+    use_fixed = np.zeros(n, dtype=bool)
+    std_wh = np.empty(n, dtype=np.float64)
+
+    for i, (wc, m) in enumerate(zip(wage_cfgs, modes)):
+        mode[i] = MODE_DAILY if wc.get("wage_type") == "daily" else MODE_CODES[m]
+        hourly[i] = wc.get("hourly_wage") or 10_320
+        daily[i] = wc.get("daily_wage") or 0
+        ot_mult[i] = wc.get("overtime_rate") or 1.5
+        night_prem[i] = wc.get("night_bonus_rate") or 0.5
+        fixed = wc.get("overtime_fixed_amount") or 0
+        if wc.get("overtime_unit", "rate") == "fixed" and fixed:
+            use_fixed[i] = True
+            ot_fixed[i] = fixed
+        std_wh[i] = wc.get("standard_work_hours") or 8.0
+
+    h = np.asarray(hours, dtype=np.float64).reshape(n, 4)
+    a = np.asarray(attendance, dtype=np.int64).reshape(n, 4)
+    return {
+        "mode": mode,
+        "hourly": hourly,
+        "daily": daily,
+        "ot_mult": ot_mult,
+        "night_prem": night_prem,
+        "ot_fixed": ot_fixed,
+        "use_fixed": use_fixed,
+        "std_wh": std_wh,
+        "total_h": h[:, 0],
+        "ot_h": h[:, 1],
+        "night_h": h[:, 2],
+        "holiday_h": h[:, 3],
+        "absent_days": a[:, 0],
+        "non_full_weeks": a[:, 1],
+        "attended_days": a[:, 2],
+        "full_weeks": a[:, 3],
+        "four_ins": np.array([t == INSURANCE_4 for t in ins_types], dtype=bool),
+        "advance": np.asarray(advances, dtype=np.int64).reshape(n),
+    }
+
+
+def compute_columns(cols, cfg):
+    """모든 지급/공제 컬럼을 한 번에 계산한다.
+
+    Returns:
+        dict: Payslip 금액 컬럼명 → np.ndarray(int64)
+    """
+    mode = cols["mode"]
+    hourly = cols["hourly"]
+    daily = cols["daily"]
+    ot_mult = cols["ot_mult"]
+    std_wh = cols["std_wh"]
+    total_h, ot_h = cols["total_h"], cols["ot_h"]
+    night_h, holiday_h = cols["night_h"], cols["holiday_h"]
+
+    is_daily = mode == MODE_DAILY
+    is_build = (mode == MODE_DAILY_BUILD) & ~is_daily
+    is_actual = (mode == MODE_ACTUAL) & ~is_daily
+    is_standard = ~(is_daily | is_build | is_actual)
+
+    # 공수제는 일당 환산 시급, 그 외는 시급 기준
+    rate = np.where(is_daily, daily / std_wh, hourly)
+
+    daily_wage = hourly * std_wh
+    base = np.select(
+        [is_daily, is_build, is_actual],
+        [
+            np.rint(daily * (total_h / std_wh)),
+            np.rint(cols["attended_days"] * daily_wage),
+            np.rint(hourly * total_h),
+        ],
+        default=hourly * Config.MONTHLY_STANDARD_HOURS,
+    )
+    weekly_pay = np.where(is_build, np.rint(cols["full_weeks"] * daily_wage), 0.0)
+    ot_pay = np.where(
+        cols["use_fixed"],
+        np.rint(ot_h * cols["ot_fixed"]),
+        np.rint(ot_h * rate * ot_mult),
+    )
+    night_pay = np.rint(night_h * rate * cols["night_prem"])
+    holiday_pay = np.rint(holiday_h * rate * ot_mult)
+
+    # 결근/주휴 공제 (standard 만, int() 절사)
+    absent_ded = np.where(
+        is_standard, np.trunc(cols["absent_days"] * hourly * std_wh), 0.0
+    )
+    weekly_ded = np.where(
+        is_standard, np.trunc(cols["non_full_weeks"] * hourly * std_wh), 0.0
+    )
+
+    base = base.astype(np.int64)
+    weekly_pay = weekly_pay.astype(np.int64)
+    ot_pay = ot_pay.astype(np.int64)
+    night_pay = night_pay.astype(np.int64)
+    holiday_pay = holiday_pay.astype(np.int64)
+    absent_ded = absent_ded.astype(np.int64)
+    weekly_ded = weekly_ded.astype(np.int64)
+
+    gross = np.maximum(
+        0, base + weekly_pay + ot_pay + night_pay + holiday_pay - absent_ded - weekly_ded
+    )
+
+    four = cols["four_ins"]
+    g = gross.astype(np.float64)
+    tax = np.where(four, 0, np.rint(g * cfg.get("TAX_RATE", 0.033))).astype(np.int64)
+    pension = np.where(four, np.rint(g * cfg.get("PENSION_RATE", 0.0475)), 0).astype(np.int64)
+    health = np.where(four, np.rint(g * cfg.get("HEALTH_RATE", 0.03595)), 0).astype(np.int64)
+    longterm = np.where(
+        four, np.rint(health * cfg.get("LONGTERM_CARE_RATE", 0.1314)), 0
+    ).astype(np.int64)
+    employment = np.where(
+        four, np.rint(g * cfg.get("EMPLOYMENT_RATE", 0.0115)), 0
+    ).astype(np.int64)
+    insurance = pension + health + longterm + employment
+
+    return {
+        "base_salary": base,
+        "weekly_holiday_pay": weekly_pay,
+        "ot_pay": ot_pay,
+        "night_pay": night_pay,
+        "holiday_pay": holiday_pay,
+        "absent_deduction": absent_ded,
+        "weekly_holiday_deduction": weekly_ded,
+        "gross": gross,
+        "tax": tax,
+        "pension": pension,
+        "health_ins": health,
+        "longterm_care": longterm,
+        "employment_ins": employment,
+        "insurance": insurance,
+        "advance_deduction": cols["advance"],
+        "net": gross - tax - insurance - cols["advance"],
+    }
@@ -0,0 +1,214 @@
+"""다개월/다현장 급여 병렬 재계산 (프로세스 풀).
+
+작업을 (월, 현장) 단위로 나누어 프로세스 풀에서 계산하고,
+부모 프로세스가 월별로 결과를 모아 한 트랜잭션으로 저장한다.
+
+- 각 워커는 자체 엔진/세션을 사용한다 (fork 후 커넥션 풀 폐기, spawn 시 앱 재로딩).
+- 워커는 읽기 + 메모리 계산만 수행하고 DB 에 쓰지 않는다.
+- 한 달의 모든 현장 조각이 도착하면 bulk upsert 후 commit (월 단위 원자성).
+"""
+import logging
+import multiprocessing
+import os
+import time
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from flask import current_app
+
+from models import Employee, Payslip, db
+from services.payroll_bulk_service import (
+    PhaseStats,
+    compute_month_rows,
+    load_month_inputs,
+    write_payslips,
+)
+from services.payroll_run_service import combine_inputs_hash, inputs_digests, record_run
+
+logger = logging.getLogger(__name__)
+
+UNASSIGNED = "unassigned"
+
+_worker_ctx = None
+
+
+def month_span(start_month, end_month):
+    """'YYYY-MM' 시작~끝(포함) 월 목록."""
+    year, mon = map(int, start_month.split("-"))
+    end_year, end_mon = map(int, end_month.split("-"))
+    months = []
+    while (year, mon) <= (end_year, end_mon):
+        months.append(f"{year:04d}-{mon:02d}")
+        mon += 1
+        if mon == 13:
+            year, mon = year + 1, 1
+    return months
+
+
+def _init_worker():
+    """워커 프로세스 초기화: 스케줄러·작업 확인 스레드 비활성화, 앱 컨텍스트, 독립 커넥션 풀."""
+    global _worker_ctx
+    os.environ["SCHEDULER_DISABLED"] = "1"
+    os.environ["JOB_RUNNER_DISABLED"] = "1"
+    from app import app
+
+    _worker_ctx = app.app_context()
+    _worker_ctx.push()
+    # fork 로 복제된 부모 커넥션은 닫지 않고 버린다 (부모가 계속 사용)
+    db.engine.dispose(close=False)
+
+
+def _compute_chunk(month, site_key, employee_ids, salary_mode):
+    """(월, 현장) 조각을 계산한다. 워커 프로세스에서 실행되며 DB 에 쓰지 않는다."""
+    stats = PhaseStats()
+    started = time.perf_counter()
+    inputs = load_month_inputs(month, stats, employee_ids)
+    rows = []
+    context, digests = None, {}
+    if inputs is not None:
+        rows = compute_month_rows(inputs, salary_mode, current_app.config)
+        context, digests = inputs_digests(inputs, salary_mode, current_app.config)
+    db.session.remove()
+    return {
+        "month": month,
+        "site": site_key,
+        "rows": rows,
+        "context": context,
+        "digests": digests,
+        "queries": stats.summary()["queries"],
+        "ms": round((time.perf_counter() - started) * 1000, 2),
+    }
+
+
+def plan_chunks(months, site_ids=None):
+    """(월, 현장, 직원 ID 목록) 작업 목록을 만든다.
+
+    Args:
+        site_ids: 지정 시 해당 현장만 (UNASSIGNED 포함 가능)
+    """
+    by_site = defaultdict(list)
+    for emp_id, site_id in db.session.query(Employee.id, Employee.site_id).all():
+        by_site[site_id if site_id else UNASSIGNED].append(emp_id)
+
+    if site_ids is not None:
+        wanted = set(site_ids)
+        by_site = {k: v for k, v in by_site.items() if k in wanted}
+
+    return [
+        (month, site_key, emp_ids)
+        for month in months
+        for site_key, emp_ids in sorted(by_site.items(), key=lambda kv: str(kv[0]))
+    ]
+
+
+def _commit_month(month, salary_mode, chunks, scope):
+    """한 달의 조각 결과를 저장하고 PayrollRun 이력을 남긴다."""
+    rows, digests, context = [], {}, None
+    for chunk in chunks:
+        rows.extend(chunk["rows"])
+        digests.update(chunk["digests"])
+        context = context or chunk["context"]
+    existing = dict(
+        db.session.query(Payslip.employee_id, Payslip.is_manual)
+        .filter(Payslip.month == month)
+        .all()
+    )
+    created, updated, skipped = write_payslips(rows, existing)
+    if rows:
+        record_run(
+            month, salary_mode, rows, existing, combine_inputs_hash(context, digests),
+            (created, updated, skipped),
+            {
+                "queries": sum(c["queries"] for c in chunks),
+                "elapsed_ms": round(sum(c["ms"] for c in chunks), 2),
+                "phases": [
+                    {"phase": f"site:{c['site']}", "queries": c["queries"], "ms": c["ms"]}
+                    for c in chunks
+                ],
+            },
+            trigger="parallel", scope=scope,
+        )
+    db.session.commit()
+    return {"employees": len(rows), "created": created, "updated": updated, "skipped": skipped}
+
+
+def _default_progress(event):
+    if event["type"] == "chunk":
+        logger.info(
+            "[급여병렬] (%d/%d) %s 현장=%s %d명 %.1fms",
+            event["done"], event["total"], event["month"], event["site"],
+            event["employees"], event["ms"],
+        )
+    else:
+        logger.info(
+            "[급여병렬] %s 저장 완료 — 생성 %d, 갱신 %d, 건너뜀 %d",
+            event["month"], event["created"], event["updated"], event["skipped"],
+        )
+
+
+def run_payroll(months, salary_mode, workers=None, site_ids=None, progress=None):
+    """여러 달의 급여를 (월, 현장) 단위로 병렬 계산하고 월별로 저장한다.
+
+    Args:
+        months: 'YYYY-MM' 목록
+        salary_mode: 기본 산정 방식
+        workers: 프로세스 수 (None=CPU 수, 1 이하면 현재 프로세스에서 순차 실행)
+        site_ids: 특정 현장만 처리 (None=전체)
+        progress: 진행 이벤트 콜백 (dict 인자)
+
+    Returns:
+        dict {months: {month: {...}}, chunks, workers, elapsed_ms}
+    """
+    progress = progress or _default_progress
+    workers = workers or os.cpu_count() or 1
+    started = time.perf_counter()
+
+    chunks = plan_chunks(months, site_ids)
+    remaining = defaultdict(int)
+    for month, _site, _ids in chunks:
+        remaining[month] += 1
+    pending = defaultdict(list)
+    scope = "full" if site_ids is None else "partial"
+    results = {month: {"employees": 0, "created": 0, "updated": 0, "skipped": 0} for month in months}
+    done = 0
+
+    def _collect(chunk):
+        nonlocal done
+        done += 1
+        month = chunk["month"]
+        pending[month].append(chunk)
+        progress({
+            "type": "chunk", "done": done, "total": len(chunks),
+            "month": month, "site": chunk["site"],
+            "employees": len(chunk["rows"]), "ms": chunk["ms"],
+        })
+        remaining[month] -= 1
+        if remaining[month] == 0:
+            results[month] = _commit_month(month, salary_mode, pending.pop(month), scope)
+            progress({"type": "month", "month": month, **results[month]})
+
+    if workers <= 1 or len(chunks) <= 1:
+        for month, site_key, emp_ids in chunks:
+            _collect(_compute_chunk(month, site_key, emp_ids, salary_mode))
+    else:
+        # 워커 시작 전에 부모 커넥션을 반납해 fork 로 공유되지 않게 한다
+        db.session.remove()
+        method = "fork" if "fork" in multiprocessing.get_all_start_methods() else "spawn"
+        with ProcessPoolExecutor(
+            max_workers=min(workers, len(chunks)),
+            mp_context=multiprocessing.get_context(method),
+            initializer=_init_worker,
+        ) as pool:
+            futures = [
+                pool.submit(_compute_chunk, month, site_key, emp_ids, salary_mode)
+                for month, site_key, emp_ids in chunks
+            ]
+            for future in as_completed(futures):
+                _collect(future.result())
+
+    return {
+        "months": results,
+        "chunks": len(chunks),
+        "workers": workers,
+        "elapsed_ms": round((time.perf_counter() - started) * 1000, 2),
+    }
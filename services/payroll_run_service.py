@@ -0,0 +1,218 @@
+"""급여 일괄 계산 실행 이력(PayrollRun) 기록과 실행 간 비교.
+
+- 실행마다 입력 해시, 산정 방식, 단계별 통계와 직원별 결과 벡터를 남긴다.
+- 결과 벡터는 employee_id(int64) 배열과 값 행렬(float64, 열=RESULT_FIELDS)을
+  npz 로 압축해 한 컬럼에 저장한다 (salary_mode 는 커널 MODE 코드로 저장).
+- 두 실행 비교는 ORM 객체 없이 numpy 로 직원 ID 를 정렬·교집합한 뒤
+  행렬 단위로 차이를 구한다.
+"""
+import hashlib
+import io
+import json
+import time
+
+import numpy as np
+
+from models import Employee, PayrollRun, db
+from services.payroll_bulk_service import PAYSLIP_VALUE_FIELDS
+from services.payroll_kernel import MODE_CODES
+
+# 결과 행렬 열 순서. is_manual=1 이면 계산만 되고 저장은 건너뛴 직원 (수동 수정 유지)
+RESULT_FIELDS = PAYSLIP_VALUE_FIELDS + ["is_manual"]
+_CODE_MODES = {code: mode for mode, code in MODE_CODES.items()}
+# 합계를 내지 않는 코드형 필드
+_CATEGORICAL = {"salary_mode", "is_manual"}
+_RATE_KEYS = ("TAX_RATE", "PENSION_RATE", "HEALTH_RATE", "LONGTERM_CARE_RATE", "EMPLOYMENT_RATE")
+
+
+def _digest(obj):
+    payload = json.dumps(obj, sort_keys=True, ensure_ascii=False, separators=(",", ":"), default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def inputs_digests(inputs, salary_mode, cfg):
+    """load_month_inputs() 결과의 입력 지문.
+
+    직원별 지문과 공통(월·산정 방식·캘린더·요율) 지문을 따로 만들어
+    (월, 현장) 조각으로 나누어 계산해도 같은 입력이면 같은 해시가 나오게 한다.
+
+    Returns:
+        (context_digest, {employee_id: digest})
+    """
+    month = inputs["month"]
+    year = int(month.split("-")[0])
+    context = _digest({
+        "month": month,
+        "salary_mode": salary_mode,
+        "overrides": sorted((d.isoformat(), t) for d, t in inputs["overrides"].items()),
+        "rates": {k: cfg.get(k) for k in _RATE_KEYS},
+        "holidays": sorted(str(d) for d in cfg.get(f"PUBLIC_HOLIDAYS_{year}", [])),
+    })
+
+    digests = {}
+    for agg in inputs["aggregates"]:
+        eid = agg.employee_id
+        emp = inputs["employees"].get(eid)
+        digests[eid] = _digest([
+            agg.emp_name, agg.dept,
+            agg.total_hours, agg.ot_hours, agg.night_hours, agg.holiday_hours,
+            sorted(d.isoformat() for d in inputs["attended"].get(eid, ())),
+            [emp.site_id, emp.insurance_type] if emp else None,
+            inputs["wage_cfgs"].get(eid),
+            inputs["advances"].get(eid, 0),
+        ])
+    return context, digests
+
+
+def combine_inputs_hash(context_digest, digests):
+    """공통 지문과 직원별 지문을 직원 ID 순으로 묶어 실행 입력 해시를 만든다."""
+    h = hashlib.sha256(context_digest.encode("ascii"))
+    for eid in sorted(digests):
+        h.update(f"|{eid}:{digests[eid]}".encode("ascii"))
+    return h.hexdigest()
+
+
+def pack_results(rows, existing):
+    """계산 행과 기존 수동 수정 여부로 (employee_ids, 값 행렬) 을 만든다."""
+    rows = sorted(rows, key=lambda r: r["employee_id"])
+    ids = np.fromiter((r["employee_id"] for r in rows), dtype=np.int64, count=len(rows))
+    values = np.zeros((len(rows), len(RESULT_FIELDS)), dtype=np.float64)
+    for i, row in enumerate(rows):
+        values[i, :-1] = [
+            MODE_CODES.get(row["salary_mode"], -1) if f == "salary_mode" else (row[f] or 0)
+            for f in PAYSLIP_VALUE_FIELDS
+        ]
+        values[i, -1] = 1.0 if existing.get(row["employee_id"]) else 0.0
+    return ids, values
+
+
+def _encode(ids, values):
+    buf = io.BytesIO()
+    np.savez_compressed(buf, ids=ids, values=values)
+    return buf.getvalue()
+
+
+def load_results(run):
+    """PayrollRun 의 (employee_ids, 값 행렬, 필드 목록)."""
+    with np.load(io.BytesIO(run.result_blob)) as data:
+        return data["ids"], data["values"], run.result_fields.split(",")
+
+
+def record_run(month, salary_mode, rows, existing, inputs_hash, counts, summary=None,
+               trigger="generate", scope="full"):
+    """실행 이력을 세션에 추가한다 (commit 은 호출자가 수행).
+
+    Args:
+        counts: (created, updated, skipped)
+        summary: PhaseStats.summary() 결과
+    """
+    ids, values = pack_results(rows, existing)
+    created, updated, skipped = counts
+    summary = summary or {}
+    run = PayrollRun(
+        month=month,
+        salary_mode=salary_mode,
+        trigger=trigger,
+        scope=scope,
+        inputs_hash=inputs_hash,
+        employees=len(rows),
+        created=created,
+        updated=updated,
+        skipped=skipped,
+        queries=summary.get("queries"),
+        elapsed_ms=summary.get("elapsed_ms"),
+        phases=json.dumps(summary.get("phases", []), ensure_ascii=False),
+        result_fields=",".join(RESULT_FIELDS),
+        result_blob=_encode(ids, values),
+    )
+    db.session.add(run)
+    return run
+
+
+def list_runs(month=None, limit=50):
+    """최근 실행 목록 (결과 벡터 제외)."""
+    query = PayrollRun.query.options(db.defer(PayrollRun.result_blob))
+    if month:
+        query = query.filter(PayrollRun.month == month)
+    return [r.to_dict() for r in query.order_by(PayrollRun.id.desc()).limit(limit).all()]
+
+
+def _value(field, v):
+    if field == "salary_mode":
+        return _CODE_MODES.get(int(v), "")
+    if field == "is_manual":
+        return bool(v)
+    v = float(v)
+    return int(v) if v.is_integer() else round(v, 2)
+
+
+def diff_runs(run_a, run_b, tolerance=1e-6):
+    """두 실행 결과를 필드 단위로 비교한다 (a → b).
+
+    Returns:
+        dict {a, b, same_inputs, fields, changed, added, removed, unchanged,
+              field_changes, totals, elapsed_ms}
+    """
+    started = time.perf_counter()
+    ids_a, vals_a, fields_a = load_results(run_a)
+    ids_b, vals_b, fields_b = load_results(run_b)
+
+    fields = [f for f in fields_a if f in fields_b]
+    vals_a = vals_a[:, [fields_a.index(f) for f in fields]]
+    vals_b = vals_b[:, [fields_b.index(f) for f in fields]]
+
+    common, ia, ib = np.intersect1d(ids_a, ids_b, assume_unique=True, return_indices=True)
+    before, after = vals_a[ia], vals_b[ib]
+    changed_mask = np.abs(after - before) > tolerance
+    changed_rows = np.flatnonzero(changed_mask.any(axis=1))
+
+    added_ids = np.setdiff1d(ids_b, ids_a, assume_unique=True)
+    removed_ids = np.setdiff1d(ids_a, ids_b, assume_unique=True)
+
+    wanted = [int(x) for x in np.concatenate([common[changed_rows], added_ids, removed_ids])]
+    names = {}
+    if wanted:
+        names = dict(
+            db.session.query(Employee.id, Employee.name).filter(Employee.id.in_(wanted)).all()
+        )
+
+    changed = []
+    for r in changed_rows:
+        eid = int(common[r])
+        changes = {}
+        for c in np.flatnonzero(changed_mask[r]):
+            field = fields[c]
+            entry = {"before": _value(field, before[r, c]), "after": _value(field, after[r, c])}
+            if field not in _CATEGORICAL:
+                entry["delta"] = _value(field, after[r, c] - before[r, c])
+            changes[field] = entry
+        changed.append({"employee_id": eid, "name": names.get(eid, ""), "changes": changes})
+
+    numeric = [i for i, f in enumerate(fields) if f not in _CATEGORICAL]
+    sum_a = vals_a[:, numeric].sum(axis=0)
+    sum_b = vals_b[:, numeric].sum(axis=0)
+    totals = {
+        fields[c]: {
+            "before": _value(fields[c], sum_a[k]),
+            "after": _value(fields[c], sum_b[k]),
+            "delta": _value(fields[c], sum_b[k] - sum_a[k]),
+        }
+        for k, c in enumerate(numeric)
+    }
+    field_changes = {
+        fields[c]: int(n) for c, n in enumerate(changed_mask.sum(axis=0)) if n
+    }
+
+    return {
+        "a": run_a.to_dict(),
+        "b": run_b.to_dict(),
+        "same_inputs": run_a.inputs_hash == run_b.inputs_hash,
+        "fields": fields,
+        "changed": changed,
+        "added": [{"employee_id": int(e), "name": names.get(int(e), "")} for e in added_ids],
+        "removed": [{"employee_id": int(e), "name": names.get(int(e), "")} for e in removed_ids],
+        "unchanged": int(len(common) - len(changed_rows)),
+        "field_changes": field_changes,
+        "totals": totals,
+        "elapsed_ms": round((time.perf_counter() - started) * 1000, 2),
+    }
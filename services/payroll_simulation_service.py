@@ -0,0 +1,181 @@
+"""급여 설정 변경 가정(what-if) 시뮬레이션 서비스.
+
+현장 WageConfig 변경안을 최근 N개월 근태에 적용했을 때의 인건비 변화를
+저장된 Payslip 과 비교하여 직원별/월별/현장 합계 증감으로 반환한다.
+
+- 월별 입력(근태 집계, 출근일, 직원, 급여설정 계층, 가불, 저장된 명세서)은
+  (현장, 월) 단위로 프로세스 내 캐시에 보관한다 (TTL: PAYROLL_SIMULATION_CACHE_TTL).
+- 캐시가 채워진 뒤의 시뮬레이션은 DB 를 조회하지 않으며, 어떤 경우에도 쓰지 않는다.
+"""
+import threading
+import time
+from collections import defaultdict
+
+from flask import current_app
+
+from models import Employee, Payslip, WageConfig, db
+from services.payroll_bulk_service import compute_month_rows, load_month_inputs
+from services.payroll_parallel_service import month_span
+from services.wage_service import coerce_wage_value, get_wage_index, resolve_wage_configs
+
+# 문자열 필드 허용값
+_CHOICES = {
+    "wage_type": {"hourly", "daily"},
+    "overtime_unit": {"rate", "fixed"},
+    "calc_method": {"standard", "daily_build", "actual"},
+}
+
+_cache = {}
+_cache_lock = threading.Lock()
+
+
+def parse_overrides(data):
+    """요청 본문의 변경안을 검증·변환한다. 잘못된 값은 ValueError."""
+    if not isinstance(data, dict):
+        raise ValueError("overrides 는 객체여야 합니다.")
+    overrides = {}
+    for field, val in data.items():
+        if field not in WageConfig.RATE_FIELDS:
+            raise ValueError(f"알 수 없는 항목: {field}")
+        try:
+            value = coerce_wage_value(field, val)
+        except (TypeError, ValueError):
+            raise ValueError(f"{field} 값이 올바르지 않습니다.")
+        if value is not None and field in _CHOICES and value not in _CHOICES[field]:
+            raise ValueError(f"{field} 값이 올바르지 않습니다.")
+        overrides[field] = value
+    return overrides
+
+
+def clear_cache():
+    with _cache_lock:
+        _cache.clear()
+
+
+def _load_entry(site_id, month):
+    """(현장, 월) 시뮬레이션 입력을 DB 에서 적재한다."""
+    emp_ids = [
+        eid for (eid,) in db.session.query(Employee.id).filter(Employee.site_id == site_id).all()
+    ]
+    if not emp_ids:
+        return {"inputs": None, "wage_index": None, "stored": {}}
+
+    wage_index = get_wage_index(fresh=True)
+    inputs = load_month_inputs(month, employee_ids=emp_ids, wage_index=wage_index)
+    stored = {
+        row.employee_id: row
+        for row in db.session.query(
+            Payslip.employee_id, Payslip.emp_name, Payslip.gross, Payslip.net
+        ).filter(Payslip.month == month, Payslip.employee_id.in_(emp_ids)).all()
+    }
+    return {"inputs": inputs, "wage_index": wage_index, "stored": stored}
+
+
+def _get_entry(site_id, month, refresh=False):
+    """캐시에서 (현장, 월) 입력을 꺼낸다. 만료/미적재면 적재 후 보관.
+
+    Returns:
+        (entry, cache_hit)
+    """
+    ttl = current_app.config.get("PAYROLL_SIMULATION_CACHE_TTL", 300)
+    key = (site_id, month)
+    now = time.monotonic()
+    with _cache_lock:
+        cached = _cache.get(key)
+    if cached and not refresh and now - cached[0] < ttl:
+        return cached[1], True
+
+    entry = _load_entry(site_id, month)
+    with _cache_lock:
+        _cache[key] = (now, entry)
+    return entry, False
+
+
+def _delta(stored, simulated):
+    return {
+        "stored_gross": stored[0],
+        "simulated_gross": simulated[0],
+        "delta_gross": simulated[0] - stored[0],
+        "stored_net": stored[1],
+        "simulated_net": simulated[1],
+        "delta_net": simulated[1] - stored[1],
+    }
+
+
+def simulate_site_wage_change(site_id, overrides, end_month, months=12,
+                              salary_mode="standard", refresh=False):
+    """현장 급여설정 변경안의 최근 N개월 인건비 영향을 계산한다 (DB 쓰기 없음).
+
+    Args:
+        site_id: 현장 ID
+        overrides: parse_overrides() 결과 {field: value}
+        end_month: 마지막 월 (YYYY-MM, 포함)
+        months: 기간 (개월 수)
+        salary_mode: 기본 산정 방식
+
+    Returns:
+        dict {site, by_month, employees, months, cache_hits, elapsed_ms}
+    """
+    started = time.perf_counter()
+    cfg = current_app.config
+
+    year, mon = map(int, end_month.split("-"))
+    mon -= months - 1
+    while mon < 1:
+        year, mon = year - 1, mon + 12
+    month_list = month_span(f"{year:04d}-{mon:02d}", end_month)
+
+    per_emp = defaultdict(lambda: {"emp_name": "", "months": 0, "stored": [0, 0], "simulated": [0, 0]})
+    by_month = []
+    cache_hits = 0
+
+    for month in month_list:
+        entry, hit = _get_entry(site_id, month, refresh)
+        cache_hits += int(hit)
+        stored_total = [0, 0]
+        simulated_total = [0, 0]
+        inputs = entry["inputs"]
+        if inputs is not None:
+            employee_sites = {eid: emp.site_id for eid, emp in inputs["employees"].items()}
+            wage_cfgs = resolve_wage_configs(
+                employee_sites, index=entry["wage_index"].with_site_overrides({site_id: overrides}),
+            )
+            rows = compute_month_rows({**inputs, "wage_cfgs": wage_cfgs}, salary_mode, cfg)
+            for row in rows:
+                emp_id = row["employee_id"]
+                stored_row = entry["stored"].get(emp_id)
+                stored = (stored_row.gross, stored_row.net) if stored_row else (0, 0)
+                emp = per_emp[emp_id]
+                emp["emp_name"] = row["emp_name"]
+                emp["months"] += 1
+                for i, (s, v) in enumerate(zip(stored, (row["gross"], row["net"]))):
+                    emp["stored"][i] += s
+                    emp["simulated"][i] += v
+                    stored_total[i] += s
+                    simulated_total[i] += v
+        by_month.append({"month": month, **_delta(stored_total, simulated_total)})
+
+    employees = [
+        {"employee_id": emp_id, "emp_name": e["emp_name"], "months": e["months"],
+         **_delta(e["stored"], e["simulated"])}
+        for emp_id, e in per_emp.items()
+    ]
+    employees.sort(key=lambda e: e["delta_gross"], reverse=True)
+
+    site_total = {
+        "employees": len(employees),
+        **_delta(
+            [sum(m["stored_gross"] for m in by_month), sum(m["stored_net"] for m in by_month)],
+            [sum(m["simulated_gross"] for m in by_month), sum(m["simulated_net"] for m in by_month)],
+        ),
+    }
+    return {
+        "site_id": site_id,
+        "months": month_list,
+        "overrides": overrides,
+        "site": site_total,
+        "by_month": by_month,
+        "employees": employees,
+        "cache_hits": cache_hits,
+        "elapsed_ms": round((time.perf_counter() - started) * 1000, 2),
+    }
@@ -0,0 +1,498 @@
+"""급여명세서 PDF 렌더링 서비스.
+
+- 한글 폰트는 프로세스당 1회만 탐색·등록한다 (get_fonts).
+- 회사명 헤더, 구분선, 직원 정보 박스(배경/격자/항목명)는 문서당 1개의 form XObject 로,
+  지급·공제 표의 배경/선/고정 항목명, 실수령액 바, 발급일은 행 구성(표시되는 항목 조합)별
+  form XObject 로 한 번만 그려 두고 페이지마다 재사용한다.
+- 직원별로는 가변 값(이름, 시간, 금액)만 페이지당 하나의 텍스트 객체로 그린다.
+
+레이아웃은 기존 platypus 표(패딩/글꼴 크기/색상)와 같은 치수로 맞춘다.
+
+렌더링 결과는 PAYSLIP_PDF_CACHE_DIR 에 내용 해시(명세서 필드 + 시급 + 발급일)로
+저장하고 재사용한다 (get_cached_pdf). 명세서 값이 바뀌면 키가 달라지므로 이전 파일은
+쓰이지 않으며, 수정/초기화/재계산 시 invalidate_pdf_cache() 로 바로 지우고
+나머지는 용량/기간 기준으로 정리한다 (evict_pdf_cache).
+"""
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from datetime import date, datetime
+from io import BytesIO
+
+from flask import current_app
+
+from reportlab.lib import colors
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.units import mm
+from reportlab.pdfbase import pdfmetrics
+from reportlab.pdfbase.ttfonts import TTFont
+from reportlab.pdfgen import canvas
+
+logger = logging.getLogger(__name__)
+
+# 레이아웃이 바뀌면 올려서 기존 캐시를 무효화한다
+RENDER_VERSION = 2
+
+FONT_CANDIDATES = [
+    "C:/Windows/Fonts/malgun.ttf",
+    "C:/Windows/Fonts/malgunbd.ttf",
+    "/usr/share/fonts/truetype/nanum/NanumGothic.ttf",
+    "/usr/share/fonts/truetype/nanum/NanumGothicBold.ttf",
+]
+
+MODE_LABELS = {"standard": "209h 고정", "daily_build": "일급제", "actual": "실근무시간", "daily": "공수제"}
+
+# 색상
+HEADER_BG = colors.HexColor("#E85D26")
+HEADER_TEXT = colors.white
+SECTION_BG = colors.HexColor("#F8F9FA")
+TOTAL_BG = colors.HexColor("#FFF3ED")
+DEDUCT_TOTAL_BG = colors.HexColor("#FEF2F2")
+DEDUCT_HEADER_BG = colors.HexColor("#6B7280")
+LABEL_COLOR = colors.HexColor("#6B7280")
+BORDER_COLOR = colors.HexColor("#DEE2E6")
+TEXT_COLOR = colors.HexColor("#212529")
+DEDUCT_COLOR = colors.HexColor("#DC2626")
+DATE_COLOR = colors.HexColor("#9CA3AF")
+MANUAL_COLOR = colors.HexColor("#F59E0B")
+
+# 페이지 치수 (pt)
+PAGE_W, PAGE_H = A4
+LEFT = 25 * mm
+WIDTH = 160 * mm
+RIGHT = LEFT + WIDTH
+TOP = PAGE_H - 20 * mm
+
+HEADER_H = 18 * 1.2 + 2
+RULE_Y = TOP - HEADER_H - 2
+TITLE_TOP = RULE_Y - 4 * mm
+TITLE_H = 3 + 16 * 1.2 + 6
+INFO_TOP = TITLE_TOP - TITLE_H - 3 * mm
+INFO_ROW_H = 6 + 12 + 6
+INFO_COLS = [30 * mm, 50 * mm, 30 * mm, 50 * mm]
+INFO_LABELS = [("성명", "부서"), ("시급", "계산방식"), ("총근무시간", "잔업"), ("심야", "휴일")]
+EARN_TOP = INFO_TOP - 4 * INFO_ROW_H - 6 * mm
+
+SECTION_HEAD_H = 7 + 12 * 1.2 + 7
+SECTION_ROW_H = 7 + 10 * 1.2 + 7
+SECTION_TOTAL_H = 7 + 11 * 1.2 + 7
+NET_H = 12 + 16 * 1.2 + 12
+
+_fonts = None
+_fonts_lock = threading.Lock()
+
+
+def _register_fonts():
+    font_name = "Helvetica"
+    font_name_bold = "Helvetica-Bold"
+    for font_path in FONT_CANDIDATES:
+        if not os.path.exists(font_path):
+            continue
+        try:
+            fname = os.path.basename(font_path).replace(".ttf", "").replace(".ttc", "")
+            pdfmetrics.registerFont(TTFont(fname, font_path))
+            if "bold" in fname.lower() or "bd" in fname.lower():
+                font_name_bold = fname
+            else:
+                font_name = fname
+        except Exception:
+            continue
+    return font_name, font_name_bold
+
+
+def get_fonts():
+    """(일반, 굵게) 폰트 이름. 최초 호출 시 1회만 등록한다."""
+    global _fonts
+    if _fonts is None:
+        with _fonts_lock:
+            if _fonts is None:
+                _fonts = _register_fonts()
+    return _fonts
+
+
+def _baseline(row_top, row_h, size, bottom_pad):
+    """platypus 표 셀(하단 정렬)과 같은 글자 기준선 위치."""
+    return row_top - row_h + bottom_pad + size * 0.2
+
+
+def _earn_items(p):
+    """지급 내역 행 목록 [(키, 항목명, 금액, 고정 항목명 여부)]."""
+    items = [("base", "기본급", f"{p.base_salary:,}원", True)]
+    if p.weekly_holiday_pay > 0:
+        items.append(("weekly", "주휴수당", f"{p.weekly_holiday_pay:,}원", True))
+    items.extend([
+        ("ot", f"잔업수당 ({p.ot_hours}h)", f"{p.ot_pay:,}원", False),
+        ("night", f"심야수당 ({p.night_hours}h)", f"{p.night_pay:,}원", False),
+        ("holiday", f"휴일수당 ({p.holiday_hours}h)", f"{p.holiday_pay:,}원", False),
+    ])
+    if p.absent_deduction > 0:
+        items.append(("absent", f"결근공제 ({int(p.absent_days)}일)", f"-{p.absent_deduction:,}원", False))
+    if p.weekly_holiday_deduction > 0:
+        items.append(("weekly_ded", "주휴공제", f"-{p.weekly_holiday_deduction:,}원", True))
+    return items
+
+
+def _deduct_items(p):
+    """공제 내역 행 목록 [(키, 항목명, 금액, 고정 항목명 여부)]."""
+    items = []
+    for key, label in (
+        ("tax", "소득세 (3.3%)"),
+        ("pension", "국민연금 (4.75%)"),
+        ("health_ins", "건강보험 (3.595%)"),
+        ("longterm_care", "장기요양보험"),
+        ("employment_ins", "고용보험 (1.15%)"),
+        ("advance_deduction", "가불 차감"),
+    ):
+        value = getattr(p, key)
+        if value > 0:
+            items.append((key, label, f"-{value:,}원", True))
+    return items
+
+
+def _section_bottom(top, rows):
+    return top - SECTION_HEAD_H - SECTION_ROW_H * rows - SECTION_TOTAL_H
+
+
+def _draw_frame_form(c, bold):
+    """회사명, 구분선, 직원 정보 박스 (문서 공통)."""
+    c.beginForm("payslip_frame")
+    c.setFillColor(HEADER_BG)
+    c.setFont(bold, 18)
+    c.drawString(LEFT + 6, TOP - 18, "Humetix Inc.")
+    c.setStrokeColor(HEADER_BG)
+    c.setLineWidth(2)
+    c.line(LEFT, RULE_Y, RIGHT, RULE_Y)
+
+    info_h = 4 * INFO_ROW_H
+    c.setFillColor(SECTION_BG)
+    c.rect(LEFT, INFO_TOP - info_h, WIDTH, info_h, stroke=0, fill=1)
+    c.setStrokeColor(BORDER_COLOR)
+    c.setLineWidth(0.5)
+    x = LEFT
+    for col_w in INFO_COLS[:-1]:
+        x += col_w
+        c.line(x, INFO_TOP, x, INFO_TOP - info_h)
+    for row in range(1, 4):
+        y = INFO_TOP - row * INFO_ROW_H
+        c.line(LEFT, y, RIGHT, y)
+    c.setLineWidth(1)
+    c.rect(LEFT, INFO_TOP - info_h, WIDTH, info_h, stroke=1, fill=0)
+
+    c.setFillColor(LABEL_COLOR)
+    c.setFont(bold, 10)
+    label_x = (LEFT + 8, LEFT + INFO_COLS[0] + INFO_COLS[1] + 8)
+    for row, labels in enumerate(INFO_LABELS):
+        y = _baseline(INFO_TOP - row * INFO_ROW_H, INFO_ROW_H, 10, 6)
+        for lx, label in zip(label_x, labels):
+            c.drawString(lx, y, label)
+    c.endForm()
+
+
+def _draw_section(c, top, title, head_bg, items, total_label, total_bg, font, bold):
+    """표 배경/선/헤더/고정 항목명을 그린다 (form 내부에서 호출)."""
+    bottom = _section_bottom(top, len(items))
+
+    c.setFillColor(head_bg)
+    c.rect(LEFT, top - SECTION_HEAD_H, WIDTH, SECTION_HEAD_H, stroke=0, fill=1)
+    c.setFillColor(total_bg)
+    c.rect(LEFT, bottom, WIDTH, SECTION_TOTAL_H, stroke=0, fill=1)
+
+    c.setStrokeColor(BORDER_COLOR)
+    c.setLineWidth(0.5)
+    y = top - SECTION_HEAD_H
+    for _ in items:
+        c.line(LEFT, y, RIGHT, y)
+        y -= SECTION_ROW_H
+    c.setLineWidth(1)
+    c.line(LEFT, y, RIGHT, y)
+    c.rect(LEFT, bottom, WIDTH, top - bottom, stroke=1, fill=0)
+
+    c.setFillColor(HEADER_TEXT)
+    c.setFont(bold, 12)
+    c.drawString(LEFT + 10, _baseline(top, SECTION_HEAD_H, 12, 7), title)
+    c.setFillColor(TEXT_COLOR)
+    c.setFont(font, 10)
+    row_top = top - SECTION_HEAD_H
+    for _key, label, _amount, static in items:
+        if static:
+            c.drawString(LEFT + 10, _baseline(row_top, SECTION_ROW_H, 10, 7), label)
+        row_top -= SECTION_ROW_H
+    c.setFont(bold, 11)
+    c.drawString(LEFT + 10, _baseline(row_top, SECTION_TOTAL_H, 11, 7), total_label)
+    return bottom
+
+
+def _draw_layout_form(c, name, earn, deduct, is_manual, font, bold, issued_label):
+    """행 구성별 표/실수령액 바/발급일 form 을 정의한다."""
+    c.beginForm(name)
+    bottom = _draw_section(c, EARN_TOP, "지급 내역", HEADER_BG, earn, "총지급액", TOTAL_BG, font, bold)
+    bottom = _draw_section(
+        c, bottom - 5 * mm, "공제 내역", DEDUCT_HEADER_BG, deduct, "공제합계", DEDUCT_TOTAL_BG, font, bold,
+    )
+    net_top = bottom - 6 * mm
+    c.setFillColor(HEADER_BG)
+    c.setStrokeColor(HEADER_BG)
+    c.rect(LEFT, net_top - NET_H, WIDTH, NET_H, stroke=1, fill=1)
+
+    date_top = net_top - NET_H - 8 * mm
+    date_h = 3 + 9 * 1.2 + 3
+    c.setFillColor(DATE_COLOR)
+    c.setFont(font, 9)
+    c.drawRightString(RIGHT - 6, _baseline(date_top, date_h, 9, 3), issued_label)
+    if is_manual:
+        c.setFillColor(MANUAL_COLOR)
+        c.setFont(font, 8)
+        c.drawRightString(
+            RIGHT - 6, _baseline(date_top - date_h, 2 + 8 * 1.2 + 3, 8, 3),
+            "* 본 명세서는 관리자에 의해 수동 수정되었습니다.",
+        )
+    c.endForm()
+
+
+class _PageText:
+    """페이지 가변 텍스트를 하나의 텍스트 객체(BT..ET)로 모은다."""
+
+    def __init__(self, c):
+        self.text = c.beginText()
+        self.font = None
+        self.color = None
+
+    def draw(self, x, y, value, font, size, color, align="left"):
+        t = self.text
+        if self.font != (font, size):
+            t.setFont(font, size)
+            self.font = (font, size)
+        if self.color is not color:
+            t.setFillColor(color)
+            self.color = color
+        if align != "left":
+            width = pdfmetrics.stringWidth(value, font, size)
+            x -= width if align == "right" else width / 2
+        t.setTextOrigin(x, y)
+        t.textOut(value)
+
+
+def _draw_amounts(page, top, items, total_amount, font, bold, amount_color):
+    row_top = top - SECTION_HEAD_H
+    for _key, label, amount, static in items:
+        base = _baseline(row_top, SECTION_ROW_H, 10, 7)
+        if not static:
+            page.draw(LEFT + 10, base, label, font, 10, TEXT_COLOR)
+        page.draw(RIGHT - 10, base, amount, font, 10, amount_color, "right")
+        row_top -= SECTION_ROW_H
+    base = _baseline(row_top, SECTION_TOTAL_H, 11, 7)
+    page.draw(RIGHT - 10, base, total_amount, bold, 11, amount_color, "right")
+    return row_top - SECTION_TOTAL_H
+
+
+def _draw_payslip(c, p, layouts, font, bold, hourly_label, issued_label):
+    earn = _earn_items(p)
+    deduct = _deduct_items(p)
+    key = (tuple(i[0] for i in earn), tuple(i[0] for i in deduct), bool(p.is_manual))
+    name = layouts.get(key)
+    if name is None:
+        name = layouts[key] = f"payslip_layout_{len(layouts)}"
+        _draw_layout_form(c, name, earn, deduct, p.is_manual, font, bold, issued_label)
+
+    c.doForm("payslip_frame")
+    c.doForm(name)
+
+    page = _PageText(c)
+    year, mon = p.month.split("-")
+    page.draw(LEFT + 6, _baseline(TITLE_TOP, TITLE_H, 16, 6), f"{year}년 {int(mon)}월 급여명세서",
+              bold, 16, TEXT_COLOR)
+
+    values = [
+        (p.emp_name, p.dept or "-"),
+        (hourly_label, MODE_LABELS.get(p.salary_mode, p.salary_mode)),
+        (f"{p.total_work_hours}h", f"{p.ot_hours}h"),
+        (f"{p.night_hours}h", f"{p.holiday_hours}h"),
+    ]
+    value_x = (LEFT + INFO_COLS[0] + 8, LEFT + sum(INFO_COLS[:3]) + 8)
+    for row, pair in enumerate(values):
+        y = _baseline(INFO_TOP - row * INFO_ROW_H, INFO_ROW_H, 10, 6)
+        for vx, value in zip(value_x, pair):
+            page.draw(vx, y, str(value), font, 10, TEXT_COLOR)
+
+    bottom = _draw_amounts(page, EARN_TOP, earn, f"{p.gross:,}원", font, bold, TEXT_COLOR)
+    total_deduct = p.tax + p.insurance + p.advance_deduction
+    bottom = _draw_amounts(page, bottom - 5 * mm, deduct, f"-{total_deduct:,}원", font, bold, DEDUCT_COLOR)
+
+    net_top = bottom - 6 * mm
+    page.draw(LEFT + WIDTH / 2, _baseline(net_top, NET_H, 16, 12), f"실수령액        {p.net:,}원",
+              bold, 16, HEADER_TEXT, "center")
+    c.drawText(page.text)
+
+
+def render_payslips_pdf(payslips, hourly, issued=None):
+    """급여명세서 목록을 1인 1페이지 PDF 로 렌더링한다. BytesIO 반환."""
+    font, bold = get_fonts()
+    buf = BytesIO()
+    c = canvas.Canvas(buf, pagesize=A4)
+    _draw_frame_form(c, bold)
+
+    layouts = {}
+    hourly_label = f"{hourly:,}원"
+    issued_label = f"발급일: {(issued or datetime.now()).strftime('%Y-%m-%d')}"
+    for payslip in payslips:
+        _draw_payslip(c, payslip, layouts, font, bold, hourly_label, issued_label)
+        c.showPage()
+
+    c.save()
+    buf.seek(0)
+    return buf
+
+
+# ── 디스크 캐시 ──────────────────────────────────
+
+_evict_lock = threading.Lock()
+_last_evict = 0.0
+_EVICT_INTERVAL = 60
+
+
+def _cache_dir():
+    path = current_app.config["PAYSLIP_PDF_CACHE_DIR"]
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def pdf_cache_key(payslips, hourly, issued):
+    """렌더링 결과를 결정하는 모든 입력의 해시 (ETag 로도 사용)."""
+    payload = {
+        "v": RENDER_VERSION,
+        "hourly": hourly,
+        "issued": issued.isoformat(),
+        "payslips": [p.to_dict() for p in payslips],
+    }
+    raw = json.dumps(payload, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()[:32]
+
+
+def _entry_prefix(month, payslip_id=None):
+    return f"{month}_{payslip_id if payslip_id is not None else 'all'}_"
+
+
+def get_cached_pdf(payslips, hourly):
+    """캐시된 PDF 경로와 ETag 를 반환한다. 없으면 렌더링 후 저장.
+
+    Args:
+        payslips: 같은 월의 Payslip 목록 (1건이면 명세서 단위로 저장)
+
+    Returns:
+        (path, etag)
+    """
+    issued = date.today()
+    key = pdf_cache_key(payslips, hourly, issued)
+    payslip_id = payslips[0].id if len(payslips) == 1 else None
+    directory = _cache_dir()
+    path = os.path.join(directory, f"{_entry_prefix(payslips[0].month, payslip_id)}{key}.pdf")
+
+    try:
+        os.utime(path)  # 최근 사용 시각 갱신 (용량 초과 시 정리 순서)
+        return path, key
+    except FileNotFoundError:
+        pass
+
+    buf = render_payslips_pdf(payslips, hourly, issued)
+    # 동시 요청이 같은 파일을 쓰더라도 완성된 파일만 보이도록 임시 파일 후 교체
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(buf.getbuffer())
+        os.replace(tmp_path, path)
+    except OSError:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+    _maybe_evict()
+    return path, key
+
+
+def invalidate_pdf_cache(month, payslip_id=None):
+    """해당 월(또는 특정 명세서)의 캐시 파일과 월 전체 PDF 를 지운다.
+
+    Returns:
+        삭제한 파일 수
+    """
+    directory = current_app.config["PAYSLIP_PDF_CACHE_DIR"]
+    if not os.path.isdir(directory):
+        return 0
+    if payslip_id is None:
+        prefixes = (f"{month}_",)
+    else:
+        prefixes = (_entry_prefix(month), _entry_prefix(month, payslip_id))
+
+    removed = 0
+    for entry in os.scandir(directory):
+        if entry.name.startswith(prefixes):
+            try:
+                os.remove(entry.path)
+                removed += 1
+            except FileNotFoundError:
+                pass
+    return removed
+
+
+def evict_pdf_cache(max_bytes=None, max_age_days=None):
+    """기간이 지난 파일을 지우고, 용량 초과 시 오래 사용되지 않은 순으로 지운다.
+
+    Returns:
+        삭제한 파일 수
+    """
+    cfg = current_app.config
+    directory = cfg["PAYSLIP_PDF_CACHE_DIR"]
+    if not os.path.isdir(directory):
+        return 0
+    if max_bytes is None:
+        max_bytes = cfg.get("PAYSLIP_PDF_CACHE_MAX_MB", 200) * 1024 * 1024
+    if max_age_days is None:
+        max_age_days = cfg.get("PAYSLIP_PDF_CACHE_MAX_AGE_DAYS", 3)
+
+    cutoff = time.time() - max_age_days * 86400
+    entries = []
+    removed = 0
+    for entry in os.scandir(directory):
+        try:
+            stat = entry.stat()
+        except FileNotFoundError:
+            continue
+        if stat.st_mtime < cutoff:
+            try:
+                os.remove(entry.path)
+                removed += 1
+            except FileNotFoundError:
+                pass
+            continue
+        entries.append((stat.st_mtime, stat.st_size, entry.path))
+
+    total = sum(size for _, size, _ in entries)
+    for _, size, path in sorted(entries):
+        if total <= max_bytes:
+            break
+        try:
+            os.remove(path)
+            removed += 1
+        except FileNotFoundError:
+            pass
+        total -= size
+
+    if removed:
+        logger.info("[명세서 PDF 캐시] %d개 파일 정리", removed)
+    return removed
+
+
+def _maybe_evict():
+    global _last_evict
+    now = time.monotonic()
+    if now - _last_evict < _EVICT_INTERVAL or not _evict_lock.acquire(blocking=False):
+        return
+    try:
+        _last_evict = now
+        evict_pdf_cache()
+    finally:
+        _evict_lock.release()
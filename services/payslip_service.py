@@ -1,12 +1,12 @@
 """급여 계산 비즈니스 로직 (payslip 라우트에서 추출)"""
-from collections import defaultdict
-from datetime import datetime, timedelta
+from datetime import datetime
 
 from flask import current_app
 from sqlalchemy import func
 
 from config import Config
-from models import AdvanceRequest, AttendanceRecord, Employee, OperationCalendarDay, Payslip, db
+from models import AdvanceRequest, Employee, Payslip, db
+from services import calendar_service
 from services.wage_service import get_wage_config
 
 ALLOWED_SALARY_MODES = {"standard", "actual", "daily_build"}
@@ -100,70 +100,15 @@ def _calc_pay(wage_cfg, salary_mode, total_h, ot_h, night_h, holiday_h,
     return base_salary, weekly_holiday_pay, ot_pay, night_pay, holiday_pay
 
 
-def _calc_attendance_info(employee_id, month, cfg):
-    """출근/결근 정보를 종합적으로 계산한다.
-
-    소정근로일: 월~금 중 공휴일 제외 (OperationCalendarDay 오버라이드 반영)
-    출근 인정: normal, night, annual, early
-    결근: absent, holiday 또는 기록 없음
-    주휴 판정: 해당 주(월~일)의 소정근로일에 모두 출근해야 주휴 발생
+def _count_attendance(scheduled_workdays, weeks, attended_dates):
+    """소정근로일/주 그룹과 출근일 집합으로 결근·개근 수치를 계산한다.
 
     Returns:
         (absent_days, non_full_weeks, attended_days, full_weeks)
     """
-    start_date, end_date = _month_range(month)
-
-    # 캘린더 오버라이드 일괄 조회
-    overrides = {
-        row.work_date: row.day_type
-        for row in OperationCalendarDay.query.filter(
-            OperationCalendarDay.work_date >= start_date,
-            OperationCalendarDay.work_date < end_date,
-        ).all()
-    }
-
-    # 공휴일
-    year = int(month.split("-")[0])
-    holidays = set(cfg.get(f"PUBLIC_HOLIDAYS_{year}", []))
-
-    def day_type(d):
-        if d in overrides:
-            return overrides[d]
-        if d.weekday() == 6:        # 일요일 → 유급휴일
-            return "paid_leave"
-        if d.weekday() == 5:        # 토요일 → 무급휴일
-            return "unpaid_leave"
-        if d.strftime("%Y-%m-%d") in holidays:
-            return "paid_leave"
-        return "workday"
-
-    # 소정근로일 집합 + 주별 그룹핑
-    scheduled_workdays = set()
-    weeks = defaultdict(set)         # (iso_year, iso_week) → set of workday dates
-
-    d = start_date
-    while d < end_date:
-        if day_type(d) == "workday":
-            scheduled_workdays.add(d)
-            iso_year, iso_week, _ = d.isocalendar()
-            weeks[(iso_year, iso_week)].add(d)
-        d += timedelta(days=1)
-
     if not scheduled_workdays:
         return 0, 0, 0, 0
 
-    # 직원 출근 기록 조회
-    records = (
-        AttendanceRecord.query
-        .filter(
-            AttendanceRecord.employee_id == employee_id,
-            AttendanceRecord.work_date >= start_date,
-            AttendanceRecord.work_date < end_date,
-        )
-        .all()
-    )
-    attended_dates = {r.work_date for r in records if r.work_type in ATTENDED_WORK_TYPES}
-
     # 결근일수 = 소정근로일 중 출근하지 않은 날
     absent_days = len(scheduled_workdays - attended_dates)
     attended_days = len(scheduled_workdays) - absent_days
@@ -181,6 +126,32 @@ def _calc_attendance_info(employee_id, month, cfg):
     return absent_days, non_full_weeks, attended_days, full_weeks
 
 
+def _calc_attendance_info(employee_id, month, cfg):
+    """출근/결근 정보를 종합적으로 계산한다.
+
+    소정근로일: 월~금 중 공휴일 제외 (OperationCalendarDay 오버라이드 반영)
+    출근 인정: normal, night, annual, early
+    결근: absent, holiday 또는 기록 없음
+    주휴 판정: 해당 주(월~일)의 소정근로일에 모두 출근해야 주휴 발생
+
+    Returns:
+        (absent_days, non_full_weeks, attended_days, full_weeks)
+    """
+    # 연도 캘린더 배열에서 소정근로일/주 그룹 조회
+    scheduled_workdays, weeks = calendar_service.month_schedule(month)
+
+    if not scheduled_workdays:
+        return 0, 0, 0, 0
+
+    # 직원×월 집계의 출근일 비트맵 (출근 인정 유형이 있는 날)
+    from services.attendance_rollup_service import bitmap_dates, get_rollup
+
+    rollup = get_rollup(employee_id, month)
+    attended_dates = bitmap_dates(month, rollup.attended_bitmap) if rollup else set()
+
+    return _count_attendance(scheduled_workdays, weeks, attended_dates)
+
+
 def _calc_absence_deductions(wage_cfg, salary_mode, absent_days, non_full_weeks):
     """결근/주휴 공제 금액을 계산한다 (출석 카운트 기반).
 
@@ -245,152 +216,76 @@ def _calc_deductions(gross, emp_ins_type, cfg):
     return tax, pension, health, longterm, employment, insurance
 
 
-def compute_payslips(month: str, salary_mode: str):
-    """월별 급여를 계산하고 DB에 저장한다.
+def _payslip_values(wage_cfg, salary_mode, hours, attendance_info, emp_ins_type, adv_total, cfg):
+    """직원 1명의 급여명세서 필드 값을 계산한다 (DB 접근 없음).
 
-    Returns (created, updated, skipped) 또는 error 문자열.
+    Args:
+        wage_cfg: get_wage_config() 결과 딕셔너리
+        salary_mode: 요청된 산정 방식 (WageConfig 로 재해석됨)
+        hours: (total_h, ot_h, night_h, holiday_h) — 이미 소수 2자리로 반올림된 값
+        attendance_info: _calc_attendance_info() 결과 튜플
+        emp_ins_type: '4대보험' | '3.3%'
+        adv_total: 승인된 가불 합계
+
+    Returns:
+        dict: Payslip 컬럼명 → 값
     """
-    cfg = current_app.config
+    total_h, ot_h, night_h, holiday_h = hours
+    absent_days, non_full_weeks, attended_days, full_weeks = attendance_info
+    effective_mode = _effective_salary_mode(wage_cfg, salary_mode)
 
-    start_date, end_date = _month_range(month)
-
-    aggregates = (
-        db.session.query(
-            AttendanceRecord.employee_id,
-            AttendanceRecord.emp_name,
-            AttendanceRecord.dept,
-            func.sum(AttendanceRecord.total_work_hours).label("total_hours"),
-            func.sum(AttendanceRecord.overtime_hours).label("ot_hours"),
-            func.sum(AttendanceRecord.night_hours).label("night_hours"),
-            func.sum(AttendanceRecord.holiday_work_hours).label("holiday_hours"),
-        )
-        .filter(
-            AttendanceRecord.work_date >= start_date,
-            AttendanceRecord.work_date < end_date,
-        )
-        .group_by(
-            AttendanceRecord.employee_id,
-            AttendanceRecord.emp_name,
-            AttendanceRecord.dept,
-        )
-        .all()
+    base_salary, weekly_hol_pay, ot_pay, night_pay, holiday_pay = _calc_pay(
+        wage_cfg, effective_mode, total_h, ot_h, night_h, holiday_h,
+        attended_days, full_weeks,
+    )
+    absent_ded, weekly_hol_ded = _calc_absence_deductions(
+        wage_cfg, effective_mode, absent_days, non_full_weeks
     )
+    gross = max(0, base_salary + weekly_hol_pay + ot_pay + night_pay + holiday_pay
+                 - absent_ded - weekly_hol_ded)
+    tax, pension, health, longterm, employment, insurance = _calc_deductions(gross, emp_ins_type, cfg)
+    net = gross - tax - insurance - adv_total
 
-    if not aggregates:
-        return f"{month} 근태 기록이 없습니다."
-
-    created = 0
-    updated = 0
-    skipped = 0
-    for row in aggregates:
-        employee_id, emp_name, dept = row.employee_id, row.emp_name, row.dept
-        total_h = round(row.total_hours or 0, 2)
-        ot_h = round(row.ot_hours or 0, 2)
-        night_h = round(row.night_hours or 0, 2)
-        holiday_h = round(row.holiday_hours or 0, 2)
-
-        # 직원별 WageConfig 해석 (직원 > 현장 > 시스템 기본값)
-        wage_cfg = get_wage_config(employee_id=employee_id)
-        effective_mode = _effective_salary_mode(wage_cfg, salary_mode)
-
-        # 출근/결근 정보
-        absent_days, non_full_weeks, attended_days, full_weeks = (
-            _calc_attendance_info(employee_id, month, cfg)
-        )
+    return {
+        "salary_mode": effective_mode,
+        "total_work_hours": total_h,
+        "ot_hours": ot_h,
+        "night_hours": night_h,
+        "holiday_hours": holiday_h,
+        "base_salary": base_salary,
+        "weekly_holiday_pay": weekly_hol_pay,
+        "ot_pay": ot_pay,
+        "night_pay": night_pay,
+        "holiday_pay": holiday_pay,
+        "absent_days": absent_days,
+        "absent_deduction": absent_ded,
+        "weekly_holiday_deduction": weekly_hol_ded,
+        "gross": gross,
+        "tax": tax,
+        "pension": pension,
+        "health_ins": health,
+        "longterm_care": longterm,
+        "employment_ins": employment,
+        "insurance": insurance,
+        "advance_deduction": adv_total,
+        "net": net,
+    }
 
-        # 급여 계산
-        base_salary, weekly_hol_pay, ot_pay, night_pay, holiday_pay = _calc_pay(
-            wage_cfg, effective_mode, total_h, ot_h, night_h, holiday_h,
-            attended_days, full_weeks,
-        )
 
-        # 결근/주휴 공제 (standard만 해당)
-        absent_ded, weekly_hol_ded = _calc_absence_deductions(
-            wage_cfg, effective_mode, absent_days, non_full_weeks
-        )
+def compute_payslips(month: str, salary_mode: str):
+    """월별 급여를 계산하고 DB에 저장한다.
 
-        gross = max(0, base_salary + weekly_hol_pay + ot_pay + night_pay + holiday_pay
-                     - absent_ded - weekly_hol_ded)
-
-        # 직원별 보험 유형 조회
-        emp = db.session.get(Employee, employee_id)
-        emp_ins_type = emp.insurance_type if emp else "3.3%"
-        tax, pension, health, longterm, employment, insurance = _calc_deductions(gross, emp_ins_type, cfg)
-
-        adv_total = (
-            db.session.query(func.coalesce(func.sum(AdvanceRequest.amount), 0))
-            .filter(
-                AdvanceRequest.employee_id == employee_id,
-                AdvanceRequest.request_month == month,
-                AdvanceRequest.status == "approved",
-            )
-            .scalar()
-        )
+    실제 계산은 payroll_bulk_service 의 일괄 엔진이 수행한다
+    (월 입력 선적재 → 메모리 계산 → bulk upsert).
 
-        net = gross - tax - insurance - adv_total
-
-        existing = Payslip.query.filter_by(employee_id=employee_id, month=month).first()
-        if existing:
-            if existing.is_manual:
-                skipped += 1
-                continue
-            existing.salary_mode = effective_mode
-            existing.total_work_hours = total_h
-            existing.ot_hours = ot_h
-            existing.night_hours = night_h
-            existing.holiday_hours = holiday_h
-            existing.base_salary = base_salary
-            existing.weekly_holiday_pay = weekly_hol_pay
-            existing.ot_pay = ot_pay
-            existing.night_pay = night_pay
-            existing.holiday_pay = holiday_pay
-            existing.absent_days = absent_days
-            existing.absent_deduction = absent_ded
-            existing.weekly_holiday_deduction = weekly_hol_ded
-            existing.gross = gross
-            existing.tax = tax
-            existing.pension = pension
-            existing.health_ins = health
-            existing.longterm_care = longterm
-            existing.employment_ins = employment
-            existing.insurance = insurance
-            existing.advance_deduction = adv_total
-            existing.net = net
-            updated += 1
-        else:
-            payslip = Payslip(
-                employee_id=employee_id,
-                emp_name=emp_name,
-                dept=dept,
-                month=month,
-                salary_mode=effective_mode,
-                total_work_hours=total_h,
-                ot_hours=ot_h,
-                night_hours=night_h,
-                holiday_hours=holiday_h,
-                base_salary=base_salary,
-                weekly_holiday_pay=weekly_hol_pay,
-                ot_pay=ot_pay,
-                night_pay=night_pay,
-                holiday_pay=holiday_pay,
-                absent_days=absent_days,
-                absent_deduction=absent_ded,
-                weekly_holiday_deduction=weekly_hol_ded,
-                gross=gross,
-                tax=tax,
-                pension=pension,
-                health_ins=health,
-                longterm_care=longterm,
-                employment_ins=employment,
-                insurance=insurance,
-                advance_deduction=adv_total,
-                net=net,
-            )
-            db.session.add(payslip)
-            created += 1
+    Returns (created, updated, skipped) 또는 error 문자열.
+    """
+    from services.payroll_bulk_service import compute_payslips_bulk
 
-    db.session.commit()
-    return created, updated, skipped
+    result = compute_payslips_bulk(month, salary_mode)
+    if isinstance(result, str):
+        return result
+    return result["created"], result["updated"], result["skipped"]
 
 
 def compute_single_payslip(employee_id: int, month: str, salary_mode: str):
@@ -404,61 +299,22 @@ def compute_single_payslip(employee_id: int, month: str, salary_mode: str):
 
     cfg = current_app.config
 
-    start_date, end_date = _month_range(month)
+    from services.attendance_rollup_service import get_rollup
 
-    row = (
-        db.session.query(
-            AttendanceRecord.emp_name,
-            AttendanceRecord.dept,
-            func.sum(AttendanceRecord.total_work_hours).label("total_hours"),
-            func.sum(AttendanceRecord.overtime_hours).label("ot_hours"),
-            func.sum(AttendanceRecord.night_hours).label("night_hours"),
-            func.sum(AttendanceRecord.holiday_work_hours).label("holiday_hours"),
-        )
-        .filter(
-            AttendanceRecord.employee_id == employee_id,
-            AttendanceRecord.work_date >= start_date,
-            AttendanceRecord.work_date < end_date,
-        )
-        .group_by(AttendanceRecord.emp_name, AttendanceRecord.dept)
-        .first()
-    )
+    row = get_rollup(employee_id, month)
 
     if not row or not row.total_hours:
         return f"{emp.name}의 {month} 근태 기록이 없습니다."
 
     emp_name = row.emp_name
     dept = row.dept
-    total_h = round(row.total_hours or 0, 2)
-    ot_h = round(row.ot_hours or 0, 2)
-    night_h = round(row.night_hours or 0, 2)
-    holiday_h = round(row.holiday_hours or 0, 2)
+    hours = tuple(
+        round(value or 0, 2)
+        for value in (row.total_hours, row.overtime_hours, row.night_hours, row.holiday_hours)
+    )
 
     # 직원별 WageConfig 해석 (직원 > 현장 > 시스템 기본값)
     wage_cfg = get_wage_config(employee_id=employee_id)
-    effective_mode = _effective_salary_mode(wage_cfg, salary_mode)
-
-    # 출근/결근 정보
-    absent_days, non_full_weeks, attended_days, full_weeks = (
-        _calc_attendance_info(employee_id, month, cfg)
-    )
-
-    # 급여 계산
-    base_salary, weekly_hol_pay, ot_pay, night_pay, holiday_pay = _calc_pay(
-        wage_cfg, effective_mode, total_h, ot_h, night_h, holiday_h,
-        attended_days, full_weeks,
-    )
-
-    # 결근/주휴 공제 (standard만 해당)
-    absent_ded, weekly_hol_ded = _calc_absence_deductions(
-        wage_cfg, effective_mode, absent_days, non_full_weeks
-    )
-
-    gross = max(0, base_salary + weekly_hol_pay + ot_pay + night_pay + holiday_pay
-                 - absent_ded - weekly_hol_ded)
-
-    emp_ins_type = emp.insurance_type if emp else "3.3%"
-    tax, pension, health, longterm, employment, insurance = _calc_deductions(gross, emp_ins_type, cfg)
 
     adv_total = (
         db.session.query(func.coalesce(func.sum(AdvanceRequest.amount), 0))
@@ -470,66 +326,29 @@ def compute_single_payslip(employee_id: int, month: str, salary_mode: str):
         .scalar()
     )
 
-    net = gross - tax - insurance - adv_total
+    values = _payslip_values(
+        wage_cfg, salary_mode, hours,
+        _calc_attendance_info(employee_id, month, cfg),
+        emp.insurance_type, adv_total, cfg,
+    )
 
     existing = Payslip.query.filter_by(employee_id=employee_id, month=month).first()
     action = "updated"
     if existing:
         if existing.is_manual:
             return "수동 수정된 명세서입니다. 초기화 후 재생성하세요."
-        existing.salary_mode = effective_mode
-        existing.total_work_hours = total_h
-        existing.ot_hours = ot_h
-        existing.night_hours = night_h
-        existing.holiday_hours = holiday_h
-        existing.base_salary = base_salary
-        existing.weekly_holiday_pay = weekly_hol_pay
-        existing.ot_pay = ot_pay
-        existing.night_pay = night_pay
-        existing.holiday_pay = holiday_pay
-        existing.absent_days = absent_days
-        existing.absent_deduction = absent_ded
-        existing.weekly_holiday_deduction = weekly_hol_ded
-        existing.gross = gross
-        existing.tax = tax
-        existing.pension = pension
-        existing.health_ins = health
-        existing.longterm_care = longterm
-        existing.employment_ins = employment
-        existing.insurance = insurance
-        existing.advance_deduction = adv_total
-        existing.net = net
+        for field, value in values.items():
+            setattr(existing, field, value)
+        payslip = existing
     else:
         action = "created"
-        payslip = Payslip(
-            employee_id=employee_id,
-            emp_name=emp_name,
-            dept=dept,
-            month=month,
-            salary_mode=effective_mode,
-            total_work_hours=total_h,
-            ot_hours=ot_h,
-            night_hours=night_h,
-            holiday_hours=holiday_h,
-            base_salary=base_salary,
-            weekly_holiday_pay=weekly_hol_pay,
-            ot_pay=ot_pay,
-            night_pay=night_pay,
-            holiday_pay=holiday_pay,
-            absent_days=absent_days,
-            absent_deduction=absent_ded,
-            weekly_holiday_deduction=weekly_hol_ded,
-            gross=gross,
-            tax=tax,
-            pension=pension,
-            health_ins=health,
-            longterm_care=longterm,
-            employment_ins=employment,
-            insurance=insurance,
-            advance_deduction=adv_total,
-            net=net,
-        )
+        payslip = Payslip(employee_id=employee_id, emp_name=emp_name, dept=dept, month=month, **values)
         db.session.add(payslip)
 
+    from services.payroll_dirty_service import clear_stale
+    from services.payslip_pdf_service import invalidate_pdf_cache
+    clear_stale(employee_id, month)
+
     db.session.commit()
+    invalidate_pdf_cache(month, payslip.id)
     return {"action": action, "emp_name": emp_name}
@@ -91,7 +91,9 @@ def _process_scheduled_contracts(app):
 
 
 def init_scheduler(app):
-    """Flask 앱에 APScheduler를 연결하고 예약발송 작업을 등록한다.
+    """Flask 앱에 APScheduler를 연결하고 예약발송을 등록한다.
+
+    백그라운드 작업 확인은 스케줄러와 별개로 job_service.init_job_runner 가 맡는다.
 
     환경변수 SCHEDULER_DISABLED=1 로 비활성화 가능 (gunicorn 멀티워커 시 활용).
     """
@@ -0,0 +1,283 @@
+"""이름·전화번호 부분 검색 서비스.
+
+목록 화면의 검색이 `LIKE '%q%'` 로 전체 행을 훑지 않도록, 검색 대상 필드를
+search_documents 에 엔티티별 문서로 모아 두고 전문 검색 인덱스로 찾는다.
+
+- SQLite: FTS5 trigram (search_documents_fts) — 3글자 이상 부분 문자열을 인덱스로 찾는다
+- MySQL: ngram FULLTEXT 인덱스 (BOOLEAN MODE 구문 검색)
+- 1~2글자 검색어(한글 이름 일부 등): 문서의 1~2글자 조각을 채움 문자로 3글자로 맞춰 둔
+  grams 컬럼에서 같은 방식으로 찾는다
+- 전화번호: 하이픈·공백을 뺀 숫자만 저장(phone_digits)하고 숫자로 비교한다
+- 쓰기 동기화: 세션 이벤트로 ORM 추가·수정·삭제 시 문서와 phone_digits 를 갱신한다
+  (직접 DB 를 고쳤다면 scripts/rebuild_search_index.py 로 재구성)
+- 그 밖의 DB 는 문서 테이블 LIKE 검색으로 동작한다 (인덱스 없음)
+"""
+import re
+from dataclasses import dataclass
+
+from sqlalchemy import (
+    Integer,
+    bindparam,
+    cast,
+    event,
+    false,
+    inspect,
+    literal_column,
+    or_,
+    select,
+    table,
+)
+from sqlalchemy.dialects import mysql
+
+from models import Application, Contract, Employee, Inquiry, SearchDocument, db
+
+# 1~2글자 조각을 3글자로 채우는 문자 (검색어·본문에 나오지 않는 제어 문자)
+GRAM_PAD = "\x1f"
+TRIGRAM = 3
+
+_PHONE_LIKE = re.compile(r"[\d\s\-+().]+")
+_registered = False
+
+
+@dataclass(frozen=True)
+class _Spec:
+    model: type
+    text_fields: tuple
+    phone_field: str | None = None
+
+    @property
+    def watched(self):
+        return self.text_fields + ((self.phone_field,) if self.phone_field else ())
+
+
+SPECS = {
+    "application": _Spec(Application, ("name",), "phone_digits"),
+    "inquiry": _Spec(Inquiry, ("company", "name", "email"), "phone_digits"),
+    "employee": _Spec(Employee, ("name",)),
+    "contract": _Spec(Contract, ("title",)),
+}
+_ENTITY_OF = {spec.model: entity for entity, spec in SPECS.items()}
+
+
+def normalize_phone(value):
+    """전화번호에서 숫자만 남긴다 ('010-1234-5678' → '01012345678')."""
+    return re.sub(r"\D", "", value or "")
+
+
+def _grams(body):
+    seen = {}
+    for line in body.lower().split("\n"):
+        for size in (1, 2):
+            for i in range(len(line) - size + 1):
+                gram = line[i:i + size]
+                if not gram.isspace():
+                    seen[gram.ljust(TRIGRAM, GRAM_PAD)] = None
+    return " ".join(seen)
+
+
+def build_document(entity, obj):
+    spec = SPECS[entity]
+    body = "\n".join(str(v) for v in (getattr(obj, f) for f in spec.text_fields) if v)
+    return {
+        "entity": entity,
+        "entity_id": str(obj.id),
+        "body": body,
+        "phone": (getattr(obj, spec.phone_field) or "") if spec.phone_field else "",
+        "grams": _grams(body),
+    }
+
+
+def _upsert_documents(session, docs):
+    table_ = SearchDocument.__table__
+    dialect = session.get_bind().dialect.name
+    if dialect in ("sqlite", "postgresql"):
+        if dialect == "sqlite":
+            from sqlalchemy.dialects.sqlite import insert
+        else:
+            from sqlalchemy.dialects.postgresql import insert
+        stmt = insert(table_)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["entity", "entity_id"],
+            set_={c: stmt.excluded[c] for c in ("body", "phone", "grams")},
+        )
+    elif dialect in ("mysql", "mariadb"):
+        from sqlalchemy.dialects.mysql import insert
+        stmt = insert(table_)
+        stmt = stmt.on_duplicate_key_update({c: stmt.inserted[c] for c in ("body", "phone", "grams")})
+    else:
+        _delete_documents(session, docs[0]["entity"], [doc["entity_id"] for doc in docs])
+        stmt = table_.insert()
+    session.execute(stmt, docs)
+
+
+def _delete_documents(session, entity, entity_ids):
+    table_ = SearchDocument.__table__
+    entity_ids = [str(i) for i in entity_ids]
+    for i in range(0, len(entity_ids), 500):
+        session.execute(
+            table_.delete().where(
+                table_.c.entity == entity, table_.c.entity_id.in_(entity_ids[i:i + 500])
+            )
+        )
+
+
+# ── 검색 ──
+
+def _backend():
+    name = db.engine.dialect.name
+    if name == "sqlite":
+        return "fts5"
+    if name in ("mysql", "mariadb"):
+        return "mysql"
+    return "like"
+
+
+def _phrase(term):
+    return '"' + term.replace('"', '""') + '"'
+
+
+def _fts(backend, column, term):
+    if backend == "fts5":
+        fts = literal_column("search_documents_fts")
+        rowids = select(literal_column("rowid")).select_from(table("search_documents_fts")).where(
+            fts.op("MATCH")(f"{column} : {_phrase(term)}")
+        )
+        return SearchDocument.id.in_(rowids)
+    return mysql.match(getattr(SearchDocument, column), against=_phrase(term)).in_boolean_mode()
+
+
+def _text_condition(backend, term):
+    if backend == "like":
+        return SearchDocument.body.contains(term)
+    if len(term) >= TRIGRAM:
+        return _fts(backend, "body", term)
+    return _fts(backend, "grams", term.lower().ljust(TRIGRAM, GRAM_PAD))
+
+
+def _phone_condition(backend, digits):
+    if backend == "like" or len(digits) < TRIGRAM:
+        return SearchDocument.phone.contains(digits)
+    return _fts(backend, "phone", digits)
+
+
+def match_ids(entity, q, fields=("text", "phone")):
+    """검색어와 맞는 엔티티 id 의 SELECT — `Model.id.in_(match_ids(...))` 로 쓴다.
+
+    Args:
+        entity: SPECS 의 키 ("application", "inquiry", "employee", "contract")
+        q: 검색어 (부분 일치, 대소문자 무시)
+        fields: "text"(이름·회사·제목 등) / "phone"(숫자 비교). 둘 다면 전화번호 검색은
+            검색어가 숫자·하이픈 등으로만 이뤄졌을 때만 더한다.
+    """
+    spec = SPECS[entity]
+    backend = _backend()
+    term = (q or "").strip()
+    digits = normalize_phone(term)
+
+    conditions = []
+    if term and "text" in fields:
+        conditions.append(_text_condition(backend, term))
+    if digits and "phone" in fields and spec.phone_field:
+        if "text" not in fields or _PHONE_LIKE.fullmatch(term):
+            conditions.append(_phone_condition(backend, digits))
+
+    key = SearchDocument.entity_id
+    if isinstance(spec.model.id.type, Integer):
+        key = cast(key, Integer)
+    return select(key).where(
+        SearchDocument.entity == entity,
+        or_(*conditions) if conditions else false(),
+    )
+
+
+# ── 쓰기 동기화 ──
+
+def _changed(obj, fields):
+    state = inspect(obj)
+    return any(state.attrs[f].history.has_changes() for f in fields)
+
+
+def _before_flush(session, flush_context, instances):
+    for obj in list(session.new) + list(session.dirty):
+        if isinstance(obj, (Application, Inquiry)) and (
+            obj in session.new or _changed(obj, ("phone",))
+        ):
+            obj.phone_digits = normalize_phone(obj.phone) or None
+
+
+def _after_flush(session, flush_context):
+    upserts, removed = {}, {}
+    for obj in session.new:
+        entity = _ENTITY_OF.get(type(obj))
+        if entity:
+            upserts.setdefault(entity, []).append(obj)
+    for obj in session.dirty:
+        entity = _ENTITY_OF.get(type(obj))
+        if entity and _changed(obj, SPECS[entity].watched):
+            upserts.setdefault(entity, []).append(obj)
+    for obj in session.deleted:
+        entity = _ENTITY_OF.get(type(obj))
+        if entity:
+            removed.setdefault(entity, []).append(obj.id)
+
+    for entity, objs in upserts.items():
+        _upsert_documents(session, [build_document(entity, obj) for obj in objs])
+    for entity, ids in removed.items():
+        _delete_documents(session, entity, ids)
+
+
+def init_search_tracking():
+    """세션 이벤트 리스너를 등록한다 (프로세스당 1회)."""
+    global _registered
+    if _registered:
+        return
+    event.listen(db.session, "before_flush", _before_flush)
+    event.listen(db.session, "after_flush", _after_flush)
+    _registered = True
+
+
+# ── 재구성 ──
+
+def rebuild_search_index(batch_size=1000):
+    """모든 검색 문서와 phone_digits 를 원본에서 다시 만든다.
+
+    Returns:
+        {엔티티: 문서 수}
+    """
+    session = db.session
+    for model in (Application, Inquiry):
+        rows = session.execute(select(model.id, model.phone, model.phone_digits)).all()
+        changed = [
+            {"_id": row.id, "_digits": normalize_phone(row.phone) or None}
+            for row in rows
+            if (normalize_phone(row.phone) or None) != row.phone_digits
+        ]
+        if changed:
+            table_ = model.__table__
+            session.execute(
+                table_.update()
+                .where(table_.c.id == bindparam("_id"))
+                .values(phone_digits=bindparam("_digits")),
+                changed,
+            )
+
+    session.execute(SearchDocument.__table__.delete())
+    counts = {}
+    for entity, spec in SPECS.items():
+        columns = [getattr(spec.model, f) for f in ("id",) + spec.watched]
+        result = session.execute(
+            select(*columns).order_by(spec.model.id).execution_options(yield_per=batch_size)
+        )
+        counts[entity] = 0
+        for rows in result.partitions():
+            session.execute(
+                SearchDocument.__table__.insert(), [build_document(entity, row) for row in rows]
+            )
+            counts[entity] += len(rows)
+
+    if _backend() == "fts5":
+        session.execute(db.text(
+            "INSERT INTO search_documents_fts(search_documents_fts) VALUES ('rebuild')"
+        ))
+    session.commit()
+    return counts
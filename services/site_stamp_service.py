@@ -0,0 +1,110 @@
+"""근태·급여명세서의 소속 현장(site_id) 비정규화 유지 서비스.
+
+AttendanceRecord.site_id / Payslip.site_id 에 근무일·급여월 당시 직원의 현장을
+저장해 두어, 현장별 목록·통계·내보내기가 직원 조인 없이
+(site_id, work_date) / (site_id, month) 인덱스 범위로 조회되도록 한다.
+
+- ORM 추가 (before_flush): site_id 가 비어 있거나 직원이 바뀐 행은 직원의 현장으로 채운다
+- Core 일괄 쓰기(엑셀 import, 급여 일괄 계산): 행을 만들 때 직원의 현장을 함께 넣는다
+- 직원 소속 현장 변경(/api/sites/<id>/assign 등, after_flush): PAYROLL_OPEN_MONTHS
+  범위의 근태·명세서를 새 현장으로 옮긴다. 지난 달은 당시 현장을 유지한다
+  (급여 재계산 대상 범위와 같음). 옮긴 달의 근태 월 집계·월별 지표도 재계산 대상으로 표시한다.
+"""
+from sqlalchemy import event, inspect, select, update
+
+from models import AttendanceRecord, Employee, Payslip, db
+from services.attendance_rollup_service import touch_rollups
+from services.monthly_metrics_service import touch_metrics
+from services.payroll_dirty_service import _open_months
+from services.payslip_service import _month_range
+
+_STAMPED = (AttendanceRecord, Payslip)
+_registered = False
+
+
+def employee_sites(session, employee_ids):
+    """{employee_id: site_id} — 세션에 적재된 직원은 메모리 값(미반영 변경 포함)을 쓴다."""
+    sites, missing = {}, []
+    for emp_id in set(employee_ids):
+        emp = session.identity_map.get(inspect(Employee).identity_key_from_primary_key((emp_id,)))
+        if emp is not None:
+            sites[emp_id] = emp.site_id
+        else:
+            missing.append(emp_id)
+    if missing:
+        with session.no_autoflush:
+            sites.update(session.execute(
+                select(Employee.id, Employee.site_id).where(Employee.id.in_(missing))
+            ).all())
+    return sites
+
+
+def _needs_stamp(session, obj):
+    if obj in session.new:
+        return obj.site_id is None
+    return inspect(obj).attrs.employee_id.history.has_changes()
+
+
+def _before_flush(session, flush_context, instances):
+    targets = [
+        obj for obj in list(session.new) + list(session.dirty)
+        if isinstance(obj, _STAMPED) and _needs_stamp(session, obj)
+    ]
+    if not targets:
+        return
+    sites = employee_sites(session, [obj.employee_id for obj in targets if obj.employee_id])
+    for obj in targets:
+        if obj.employee_id:
+            obj.site_id = sites.get(obj.employee_id)
+        elif obj.employee is not None:
+            obj.site_id = obj.employee.site_id
+
+
+def restamp_open_months(session, site_changes):
+    """직원별 새 현장을 열린 급여월(PAYROLL_OPEN_MONTHS)의 근태·명세서에 반영한다.
+
+    Args:
+        site_changes: {employee_id: 새 site_id 또는 None}
+    """
+    if not site_changes:
+        return
+    months = _open_months()
+    first_day = _month_range(months[-1])[0]
+    by_site = {}
+    for emp_id, site_id in site_changes.items():
+        by_site.setdefault(site_id, []).append(emp_id)
+    records, payslips = AttendanceRecord.__table__, Payslip.__table__
+    for site_id, emp_ids in by_site.items():
+        session.execute(
+            update(records)
+            .where(records.c.employee_id.in_(emp_ids), records.c.work_date >= first_day)
+            .values(site_id=site_id)
+        )
+        session.execute(
+            update(payslips)
+            .where(payslips.c.employee_id.in_(emp_ids), payslips.c.month.in_(months))
+            .values(site_id=site_id)
+        )
+    touch_rollups([(emp_id, month) for emp_id in site_changes for month in months], session)
+    touch_metrics(months, session)
+
+
+def _after_flush(session, flush_context):
+    changes = {
+        obj.id: obj.site_id
+        for obj in session.dirty
+        if isinstance(obj, Employee)
+        and obj.id is not None
+        and inspect(obj).attrs.site_id.history.has_changes()
+    }
+    restamp_open_months(session, changes)
+
+
+def init_site_tracking():
+    """세션 이벤트 리스너를 등록한다 (프로세스당 1회)."""
+    global _registered
+    if _registered:
+        return
+    event.listen(db.session, "before_flush", _before_flush)
+    event.listen(db.session, "after_flush", _after_flush)
+    _registered = True
@@ -3,15 +3,141 @@
 우선순위: employee 개별 설정 > site 현장 설정 > system 기본값
 각 필드별로 독립적으로 해석 (employee에 hourly_wage만 설정하면
 나머지는 site → system 순서로 폴백).
+
+WageConfig 전체를 워커 메모리의 계층별 인덱스(WageIndex)로 캐시한다.
+WageConfig 가 바뀌는 flush 에서 공유 버전 카운터(cache_versions)를 올리므로
+save_wage_config 등으로 저장하면 다른 gunicorn 워커도 다음 버전 확인 때 다시 적재한다.
 """
 import logging
+import threading
+import time
+from types import SimpleNamespace
+
+from flask import current_app
+from sqlalchemy import event, select
 
 from models import Employee, WageConfig, db
 from models.wage_config import WAGE_DEFAULTS
+from services.cache_version_service import bump_version, current_version
 
 logger = logging.getLogger(__name__)
 
 
+_CACHE_NAME = "wage_config"
+_PENDING_KEY = "wage_config_changed"
+
+_cache_lock = threading.Lock()
+_cache = {"index": None, "version": None, "checked": 0.0}
+_registered = False
+
+
+class WageIndex:
+    """WageConfig 전체의 계층별 스냅샷과 해석 결과 메모.
+
+    기본값 ← 시스템 ← 현장 ← 직원 순으로 덮어쓴 결과를 현장별·직원별로 한 번만
+    만들어 두므로, 이후 해석은 딕셔너리 조회와 복사뿐이다.
+    """
+
+    def __init__(self, rows=(), layers=None):
+        if layers is None:
+            emp_layers, site_layers, sys_layer = {}, {}, None
+            for row in rows:
+                layer = SimpleNamespace(**{f: row[f] for f in WageConfig.RATE_FIELDS})
+                if row["config_type"] == "employee":
+                    emp_layers[row["target_id"]] = layer
+                elif row["config_type"] == "site":
+                    site_layers[row["target_id"]] = layer
+                elif row["config_type"] == "system" and sys_layer is None:
+                    sys_layer = layer
+            layers = (emp_layers, site_layers, sys_layer)
+        self.layers = layers
+        defaults = {f: WAGE_DEFAULTS.get(f) for f in WageConfig.RATE_FIELDS}
+        self._base = self._overlay(defaults, layers[2])
+        self._sites = {}
+        self._resolved = {}
+
+    def with_site_overrides(self, site_overrides):
+        """현장 설정을 가정값으로 덮어쓴 새 인덱스 (시뮬레이션용).
+
+        Args:
+            site_overrides: {site_id: {field: value}} — 값이 None 이면 상위로 위임
+        """
+        emp_layers, site_layers, sys_layer = self.layers
+        site_layers = dict(site_layers)
+        for site_id, overrides in site_overrides.items():
+            base = site_layers.get(site_id)
+            merged = {f: getattr(base, f, None) for f in WageConfig.RATE_FIELDS}
+            merged.update(overrides)
+            site_layers[site_id] = SimpleNamespace(**merged)
+        return WageIndex(layers=(emp_layers, site_layers, sys_layer))
+
+    @staticmethod
+    def _overlay(base, layer):
+        if layer is None:
+            return base
+        own = {}
+        for field in WageConfig.RATE_FIELDS:
+            value = getattr(layer, field)
+            if value is not None:
+                own[field] = value
+        return {**base, **own} if own else base
+
+    def _site_config(self, site_id):
+        if not site_id:
+            return self._base
+        merged = self._sites.get(site_id)
+        if merged is None:
+            merged = self._sites[site_id] = self._overlay(self._base, self.layers[1].get(site_id))
+        return merged
+
+    def resolve(self, employee_id, site_id):
+        """직원/현장 조합의 해석 결과 (호출자가 수정해도 되도록 복사본)."""
+        key = (employee_id, site_id)
+        merged = self._resolved.get(key)
+        if merged is None:
+            base = self._site_config(site_id)
+            layer = self.layers[0].get(employee_id) if employee_id else None
+            merged = self._resolved[key] = self._overlay(base, layer)
+        return dict(merged)
+
+
+def _load_index():
+    table = WageConfig.__table__
+    rows = db.session.execute(
+        select(table.c.config_type, table.c.target_id, *[table.c[f] for f in WageConfig.RATE_FIELDS])
+        .order_by(table.c.id.asc())
+    ).mappings().all()
+    return WageIndex(rows)
+
+
+def get_wage_index(fresh=False):
+    """워커 메모리에 캐시된 WageIndex.
+
+    WAGE_CACHE_CHECK_SECONDS 마다(fresh=True 면 즉시) 공유 버전 카운터를 확인하여
+    다른 워커가 설정을 바꿨으면 다시 적재한다.
+    """
+    now = time.monotonic()
+    interval = current_app.config.get("WAGE_CACHE_CHECK_SECONDS", 1)
+    with _cache_lock:
+        index, version, checked = _cache["index"], _cache["version"], _cache["checked"]
+    if index is not None and not fresh and now - checked < interval:
+        return index
+
+    # 버전을 먼저 읽어야 적재 중 커밋된 변경이 다음 확인에서 다시 반영된다
+    stored = current_version(_CACHE_NAME)
+    if index is None or stored != version:
+        index = _load_index()
+    with _cache_lock:
+        _cache.update(index=index, version=stored, checked=now)
+    return index
+
+
+def invalidate_wage_cache():
+    """이 워커의 캐시를 비운다."""
+    with _cache_lock:
+        _cache.update(index=None, version=None, checked=0.0)
+
+
 def get_wage_config(employee_id=None, site_id=None):
     """직원 또는 현장에 해당하는 급여 설정을 해석하여 반환한다.
 
@@ -22,48 +148,37 @@ def get_wage_config(employee_id=None, site_id=None):
     Returns:
         dict: 모든 필드가 채워진 급여 설정 딕셔너리
     """
-    layers = []  # 우선순위 높은 순서대로
+    if employee_id and not site_id:
+        emp = db.session.get(Employee, employee_id)
+        if emp and emp.site_id:
+            site_id = emp.site_id
+    return get_wage_index().resolve(employee_id, site_id)
 
-    if employee_id:
-        # 직원 개별 설정
-        emp_cfg = WageConfig.query.filter_by(
-            config_type="employee", target_id=employee_id
-        ).first()
-        if emp_cfg:
-            layers.append(emp_cfg)
 
-        # 직원의 소속 현장 설정
-        if not site_id:
-            emp = db.session.get(Employee, employee_id)
-            if emp and emp.site_id:
-                site_id = emp.site_id
-
-    if site_id:
-        site_cfg = WageConfig.query.filter_by(
-            config_type="site", target_id=site_id
-        ).first()
-        if site_cfg:
-            layers.append(site_cfg)
-
-    # 시스템 기본 설정 (DB)
-    sys_cfg = WageConfig.query.filter_by(config_type="system").first()
-    if sys_cfg:
-        layers.append(sys_cfg)
-
-    # 필드별로 우선순위 해석
-    result = {}
-    for field in WageConfig.RATE_FIELDS:
-        value = None
-        for layer in layers:
-            v = getattr(layer, field, None)
-            if v is not None:
-                value = v
-                break
-        if value is None:
-            value = WAGE_DEFAULTS.get(field)
-        result[field] = value
+def resolve_wage_configs(employee_sites, fresh=False, index=None):
+    """여러 직원의 급여 설정을 캐시된 인덱스로 일괄 해석한다.
+
+    Args:
+        employee_sites: {employee_id: site_id 또는 None}
+        fresh: True 면 확인 주기와 무관하게 공유 버전을 확인한다 (급여 계산용)
+        index: 재사용할 WageIndex (여러 달 연속 적재, 시뮬레이션용)
+
+    Returns:
+        dict: {employee_id: get_wage_config() 와 동일한 딕셔너리}
+    """
+    index = index or get_wage_index(fresh=fresh)
+    return {eid: index.resolve(eid, site_id) for eid, site_id in employee_sites.items()}
+
 
-    return result
+def coerce_wage_value(field, val):
+    """입력값을 WageConfig 필드 타입으로 변환한다. 빈 값은 None (상위로 위임)."""
+    if val == "" or val is None:
+        return None
+    if field in WageConfig.STR_FIELDS:
+        return str(val)
+    if field in WageConfig.INT_FIELDS:
+        return int(val)
+    return float(val)
 
 
 def get_wage_config_detail(employee_id):
@@ -76,24 +191,17 @@ def get_wage_config_detail(employee_id):
     if not emp:
         return []
 
+    emp_layers, site_layers, sys_cfg = get_wage_index().layers
     layers = []
 
-    emp_cfg = WageConfig.query.filter_by(
-        config_type="employee", target_id=employee_id
-    ).first()
-    if emp_cfg:
-        layers.append(("employee", f"직원: {emp.name}", emp_cfg))
-
-    if emp.site_id:
-        site_cfg = WageConfig.query.filter_by(
-            config_type="site", target_id=emp.site_id
-        ).first()
-        if site_cfg:
-            site_name = emp.site.name if emp.site else str(emp.site_id)
-            layers.append(("site", f"현장: {site_name}", site_cfg))
-
-    sys_cfg = WageConfig.query.filter_by(config_type="system").first()
-    if sys_cfg:
+    if employee_id in emp_layers:
+        layers.append(("employee", f"직원: {emp.name}", emp_layers[employee_id]))
+
+    if emp.site_id and emp.site_id in site_layers:
+        site_name = emp.site.name if emp.site else str(emp.site_id)
+        layers.append(("site", f"현장: {site_name}", site_layers[emp.site_id]))
+
+    if sys_cfg is not None:
         layers.append(("system", "시스템 설정", sys_cfg))
 
     FIELD_LABELS = {
@@ -157,17 +265,40 @@ def save_wage_config(config_type, target_id, data):
 
     for field in WageConfig.RATE_FIELDS:
         if field in data:
-            val = data[field]
             # 빈 문자열이나 None → null (상위로 위임)
-            if val == "" or val is None:
-                setattr(cfg, field, None)
-            elif field in WageConfig.STR_FIELDS:
-                setattr(cfg, field, str(val))
-            elif field in WageConfig.INT_FIELDS:
-                setattr(cfg, field, int(val))
-            else:
-                setattr(cfg, field, float(val))
+            setattr(cfg, field, coerce_wage_value(field, data[field]))
 
     db.session.commit()
     logger.info("WageConfig saved: type=%s, target=%s", config_type, target_id)
     return cfg
+
+
+def _after_flush(session, flush_context):
+    changed = [
+        obj for obj in list(session.new) + list(session.dirty) + list(session.deleted)
+        if isinstance(obj, WageConfig)
+    ]
+    if not changed:
+        return
+    if not session.info.get(_PENDING_KEY):
+        # 트랜잭션당 한 번만 올린다
+        bump_version(session, _CACHE_NAME)
+        session.info[_PENDING_KEY] = True
+    invalidate_wage_cache()
+
+
+def _after_end(session):
+    # flush~commit 사이에 다시 적재된 캐시도 확정 상태로 재적재되도록 한 번 더 비운다
+    if session.info.pop(_PENDING_KEY, False):
+        invalidate_wage_cache()
+
+
+def init_wage_tracking():
+    """WageConfig 변경 감지 리스너 등록 (프로세스당 1회)."""
+    global _registered
+    if _registered:
+        return
+    event.listen(db.session, "after_flush", _after_flush)
+    event.listen(db.session, "after_commit", _after_end)
+    event.listen(db.session, "after_rollback", _after_end)
+    _registered = True
@@ -11,17 +11,28 @@ os.environ["ADMIN_PASSWORD"] = "test_admin_password"
 os.environ["DATABASE_URL"] = f"sqlite:///{TEST_DB_PATH.as_posix()}"
 
 from app import app as _flask_app, db
+from services.attendance_service import clear_list_stats_cache
+from services.calendar_service import invalidate_calendar
+from services.dashboard_service import clear_dashboard_cache
+from services.wage_service import invalidate_wage_cache
 
 
 @pytest.fixture
-def flask_app():
+def flask_app(tmp_path):
     _flask_app.config["TESTING"] = True
     _flask_app.config["WTF_CSRF_ENABLED"] = False
+    _flask_app.config["PAYSLIP_PDF_CACHE_DIR"] = str(tmp_path / "payslip_pdf")
+    _flask_app.config["JOB_ARTIFACT_DIR"] = str(tmp_path / "jobs")
+    _flask_app.config["JOB_INLINE"] = True
 
     with _flask_app.app_context():
         db.session.remove()
         db.drop_all()
         db.create_all()
+        invalidate_calendar()
+        invalidate_wage_cache()
+        clear_list_stats_cache()
+        clear_dashboard_cache()
         yield _flask_app
         db.session.remove()
         db.drop_all()
@@ -0,0 +1,80 @@
+"""Tests for the admin attendance list: single-pass cached stats and COUNT-free paging."""
+
+from datetime import date, timedelta
+
+from sqlalchemy import event
+
+from models import AttendanceRecord, Employee, db
+from services import attendance_service
+from services.attendance_service import attendance_list_stats
+
+
+def _login(client):
+    with client.session_transaction() as sess:
+        sess["is_admin"] = True
+
+
+def _seed():
+    emp = Employee(name="홍길동", birth_date="900101", is_active=True)
+    db.session.add(emp)
+    db.session.flush()
+    start = date(2026, 1, 1)
+    for i in range(120):
+        db.session.add(AttendanceRecord(
+            employee_id=emp.id, birth_date=emp.birth_date, emp_name=emp.name,
+            work_date=start + timedelta(days=i), work_type=("normal", "night", "annual")[i % 3],
+            total_work_hours=8.0, overtime_hours=0.5, night_hours=1.0 if i % 3 == 1 else 0.0,
+        ))
+    db.session.commit()
+    return emp
+
+
+def test_stats_use_one_aggregate_and_paging_skips_count(client, flask_app):
+    _login(client)
+    emp = _seed()
+
+    statements = []
+
+    def _record_sql(conn, cursor, statement, *args):
+        if "attendance_records" in statement:
+            statements.append(statement)
+
+    event.listen(db.engine, "before_cursor_execute", _record_sql)
+    try:
+        page = client.get("/admin/attendance?page=1").get_data(as_text=True)
+        first = list(statements)
+        statements.clear()
+        client.get("/admin/attendance?page=3")
+        flipped = list(statements)
+    finally:
+        event.remove(db.engine, "before_cursor_execute", _record_sql)
+
+    assert "근무 기록 (120건 / 1페이지)" in page
+    assert len(first) == 2 and "count(*)" in first[0] and "LIMIT" in first[1]
+    assert len(flipped) == 1 and "count(" not in flipped[0] and "OFFSET" in flipped[0]
+
+    stats = attendance_list_stats(AttendanceRecord.query, ("", "", "", ""))
+    assert stats == {
+        "total": 120, "day": 40, "night": 40, "total_work": 960.0,
+        "total_night": 40.0, "total_ot": 60.0, "total_holiday": 0.0,
+    }
+
+    # 근태를 저장하면 캐시가 비워져 바로 반영된다
+    db.session.add(AttendanceRecord(
+        employee_id=emp.id, birth_date=emp.birth_date, emp_name=emp.name,
+        work_date=date(2026, 6, 1), work_type="night", total_work_hours=8.0,
+    ))
+    db.session.commit()
+    page = client.get("/admin/attendance?page=3").get_data(as_text=True)
+    assert "근무 기록 (121건 / 3페이지)" in page
+
+
+def test_stats_cache_keeps_only_recent_filters(flask_app, monkeypatch):
+    _seed()
+    monkeypatch.setattr(attendance_service, "_LIST_STATS_MAX", 3)
+    cache = attendance_service._list_stats_cache
+    for name in ("가", "나", "다"):
+        attendance_list_stats(AttendanceRecord.query, ("", "", name, ""))
+    attendance_list_stats(AttendanceRecord.query, ("", "", "가", ""))  # 최근 사용으로 갱신
+    attendance_list_stats(AttendanceRecord.query, ("", "", "라", ""))
+    assert [key[2] for key in cache] == ["다", "가", "라"]
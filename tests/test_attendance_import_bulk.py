@@ -0,0 +1,121 @@
+"""Tests for the prefetching / bulk-upsert attendance import."""
+
+from datetime import date
+
+import numpy as np
+from sqlalchemy import event
+
+from models import AttendanceRecord, Employee, PayrollStaleMark, db
+from services.attendance_import import CATEGORIES, ParsedEmployee, import_attendance_to_db
+
+
+DATES = [date(2026, 3, d) for d in range(1, 32)]
+
+
+def _day(base=8.0, ot=0.0, night=0.0, holiday=0.0, is_annual=False):
+    return {"base": base, "ot": ot, "night": night, "holiday": holiday,
+            "holiday_ot": 0.0, "late": 0.0, "is_annual": is_annual}
+
+
+def _employee(name, days):
+    hours = np.zeros((len(CATEGORIES), 31))
+    annual = 0
+    for work_date, values in days.items():
+        col = work_date.day - 1
+        hours[:, col] = [values[key] for key in CATEGORIES]
+        if values["is_annual"]:
+            annual |= 1 << col
+    return ParsedEmployee(name=name, hire_date=date(2025, 1, 1), resign_date=None, hourly_wage=0.0,
+                          hours=hours, annual=annual, summary=hours.sum(axis=1))
+
+
+def _parsed(employees):
+    return {
+        "year": 2026, "month": 3, "month_str": "2026-03", "site_name": "테스트",
+        "dates": DATES, "errors": [],
+        "employees": [_employee(name, days) for name, days in employees],
+    }
+
+
+def _days(count, **kwargs):
+    return {date(2026, 3, d): _day(**kwargs) for d in range(2, 2 + count)}
+
+
+def _count_statements():
+    statements = []
+
+    def _count(conn, cursor, statement, *args):
+        statements.append(statement.split()[0].upper())
+
+    event.listen(db.engine, "before_cursor_execute", _count)
+    return statements, lambda: event.remove(db.engine, "before_cursor_execute", _count)
+
+
+def test_import_uses_constant_queries_and_skips_unchanged(flask_app):
+    for i in range(20):
+        db.session.add(Employee(name=f"직원{i:02d}", birth_date="900101", is_active=True))
+    db.session.commit()
+    parsed = _parsed([(f"직원{i:02d}", _days(20)) for i in range(20)] + [("신입", _days(5))])
+
+    statements, stop = _count_statements()
+    try:
+        result = import_attendance_to_db(parsed)
+    finally:
+        stop()
+    assert (result["created"], result["updated"], result["unchanged"]) == (405, 0, 0)
+    assert [e["name"] for e in result["new_employees"]] == ["신입"]
+    assert AttendanceRecord.query.count() == 405
+    # 직원 IN 조회 + 신규 직원 INSERT + 기존 근태 조회 + upsert + stale 표시
+    # + 월별 지표 재계산(조회·삭제·삽입) (행 수와 무관)
+    assert len(statements) <= 13
+
+    stamp = db.session.query(db.func.max(AttendanceRecord.updated_at)).scalar()
+    PayrollStaleMark.query.delete()
+    db.session.commit()
+
+    # 같은 파일 재업로드: 쓰기 없음, updated_at 유지
+    again = import_attendance_to_db(parsed)
+    assert (again["created"], again["updated"], again["unchanged"]) == (0, 0, 405)
+    assert db.session.query(db.func.max(AttendanceRecord.updated_at)).scalar() == stamp
+    assert PayrollStaleMark.query.count() == 0
+
+    # 한 직원의 하루만 바뀐 파일: 1건만 갱신, 해당 직원·월만 재계산 대상
+    parsed["employees"][3].hours[:, 4] = [8.0, 2.0, 0.0, 0.0, 0.0, 0.0]
+    changed = import_attendance_to_db(parsed)
+    assert (changed["created"], changed["updated"], changed["unchanged"]) == (0, 1, 404)
+    rec = AttendanceRecord.query.filter_by(emp_name="직원03", work_date=date(2026, 3, 5)).one()
+    assert (rec.total_work_hours, rec.overtime_hours) == (10.0, 2.0)
+    assert [(m.employee_id, m.month) for m in PayrollStaleMark.query.all()] == [(rec.employee_id, "2026-03")]
+
+
+def test_source_priority_and_duplicate_names(flask_app):
+    emp = Employee(name="홍길동", birth_date="900101", is_active=True)
+    db.session.add_all([
+        emp,
+        Employee(name="김철수", birth_date="900101", is_active=True),
+        Employee(name="김철수", birth_date="910101", is_active=True),
+    ])
+    db.session.flush()
+    for day, source in ((2, "admin"), (3, "employee"), (4, "excel")):
+        db.session.add(AttendanceRecord(
+            employee_id=emp.id, birth_date="900101", emp_name="홍길동", work_date=date(2026, 3, day),
+            work_type="normal", total_work_hours=4.0, source=source,
+        ))
+    db.session.commit()
+
+    result = import_attendance_to_db(_parsed([("홍길동", _days(4)), ("김철수", _days(2))]))
+    assert (result["created"], result["updated"], result["skipped"]) == (1, 1, 2)
+    assert any("동명이인: 김철수 (2명)" in e for e in result["errors"])
+    assert sum("입력 기록 보호" in w for w in result["warnings"]) == 2
+
+    hours = {
+        r.work_date.day: (r.source, r.total_work_hours)
+        for r in AttendanceRecord.query.filter_by(employee_id=emp.id)
+    }
+    assert hours == {2: ("admin", 4.0), 3: ("employee", 4.0), 4: ("excel", 8.0), 5: ("excel", 8.0)}
+
+
+def test_dry_run_writes_nothing(flask_app):
+    result = import_attendance_to_db(_parsed([("신입", _days(3))]), dry_run=True)
+    assert result["created"] == 3 and result["new_employees"][0]["name"] == "신입"
+    assert Employee.query.count() == 0 and AttendanceRecord.query.count() == 0
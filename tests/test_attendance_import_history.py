@@ -0,0 +1,88 @@
+"""Tests for content-hash import history: cached re-uploads and diffs against the last import."""
+
+import copy
+from datetime import date
+from io import BytesIO
+
+from models import AttendanceImport, AttendanceRecord
+from services import attendance_import
+from services.attendance_import import parse_attendance_excel
+from services.import_history_service import diff_parsed
+from test_attendance_parse import build_workbook
+
+WEEK = {d: {"기본": 8} for d in range(2, 7)}
+FILENAME = "Humetix - 영진팩 3월 근태.xlsx"
+
+
+def _login(client):
+    with client.session_transaction() as sess:
+        sess["is_admin"] = True
+
+
+def _upload(client, stream, filename=FILENAME):
+    resp = client.post("/admin/attendance/import", data={"files": [(stream, filename)]},
+                       content_type="multipart/form-data")
+    assert resp.status_code == 200
+    return resp.get_data(as_text=True)
+
+
+def _setup(flask_app, tmp_path, monkeypatch):
+    monkeypatch.setattr(attendance_import, "_PENDING_DIR", str(tmp_path))
+    monkeypatch.setitem(flask_app.config, "ATTENDANCE_IMPORT_WORKERS", 1)
+
+
+def test_reupload_uses_cached_preview_without_parsing(client, flask_app, tmp_path, monkeypatch):
+    _login(client)
+    _setup(flask_app, tmp_path, monkeypatch)
+    workbook = build_workbook([("이은비", WEEK), ("김철수", WEEK)]).getvalue()
+
+    _upload(client, BytesIO(workbook))
+    row = AttendanceImport.query.one()
+    assert (row.status, row.site_name, row.month, row.record_count) == ("preview", "영진팩", "2026-03", 10)
+    client.post("/admin/attendance/import/execute")
+    row = AttendanceImport.query.one()
+    assert (row.status, row.created) == ("executed", 10) and row.executed_at is not None
+
+    def _no_parse(*args, **kwargs):
+        raise AssertionError("cached upload must not be parsed")
+
+    monkeypatch.setattr(attendance_import, "parse_attendance_workbook", _no_parse)
+    page = _upload(client, BytesIO(workbook), "다시 올린 파일.xlsx")
+    assert "이미 업로드한 파일입니다" in page and "저장된 미리보기" in page
+    assert AttendanceImport.query.count() == 1
+
+    # 다시 실행해도 값이 같아 쓰지 않는다
+    client.post("/admin/attendance/import/execute")
+    row = AttendanceImport.query.one()
+    assert (row.status, row.created, row.unchanged) == ("executed", 0, 10)
+    assert AttendanceRecord.query.count() == 10
+
+
+def test_changed_file_shows_only_differing_employees_and_days(client, flask_app, tmp_path, monkeypatch):
+    _login(client)
+    _setup(flask_app, tmp_path, monkeypatch)
+    _upload(client, build_workbook([("이은비", WEEK), ("김철수", WEEK)]))
+    client.post("/admin/attendance/import/execute")
+
+    changed = {**WEEK, 3: {"기본": 8, "연장": 2}}
+    page = _upload(client, build_workbook([("이은비", changed), ("박신입", WEEK)]))
+    assert "변경 1명 / 1일" in page and "추가 1명" in page and "제외 1명" in page
+    assert "2026-03-03" in page and "기본 8 · 연장 2" in page
+    assert "2026-03-04" not in page
+    assert AttendanceImport.query.count() == 2
+
+
+def test_diff_detects_annual_marks():
+    old = parse_attendance_excel(build_workbook([("이은비", WEEK)]))
+    new = copy.deepcopy(old)
+    emp = new["employees"][0]
+    emp.hours[:, 5] = 0.0
+    emp.annual |= 1 << 5
+
+    diff = diff_parsed(old, new)
+    assert diff["changed"] == [{
+        "name": "이은비",
+        "days": [{"date": date(2026, 3, 6).isoformat(), "before": "기본 8", "after": "연차"}],
+    }]
+    assert diff["changed_days"] == 1 and not diff["identical"]
+    assert diff_parsed(old, old)["identical"]
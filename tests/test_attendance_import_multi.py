@@ -0,0 +1,127 @@
+"""Tests for multi-file / ZIP / multi-sheet attendance import."""
+
+import zipfile
+from datetime import date
+from io import BytesIO
+
+from werkzeug.datastructures import FileStorage
+
+from models import AttendanceRecord, Employee
+from services import attendance_import
+from services.attendance_import import (
+    import_attendance_batch,
+    parse_attendance_files,
+    stage_uploads,
+)
+from test_attendance_parse import build_multi_sheet_workbook, build_workbook
+
+WEEK = {d: {"기본": 8} for d in range(2, 7)}
+
+
+def _login(client):
+    with client.session_transaction() as sess:
+        sess["is_admin"] = True
+
+
+def _zip(members):
+    buf = BytesIO()
+    with zipfile.ZipFile(buf, "w") as zf:
+        for name, data in members:
+            zf.writestr(name, data)
+    buf.seek(0)
+    return buf
+
+
+def _site_zip():
+    return _zip([
+        ("근태/Humetix - 대성 3월 근태.xlsx", build_workbook([("박대성", WEEK)], site="대성").getvalue()),
+        ("../../evil.xlsx", build_workbook([("침입자", WEEK)], site="침입").getvalue()),
+        ("__MACOSX/근태/._Humetix - 대성 3월 근태.xlsx", b"\x00"),
+        ("readme.txt", b"memo"),
+    ])
+
+
+def test_zip_and_monthly_sheets_parse_in_parallel_and_commit_together(flask_app, tmp_path, monkeypatch):
+    uploads = [
+        FileStorage(build_workbook([("이은비", WEEK), ("김철수", WEEK)]), "Humetix - 영진팩 3월 근태.xlsx"),
+        FileStorage(build_multi_sheet_workbook([
+            ([("이은비", WEEK)], 2026, 1, "한솔"),
+            ([("이은비", WEEK)], 2026, 2, "한솔"),
+        ]), "한솔 1~2월.xlsx"),
+        FileStorage(_site_zip(), "sites.zip"),
+        FileStorage(BytesIO(b"not a zip"), "broken.zip"),
+        FileStorage(BytesIO(b"x"), "memo.txt"),
+    ]
+    staging = tmp_path / "staging"
+    staging.mkdir()
+    files, failed = stage_uploads(uploads, str(staging))
+    # ZIP 항목 경로는 쓰지 않고 staging 디렉터리 안에만 푼다
+    assert sorted(p.name for p in staging.iterdir()) == sorted(p.split("/")[-1] for p, _ in files)
+    assert [name for _, name in files] == [
+        "Humetix - 영진팩 3월 근태.xlsx", "한솔 1~2월.xlsx", "Humetix - 대성 3월 근태.xlsx", "evil.xlsx",
+    ]
+    assert [f["label"] for f in failed] == ["broken.zip", "memo.txt"]
+
+    sets, failures = parse_attendance_files(files, workers=2)
+    assert failures == []
+    assert [(s["label"], s["month_str"], s["site_name"]) for s in sets] == [
+        ("Humetix - 영진팩 3월 근태.xlsx", "2026-03", "영진팩"),
+        ("한솔 1~2월.xlsx [1월 근태]", "2026-01", "한솔"),
+        ("한솔 1~2월.xlsx [2월 근태]", "2026-02", "한솔"),
+        ("Humetix - 대성 3월 근태.xlsx", "2026-03", "대성"),
+        ("evil.xlsx", "2026-03", "침입"),
+    ]
+
+    preview = import_attendance_batch(sets, dry_run=True)
+    assert preview["created"] == 6 * 5
+    assert [e["name"] for e in preview["new_employees"]] == ["이은비", "김철수", "박대성", "침입자"]
+    assert preview["site_name"] == "영진팩 외 3곳"
+    assert Employee.query.count() == 0
+
+    # 네 번째 시트에서 실패하면 앞 시트까지 모두 취소
+    calls = []
+    real_upsert = attendance_import._upsert_records
+
+    def _failing_upsert(rows):
+        calls.append(len(rows))
+        if len(calls) == 4:
+            raise RuntimeError("disk full")
+        real_upsert(rows)
+
+    monkeypatch.setattr(attendance_import, "_upsert_records", _failing_upsert)
+    failed_run = import_attendance_batch(sets)
+    assert any("전체 취소" in e for e in failed_run["errors"])
+    assert AttendanceRecord.query.count() == 0 and Employee.query.count() == 0
+
+    monkeypatch.setattr(attendance_import, "_upsert_records", real_upsert)
+    result = import_attendance_batch(sets)
+    assert result["errors"] == [] and result["created"] == 30
+    assert Employee.query.filter_by(name="이은비").count() == 1
+    months = {r.work_date.month for r in AttendanceRecord.query.filter_by(emp_name="이은비")}
+    assert months == {1, 2, 3}
+
+
+def test_upload_route_previews_merged_set_and_executes(client, flask_app, tmp_path, monkeypatch):
+    _login(client)
+    monkeypatch.setattr(attendance_import, "_PENDING_DIR", str(tmp_path))
+    monkeypatch.setitem(flask_app.config, "ATTENDANCE_IMPORT_WORKERS", 2)
+
+    resp = client.post("/admin/attendance/import", data={
+        "files": [
+            (build_workbook([("이은비", WEEK)]), "Humetix - 영진팩 3월 근태.xlsx"),
+            (_site_zip(), "sites.zip"),
+            (BytesIO(b"x"), "memo.txt"),
+        ],
+    }, content_type="multipart/form-data")
+    page = resp.get_data(as_text=True)
+    assert resp.status_code == 200
+    assert "미리보기" in page and "Humetix - 대성 3월 근태.xlsx" in page
+    assert "제외 — 엑셀(.xlsx, .xls) 또는 ZIP 파일만 업로드 가능합니다." in page
+    assert AttendanceRecord.query.count() == 0
+
+    resp = client.post("/admin/attendance/import/execute")
+    assert resp.status_code == 200
+    assert "저장 완료" in resp.get_data(as_text=True)
+    assert AttendanceRecord.query.count() == 15
+    assert AttendanceRecord.query.filter_by(emp_name="박대성", work_date=date(2026, 3, 2)).one().source == "excel"
+    assert list(tmp_path.iterdir()) == []
@@ -0,0 +1,113 @@
+"""Tests for the streaming attendance workbook parser and its binary staging format."""
+
+from datetime import date, datetime
+from io import BytesIO
+
+import numpy as np
+from openpyxl import Workbook
+
+from models import AttendanceRecord, db
+from services import attendance_import
+from services.attendance_import import (
+    CATEGORIES,
+    execute_pending_import,
+    pack_parsed,
+    parse_attendance_excel,
+    save_pending_import,
+    unpack_parsed,
+)
+
+LABELS = ["기본", "연장", "심야", "특근", "특연", "지조"]
+
+
+def build_workbook(employees, year=2026, month=3, site="영진팩"):
+    """근태 양식과 같은 배치의 워크북 바이트. employees: [(name, {day: {label: value}})]"""
+    return build_multi_sheet_workbook([(employees, year, month, site)])
+
+
+def build_multi_sheet_workbook(sheets):
+    """월별 시트 워크북 바이트. sheets: [(employees, year, month, site)]"""
+    wb = Workbook()
+    for i, (employees, year, month, site) in enumerate(sheets):
+        _fill_sheet(wb.active if i == 0 else wb.create_sheet(), employees, year, month, site)
+    buf = BytesIO()
+    wb.save(buf)
+    buf.seek(0)
+    return buf
+
+
+def _fill_sheet(ws, employees, year, month, site):
+    ws.title = f"{month}월 근태"
+    ws.cell(row=2, column=5, value=site)
+    ws.cell(row=2, column=10, value=year)
+    ws.cell(row=2, column=13, value=month)
+    for day in range(1, 32):
+        try:
+            ws.cell(row=5, column=7 + day, value=datetime(year, month, day))
+        except ValueError:
+            pass
+    row = 8
+    for seq, (name, days) in enumerate(employees, start=1):
+        ws.cell(row=row, column=2, value=seq)
+        ws.cell(row=row, column=3, value=name)
+        ws.cell(row=row, column=4, value=datetime(2024, 1, 2))
+        ws.cell(row=row, column=6, value=10_320)
+        for offset, label in enumerate(LABELS):
+            ws.cell(row=row + offset, column=7, value=label)
+            total = 0
+            for day, values in days.items():
+                value = values.get(label)
+                if value is not None:
+                    ws.cell(row=row + offset, column=7 + day, value=value)
+                    if not isinstance(value, str):
+                        total += value
+            ws.cell(row=row + offset, column=39, value=total)
+        row += 6
+
+
+def test_parse_produces_compact_arrays(flask_app):
+    stream = build_workbook([
+        ("이은비\n(포장)", {2: {"기본": 8, "연장": 2}, 3: {"기본": 8, "심야": 1.5}, 4: {"연장": "연차"}}),
+        ("", {}),
+        ("김철수", {7: {"특근": 8}}),
+    ])
+    parsed = parse_attendance_excel(stream, "Humetix - 영진팩 3월 근태.xlsx")
+
+    assert (parsed["month_str"], parsed["site_name"]) == ("2026-03", "영진팩")
+    assert parsed["dates"][0] == date(2026, 3, 1) and parsed["dates"][30] == date(2026, 3, 31)
+    names = [e.name for e in parsed["employees"]]
+    assert names == ["이은비", "김철수"]
+
+    emp = parsed["employees"][0]
+    assert emp.hours.shape == (len(CATEGORIES), 31) and emp.hours.dtype == np.float64
+    assert emp.hours[:, 1].tolist() == [8, 2, 0, 0, 0, 0]
+    assert emp.hours[:, 2].tolist() == [8, 0, 1.5, 0, 0, 0]
+    assert emp.is_annual(3) and emp.annual_count() == 1
+    assert emp.active_columns() == [1, 2, 3]
+    assert emp.summary.tolist() == [16, 2, 1.5, 0, 0, 0]
+    assert emp.hire_date == date(2024, 1, 2) and emp.hourly_wage == 10_320
+
+
+def test_binary_staging_round_trip_and_execute(flask_app, tmp_path, monkeypatch):
+    monkeypatch.setattr(attendance_import, "_PENDING_DIR", str(tmp_path))
+    days = {d: {"기본": 8, "연장": 1} for d in range(2, 28)}
+    days[28] = {"연장": "연차"}
+    parsed = parse_attendance_excel(build_workbook([(f"직원{i}", days) for i in range(50)]))
+
+    restored = unpack_parsed(pack_parsed(parsed))
+    assert restored["dates"] == parsed["dates"]
+    for a, b in zip(parsed["employees"], restored["employees"]):
+        assert (a.name, a.hire_date, a.annual) == (b.name, b.hire_date, b.annual)
+        assert np.array_equal(a.hours, b.hours) and np.array_equal(a.summary, b.summary)
+
+    import_id = save_pending_import(parsed)
+    staged = tmp_path / f"import_{import_id}.npz"
+    assert staged.stat().st_size < 50 * 31 * 6 * 8 + 8192
+
+    result = execute_pending_import(import_id)
+    assert not staged.exists()
+    assert result["created"] == 50 * 27 and result["employee_count"] == 50
+    annual = AttendanceRecord.query.filter_by(work_date=date(2026, 3, 28)).all()
+    assert len(annual) == 50 and {r.work_type for r in annual} == {"annual"}
+    rec = db.session.query(AttendanceRecord).filter_by(work_date=date(2026, 3, 2)).first()
+    assert (rec.total_work_hours, rec.overtime_hours, rec.source) == (9.0, 1.0, "excel")
@@ -0,0 +1,161 @@
+"""Tests for the incrementally maintained (employee, month) attendance rollup."""
+
+from datetime import date
+
+import numpy as np
+from sqlalchemy import event
+
+from models import AttendanceMonthly, AttendanceRecord, Employee, OperationCalendarDay, db
+from services.attendance_import import CATEGORIES, ParsedEmployee, import_attendance_to_db
+from services.attendance_rollup_service import (
+    bitmap_dates,
+    month_totals,
+    rebuild_rollups,
+    reconcile_rollups,
+)
+from services.leave_service import check_full_attendance
+from services.payroll_bulk_service import load_month_inputs
+
+
+def _snapshot():
+    return {
+        (r.employee_id, r.month): (
+            r.emp_name, r.record_count, r.attended_days, r.attended_bitmap,
+            round(r.total_hours, 6), round(r.overtime_hours, 6), round(r.night_hours, 6),
+            round(r.holiday_hours, 6), r.work_type_counts,
+        )
+        for r in AttendanceMonthly.query.all()
+    }
+
+
+def _assert_matches_rebuild():
+    incremental = _snapshot()
+    rebuild_rollups()
+    assert incremental == _snapshot()
+    return incremental
+
+
+def _record(emp, day, work_type="normal", hours=8.0, month=3, **kwargs):
+    return AttendanceRecord(
+        employee_id=emp.id, birth_date=emp.birth_date, emp_name=emp.name,
+        work_date=date(2026, month, day), work_type=work_type, total_work_hours=hours, **kwargs,
+    )
+
+
+def test_rollup_follows_every_write_path(flask_app):
+    a = Employee(name="홍길동", birth_date="900101", is_active=True)
+    b = Employee(name="김철수", birth_date="910101", is_active=True)
+    db.session.add_all([a, b])
+    db.session.flush()
+    db.session.add_all([_record(a, d, overtime_hours=1.0) for d in range(2, 7)])
+    db.session.add(_record(a, 9, "annual", 0.0))
+    db.session.add(_record(b, 2, "absent", 0.0))
+    db.session.commit()
+
+    rows = _assert_matches_rebuild()
+    assert rows[(a.id, "2026-03")][1:4] == (6, 6, sum(1 << (d - 1) for d in (2, 3, 4, 5, 6, 9)))
+    assert rows[(b.id, "2026-03")][2:4] == (0, 0)
+
+    # 수정: 근무일을 다른 달로 옮기면 두 달 모두 갱신
+    rec = AttendanceRecord.query.filter_by(employee_id=a.id, work_date=date(2026, 3, 6)).one()
+    rec.work_date = date(2026, 4, 1)
+    rec.night_hours = 2.0
+    db.session.commit()
+    rows = _assert_matches_rebuild()
+    assert rows[(a.id, "2026-03")][1] == 5 and rows[(a.id, "2026-04")][6] == 2.0
+
+    # 삭제 (ORM) → 행이 비면 집계 행도 삭제
+    db.session.delete(rec)
+    db.session.commit()
+    assert (a.id, "2026-04") not in _assert_matches_rebuild()
+
+    # Query.update()/delete() 일괄 문
+    AttendanceRecord.query.filter(AttendanceRecord.employee_id == a.id).update(
+        {"total_work_hours": 10.0}, synchronize_session=False
+    )
+    db.session.commit()
+    AttendanceRecord.query.filter(AttendanceRecord.employee_id == b.id).delete(synchronize_session=False)
+    db.session.commit()
+    rows = _assert_matches_rebuild()
+    assert rows[(a.id, "2026-03")][4] == 50.0 and (b.id, "2026-03") not in rows
+
+    # Core 일괄 upsert (엑셀 import)
+    hours = np.zeros((len(CATEGORIES), 31))
+    hours[0, 14:16] = 8.0
+    import_attendance_to_db({
+        "month_str": "2026-03", "site_name": "", "errors": [],
+        "dates": [date(2026, 3, d) for d in range(1, 32)],
+        "employees": [ParsedEmployee("김철수", None, None, 0.0, hours, 0, hours.sum(axis=1))],
+    })
+    rows = _assert_matches_rebuild()
+    assert rows[(b.id, "2026-03")][1] == 2
+
+    # rollback 된 변경은 반영되지 않음
+    db.session.add(_record(b, 20))
+    db.session.flush()
+    db.session.rollback()
+    db.session.add(_record(a, 21))
+    db.session.commit()
+    assert _assert_matches_rebuild()[(b.id, "2026-03")][1] == 2
+
+
+def test_readers_use_rollup_instead_of_records(flask_app):
+    emp = Employee(name="홍길동", birth_date="900101", is_active=True)
+    db.session.add(emp)
+    db.session.flush()
+    workdays = [d for d in range(1, 32) if date(2026, 3, d).weekday() < 5]
+    db.session.add_all([_record(emp, d, "night" if d == 3 else "normal", night_hours=1.0) for d in workdays])
+    db.session.add(OperationCalendarDay(work_date=date(2026, 3, 2), day_type="workday"))
+    db.session.commit()
+
+    statements = []
+
+    def _record_sql(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(db.engine, "before_cursor_execute", _record_sql)
+    try:
+        is_full, worked, required = check_full_attendance(emp.id, 2026, 3)
+        totals = month_totals("2026-03")
+        inputs = load_month_inputs("2026-03")
+    finally:
+        event.remove(db.engine, "before_cursor_execute", _record_sql)
+
+    assert not any("attendance_records" in sql for sql in statements)
+    # 급여 입력 적재는 읽기 전용이다 (모의 계산·풀 워커도 같은 경로)
+    assert not any(sql.lstrip().upper().startswith(("INSERT", "UPDATE", "DELETE")) for sql in statements)
+    assert (is_full, worked) == (worked >= required, len(workdays))
+    assert totals == {
+        "records": len(workdays), "total_hours": 8.0 * len(workdays), "ot_hours": 0.0,
+        "night_hours": float(len(workdays)), "holiday_hours": 0.0, "workers": 1,
+    }
+    agg = inputs["aggregates"][0]
+    assert (agg.employee_id, agg.emp_name, agg.total_hours) == (emp.id, "홍길동", 8.0 * len(workdays))
+    assert inputs["attended"][emp.id] == {date(2026, 3, d) for d in workdays}
+    assert bitmap_dates("2026-03", 1 | 1 << 30) == {date(2026, 3, 1), date(2026, 3, 31)}
+
+
+def test_reconcile_fixes_only_pairs_changed_outside_the_session(flask_app):
+    kim = Employee(name="김철수", birth_date="900101", is_active=True)
+    lee = Employee(name="이은비", birth_date="910101", is_active=True)
+    park = Employee(name="박신입", birth_date="920101", is_active=True)
+    db.session.add_all([kim, lee, park])
+    db.session.flush()
+    db.session.add_all([_record(emp, d) for emp in (kim, lee, park) for d in range(2, 7)])
+    db.session.commit()
+    assert reconcile_rollups("2026-03") == {"checked": 3, "stale": 0}
+
+    # 리스너를 거치지 않는 엔진 직접 쓰기: 시간 수정 + 하루 삭제 + 한 달 전부 삭제
+    with db.engine.begin() as conn:
+        conn.execute(db.text(
+            "UPDATE attendance_records SET total_work_hours = 10 WHERE employee_id = :id"
+        ), {"id": kim.id})
+        conn.execute(db.text(
+            "DELETE FROM attendance_records WHERE employee_id = :id AND work_date = '2026-03-06'"
+        ), {"id": lee.id})
+        conn.execute(db.text("DELETE FROM attendance_records WHERE employee_id = :id"), {"id": park.id})
+
+    assert reconcile_rollups("2026-03") == {"checked": 3, "stale": 3}
+    rows = {r.employee_id: (r.record_count, r.total_hours) for r in AttendanceMonthly.query.all()}
+    assert rows == {kim.id: (5, 50.0), lee.id: (4, 32.0)}
+    _assert_matches_rebuild()
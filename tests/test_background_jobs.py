@@ -0,0 +1,235 @@
+"""Tests for the background job queue and async admin endpoints."""
+
+import threading
+import time
+from datetime import date, datetime, timedelta
+from io import BytesIO
+
+from flask import current_app
+from openpyxl import load_workbook
+
+from models import AttendanceRecord, BackgroundJob, Employee, Payslip, db
+from services import job_service
+from services.job_service import JobError, claim_job, enqueue_job, job_handler, run_job
+
+
+def _login(client):
+    with client.session_transaction() as sess:
+        sess["is_admin"] = True
+
+
+def _seed():
+    emp = Employee(name="홍길동", birth_date="900101", is_active=True)
+    db.session.add(emp)
+    db.session.flush()
+    for day in range(2, 7):
+        db.session.add(AttendanceRecord(
+            employee_id=emp.id, birth_date="900101", emp_name="홍길동",
+            work_date=date(2026, 3, day), work_type="normal", total_work_hours=8.0,
+            overtime_hours=0.0, night_hours=0.0, holiday_work_hours=0.0,
+        ))
+    db.session.commit()
+    return emp
+
+
+calls = []
+
+
+@job_handler("test_count")
+def _count(ctx, value):
+    ctx.progress(50, "중간")
+    calls.append(value)
+    return {"value": value}
+
+
+@job_handler("test_fail")
+def _fail(ctx):
+    raise JobError("실패 사유")
+
+
+@job_handler("test_slow")
+def _slow(ctx, seconds, expire=False):
+    if expire:
+        # 실행 중에 다른 워커가 응답 없는 작업으로 실패 처리한 상황
+        db.session.execute(db.text(
+            "UPDATE background_jobs SET heartbeat_at = :old WHERE id = :id"
+        ), {"old": datetime.now() - timedelta(hours=1), "id": ctx.job_id})
+        db.session.commit()
+        job_service._recover_stale(current_app)
+    time.sleep(seconds)
+    with db.engine.connect() as conn:
+        started, beat = conn.execute(db.text(
+            "SELECT started_at, heartbeat_at FROM background_jobs WHERE id = :id"
+        ), {"id": ctx.job_id}).one()
+    return {"beat_after_start": str(beat) > str(started)}
+
+
+def test_async_generate_returns_job_id(client, flask_app):
+    _login(client)
+    _seed()
+    resp = client.post("/admin/payslip/generate", json={"month": "2026-03", "async": True})
+    assert resp.status_code == 202
+    job_id = resp.get_json()["job_id"]
+
+    status = client.get(f"/admin/jobs/{job_id}").get_json()
+    assert status["status"] == "succeeded" and status["progress"] == 100
+    assert status["result"]["created"] == 1
+    assert Payslip.query.filter_by(month="2026-03").count() == 1
+
+    listed = client.get("/admin/jobs?kind=payroll_generate").get_json()["jobs"]
+    assert [j["id"] for j in listed] == [job_id]
+
+
+def test_async_export_artifact_download(client, flask_app):
+    _login(client)
+    _seed()
+    client.post("/admin/payslip/generate", json={"month": "2026-03"})
+
+    job_id = client.get("/admin/payslip/excel?month=2026-03&async=1").get_json()["job_id"]
+    resp = client.get(f"/admin/jobs/{job_id}/artifact")
+    assert resp.status_code == 200
+    assert "2026-03" in resp.headers["Content-Disposition"]
+    ws = load_workbook(BytesIO(resp.data)).active
+    assert ws.max_row == 2
+
+    failed = client.get("/admin/payslip/pdf?month=2020-01&async=1").get_json()["job_id"]
+    assert client.get(f"/admin/jobs/{failed}").get_json()["error"] == "해당 월 급여 데이터가 없습니다."
+    assert client.get(f"/admin/jobs/{failed}/artifact").status_code == 409
+
+
+def test_job_is_claimed_exactly_once(flask_app):
+    calls.clear()
+    job = BackgroundJob(kind="test_count", status="queued", params='{"value": 7}')
+    db.session.add(job)
+    db.session.commit()
+    job_id = job.id
+
+    ran = []
+
+    def _worker():
+        with flask_app.app_context():
+            ran.append(run_job(job_id))
+            db.session.remove()
+
+    threads = [threading.Thread(target=_worker) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert sorted(ran) == [False, False, False, True]
+    assert calls == [7]
+    db.session.expire_all()
+    assert db.session.get(BackgroundJob, job_id).status == "succeeded"
+    assert claim_job(job_id) is False
+
+
+def test_failed_and_stale_jobs(flask_app):
+    job = enqueue_job("test_fail")
+    assert job.status == "failed" and job.error == "실패 사유"
+
+    stale = BackgroundJob(kind="test_count", status="running", params="{}",
+                          heartbeat_at=datetime.now() - timedelta(hours=1))
+    db.session.add(stale)
+    db.session.commit()
+    job_service._recover_stale(flask_app)
+    db.session.expire_all()
+    assert db.session.get(BackgroundJob, stale.id).status == "failed"
+
+
+def test_thread_pool_runs_job(flask_app, monkeypatch):
+    calls.clear()
+    monkeypatch.setitem(flask_app.config, "JOB_INLINE", False)
+    job_id = enqueue_job("test_count", {"value": 3}).id
+
+    deadline = time.time() + 10
+    while time.time() < deadline:
+        db.session.expire_all()
+        if db.session.get(BackgroundJob, job_id).status in ("succeeded", "failed"):
+            break
+        time.sleep(0.05)
+
+    job = db.session.get(BackgroundJob, job_id)
+    assert job.status == "succeeded"
+    assert job.to_dict()["result"] == {"value": 3}
+    assert calls == [3]
+
+
+def test_running_job_sends_its_own_heartbeat(flask_app, monkeypatch):
+    monkeypatch.setitem(flask_app.config, "JOB_HEARTBEAT_SECONDS", 0.05)
+    job = enqueue_job("test_slow", {"seconds": 0.4})
+    assert job.status == "succeeded"
+    # 스케줄러·작업 확인 스레드 없이도 실행 도중 하트비트가 갱신된다
+    assert job.to_dict()["result"] == {"beat_after_start": True}
+
+
+def test_job_recovered_as_stale_is_not_flipped_back(flask_app):
+    job = enqueue_job("test_slow", {"seconds": 0, "expire": True})
+    db.session.expire_all()
+    job = db.session.get(BackgroundJob, job.id)
+    assert job.status == "failed" and job.error == "작업자 응답이 없어 중단되었습니다."
+    assert job.result is None
+
+
+def test_admin_pages_run_long_tasks_as_jobs(client, flask_app, tmp_path, monkeypatch):
+    from services import attendance_import
+    from test_attendance_parse import build_workbook
+
+    _login(client)
+    monkeypatch.setattr(attendance_import, "_PENDING_DIR", str(tmp_path))
+    week = {d: {"기본": 8} for d in range(2, 7)}
+    client.post("/admin/attendance/import",
+                data={"files": [(build_workbook([("이은비", week)]), "Humetix - 영진팩 3월 근태.xlsx")]},
+                content_type="multipart/form-data")
+
+    resp = client.post("/admin/attendance/import/execute", data={"async": "1"})
+    assert resp.status_code == 202
+    job_id = resp.get_json()["job_id"]
+    page = client.get(f"/admin/attendance/import/result/{job_id}").get_data(as_text=True)
+    assert "영진팩 근태 업로드 완료: 신규 5건" in page
+    assert AttendanceRecord.query.count() == 5
+
+    failed = enqueue_job("test_fail", {})
+    resp = client.get(f"/admin/attendance/import/result/{failed.id}")
+    assert resp.status_code == 302
+
+    # 화면은 작업으로 등록한 뒤 진행률을 조회하고 결과 파일을 받는다
+    assert "runJob('/admin/payslip/generate'" in client.get("/admin/payslip").get_data(as_text=True)
+    assert "runJob('/admin/leave/sync'" in client.get("/admin/leave").get_data(as_text=True)
+    for url in ("/admin/payslip", "/admin/attendance", "/admin/severance"):
+        assert "data-job-download" in client.get(url).get_data(as_text=True)
+
+
+def _thread_names():
+    return sorted(t.name for t in threading.enumerate())
+
+
+def test_runner_starts_only_in_request_serving_processes(client, flask_app, monkeypatch):
+    import multiprocessing
+    from concurrent.futures import ProcessPoolExecutor
+
+    from services.attendance_import import _init_parse_worker
+
+    stop = threading.Event()
+    monkeypatch.setattr(job_service, "_runner_loop", lambda app: stop.wait(5))
+    monkeypatch.setitem(job_service._runner, "thread", None)
+    monkeypatch.setitem(flask_app.config, "JOB_INLINE", False)
+    try:
+        monkeypatch.setenv("JOB_RUNNER_DISABLED", "1")
+        client.get("/")
+        assert "job-runner" not in _thread_names()
+
+        monkeypatch.delenv("JOB_RUNNER_DISABLED")
+        client.get("/")
+        assert "job-runner" in _thread_names()
+
+        # fork 로 만든 풀 워커에는 작업 확인 스레드가 없다
+        if "fork" in multiprocessing.get_all_start_methods():
+            with ProcessPoolExecutor(
+                max_workers=1, mp_context=multiprocessing.get_context("fork"),
+                initializer=_init_parse_worker,
+            ) as pool:
+                assert "job-runner" not in pool.submit(_thread_names).result()
+    finally:
+        stop.set()
+        job_service._runner["thread"].join()
@@ -0,0 +1,119 @@
+"""Tests for the vectorized work-hours calculator and bulk recompute."""
+
+import random
+import time
+from datetime import date, timedelta
+
+import numpy as np
+
+from models import AttendanceRecord, Employee, OperationCalendarDay, PayrollStaleMark, db
+from services import calendar_service
+from services.attendance_service import (
+    _get_cfg,
+    calc_work_hours,
+    calc_work_hours_batch,
+    hhmm_to_minutes,
+    recompute_work_hours,
+)
+
+DAY_TYPE_NAMES = {-1: None, **{code: name for name, code in calendar_service.DAY_TYPE_CODES.items()}}
+
+
+def _hhmm(minutes):
+    return f"{minutes // 60:02d}:{minutes % 60:02d}"
+
+
+def _assert_matches_scalar(pairs, day_types, cfg, break_hours=None, std_hours=None):
+    in_min = hhmm_to_minutes([p[0] for p in pairs])
+    out_min = hhmm_to_minutes([p[1] for p in pairs])
+    batch = np.column_stack(calc_work_hours_batch(
+        in_min, out_min, np.array(day_types), cfg, break_hours=break_hours, std_hours=std_hours,
+    ))
+    for i, (clock_in, clock_out) in enumerate(pairs):
+        row_cfg = dict(cfg)
+        if break_hours is not None:
+            row_cfg["BREAK_HOURS"] = float(np.broadcast_to(break_hours, len(pairs))[i])
+        if std_hours is not None:
+            row_cfg["STANDARD_WORK_HOURS"] = float(np.broadcast_to(std_hours, len(pairs))[i])
+        expected = calc_work_hours(clock_in, clock_out, row_cfg,
+                                   calendar_day_type=DAY_TYPE_NAMES[day_types[i]])
+        assert tuple(batch[i].tolist()) == expected, (clock_in, clock_out, day_types[i])
+
+
+def test_edge_cases_match_scalar(flask_app):
+    cfg = _get_cfg()
+    pairs = [
+        ("09:00", "18:00"), ("08:30", "21:45"), ("22:00", "06:00"), ("19:00", "07:00"),
+        ("15:00", "23:30"), ("14:59", "23:30"), ("05:00", "14:00"), ("06:00", "14:00"),
+        ("09:00", "09:00"), ("09:00", "09:30"), ("00:00", "08:00"), ("23:59", "00:01"),
+    ]
+    for code in (-1, 0, 1, 2):
+        _assert_matches_scalar(pairs, [code] * len(pairs), cfg)
+
+
+def test_random_records_with_per_employee_settings_match_scalar(flask_app):
+    cfg = _get_cfg()
+    rng = random.Random(12)
+    n = 2000
+    pairs = [(_hhmm(rng.randrange(1440)), _hhmm(rng.randrange(1440))) for _ in range(n)]
+    day_types = [rng.choice((-1, 0, 1, 2)) for _ in range(n)]
+    breaks = np.array([rng.choice((0.0, 0.5, 1.0, 1.5)) for _ in range(n)])
+    stds = np.array([rng.choice((4.0, 7.5, 8.0, 10.0)) for _ in range(n)])
+    _assert_matches_scalar(pairs, day_types, cfg, break_hours=breaks, std_hours=stds)
+
+    night_cfg = {**cfg, "NIGHT_START": 21, "NIGHT_END": 5}
+    _assert_matches_scalar(pairs[:300], day_types[:300], night_cfg)
+
+
+def test_day_type_codes_follow_calendar(flask_app):
+    db.session.add(OperationCalendarDay(work_date=date(2026, 3, 4), day_type="unpaid_leave"))
+    db.session.commit()
+    dates = [date(2025, 12, 31), date(2026, 3, 2), date(2026, 3, 4), date(2026, 3, 7), date(2026, 3, 8)]
+    codes = calendar_service.day_type_codes(dates)
+    assert [DAY_TYPE_NAMES[c] for c in codes.tolist()] == [
+        calendar_service.day_type(d) for d in dates
+    ] == ["workday", "paid_leave", "unpaid_leave", "unpaid_leave", "paid_leave"]
+
+
+def test_recompute_updates_only_changed_records(flask_app):
+    emp = Employee(name="홍길동", birth_date="900101", is_active=True)
+    db.session.add(emp)
+    db.session.flush()
+    cfg = _get_cfg()
+    start = date(2026, 1, 1)
+    rng = random.Random(3)
+    for offset in range(365):
+        work_date = start + timedelta(days=offset)
+        clock_in, clock_out = _hhmm(rng.randrange(1440)), _hhmm(rng.randrange(1440))
+        total, ot, night, holiday = calc_work_hours(
+            clock_in, clock_out, cfg, calendar_day_type=calendar_service.day_type(work_date))
+        db.session.add(AttendanceRecord(
+            employee_id=emp.id, birth_date="900101", emp_name="홍길동", work_date=work_date,
+            clock_in=clock_in, clock_out=clock_out, work_type="normal", total_work_hours=total,
+            overtime_hours=ot, night_hours=night, holiday_work_hours=holiday,
+        ))
+    db.session.commit()
+    PayrollStaleMark.query.delete()
+    db.session.commit()
+
+    result = recompute_work_hours(date(2026, 1, 1), date(2026, 12, 31))
+    assert result == {"scanned": 365, "changed": 0, "months": []}
+
+    # 3월 4일을 유급휴일로 지정하면 해당 레코드만 바뀌고 3월만 재계산 대상이 된다
+    db.session.add(OperationCalendarDay(work_date=date(2026, 3, 4), day_type="paid_leave"))
+    AttendanceRecord.query.filter_by(work_date=date(2026, 3, 4)).update(
+        {"clock_in": "09:00", "clock_out": "20:00"}
+    )
+    db.session.commit()
+    PayrollStaleMark.query.delete()
+    db.session.commit()
+
+    started = time.perf_counter()
+    result = recompute_work_hours(date(2026, 1, 1), date(2026, 12, 31))
+    db.session.commit()
+    assert time.perf_counter() - started < 2.0
+    assert result["changed"] == 1 and result["months"] == ["2026-03"]
+
+    record = AttendanceRecord.query.filter_by(work_date=date(2026, 3, 4)).one()
+    assert (record.total_work_hours, record.overtime_hours, record.holiday_work_hours) == (10.0, 2.0, 8.0)
+    assert [(m.employee_id, m.month) for m in PayrollStaleMark.query.all()] == [(emp.id, "2026-03")]
@@ -0,0 +1,72 @@
+"""Tests for the unified operation-calendar service."""
+
+from datetime import date, timedelta
+
+from sqlalchemy import event
+
+from models import OperationCalendarDay, db
+from services import calendar_service
+from services.attendance_service import _default_day_type, _effective_day_type
+from services.leave_service import get_working_days
+
+
+def _login(client):
+    with client.session_transaction() as sess:
+        sess["is_admin"] = True
+
+
+def test_default_types_follow_each_years_holidays(flask_app):
+    assert _default_day_type(date(2025, 10, 6)) == "paid_leave"     # 2025 추석
+    assert _default_day_type(date(2026, 3, 2)) == "paid_leave"      # 2026 대체공휴일
+    assert _default_day_type(date(2026, 3, 7)) == "unpaid_leave"    # 토요일
+    assert _default_day_type(date(2026, 3, 8)) == "paid_leave"      # 일요일
+    # 공휴일 미등록 연도는 주말만 휴일
+    assert _default_day_type(date(2030, 1, 1)) == "workday"
+    assert get_working_days(2030, 1) == 23
+
+
+def test_month_schedule_groups_iso_weeks(flask_app):
+    scheduled, weeks = calendar_service.month_schedule("2026-03")
+    expected = {
+        date(2026, 3, 1) + timedelta(days=i) for i in range(31)
+        if (date(2026, 3, 1) + timedelta(days=i)).weekday() < 5
+    } - {date(2026, 3, 2)}
+    assert scheduled == expected
+    assert get_working_days(2026, 3) == 21
+    assert weeks[(2026, 10)] == {date(2026, 3, d) for d in (3, 4, 5, 6)}
+    assert set().union(*weeks.values()) == scheduled
+
+
+def test_lookups_hit_cache_without_queries(flask_app):
+    calendar_service.get_year_calendar(2026)
+    statements = []
+
+    def _count(*args, **kwargs):
+        statements.append(1)
+
+    event.listen(db.engine, "before_cursor_execute", _count)
+    try:
+        for day in range(1, 366):
+            _effective_day_type(date(2026, 1, 1) + timedelta(days=day - 1))
+        calendar_service.month_schedule("2026-07")
+    finally:
+        event.remove(db.engine, "before_cursor_execute", _count)
+    assert statements == []
+
+
+def test_calendar_save_invalidates_cache(client, flask_app):
+    _login(client)
+    assert _effective_day_type(date(2026, 3, 4)) == "workday"
+
+    client.post("/admin/attendance-calendar", data={
+        "work_date": "2026-03-04", "day_type": "paid_leave", "month": "2026-03",
+    })
+    assert _effective_day_type(date(2026, 3, 4)) == "paid_leave"
+    assert _default_day_type(date(2026, 3, 4)) == "workday"
+    assert get_working_days(2026, 3) == 20
+
+    client.post("/admin/attendance-calendar", data={
+        "work_date": "2026-03-04", "day_type": "default", "month": "2026-03",
+    })
+    assert _effective_day_type(date(2026, 3, 4)) == "workday"
+    assert OperationCalendarDay.query.count() == 0
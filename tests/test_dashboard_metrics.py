@@ -0,0 +1,99 @@
+"""Tests for the cached dashboard metrics shared by the admin home and dashboard."""
+
+from datetime import date
+
+from sqlalchemy import event, text
+
+from models import AdvanceRequest, Application, Employee, Payslip, Site, db
+from services.cache_version_service import bump_version
+from services.dashboard_service import dashboard_metrics
+
+MONTH = date.today().strftime("%Y-%m")
+
+
+def _login(client):
+    with client.session_transaction() as sess:
+        sess["is_admin"] = True
+
+
+def _seed():
+    site = Site(name="영진팩")
+    db.session.add(site)
+    db.session.flush()
+    kim = Employee(name="김철수", birth_date="900101", site_id=site.id, work_type="weekly")
+    lee = Employee(name="이은비", birth_date="910101", work_type="shift")
+    park = Employee(name="박퇴사", birth_date="920101", is_active=False)
+    db.session.add_all([kim, lee, park])
+    db.session.flush()
+    db.session.add_all([
+        AdvanceRequest(employee_id=kim.id, birth_date=kim.birth_date, emp_name=kim.name,
+                       request_month=MONTH, amount=100_000, status="approved"),
+        AdvanceRequest(employee_id=lee.id, birth_date=lee.birth_date, emp_name=lee.name,
+                       request_month=MONTH, amount=50_000, status="pending"),
+        Payslip(employee_id=kim.id, emp_name=kim.name, month=MONTH, gross=3_000_000, net=2_700_000),
+        Application(id="a1", name="정지원", phone="010-1111-2222"),
+    ])
+    db.session.commit()
+    return kim
+
+
+def test_snapshot_is_cached_and_invalidated_on_writes(client, flask_app):
+    _login(client)
+    kim = _seed()
+
+    statements = []
+
+    def _record_sql(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(db.engine, "before_cursor_execute", _record_sql)
+    try:
+        home = client.get("/humetix_master_99").get_data(as_text=True)
+        first = len(statements)
+        statements.clear()
+        client.get("/admin/dashboard")
+        client.get("/humetix_master_99")
+        cached = len(statements)
+    finally:
+        event.remove(db.engine, "before_cursor_execute", _record_sql)
+
+    assert first <= 10 and cached <= 2
+    assert "영진팩" in home and "정지원" in home and "김철수" in home
+
+    stats = dashboard_metrics(MONTH)
+    assert stats["employees"] == {"active": 2, "inactive": 1, "weekly": 1, "shift": 1, "unassigned": 1}
+    assert stats["todo"] == {"advances": 1, "applications": 1, "inquiries": 0}
+    assert stats["advance"] == {"pending": 1, "approved": 1, "rejected": 0, "total_amount": 100_000}
+    assert stats["payslip"]["total_net"] == 2_700_000
+    assert stats["sites"] == [{"id": kim.site_id, "name": "영진팩", "count": 1}]
+
+    # ORM 저장
+    kim.is_active = False
+    db.session.commit()
+    assert dashboard_metrics(MONTH)["employees"]["active"] == 1
+
+    # session.execute 로 실행한 Core 쓰기
+    db.session.execute(Payslip.__table__.update().values(net=1_000_000))
+    db.session.commit()
+    assert dashboard_metrics(MONTH)["payslip"]["total_net"] == 1_000_000
+
+    data = client.get(f"/api/dashboard/metrics?month={MONTH}").get_json()
+    assert data["month"] == MONTH and data["payslip"]["total_net"] == 1_000_000
+    assert data["recent_apps"][0]["name"] == "정지원" and "T" in data["recent_apps"][0]["timestamp"]
+
+
+def test_other_worker_changes_follow_the_shared_version(client, flask_app):
+    _seed()
+    flask_app.config["DASHBOARD_CACHE_CHECK_SECONDS"] = 0
+    try:
+        assert dashboard_metrics(MONTH)["todo"]["applications"] == 1
+
+        # 다른 워커의 변경을 흉내: 이 워커 리스너를 거치지 않은 쓰기 + 버전 증가
+        with db.engine.begin() as conn:
+            conn.execute(text("UPDATE applications SET status = 'review'"))
+        assert dashboard_metrics(MONTH)["todo"]["applications"] == 1
+        bump_version(db.session, "dashboard_metrics")
+        db.session.commit()
+        assert dashboard_metrics(MONTH)["todo"]["applications"] == 0
+    finally:
+        flask_app.config["DASHBOARD_CACHE_CHECK_SECONDS"] = 1
@@ -0,0 +1,76 @@
+"""Tests for the streaming XLSX/CSV export service."""
+
+from datetime import date
+from io import BytesIO
+
+from openpyxl import load_workbook
+
+from models import AttendanceRecord, Employee, Payslip, db
+from services.export_service import SPOOL_MAX_BYTES, build_export
+
+
+def _login(client):
+    with client.session_transaction() as sess:
+        sess["is_admin"] = True
+
+
+def _seed_attendance():
+    emp = Employee(name="홍길동", birth_date="900101", is_active=True)
+    db.session.add(emp)
+    db.session.flush()
+    for day, work_type in [(3, "normal"), (2, "night"), (4, "annual")]:
+        db.session.add(AttendanceRecord(
+            employee_id=emp.id, birth_date="900101", emp_name="홍길동", dept="생산부",
+            work_date=date(2026, 3, day), clock_in="08:00", clock_out="17:00",
+            work_type=work_type, total_work_hours=8.0, overtime_hours=0.0,
+            night_hours=0.0, holiday_work_hours=None, source="excel",
+        ))
+    db.session.add(Payslip(employee_id=emp.id, emp_name="홍길동", month="2026-03",
+                           salary_mode="daily_build", gross=100, net=90, is_manual=True))
+    db.session.commit()
+
+
+def test_csv_export_has_bom_and_rows():
+    out = build_export(["이름", "금액"], iter([["홍길동", 1000], ["김철수", None]]), "csv")
+    data = out.read()
+    assert data.startswith(b"\xef\xbb\xbf")
+    assert data.decode("utf-8-sig").splitlines() == ["이름,금액", "홍길동,1000", "김철수,"]
+
+
+def test_large_export_spools_to_disk():
+    rows = ([i, "x" * 200] for i in range(SPOOL_MAX_BYTES // 200 + 1000))
+    out = build_export(["번호", "값"], rows, "csv")
+    assert out._rolled
+
+
+def test_attendance_excel_streams_same_columns(client, flask_app):
+    _login(client)
+    _seed_attendance()
+
+    resp = client.get("/admin/attendance/excel?start_date=2026-03-01&end_date=2026-03-31")
+    assert resp.status_code == 200
+    assert resp.content_length == len(resp.data)
+    ws = load_workbook(BytesIO(resp.data)).active
+    rows = list(ws.iter_rows(values_only=True))
+    assert ws.title == "근태기록"
+    assert rows[0][:4] == ("직원ID", "이름", "부서", "날짜")
+    assert [r[3] for r in rows[1:]] == ["2026-03-02", "2026-03-03", "2026-03-04"]
+    assert rows[1][6:] == ("야간", 8, 0, 0, 0, "엑셀")
+    assert ws["A1"].font.bold
+
+    resp = client.get("/admin/attendance/excel?format=csv")
+    assert resp.mimetype == "text/csv"
+    assert resp.headers["Content-Disposition"].endswith("_all_all.csv")
+    lines = resp.data.decode("utf-8-sig").splitlines()
+    assert len(lines) == 4 and lines[1].startswith("1,홍길동,생산부,2026-03-02")
+
+
+def test_payslip_excel_labels(client, flask_app):
+    _login(client)
+    _seed_attendance()
+
+    resp = client.get("/admin/payslip/excel?month=2026-03")
+    ws = load_workbook(BytesIO(resp.data)).active
+    row = [c.value for c in ws[2]]
+    assert ws.title == "2026-03 급여"
+    assert row[3] == "일급제" and row[-1] == "Y" and row[-2] == 90
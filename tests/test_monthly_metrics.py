@@ -0,0 +1,132 @@
+"""Tests for the precomputed monthly metrics behind the dashboard trend APIs."""
+
+from datetime import date
+
+from sqlalchemy import event
+
+from models import AdvanceRequest, AttendanceRecord, Employee, MonthlyMetric, Payslip, Site, db
+from services.monthly_metrics_service import month_window, rebuild_metrics
+
+
+def _login(client):
+    with client.session_transaction() as sess:
+        sess["is_admin"] = True
+
+
+def _record(emp, day, hours=8.0, ot=0.0):
+    return AttendanceRecord(
+        employee_id=emp.id, birth_date=emp.birth_date, emp_name=emp.name,
+        work_date=day, work_type="normal", total_work_hours=hours, overtime_hours=ot,
+    )
+
+
+def _seed():
+    east, west = Site(name="동부"), Site(name="서부")
+    db.session.add_all([east, west])
+    db.session.flush()
+    kim = Employee(name="김철수", birth_date="900101", site_id=east.id)
+    lee = Employee(name="이은비", birth_date="910101", site_id=west.id)
+    db.session.add_all([kim, lee])
+    db.session.flush()
+    db.session.add_all([
+        _record(kim, date(2026, 1, 5), ot=2.0),
+        _record(kim, date(2026, 1, 6)),
+        _record(lee, date(2026, 1, 5)),
+        _record(kim, date(2026, 3, 2)),
+        Payslip(employee_id=kim.id, emp_name=kim.name, month="2026-01", gross=3_000_000, net=2_700_000),
+        AdvanceRequest(employee_id=lee.id, birth_date=lee.birth_date, emp_name=lee.name,
+                       request_month="2026-01", amount=200_000, status="approved"),
+        AdvanceRequest(employee_id=kim.id, birth_date=kim.birth_date, emp_name=kim.name,
+                       request_month="2026-01", amount=90_000, status="pending"),
+    ])
+    db.session.commit()
+    return east, west, kim, lee
+
+
+def _snapshot():
+    columns = [c.name for c in MonthlyMetric.__table__.columns if c.name not in ("id", "updated_at")]
+    return sorted(
+        tuple(getattr(row, c) for c in columns) for row in MonthlyMetric.query.all()
+    )
+
+
+def test_month_window():
+    assert month_window(3, "2026-02") == ["2025-12", "2026-01", "2026-02"]
+    assert len(month_window(24)) == 24
+
+
+def test_metrics_follow_writes_and_match_rebuild(flask_app):
+    east, west, kim, lee = _seed()
+
+    total = MonthlyMetric.query.filter_by(site_id=0, month="2026-01").one()
+    assert (total.headcount, total.attendance_records, total.total_hours, total.ot_hours) == (2, 3, 24.0, 2.0)
+    assert (total.payslip_count, total.gross, total.net) == (1, 3_000_000, 2_700_000)
+    assert (total.advance_count, total.advance_amount) == (1, 200_000)
+    west_row = MonthlyMetric.query.filter_by(site_id=west.id, month="2026-01").one()
+    assert (west_row.headcount, west_row.advance_amount, west_row.gross) == (1, 200_000, 0)
+
+    # 가불 승인·근태 삭제·명세서 수정이 같은 commit 에서 반영된다
+    pending = AdvanceRequest.query.filter_by(status="pending").one()
+    pending.status = "approved"
+    AttendanceRecord.query.filter_by(work_date=date(2026, 3, 2)).delete()
+    Payslip.query.filter_by(month="2026-01").update({"net": 2_500_000})
+    db.session.commit()
+
+    total = MonthlyMetric.query.filter_by(site_id=0, month="2026-01").one()
+    assert (total.advance_count, total.advance_amount, total.net) == (2, 290_000, 2_500_000)
+    assert MonthlyMetric.query.filter_by(month="2026-03").count() == 0
+
+    # 쓰기마다 유지한 지표와 전체 재구성 결과가 같다
+    incremental = _snapshot()
+    rebuild_metrics()
+    assert _snapshot() == incremental
+
+
+def test_site_change_moves_current_month_metrics(flask_app):
+    east, west, kim, lee = _seed()
+    month = date.today().strftime("%Y-%m")
+    db.session.add(_record(kim, date.today()))
+    db.session.commit()
+    assert MonthlyMetric.query.filter_by(site_id=east.id, month=month).one().headcount == 1
+
+    kim.site_id = west.id
+    db.session.commit()
+    assert MonthlyMetric.query.filter_by(site_id=east.id, month=month).count() == 0
+    assert MonthlyMetric.query.filter_by(site_id=west.id, month=month).one().headcount == 1
+
+
+def test_trend_api_reads_only_metrics_table(client, flask_app):
+    _login(client)
+    east, west, kim, lee = _seed()
+
+    statements = []
+
+    def _record_sql(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(db.engine, "before_cursor_execute", _record_sql)
+    try:
+        data = client.get("/api/dashboard/trends?months=3&end=2026-03").get_json()
+    finally:
+        event.remove(db.engine, "before_cursor_execute", _record_sql)
+
+    assert data["months"] == ["2026-01", "2026-02", "2026-03"]
+    assert data["series"]["headcount"] == [2, 0, 1]
+    assert data["series"]["ot_hours"] == [2.0, 0.0, 0.0]
+    assert data["series"]["gross"] == [3_000_000, 0, 0]
+    assert len(statements) == 1 and "FROM monthly_metrics" in statements[0]
+    assert "attendance_monthly" not in statements[0] and "FROM attendance_records" not in statements[0]
+
+    data = client.get(f"/api/dashboard/trends?months=3&end=2026-03&site_id={east.id}").get_json()
+    assert data["series"]["total_hours"] == [16.0, 0.0, 8.0]
+
+    data = client.get("/api/dashboard/trends/sites?metric=headcount&months=2&end=2026-01").get_json()
+    assert [(s["name"], s["values"]) for s in data["sites"]] == [("동부", [0, 1]), ("서부", [0, 1])]
+
+
+def test_trend_api_rejects_bad_parameters(client, flask_app):
+    _login(client)
+    for query in ("months=0", "months=25", "months=x", "end=2026-13", "site_id=-1"):
+        assert client.get(f"/api/dashboard/trends?{query}").status_code == 400
+    assert client.get("/api/dashboard/trends/sites?metric=id").status_code == 400
+    assert client.get("/api/dashboard/trends?months=24").status_code == 200
@@ -0,0 +1,110 @@
+"""Tests for cursor (keyset) pagination on admin lists and the attendance API."""
+
+from datetime import date, datetime, timedelta
+
+from sqlalchemy import event
+
+from models import Announcement, AttendanceRecord, Employee, Inquiry, db
+from services.pagination_service import decode_cursor, encode_cursor, keyset_page
+
+
+def _login(client):
+    with client.session_transaction() as sess:
+        sess["is_admin"] = True
+
+
+def test_cursor_walks_ties_and_nulls_both_ways(flask_app):
+    base = datetime(2026, 3, 1, 9, 0)
+    # 같은 시각(동점)과 NULL 정렬 키를 섞어 둔다
+    for i in range(7):
+        db.session.add(Inquiry(company="c", name=f"문의{i}", phone="010", message="m", created_at=base + timedelta(hours=i // 3)))
+    db.session.commit()
+    db.session.execute(db.text("UPDATE inquiries SET created_at = NULL WHERE name IN ('문의1', '문의5')"))
+    db.session.commit()
+
+    order = [(Inquiry.created_at, True), (Inquiry.id, True)]
+    expected = [i.id for i in Inquiry.query.order_by(Inquiry.created_at.desc(), Inquiry.id.desc())]
+
+    pages, cursor = [], None
+    while True:
+        page = keyset_page(Inquiry.query, order, cursor, per_page=2)
+        pages.append([i.id for i in page.items])
+        if not page.has_next:
+            break
+        cursor = page.next_cursor
+    assert sum(pages, []) == expected
+    assert [len(p) for p in pages] == [2, 2, 2, 1]
+
+    # 마지막 페이지에서 이전으로 되돌아가면 같은 페이지가 역순으로 나온다
+    back = []
+    while page.has_prev:
+        page = keyset_page(Inquiry.query, order, page.prev_cursor, per_page=2)
+        back.append([i.id for i in page.items])
+    assert back == pages[-2::-1]
+
+    values, direction = decode_cursor(encode_cursor([base, date(2026, 3, 1), None, 5]), 4)
+    assert values == [base, date(2026, 3, 1), None, 5] and direction == "n"
+
+
+def test_attendance_api_pages_without_offset(client, flask_app):
+    _login(client)
+    emp = Employee(name="홍길동", birth_date="900101", is_active=True)
+    db.session.add(emp)
+    db.session.flush()
+    for i in range(25):
+        db.session.add(AttendanceRecord(
+            employee_id=emp.id, birth_date=emp.birth_date, emp_name=emp.name,
+            work_date=date(2026, 1, 1) + timedelta(days=i), work_type="normal",
+        ))
+    db.session.commit()
+
+    statements = []
+
+    def _record_sql(conn, cursor, statement, parameters, *args):
+        if "attendance_records" in statement:
+            statements.append((statement, parameters))
+
+    event.listen(db.engine, "before_cursor_execute", _record_sql)
+    try:
+        seen, cursor = [], ""
+        while True:
+            data = client.get(f"/api/attendance?per_page=10&cursor={cursor}").get_json()
+            seen += [r["work_date"] for r in data["records"]]
+            if not data["next_cursor"]:
+                break
+            cursor = data["next_cursor"]
+    finally:
+        event.remove(db.engine, "before_cursor_execute", _record_sql)
+
+    assert len(seen) == 25 and seen == sorted(seen)
+    # SQLite 는 LIMIT 뒤에 항상 OFFSET 을 붙이므로 바인딩된 값이 0 인지 본다
+    assert len(statements) == 3
+    assert all("LIMIT" in sql and "count(" not in sql for sql, _ in statements)
+    assert [params[-1] for _, params in statements] == [0, 0, 0]
+
+    # 근태 화면은 next_cursor 를 따라가며 기간 전체를 근무일 오름차순으로 모은다
+    assert "fetchPage(data.next_cursor)" in client.get("/attendance").get_data(as_text=True)
+
+    assert client.get("/api/attendance?cursor=not-a-cursor").status_code == 400
+    assert client.get(f"/api/attendance?cursor={encode_cursor([1])}").status_code == 400
+
+
+def test_admin_lists_use_cursor_pager(client, flask_app):
+    _login(client)
+    for i in range(60):
+        db.session.add(Announcement(title=f"공지{i:02d}", content="c", category="public", is_pinned=i == 0))
+    db.session.commit()
+
+    page = client.get("/admin/notices").get_data(as_text=True)
+    assert "공지00" in page and "공지59" in page and "공지09" not in page
+    assert "cursor=" in page
+
+    # 잘못된 커서는 HTML 화면에서 첫 페이지로 돌아간다
+    fallback = client.get("/admin/notices?cursor=%%%").get_data(as_text=True)
+    assert fallback.count("공지") == page.count("공지")
+
+    for path in ("/admin/employees", "/admin/contracts", "/inquiries", "/admin/applications"):
+        assert client.get(path).status_code == 200
+
+    page = keyset_page(Announcement.query, [(Announcement.id, False)], count_total=True, total_cap=50)
+    assert page.total == 50 and page.total_capped
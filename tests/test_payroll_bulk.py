@@ -0,0 +1,175 @@
+"""Tests for the set-based bulk payroll engine."""
+
+from datetime import date, timedelta
+
+from models import (
+    AdvanceRequest,
+    AttendanceRecord,
+    Employee,
+    OperationCalendarDay,
+    Payslip,
+    PayrollStaleMark,
+    Site,
+    db,
+)
+from services.calendar_service import get_year_calendar
+from services.payroll_bulk_service import _upsert_statement, compute_payslips_bulk
+from services.payroll_dirty_service import mark_stale
+from services.payslip_service import compute_payslips, compute_single_payslip
+from services.wage_service import get_wage_index, save_wage_config
+
+MONTH = "2026-03"
+COMPARE_FIELDS = [
+    "salary_mode", "total_work_hours", "ot_hours", "night_hours", "holiday_hours",
+    "base_salary", "weekly_holiday_pay", "ot_pay", "night_pay", "holiday_pay",
+    "absent_days", "absent_deduction", "weekly_holiday_deduction", "gross",
+    "tax", "pension", "health_ins", "longterm_care", "employment_ins",
+    "insurance", "advance_deduction", "net",
+]
+
+
+def _add_employee(name, site_id=None, insurance_type="3.3%", skip_days=()):
+    emp = Employee(name=name, birth_date="900101", site_id=site_id,
+                   insurance_type=insurance_type, is_active=True)
+    db.session.add(emp)
+    db.session.flush()
+    d = date(2026, 3, 1)
+    while d.month == 3:
+        if d.weekday() < 5 and d.day not in skip_days:
+            db.session.add(AttendanceRecord(
+                employee_id=emp.id, birth_date="900101", emp_name=name, dept="생산",
+                work_date=d, work_type="normal", clock_in="08:00", clock_out="19:30",
+                total_work_hours=9.5, overtime_hours=1.5,
+                night_hours=0.0, holiday_work_hours=0.0,
+            ))
+        d += timedelta(days=1)
+    return emp
+
+
+def _seed():
+    site = Site(name="영진팩")
+    db.session.add(site)
+    db.session.flush()
+    emps = [
+        _add_employee("가", insurance_type="4대보험"),
+        _add_employee("나", skip_days=(10, 11)),
+        _add_employee("다", site_id=site.id),
+        _add_employee("라", site_id=site.id, insurance_type="4대보험", skip_days=(20,)),
+    ]
+    db.session.add(OperationCalendarDay(work_date=date(2026, 3, 16), day_type="paid_leave"))
+    db.session.add(AdvanceRequest(
+        employee_id=emps[1].id, birth_date="900101", emp_name="나",
+        request_month=MONTH, amount=200_000, status="approved",
+    ))
+    db.session.commit()
+    save_wage_config("site", site.id, {"wage_type": "daily", "daily_wage": 150_000})
+    save_wage_config("employee", emps[3].id, {"overtime_unit": "fixed", "overtime_fixed_amount": 20_000})
+    save_wage_config("employee", emps[1].id, {"calc_method": "daily_build"})
+    return emps
+
+
+def _snapshot():
+    return {
+        ps.employee_id: {f: getattr(ps, f) for f in COMPARE_FIELDS}
+        for ps in Payslip.query.filter_by(month=MONTH).all()
+    }
+
+
+def test_bulk_matches_single_employee_path(flask_app):
+    emps = _seed()
+    for emp in emps:
+        compute_single_payslip(emp.id, MONTH, "standard")
+    expected = _snapshot()
+    Payslip.query.delete()
+    db.session.commit()
+
+    result = compute_payslips_bulk(MONTH, "standard")
+    db.session.expire_all()
+
+    assert result["created"] == 4
+    assert _snapshot() == expected
+
+
+def test_single_regenerate_updates_existing_payslip(flask_app):
+    emps = _seed()
+    assert compute_single_payslip(emps[1].id, MONTH, "standard")["action"] == "created"
+    first = Payslip.query.filter_by(employee_id=emps[1].id).one()
+    gross = first.gross
+
+    AttendanceRecord.query.filter_by(employee_id=emps[1].id, work_date=date(2026, 3, 2)).delete()
+    db.session.commit()
+    assert compute_single_payslip(emps[1].id, MONTH, "standard")["action"] == "updated"
+    db.session.expire_all()
+    again = Payslip.query.filter_by(employee_id=emps[1].id).one()
+    assert again.id == first.id and again.gross != gross
+
+
+def test_bulk_updates_and_skips_manual(flask_app):
+    emps = _seed()
+    assert compute_payslips(MONTH, "standard") == (4, 0, 0)
+
+    manual = Payslip.query.filter_by(employee_id=emps[0].id).first()
+    manual.net = 1
+    manual.is_manual = True
+    db.session.commit()
+
+    mark_stale([(emps[0].id, MONTH), (emps[1].id, MONTH)], "attendance")
+    db.session.commit()
+
+    assert compute_payslips(MONTH, "standard") == (0, 3, 1)
+    db.session.expire_all()
+    assert db.session.get(Payslip, manual.id).net == 1
+    # 건너뛴 수동 명세서의 stale 표시는 남는다
+    assert [m.employee_id for m in PayrollStaleMark.query.filter_by(month=MONTH)] == [emps[0].id]
+
+
+def test_mysql_upsert_keeps_manual_payslips():
+    from sqlalchemy.dialects import mysql
+
+    sql = str(_upsert_statement("mysql").compile(dialect=mysql.dialect()))
+    assert "ON DUPLICATE KEY UPDATE" in sql
+    assert "net = if(payslips.is_manual, payslips.net, VALUES(net))" in sql
+    assert "updated_at = if(payslips.is_manual, payslips.updated_at, VALUES(updated_at))" in sql
+    assert "is_manual = " not in sql.split("ON DUPLICATE KEY UPDATE")[1]
+
+
+def test_bulk_query_count_is_fixed(flask_app):
+    _seed()
+    get_year_calendar(2026)  # 캘린더는 연도 단위 캐시 — 적재 후 비교
+    get_wage_index()         # 급여 설정도 워커 캐시 — 버전 확인 1회만 남는다
+    small = compute_payslips_bulk(MONTH, "standard")
+    for i in range(10):
+        _add_employee(f"추가{i}")
+    db.session.commit()
+    large = compute_payslips_bulk(MONTH, "standard")
+
+    assert large["employees"] == small["employees"] + 10
+    assert large["queries"] == small["queries"]
+    assert [p["phase"] for p in large["phases"]] == [
+        "attendance", "calendar", "employees", "wage_configs",
+        "advances", "existing", "compute", "write",
+    ]
+
+
+def test_bulk_without_attendance_returns_error(flask_app):
+    assert compute_payslips_bulk(MONTH, "standard") == f"{MONTH} 근태 기록이 없습니다."
+
+
+def test_phase_stats_count_only_this_sessions_queries(flask_app):
+    import threading
+
+    from services.payroll_bulk_service import PhaseStats
+
+    def _other_request():
+        with flask_app.app_context():
+            for _ in range(5):
+                Employee.query.count()
+            db.session.remove()
+
+    stats = PhaseStats()
+    with stats.phase("employees"):
+        Employee.query.count()
+        worker = threading.Thread(target=_other_request)
+        worker.start()
+        worker.join()
+    assert stats.summary()["queries"] == 1
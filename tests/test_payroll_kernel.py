@@ -0,0 +1,72 @@
+"""Tests for the vectorized payroll kernel (must match the scalar helpers exactly)."""
+
+import random
+
+from config import Config
+from services.payroll_kernel import compute_columns, pack_columns
+from services.payslip_service import _effective_salary_mode, _payslip_values
+
+CFG = {
+    "TAX_RATE": Config.TAX_RATE,
+    "PENSION_RATE": Config.PENSION_RATE,
+    "HEALTH_RATE": Config.HEALTH_RATE,
+    "LONGTERM_CARE_RATE": Config.LONGTERM_CARE_RATE,
+    "EMPLOYMENT_RATE": Config.EMPLOYMENT_RATE,
+}
+
+
+def _random_case(rng):
+    wage_cfg = {
+        "wage_type": rng.choice(["hourly", "hourly", "daily"]),
+        "hourly_wage": rng.choice([None, 0, 10_320, 12_345, 15_000]),
+        "daily_wage": rng.choice([None, 0, 130_000, 151_111]),
+        "standard_work_hours": rng.choice([None, 8.0, 7.5, 9.0]),
+        "overtime_rate": rng.choice([None, 1.5, 2.0, 1.25]),
+        "night_bonus_rate": rng.choice([None, 0.5, 0.3]),
+        "overtime_unit": rng.choice([None, "rate", "fixed"]),
+        "overtime_fixed_amount": rng.choice([None, 0, 15_000, 17_777]),
+        "calc_method": rng.choice([None, "standard", "actual", "daily_build"]),
+    }
+    hours = tuple(round(rng.uniform(0, 250), rng.choice([0, 1, 2])) for _ in range(4))
+    workdays = rng.randint(18, 23)
+    attended = rng.randint(0, workdays)
+    weeks = rng.randint(4, 6)
+    full = rng.randint(0, weeks)
+    attendance = (workdays - attended, weeks - full, attended, full)
+    ins_type = rng.choice(["3.3%", "4대보험"])
+    advance = rng.choice([0, 0, 100_000, 350_000])
+    mode = rng.choice(["standard", "actual", "daily_build"])
+    return wage_cfg, mode, hours, attendance, ins_type, advance
+
+
+def test_kernel_matches_scalar_helpers():
+    rng = random.Random(20260301)
+    cases = [_random_case(rng) for _ in range(5000)]
+
+    modes = [_effective_salary_mode(c[0], c[1]) for c in cases]
+    cols = pack_columns(
+        [c[0] for c in cases], modes, [c[2] for c in cases],
+        [c[3] for c in cases], [c[4] for c in cases], [c[5] for c in cases],
+    )
+    result = {k: v.tolist() for k, v in compute_columns(cols, CFG).items()}
+
+    for i, (wage_cfg, mode, hours, attendance, ins_type, advance) in enumerate(cases):
+        expected = _payslip_values(wage_cfg, mode, hours, attendance, ins_type, advance, CFG)
+        for field, values in result.items():
+            assert values[i] == expected[field], (field, cases[i])
+
+
+def test_kernel_rounding_half_even_and_truncation():
+    # 0.5 경계: round() 와 동일하게 짝수 반올림
+    wage_cfg = {"wage_type": "hourly", "hourly_wage": 1, "overtime_rate": 1.0,
+                "night_bonus_rate": 0.5, "standard_work_hours": 8.0}
+    cols = pack_columns(
+        [wage_cfg, wage_cfg], ["actual", "standard"],
+        [(2.5, 3.5, 5.0, 0.0), (0.0, 0.0, 0.0, 0.0)],
+        [(0, 0, 0, 0), (1, 0, 0, 0)], ["3.3%", "3.3%"], [0, 0],
+    )
+    out = compute_columns(cols, CFG)
+    assert out["base_salary"].tolist()[0] == round(2.5)
+    assert out["ot_pay"].tolist()[0] == round(3.5)
+    assert out["night_pay"].tolist()[0] == round(2.5)
+    assert out["absent_deduction"].tolist()[1] == int(1 * 1 * 8.0)
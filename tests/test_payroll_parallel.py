@@ -0,0 +1,86 @@
+"""Tests for the (site, month) process-pool payroll runner."""
+
+from datetime import date
+
+from models import AttendanceRecord, Employee, Payslip, Site, db
+from services.payroll_bulk_service import compute_payslips_bulk
+from services.payroll_parallel_service import UNASSIGNED, month_span, run_payroll
+from services.wage_service import save_wage_config
+
+MONTHS = ["2026-02", "2026-03"]
+
+
+def _seed():
+    sites = [Site(name="A현장"), Site(name="B현장")]
+    db.session.add_all(sites)
+    db.session.flush()
+    for i, site_id in enumerate([sites[0].id, sites[0].id, sites[1].id, None]):
+        emp = Employee(name=f"직원{i}", birth_date="900101", site_id=site_id,
+                       insurance_type="4대보험" if i % 2 else "3.3%", is_active=True)
+        db.session.add(emp)
+        db.session.flush()
+        for month in (2, 3):
+            for day in range(2, 20 - i):
+                d = date(2026, month, day)
+                if d.weekday() >= 5:
+                    continue
+                db.session.add(AttendanceRecord(
+                    employee_id=emp.id, birth_date="900101", emp_name=emp.name,
+                    work_date=d, work_type="normal", total_work_hours=9.0,
+                    overtime_hours=1.0, night_hours=0.5, holiday_work_hours=0.0,
+                ))
+    db.session.commit()
+    save_wage_config("site", sites[1].id, {"hourly_wage": 12_000, "calc_method": "actual"})
+    return sites
+
+
+def _snapshot():
+    return sorted(
+        (ps.employee_id, ps.month, ps.salary_mode, ps.gross, ps.net, ps.insurance)
+        for ps in Payslip.query.all()
+    )
+
+
+def test_month_span_crosses_year():
+    assert month_span("2025-11", "2026-02") == ["2025-11", "2025-12", "2026-01", "2026-02"]
+
+
+def test_run_payroll_matches_bulk_engine(flask_app):
+    _seed()
+    for month in MONTHS:
+        compute_payslips_bulk(month, "standard")
+    expected = _snapshot()
+    Payslip.query.delete()
+    db.session.commit()
+
+    events = []
+    result = run_payroll(MONTHS, "standard", workers=1, progress=events.append)
+
+    assert result["chunks"] == 6
+    assert result["months"]["2026-03"]["created"] == 4
+    assert [e["month"] for e in events if e["type"] == "month"] == MONTHS
+    db.session.expire_all()
+    assert _snapshot() == expected
+
+
+def test_run_payroll_process_pool(flask_app):
+    _seed()
+    for month in MONTHS:
+        compute_payslips_bulk(month, "standard")
+    expected = _snapshot()
+    Payslip.query.delete()
+    db.session.commit()
+
+    result = run_payroll(MONTHS, "standard", workers=2, progress=lambda e: None)
+
+    assert sum(m["created"] for m in result["months"].values()) == 8
+    db.session.expire_all()
+    assert _snapshot() == expected
+
+
+def test_run_payroll_site_filter(flask_app):
+    _seed()
+    result = run_payroll(["2026-03"], "standard", workers=1, site_ids=[UNASSIGNED],
+                         progress=lambda e: None)
+    assert result["months"]["2026-03"]["created"] == 1
+    assert Payslip.query.count() == 1
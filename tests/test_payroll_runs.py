@@ -0,0 +1,121 @@
+"""Tests for payroll run history and run-to-run diffs."""
+
+import time
+from datetime import date
+
+from models import AdvanceRequest, AttendanceRecord, Employee, PayrollRun, db
+from services.payroll_bulk_service import PAYSLIP_VALUE_FIELDS, compute_payslips_bulk
+from services.payroll_parallel_service import run_payroll
+from services.payroll_run_service import diff_runs, record_run
+
+MONTH = "2026-03"
+
+
+def _login(client):
+    with client.session_transaction() as sess:
+        sess["is_admin"] = True
+
+
+def _seed(count=3):
+    emps = []
+    for i in range(count):
+        emp = Employee(name=f"직원{i}", birth_date="900101",
+                       insurance_type="4대보험" if i % 2 else "3.3%", is_active=True)
+        db.session.add(emp)
+        db.session.flush()
+        for day in range(2, 28):
+            d = date(2026, 3, day)
+            if d.weekday() >= 5:
+                continue
+            db.session.add(AttendanceRecord(
+                employee_id=emp.id, birth_date="900101", emp_name=emp.name,
+                work_date=d, work_type="normal", total_work_hours=9.0,
+                overtime_hours=1.0, night_hours=0.0, holiday_work_hours=0.0,
+            ))
+        emps.append(emp)
+    db.session.commit()
+    return emps
+
+
+def test_rerun_with_changed_inputs_diffs_by_field(flask_app):
+    emps = _seed()
+    first = compute_payslips_bulk(MONTH, "standard")
+    same = compute_payslips_bulk(MONTH, "standard")
+
+    run_a = db.session.get(PayrollRun, first["run_id"])
+    run_b = db.session.get(PayrollRun, same["run_id"])
+    assert run_a.inputs_hash == run_b.inputs_hash
+    assert run_a.employees == 3 and run_a.created == 3 and run_b.updated == 3
+    diff = diff_runs(run_a, run_b)
+    assert diff["same_inputs"] and diff["changed"] == [] and diff["unchanged"] == 3
+
+    db.session.add(AdvanceRequest(
+        employee_id=emps[1].id, birth_date="900101", emp_name=emps[1].name,
+        request_month=MONTH, amount=150_000, status="approved",
+    ))
+    db.session.commit()
+    third = compute_payslips_bulk(MONTH, "standard")
+    run_c = db.session.get(PayrollRun, third["run_id"])
+    assert run_c.inputs_hash != run_b.inputs_hash
+
+    diff = diff_runs(run_b, run_c)
+    assert [c["employee_id"] for c in diff["changed"]] == [emps[1].id]
+    changes = diff["changed"][0]["changes"]
+    assert set(changes) == {"advance_deduction", "net"}
+    assert changes["advance_deduction"] == {"before": 0, "after": 150_000, "delta": 150_000}
+    assert changes["net"]["delta"] == -150_000
+    assert diff["totals"]["net"]["delta"] == -150_000
+    assert diff["field_changes"] == {"advance_deduction": 1, "net": 1}
+
+
+def test_parallel_run_hash_matches_bulk(flask_app):
+    _seed()
+    bulk = db.session.get(PayrollRun, compute_payslips_bulk(MONTH, "standard")["run_id"])
+    run_payroll([MONTH], "standard", workers=1)
+    parallel = PayrollRun.query.filter_by(trigger="parallel").one()
+
+    assert parallel.inputs_hash == bulk.inputs_hash
+    assert diff_runs(bulk, parallel)["changed"] == []
+
+
+def test_runs_api_lists_and_diffs(client, flask_app):
+    _login(client)
+    emps = _seed(2)
+    a = compute_payslips_bulk(MONTH, "standard")["run_id"]
+    AttendanceRecord.query.filter_by(employee_id=emps[0].id, work_date=date(2026, 3, 2)).delete()
+    db.session.commit()
+    b = client.post("/admin/payslip/generate", json={"month": MONTH}).get_json()["run_id"]
+
+    runs = client.get(f"/admin/payslip/runs?month={MONTH}").get_json()["runs"]
+    assert [r["id"] for r in runs] == [b, a]
+    assert runs[0]["trigger"] == "generate" and runs[0]["phases"]
+
+    resp = client.get(f"/admin/payslip/runs/{a}/diff/{b}")
+    assert resp.status_code == 200
+    body = resp.get_json()
+    assert [c["name"] for c in body["changed"]] == [emps[0].name]
+    assert body["changed"][0]["changes"]["total_work_hours"]["delta"] == -9
+
+    assert client.get(f"/admin/payslip/runs/{a}/diff/9999").status_code == 404
+
+
+def test_diff_of_large_month_is_fast(flask_app):
+    n = 2000
+    rows = []
+    for eid in range(1, n + 1):
+        row = {f: float(eid) for f in PAYSLIP_VALUE_FIELDS if f != "salary_mode"}
+        row.update(employee_id=eid, salary_mode="standard")
+        rows.append(row)
+    run_a = record_run(MONTH, "standard", rows, {}, "a" * 64, (n, 0, 0))
+    for row in rows[::10]:
+        row["net"] += 1000
+    rows.append({**rows[0], "employee_id": n + 1})
+    run_b = record_run(MONTH, "standard", rows[1:], {}, "b" * 64, (0, n, 0))
+    db.session.commit()
+
+    started = time.perf_counter()
+    diff = diff_runs(run_a, run_b)
+    assert time.perf_counter() - started < 1.0
+    assert len(diff["changed"]) == n // 10 - 1
+    assert [e["employee_id"] for e in diff["added"]] == [n + 1]
+    assert [e["employee_id"] for e in diff["removed"]] == [1]
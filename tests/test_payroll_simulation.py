@@ -0,0 +1,124 @@
+"""Tests for the what-if site wage config simulation."""
+
+from datetime import date
+
+import pytest
+from sqlalchemy import event
+
+from models import AttendanceRecord, Employee, Payslip, Site, db
+from services.payroll_bulk_service import compute_payslips_bulk
+from services.payroll_simulation_service import (
+    clear_cache,
+    parse_overrides,
+    simulate_site_wage_change,
+)
+
+MONTHS = ["2026-02", "2026-03"]
+
+
+@pytest.fixture(autouse=True)
+def _fresh_cache():
+    clear_cache()
+    yield
+    clear_cache()
+
+
+def _login(client):
+    with client.session_transaction() as sess:
+        sess["is_admin"] = True
+
+
+def _seed():
+    site = Site(name="A현장")
+    other = Site(name="B현장")
+    db.session.add_all([site, other])
+    db.session.flush()
+    for i, site_id in enumerate([site.id, site.id, other.id]):
+        emp = Employee(name=f"직원{i}", birth_date="900101", site_id=site_id,
+                       insurance_type="4대보험" if i % 2 else "3.3%", is_active=True)
+        db.session.add(emp)
+        db.session.flush()
+        for month in (2, 3):
+            for day in range(2, 20):
+                d = date(2026, month, day)
+                if d.weekday() >= 5:
+                    continue
+                db.session.add(AttendanceRecord(
+                    employee_id=emp.id, birth_date="900101", emp_name=emp.name,
+                    work_date=d, work_type="normal", total_work_hours=9.0,
+                    overtime_hours=1.0, night_hours=0.0, holiday_work_hours=0.0,
+                ))
+    db.session.commit()
+    for month in MONTHS:
+        compute_payslips_bulk(month, "standard")
+    return site
+
+
+def _snapshot():
+    return sorted((ps.employee_id, ps.month, ps.gross, ps.net) for ps in Payslip.query.all())
+
+
+def test_unchanged_config_has_zero_delta(flask_app):
+    site = _seed()
+    result = simulate_site_wage_change(site.id, {}, "2026-03", months=2)
+    assert result["months"] == MONTHS
+    assert result["site"]["employees"] == 2
+    assert result["site"]["delta_gross"] == 0
+    assert result["site"]["stored_gross"] > 0
+
+
+def test_raised_wage_increases_cost_without_writing(flask_app):
+    site = _seed()
+    before = _snapshot()
+
+    result = simulate_site_wage_change(site.id, {"hourly_wage": 20_000}, "2026-03", months=2)
+
+    assert result["site"]["delta_gross"] > 0
+    assert all(e["delta_gross"] > 0 for e in result["employees"])
+    assert sum(m["delta_gross"] for m in result["by_month"]) == result["site"]["delta_gross"]
+    db.session.expire_all()
+    assert _snapshot() == before
+
+
+def test_warm_cache_issues_no_queries(flask_app):
+    site = _seed()
+    simulate_site_wage_change(site.id, {}, "2026-03", months=2)
+
+    queries = []
+
+    def _count(*args):
+        queries.append(args[2])
+
+    event.listen(db.engine, "before_cursor_execute", _count)
+    try:
+        result = simulate_site_wage_change(site.id, {"overtime_rate": 2.0}, "2026-03", months=2)
+    finally:
+        event.remove(db.engine, "before_cursor_execute", _count)
+
+    assert result["cache_hits"] == 2
+    assert queries == []
+
+
+def test_parse_overrides_rejects_invalid():
+    assert parse_overrides({"hourly_wage": "12000", "calc_method": None}) == {
+        "hourly_wage": 12000, "calc_method": None,
+    }
+    with pytest.raises(ValueError):
+        parse_overrides({"unknown": 1})
+    with pytest.raises(ValueError):
+        parse_overrides({"wage_type": "weekly"})
+
+
+def test_simulate_endpoint(client, flask_app):
+    _login(client)
+    site = _seed()
+    resp = client.post(f"/api/sites/{site.id}/wage-config/simulate", json={
+        "overrides": {"hourly_wage": 20_000}, "months": 2, "end_month": "2026-03",
+    })
+    body = resp.get_json()
+    assert body["success"] and body["site"]["delta_gross"] > 0
+
+    resp = client.post(f"/api/sites/{site.id}/wage-config/simulate", json={
+        "overrides": {"hourly_wage": "abc"},
+    })
+    assert resp.status_code == 400
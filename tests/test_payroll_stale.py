@@ -0,0 +1,123 @@
+"""Tests for payroll dirty tracking and stale-only recompute."""
+
+from datetime import date
+
+from models import (
+    AdvanceRequest, AttendanceRecord, Employee, OperationCalendarDay, Payslip,
+    PayrollStaleMark, Site, db,
+)
+from services.payroll_dirty_service import recompute_stale, stale_summary
+from services.wage_service import save_wage_config
+
+MONTH = "2026-03"
+
+
+def _login(client):
+    with client.session_transaction() as sess:
+        sess["is_admin"] = True
+
+
+def _employee_with_days(name, days, year=2026, month=3, site_id=None):
+    emp = Employee(name=name, birth_date="900101", site_id=site_id, is_active=True)
+    db.session.add(emp)
+    db.session.flush()
+    for day in days:
+        db.session.add(AttendanceRecord(
+            employee_id=emp.id, birth_date="900101", emp_name=name,
+            work_date=date(year, month, day), work_type="normal",
+            total_work_hours=8.0, overtime_hours=0.0, night_hours=0.0, holiday_work_hours=0.0,
+        ))
+    db.session.commit()
+    return emp
+
+
+def _marks():
+    return {(m.employee_id, m.month) for m in PayrollStaleMark.query.all()}
+
+
+def test_attendance_changes_mark_only_affected_pairs(flask_app):
+    a = _employee_with_days("가", [2, 3, 4])
+    b = _employee_with_days("나", [2, 3])
+    assert _marks() == {(a.id, MONTH), (b.id, MONTH)}
+
+    result = recompute_stale("standard")
+    assert result["created"] == 2 and result["cleared"] == 2
+    assert _marks() == set()
+
+    rec = AttendanceRecord.query.filter_by(employee_id=b.id).first()
+    rec.overtime_hours = 2.0
+    db.session.commit()
+    assert _marks() == {(b.id, MONTH)}
+
+    result = recompute_stale("standard")
+    assert (result["created"], result["updated"]) == (0, 1)
+    assert Payslip.query.filter_by(employee_id=b.id).first().ot_hours == 2.0
+
+
+def test_moving_work_date_marks_both_months(flask_app):
+    emp = _employee_with_days("가", [31])
+    recompute_stale("standard")
+    rec = AttendanceRecord.query.filter_by(employee_id=emp.id).first()
+    rec.work_date = date(2026, 4, 1)
+    db.session.commit()
+    assert _marks() == {(emp.id, "2026-03"), (emp.id, "2026-04")}
+
+
+def test_approved_advance_and_calendar_mark_pairs(flask_app):
+    a = _employee_with_days("가", [2, 3])
+    b = _employee_with_days("나", [2])
+    recompute_stale("standard")
+
+    db.session.add(AdvanceRequest(
+        employee_id=a.id, birth_date="900101", emp_name="가",
+        request_month=MONTH, amount=100_000, status="pending",
+    ))
+    db.session.commit()
+    assert _marks() == set()
+
+    adv = AdvanceRequest.query.first()
+    adv.status = "approved"
+    db.session.commit()
+    assert _marks() == {(a.id, MONTH)}
+
+    db.session.add(OperationCalendarDay(work_date=date(2026, 3, 5), day_type="paid_leave"))
+    db.session.commit()
+    assert _marks() == {(a.id, MONTH), (b.id, MONTH)}
+
+
+def test_site_wage_config_fans_out_to_site_employees(flask_app):
+    today = date.today()
+    site = Site(name="영진팩")
+    db.session.add(site)
+    db.session.commit()
+    on_site = _employee_with_days("가", [1], today.year, today.month, site_id=site.id)
+    _employee_with_days("나", [1], today.year, today.month)
+    recompute_stale("standard")
+
+    save_wage_config("site", site.id, {"hourly_wage": 12_000})
+    assert _marks() == {(on_site.id, today.strftime("%Y-%m"))}
+
+
+def test_bulk_delete_marks_and_manual_payslip_is_skipped(client, flask_app):
+    _login(client)
+    emp = _employee_with_days("가", [2, 3])
+    recompute_stale("standard")
+    ps = Payslip.query.filter_by(employee_id=emp.id).first()
+    ps.is_manual = True
+    db.session.commit()
+
+    resp = client.post("/api/attendance/bulk-delete", json={
+        "filter": {"start_date": "2026-03-03", "end_date": "2026-03-03"},
+    })
+    assert resp.get_json()["deleted"] == 1
+    assert stale_summary() == {MONTH: 1}
+
+    resp = client.post("/admin/payslip/recompute-stale", json={"salary_mode": "standard"})
+    body = resp.get_json()
+    assert body["success"] and body["skipped"] == 1
+    # 건너뛴 수동 명세서는 초기화할 때까지 재계산 필요로 남는다
+    assert stale_summary() == {MONTH: 1}
+    assert body["cleared"] == 0 and body["months"][MONTH]["kept"] == 1
+
+    client.post(f"/admin/payslip/{ps.id}/reset")
+    assert stale_summary() == {}
@@ -0,0 +1,122 @@
+"""Tests for the payslip PDF renderer."""
+
+import os
+import time
+from io import BytesIO
+
+from pypdf import PdfReader
+
+from models import Employee, Payslip, db
+from services import payslip_pdf_service
+from services.payslip_pdf_service import evict_pdf_cache, get_fonts, render_payslips_pdf
+
+
+def _payslip(i, **overrides):
+    values = dict(
+        employee_id=i, emp_name=f"직원{i}", dept="생산부", month="2026-03", salary_mode="standard",
+        total_work_hours=209.0, ot_hours=10.0, night_hours=5.0, holiday_hours=0.0,
+        base_salary=2_156_880, weekly_holiday_pay=0, ot_pay=154_800, night_pay=25_800,
+        holiday_pay=0, absent_days=0.0, absent_deduction=0, weekly_holiday_deduction=0,
+        gross=2_337_480, tax=77_137, pension=0, health_ins=0, longterm_care=0,
+        employment_ins=0, insurance=0, advance_deduction=0, net=2_260_343, is_manual=False,
+    )
+    values.update(overrides)
+    return Payslip(**values)
+
+
+def test_one_page_per_payslip_and_shared_layouts(flask_app):
+    payslips = [
+        _payslip(1),
+        _payslip(2, advance_deduction=100_000, net=2_160_343),
+        _payslip(3, is_manual=True),
+        _payslip(4, gross=2_337_481),
+    ]
+    buf = render_payslips_pdf(payslips, 10_320)
+    reader = PdfReader(BytesIO(buf.getvalue()))
+
+    assert len(reader.pages) == 4
+    text = reader.pages[3].extract_text()
+    assert "2,337,481" in text and "10,320" in text
+    # 프레임 1개 + 행 구성 3종 (기본 / 가불 / 수동수정)
+    xobjects = set()
+    for page in reader.pages:
+        xobjects.update(page["/Resources"]["/XObject"].keys())
+    assert len(xobjects) == 4
+
+
+def test_fonts_registered_once(monkeypatch):
+    calls = []
+    monkeypatch.setattr(payslip_pdf_service, "_fonts", None)
+    monkeypatch.setattr(
+        payslip_pdf_service, "_register_fonts",
+        lambda: calls.append(1) or ("Helvetica", "Helvetica-Bold"),
+    )
+    assert get_fonts() == get_fonts() == ("Helvetica", "Helvetica-Bold")
+    assert calls == [1]
+
+
+def _login(client):
+    with client.session_transaction() as sess:
+        sess["is_admin"] = True
+
+
+def _stored_payslip():
+    emp = Employee(name="홍길동", birth_date="900101", is_active=True)
+    db.session.add(emp)
+    db.session.flush()
+    ps = _payslip(emp.id, emp_name="홍길동")
+    db.session.add(ps)
+    db.session.commit()
+    return ps
+
+
+def test_public_pdf_served_from_cache_with_etag(client, flask_app, monkeypatch):
+    _stored_payslip()
+    renders = []
+    original = payslip_pdf_service.render_payslips_pdf
+
+    def _counting(*args, **kwargs):
+        renders.append(1)
+        return original(*args, **kwargs)
+
+    monkeypatch.setattr(payslip_pdf_service, "render_payslips_pdf", _counting)
+    url = "/payslip/pdf?birth_date=900101&emp_name=홍길동&month=2026-03"
+
+    first = client.get(url)
+    assert first.status_code == 200 and first.data.startswith(b"%PDF")
+    etag = first.headers["ETag"]
+    assert "private" in first.headers["Cache-Control"]
+
+    again = client.get(url)
+    assert again.data == first.data
+    assert client.get(url, headers={"If-None-Match": etag}).status_code == 304
+    assert renders == [1]
+
+
+def test_manual_update_invalidates_cached_pdf(client, flask_app):
+    _login(client)
+    ps = _stored_payslip()
+    url = f"/admin/payslip/pdf?month=2026-03&employee_id={ps.employee_id}"
+    etag = client.get(url).headers["ETag"]
+    assert len(os.listdir(flask_app.config["PAYSLIP_PDF_CACHE_DIR"])) == 1
+
+    client.put(f"/admin/payslip/{ps.id}", json={"ot_pay": 200_000})
+    assert os.listdir(flask_app.config["PAYSLIP_PDF_CACHE_DIR"]) == []
+
+    resp = client.get(url, headers={"If-None-Match": etag})
+    assert resp.status_code == 200 and resp.headers["ETag"] != etag
+
+
+def test_evict_by_age_and_size(flask_app):
+    directory = flask_app.config["PAYSLIP_PDF_CACHE_DIR"]
+    os.makedirs(directory)
+    now = time.time()
+    for i, age_days in enumerate([10, 2, 1, 0]):
+        path = os.path.join(directory, f"2026-03_{i}_key.pdf")
+        with open(path, "wb") as f:
+            f.write(b"x" * 1000)
+        os.utime(path, (now - age_days * 86400, now - age_days * 86400))
+
+    removed = evict_pdf_cache(max_bytes=2000, max_age_days=3)
+    assert removed == 2
+    assert sorted(os.listdir(directory)) == ["2026-03_2_key.pdf", "2026-03_3_key.pdf"]
@@ -0,0 +1,127 @@
+"""Tests for the name / phone search index and the list views that use it."""
+
+from datetime import date
+
+from sqlalchemy import text
+
+from models import (
+    Application,
+    AttendanceRecord,
+    Contract,
+    Employee,
+    Inquiry,
+    SearchDocument,
+    db,
+)
+from services.search_service import match_ids, rebuild_search_index
+
+
+def _login(client):
+    with client.session_transaction() as sess:
+        sess["is_admin"] = True
+
+
+def _ids(entity, q, **kwargs):
+    return {row[0] for row in db.session.execute(match_ids(entity, q, **kwargs))}
+
+
+def test_partial_korean_names_and_phone_digits(flask_app):
+    db.session.add_all([
+        Application(id="a1", name="홍길동", phone="010-1234-5678"),
+        Application(id="a2", name="김길순", phone="01098765678"),
+        Application(id="a3", name="Hong Minsu", phone="010 5555 0000"),
+    ])
+    db.session.commit()
+    assert db.session.get(Application, "a1").phone_digits == "01012345678"
+
+    assert _ids("application", "홍길동", fields=("text",)) == {"a1"}
+    assert _ids("application", "길동", fields=("text",)) == {"a1"}
+    assert _ids("application", "길", fields=("text",)) == {"a1", "a2"}
+    assert _ids("application", "동", fields=("text",)) == {"a1"}
+    assert _ids("application", "hong", fields=("text",)) == {"a3"}
+    assert _ids("application", "ng mi", fields=("text",)) == {"a3"}
+    assert _ids("application", "5678", fields=("phone",)) == {"a1", "a2"}
+    assert _ids("application", "1234-56", fields=("phone",)) == {"a1"}
+    assert _ids("application", "5678", fields=("text",)) == set()
+
+    plan = db.session.execute(text(
+        "EXPLAIN QUERY PLAN SELECT rowid FROM search_documents_fts "
+        "WHERE search_documents_fts MATCH 'body : \"길동이\"'"
+    )).all()
+    assert any("VIRTUAL TABLE INDEX" in row[-1] for row in plan)
+
+
+def test_index_follows_writes_and_rebuild(flask_app):
+    emp = Employee(name="이은비", birth_date="900101")
+    inquiry = Inquiry(company="휴메틱스", name="박민수", phone="02-555-1234", email="pm@ex.com")
+    db.session.add_all([emp, inquiry])
+    db.session.commit()
+    assert _ids("employee", "은비") == {emp.id}
+    assert _ids("inquiry", "555-12") == {inquiry.id}
+    assert _ids("inquiry", "메틱") == {inquiry.id}
+
+    emp.name = "이수아"
+    inquiry.phone = "031-777-8888"
+    db.session.commit()
+    assert _ids("employee", "은비") == set() and _ids("employee", "수아") == {emp.id}
+    assert inquiry.phone_digits == "0317778888"
+    assert _ids("inquiry", "7778") == {inquiry.id} and _ids("inquiry", "5551") == set()
+
+    db.session.delete(inquiry)
+    db.session.commit()
+    assert SearchDocument.query.filter_by(entity="inquiry").count() == 0
+
+    # 직접 DB 를 고친 경우 재구성으로 맞춘다
+    db.session.execute(text("DELETE FROM search_documents"))
+    db.session.execute(text("UPDATE employees SET name = '최하나'"))
+    db.session.commit()
+    assert rebuild_search_index() == {"application": 0, "inquiry": 0, "employee": 1, "contract": 0}
+    assert _ids("employee", "하나") == {emp.id}
+
+
+def test_list_views_use_search(client, flask_app):
+    _login(client)
+    kim = Employee(name="김철수", birth_date="900101")
+    lee = Employee(name="이영희", birth_date="910101")
+    db.session.add_all([kim, lee])
+    db.session.flush()
+    for emp in (kim, lee):
+        db.session.add(AttendanceRecord(
+            employee_id=emp.id, birth_date=emp.birth_date, emp_name=emp.name,
+            work_date=date(2026, 3, 2), work_type="normal",
+        ))
+    db.session.add_all([
+        Contract(title="근로계약서", employee_id=kim.id),
+        Contract(title="비밀유지 서약", employee_id=lee.id),
+        Application(id="x1", name="정지원", phone="010-2222-3333"),
+        Application(id="x2", name="한지민", phone="010-4444-5555"),
+        Inquiry(company="대한물류", name="오세훈", phone="010-6666-7777"),
+        Inquiry(company="서울포장", name="유재석", phone="010-8888-9999"),
+    ])
+    db.session.commit()
+
+    records = client.get("/api/attendance?emp_name=철수").get_json()["records"]
+    assert [r["emp_name"] for r in records] == ["김철수"]
+
+    # 근태 이름 필터는 직원 현재 이름이 아닌 근태에 기록된 이름을 기준으로 한다
+    kim.name = "김민수"
+    db.session.commit()
+    assert client.get("/api/attendance?emp_name=민수").get_json()["records"] == []
+    resp = client.post("/api/attendance/bulk-delete", json={"filter": {"emp_name": "민수"}})
+    assert resp.get_json()["deleted"] == 0
+    resp = client.post("/api/attendance/bulk-delete", json={"filter": {"emp_name": "철수"}})
+    assert resp.get_json()["deleted"] == 1
+    assert [r.emp_name for r in AttendanceRecord.query.all()] == ["이영희"]
+
+    page = client.get("/admin/contracts?q=영희").get_data(as_text=True)
+    assert "비밀유지 서약" in page and "근로계약서" not in page
+    page = client.get("/admin/contracts?q=서약").get_data(as_text=True)
+    assert "비밀유지 서약" in page and "근로계약서" not in page
+
+    page = client.get("/admin/applications?type=phone&q=2222-3333").get_data(as_text=True)
+    assert "정지원" in page and "한지민" not in page
+
+    page = client.get("/inquiries?q=물류").get_data(as_text=True)
+    assert "오세훈" in page and "유재석" not in page
+    page = client.get("/inquiries?q=8888").get_data(as_text=True)
+    assert "유재석" in page and "오세훈" not in page
@@ -0,0 +1,90 @@
+"""Tests for the batch severance report and its export."""
+
+import csv
+import io
+from datetime import date
+
+from sqlalchemy import event
+
+from models import Employee, Payslip, db
+from services.leave_service import calc_severance, severance_report
+
+
+def _login(client):
+    with client.session_transaction() as sess:
+        sess["is_admin"] = True
+
+
+def _seed():
+    specs = [
+        ("가직원", date(2020, 1, 15), None, ["2026-05", "2026-06", "2026-07", "2026-08"]),
+        ("나직원", date(2021, 3, 2), date(2026, 6, 30), ["2026-04", "2026-05", "2026-06"]),
+        ("다직원", date(2026, 2, 1), None, ["2026-06", "2026-07", "2026-08"]),
+        ("라직원", date(2019, 7, 1), None, ["2026-08"]),
+        ("마직원", date(2018, 1, 1), None, []),
+        ("바직원", None, None, ["2026-08"]),
+    ]
+    emps = []
+    for i, (name, hire, resign, months) in enumerate(specs):
+        emp = Employee(name=name, birth_date="900101", hire_date=hire, resign_date=resign, is_active=True)
+        db.session.add(emp)
+        db.session.flush()
+        for j, month in enumerate(months):
+            db.session.add(Payslip(employee_id=emp.id, month=month, emp_name=name,
+                                   gross=2_500_000 + i * 10_000 + j * 1_000))
+        emps.append(emp)
+    db.session.add(Employee(name="퇴사자", birth_date="900101", hire_date=date(2015, 1, 1), is_active=False))
+    db.session.commit()
+    return emps
+
+
+def test_report_matches_single_calculation_in_one_query(flask_app):
+    emps = _seed()
+    today = date.today()
+
+    statements = []
+
+    def _count(*args, **kwargs):
+        statements.append(1)
+
+    event.listen(db.engine, "before_cursor_execute", _count)
+    try:
+        report = severance_report(today)
+    finally:
+        event.remove(db.engine, "before_cursor_execute", _count)
+    assert len(statements) == 1
+
+    by_id = {e["employee_id"]: e for e in report["employees"]}
+    assert set(by_id) == {emp.id for emp in emps}
+    for emp in emps:
+        expected = calc_severance(emp.id)
+        entry = by_id[emp.id]
+        if "error" in expected:
+            assert entry["error"] == expected["error"] and entry["severance"] == 0
+            continue
+        assert {k: v for k, v in entry.items() if k not in ("employee_id", "birth_date")} == expected
+
+    # 최근 3개월만 합산 (가직원 5월분 제외)
+    assert by_id[emps[0].id]["total_gross_3m"] == 3 * 2_500_000 + 1_000 + 2_000 + 3_000
+    assert report["summary"]["total_severance"] == sum(e["severance"] for e in report["employees"])
+    assert report["summary"]["calculated"] == 2
+
+
+def test_report_reflects_new_payslips_and_exports(client, flask_app):
+    _login(client)
+    emps = _seed()
+    before = severance_report()["summary"]["calculated"]
+    db.session.add(Payslip(employee_id=emps[3].id, month="2026-07", emp_name="라직원", gross=2_000_000))
+    db.session.add(Payslip(employee_id=emps[3].id, month="2026-06", emp_name="라직원", gross=2_000_000))
+    db.session.commit()
+    assert severance_report()["summary"]["calculated"] == before + 1
+
+    resp = client.get("/admin/severance/excel?format=csv")
+    assert resp.status_code == 200
+    rows = list(csv.reader(io.StringIO(resp.data.decode("utf-8-sig"))))
+    assert rows[0][1] == "이름" and len(rows) == 1 + len(emps)
+    assert [r[1] for r in rows[1:]] == sorted(e.name for e in emps)
+
+    page = client.get("/admin/severance")
+    assert page.status_code == 200
+    assert "재직자 전체" in page.get_data(as_text=True)
@@ -0,0 +1,115 @@
+"""Tests for the denormalized site_id on attendance records and payslips."""
+
+from datetime import date, timedelta
+from io import BytesIO
+
+import numpy as np
+from openpyxl import load_workbook
+from sqlalchemy import text
+
+from models import AttendanceRecord, Employee, Payslip, Site, db
+from services.attendance_import import CATEGORIES, ParsedEmployee, import_attendance_to_db
+from services.payroll_bulk_service import compute_payslips_bulk
+
+OLD_MONTH = "2020-01"
+
+
+def _login(client):
+    with client.session_transaction() as sess:
+        sess["is_admin"] = True
+
+
+def _record(emp, work_date, **kwargs):
+    return AttendanceRecord(
+        employee_id=emp.id, birth_date=emp.birth_date, emp_name=emp.name,
+        work_date=work_date, work_type="normal", total_work_hours=8.0, **kwargs,
+    )
+
+
+def _seed():
+    a, b = Site(name="영진팩"), Site(name="한솔")
+    db.session.add_all([a, b])
+    db.session.flush()
+    kim = Employee(name="김철수", birth_date="900101", site_id=a.id, is_active=True)
+    lee = Employee(name="이은비", birth_date="910101", site_id=b.id, is_active=True)
+    db.session.add_all([kim, lee])
+    db.session.flush()
+    return a, b, kim, lee
+
+
+def test_writes_stamp_site_and_reassignment_moves_open_months(client, flask_app):
+    _login(client)
+    a, b, kim, lee = _seed()
+    today = date.today().replace(day=1)
+    db.session.add_all([_record(kim, today), _record(kim, date(2020, 1, 6)), _record(lee, today)])
+    db.session.add(Payslip(employee_id=kim.id, emp_name=kim.name, month=OLD_MONTH))
+    db.session.commit()
+    assert {r.emp_name: r.site_id for r in AttendanceRecord.query.filter_by(work_date=today)} == {
+        "김철수": a.id, "이은비": b.id,
+    }
+    assert Payslip.query.one().site_id == a.id
+
+    # Core 일괄 쓰기 (엑셀 import / 급여 일괄 계산)
+    hours = np.zeros((len(CATEGORIES), 31))
+    hours[0, 1:3] = 8.0
+    import_attendance_to_db({
+        "month_str": OLD_MONTH, "site_name": "", "errors": [],
+        "dates": [date(2020, 1, d) for d in range(1, 32)],
+        "employees": [ParsedEmployee("이은비", None, None, 0.0, hours, 0, hours.sum(axis=1))],
+    })
+    assert {r.site_id for r in AttendanceRecord.query.filter_by(employee_id=lee.id)} == {b.id}
+    compute_payslips_bulk(today.strftime("%Y-%m"), "standard")
+    current = today.strftime("%Y-%m")
+    assert {p.emp_name: p.site_id for p in Payslip.query.filter_by(month=current)} == {
+        "김철수": a.id, "이은비": b.id,
+    }
+
+    # 현장 재배치: 열린 급여월만 새 현장으로, 지난 달은 당시 현장 유지
+    resp = client.post(f"/api/sites/{b.id}/assign", json={"employee_ids": [kim.id]})
+    assert resp.get_json()["assigned"] == 1
+    stamped = {r.work_date: r.site_id for r in AttendanceRecord.query.filter_by(employee_id=kim.id)}
+    assert stamped == {today: b.id, date(2020, 1, 6): a.id}
+    assert {p.month: p.site_id for p in Payslip.query.filter_by(employee_id=kim.id)} == {
+        OLD_MONTH: a.id, current: b.id,
+    }
+
+
+def test_site_filter_on_list_stats_and_exports(client, flask_app):
+    _login(client)
+    a, b, kim, lee = _seed()
+    start = date(2026, 3, 2)
+    for i in range(5):
+        db.session.add(_record(kim, start + timedelta(days=i)))
+    for i in range(3):
+        db.session.add(_record(lee, start + timedelta(days=i)))
+    db.session.add_all([
+        Payslip(employee_id=kim.id, emp_name=kim.name, month="2026-03"),
+        Payslip(employee_id=lee.id, emp_name=lee.name, month="2026-03"),
+    ])
+    db.session.commit()
+
+    page = client.get(f"/admin/attendance?site_id={b.id}").get_data(as_text=True)
+    assert "근무 기록 (3건)" in page and "김철수" not in page.split("근무 기록")[1]
+
+    records = client.get(f"/api/attendance?site_id={a.id}").get_json()["records"]
+    assert len(records) == 5 and {r["site_id"] for r in records} == {a.id}
+    assert client.get("/api/attendance?site_id=x").status_code == 400
+
+    sheet = load_workbook(BytesIO(client.get(f"/admin/attendance/excel?site_id={b.id}").data)).active
+    assert [row[1] for row in sheet.iter_rows(min_row=2, values_only=True)] == ["이은비"] * 3
+
+    page = client.get(f"/admin/payslip?month=2026-03&site_id={a.id}").get_data(as_text=True)
+    assert "(1건)" in page
+    sheet = load_workbook(BytesIO(client.get(f"/admin/payslip/excel?month=2026-03&site_id={b.id}").data)).active
+    assert [row[1] for row in sheet.iter_rows(min_row=2, values_only=True)] == ["이은비"]
+
+    # 조회 결과 전체삭제도 현장 조건을 따른다
+    resp = client.post("/api/attendance/bulk-delete", json={"filter": {"site_id": str(b.id)}})
+    assert resp.get_json()["deleted"] == 3
+    assert AttendanceRecord.query.count() == 5
+
+    plan = db.session.execute(text(
+        "EXPLAIN QUERY PLAN SELECT count(*) FROM attendance_records "
+        "WHERE site_id = :site AND work_date >= :start AND work_date < :end"
+    ), {"site": a.id, "start": "2026-03-01", "end": "2026-04-01"}).all()
+    assert any("ix_attendance_site_date" in row[-1] for row in plan)
@@ -0,0 +1,134 @@
+"""Tests for the cached WageConfig resolver and its shared version counter."""
+
+import gc
+import random
+import time
+
+from sqlalchemy import event, update
+
+from models import CacheVersion, Employee, Site, WageConfig, db
+from models.wage_config import WAGE_DEFAULTS
+from services.wage_service import (
+    get_wage_config,
+    get_wage_config_detail,
+    get_wage_index,
+    resolve_wage_configs,
+    save_wage_config,
+)
+
+
+def _merge(layers):
+    """필드별로 앞선 레이어의 값, 없으면 기본값 (검증용 기준 구현)."""
+    return {
+        field: next(
+            (getattr(layer, field) for layer in layers if getattr(layer, field) is not None),
+            WAGE_DEFAULTS.get(field),
+        )
+        for field in WageConfig.RATE_FIELDS
+    }
+
+
+def _count_queries():
+    statements = []
+
+    def _count(*args, **kwargs):
+        statements.append(1)
+
+    event.listen(db.engine, "before_cursor_execute", _count)
+    return statements, lambda: event.remove(db.engine, "before_cursor_execute", _count)
+
+
+def test_bulk_resolution_matches_layer_merge(flask_app, monkeypatch):
+    monkeypatch.setitem(flask_app.config, "WAGE_CACHE_CHECK_SECONDS", 3600)
+    rng = random.Random(5)
+    sites = [Site(name=f"현장{i}") for i in range(20)]
+    db.session.add_all(sites)
+    db.session.flush()
+    db.session.add(WageConfig(config_type="system", hourly_wage=11_000, break_hours=0.5))
+    for site in sites[::2]:
+        db.session.add(WageConfig(config_type="site", target_id=site.id,
+                                  hourly_wage=rng.choice((12_000, None)), overtime_rate=2.0))
+    employee_sites = {}
+    for eid in range(1, 2001):
+        employee_sites[eid] = rng.choice([None] + [s.id for s in sites])
+        if eid % 7 == 0:
+            db.session.add(WageConfig(config_type="employee", target_id=eid, daily_wage=150_000))
+    db.session.commit()
+
+    expected = {}
+    for eid, site_id in employee_sites.items():
+        layers = [
+            WageConfig.query.filter_by(config_type="employee", target_id=eid).first(),
+            WageConfig.query.filter_by(config_type="site", target_id=site_id).first() if site_id else None,
+            WageConfig.query.filter_by(config_type="system").first(),
+        ]
+        expected[eid] = _merge([layer for layer in layers if layer is not None])
+
+    db.session.expunge_all()
+    gc.collect()  # 검증용으로 적재한 ORM 객체 정리가 측정에 끼지 않도록
+    get_wage_index()
+    statements, stop = _count_queries()
+    try:
+        started = time.perf_counter()
+        resolved = resolve_wage_configs(employee_sites)
+        elapsed = time.perf_counter() - started
+    finally:
+        stop()
+    assert resolved == expected
+    assert statements == []
+    assert elapsed < 0.05
+
+    resolved[7]["hourly_wage"] = 0
+    assert resolve_wage_configs({7: employee_sites[7]})[7] == expected[7]
+
+
+def test_save_invalidates_and_bumps_shared_version(flask_app):
+    emp = Employee(name="홍길동", birth_date="900101", is_active=True)
+    db.session.add(emp)
+    db.session.commit()
+    assert get_wage_config(employee_id=emp.id)["hourly_wage"] == 10_320
+
+    save_wage_config("system", None, {"hourly_wage": 11_000})
+    assert db.session.get(CacheVersion, "wage_config").version == 1
+    assert get_wage_config(employee_id=emp.id)["hourly_wage"] == 11_000
+
+    save_wage_config("employee", emp.id, {"hourly_wage": 12_500, "break_hours": ""})
+    assert db.session.get(CacheVersion, "wage_config").version == 2
+    assert get_wage_config(employee_id=emp.id)["hourly_wage"] == 12_500
+    detail = {d["field"]: d for d in get_wage_config_detail(emp.id)}
+    assert detail["hourly_wage"]["source"] == "employee"
+    assert detail["break_hours"]["source"] == "default"
+
+
+def test_other_worker_change_is_picked_up_by_version(flask_app, monkeypatch):
+    monkeypatch.setitem(flask_app.config, "WAGE_CACHE_CHECK_SECONDS", 0)
+    save_wage_config("system", None, {"hourly_wage": 11_000})
+    assert get_wage_config()["hourly_wage"] == 11_000
+
+    # 다른 워커의 저장: 별도 커넥션에서 행 수정 + 버전 증가 (이 프로세스 리스너는 모름)
+    with db.engine.begin() as conn:
+        conn.execute(update(WageConfig).where(WageConfig.config_type == "system").values(hourly_wage=13_000))
+    assert get_wage_config()["hourly_wage"] == 11_000
+
+    with db.engine.begin() as conn:
+        conn.execute(update(CacheVersion).values(version=CacheVersion.version + 1))
+    assert get_wage_config()["hourly_wage"] == 13_000
+
+
+def test_site_overrides_resolve_like_a_saved_site_config(flask_app):
+    site = Site(name="영진팩")
+    db.session.add(site)
+    db.session.flush()
+    emp = Employee(name="홍길동", birth_date="900101", site_id=site.id, is_active=True)
+    db.session.add(emp)
+    db.session.commit()
+    save_wage_config("site", site.id, {"hourly_wage": 12_000, "overtime_rate": 2.0})
+    save_wage_config("employee", emp.id, {"daily_wage": 150_000})
+
+    simulated = get_wage_index(fresh=True).with_site_overrides(
+        {site.id: {"hourly_wage": 13_000, "overtime_rate": None}}
+    )
+    save_wage_config("site", site.id, {"hourly_wage": 13_000, "overtime_rate": None})
+    actual = get_wage_config(employee_id=emp.id)
+    assert simulated.resolve(emp.id, site.id) == actual
+    assert (actual["hourly_wage"], actual["daily_wage"]) == (13_000, 150_000)